@@ -2,20 +2,37 @@ import json
 import os
 import sys
 
+from build_words_dict import normalize_word
+
 TU_DIEN_PATH = "./data/tu_dien.txt"
 
 def add_word_to_tu_dien(word: str):
     """Add word to tu_dien.txt file for persistence"""
+    append_words_to_tu_dien([word])
+
+def append_words_to_tu_dien(words: list):
+    """Append several words to tu_dien.txt in a single write"""
+    if not words:
+        return
     try:
         with open(TU_DIEN_PATH, "a", encoding="utf-8") as f:
-            f.write(f'{{"text": "{word}", "source": ["user_added"]}}\n')
-        print(f"[ADD_WORD] Added to tu_dien.txt: {word}")
+            f.writelines(
+                json.dumps({"text": word, "source": ["user_added"]}, ensure_ascii=False) + "\n"
+                for word in words
+            )
+        for word in words:
+            print(f"[ADD_WORD] Added to tu_dien.txt: {word}")
     except Exception as e:
         print(f"[ADD_WORD] Error adding to tu_dien.txt: {e}")
 
-def load_existing_words():
-    """Load all existing words from tu_dien.txt"""
-    words = set()
+def find_existing_words(candidates: set) -> set:
+    """Return which candidate words already exist in tu_dien.txt.
+
+    Streams the file and only keeps matches, instead of materializing the
+    whole dictionary as a set. Stops reading once every candidate is found.
+    """
+    remaining = set(candidates)
+    found = set()
     try:
         with open(TU_DIEN_PATH, "r", encoding="utf-8") as f:
             for line_num, line in enumerate(f, 1):
@@ -23,49 +40,57 @@ def load_existing_words():
                 if not line:
                     continue
                 try:
-                    entry = json.loads(line)
-                    word = entry.get("text", "").strip()
-                    if word:
-                        words.add(word)
+                    word = normalize_word(json.loads(line).get("text", ""))
                 except json.JSONDecodeError as e:
                     print(f"[WARNING] Line {line_num}: Invalid JSON - {e}")
+                    continue
+                if word in remaining:
+                    remaining.discard(word)
+                    found.add(word)
+                    if not remaining:
+                        break
     except FileNotFoundError:
         print(f"[ERROR] {TU_DIEN_PATH} not found")
-    return words
+    return found
 
 def clean_duplicates():
-    """Remove duplicate words from tu_dien.txt, keeping the first occurrence"""
+    """Remove duplicate words from tu_dien.txt, keeping the first occurrence.
+
+    Words are compared after NFC normalization, so composed and decomposed
+    spellings of the same word count as duplicates. The file is streamed
+    into a temp file and swapped in atomically.
+    """
+    tmp_path = f"{TU_DIEN_PATH}.tmp"
     try:
-        with open(TU_DIEN_PATH, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-        
         seen_words = set()
-        unique_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-                word = entry.get("text", "").strip()
-                if word and word not in seen_words:
-                    seen_words.add(word)
-                    unique_lines.append(line + "\n")
-                elif word in seen_words:
-                    print(f"[CLEAN] Removed duplicate: {word}")
-            except json.JSONDecodeError:
-                # Keep invalid lines as is
-                unique_lines.append(line + "\n")
+        kept = 0
         
-        # Write back unique lines
-        with open(TU_DIEN_PATH, "w", encoding="utf-8") as f:
-            f.writelines(unique_lines)
+        with open(TU_DIEN_PATH, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as dst:
+            for line in src:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    word = normalize_word(entry.get("text", ""))
+                    if word and word not in seen_words:
+                        seen_words.add(word)
+                    elif word in seen_words:
+                        print(f"[CLEAN] Removed duplicate: {word}")
+                        continue
+                except json.JSONDecodeError:
+                    # Keep invalid lines as is
+                    pass
+                dst.write(line + "\n")
+                kept += 1
         
-        print(f"[CLEAN] Cleaned duplicates. Kept {len(unique_lines)} lines.")
+        os.replace(tmp_path, TU_DIEN_PATH)
+        print(f"[CLEAN] Cleaned duplicates. Kept {kept} lines.")
     
     except Exception as e:
         print(f"[CLEAN] Error cleaning duplicates: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 def add_words():
     """Add new words, skipping existing ones"""
@@ -6015,19 +6040,23 @@ def add_words():
   ]
 }
     
-    existing_words = load_existing_words()
-    added_count = 0
+    # Normalize candidates first (keeps input order, drops in-batch duplicates)
+    candidates = list(dict.fromkeys(
+        normalize_word(f"{key} {word}")
+        for key, words in new_words.items()
+        for word in words
+    ))
+    existing_words = find_existing_words(set(candidates))
     
-    for key, words in new_words.items():
-        for word in words:
-            full_word = f"{key} {word}"
-            if full_word not in existing_words:
-                add_word_to_tu_dien(full_word)
-                added_count += 1
-            else:
-                print(f"[SKIP] Word already exists: {full_word}")
+    to_add = []
+    for full_word in candidates:
+        if full_word not in existing_words:
+            to_add.append(full_word)
+        else:
+            print(f"[SKIP] Word already exists: {full_word}")
     
-    print(f"[ADD] Added {added_count} new words.")
+    append_words_to_tu_dien(to_add)
+    print(f"[ADD] Added {len(to_add)} new words.")
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
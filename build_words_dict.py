@@ -5,94 +5,370 @@ Creates a memory-based lookup structure for fast word chain validation.
 
 Format: JSONL file where each line is {"text": "word", "source": [...]}
 Output: JSON with mapping first_syllable -> [second_syllables]
+
+The builder splits the input into line-aligned byte ranges and hands them to
+a process pool. Each worker reads its own range from the file (nothing but
+the offsets crosses the process boundary), parses and NFC-normalizes it, then
+spills a sorted unique run to a temp file. The runs are k-way merged (sort-merge dedupe) and the index is
+written out group by group, so memory stays bounded by the chunk size
+instead of the dictionary size.
+
+Usage:
+    python build_words_dict.py                      # build data/words_dict.json
+    python build_words_dict.py --workers 4          # override pool size
+    python build_words_dict.py --benchmark 3000000  # synthetic benchmark
 """
+import argparse
+import heapq
+import itertools
 import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import unicodedata
 from collections import defaultdict
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 DICT_FILE = "./data/tu_dien.txt"
 OUTPUT_FILE = "./data/words_dict.json"
 
+CHUNK_BYTES = 4 * 1024 * 1024  # Bytes of input per worker job
+PROGRESS_EVERY = 20          # Report progress every N completed chunks
+
+
+def normalize_word(text: str) -> str:
+    """Normalize a dictionary word: NFC, lowercase, single spaces.
+
+    Vietnamese text may arrive pre-composed (NFC) or with combining tone
+    marks (NFD). Both forms must collapse to the same key, otherwise the
+    same word is stored twice and user input never matches one of them.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+def _parse_line(line: str) -> Optional[str]:
+    """Parse one JSONL line into a normalized word (None if blank or without text).
+
+    Raises:
+        ValueError: the line is not JSON (json.JSONDecodeError), or is JSON
+            but not an object with a string "text".
+    """
+    line = line.strip()
+    if not line:
+        return None
+    entry = json.loads(line)
+    if not isinstance(entry, dict):
+        raise ValueError(f"expected a JSON object, got {type(entry).__name__}")
+    text = entry.get("text", "")
+    if not isinstance(text, str):
+        raise ValueError(f"expected a string \"text\", got {type(text).__name__}")
+    word = normalize_word(text)
+    return word or None
+
+
+def _process_range(args: Tuple[int, str, int, int, str]) -> Tuple[str, int, int]:
+    """Worker: read bytes [start, end) of the input, parse them and spill the
+    sorted unique words to a run file.
+
+    Returns:
+        (run_path, lines_processed, invalid_lines)
+    """
+    chunk_id, file_path, start, end, run_dir = args
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # Split on "\n" only: str.splitlines() would also break on U+2028 inside strings
+    lines = data.decode("utf-8").split("\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    words = set()
+    invalid = 0
+    for line in lines:
+        try:
+            word = _parse_line(line)
+        except ValueError:
+            invalid += 1
+            continue
+        if word:
+            words.add(word)
+
+    run_path = os.path.join(run_dir, f"run_{chunk_id:06d}.txt")
+    with open(run_path, "w", encoding="utf-8") as f:
+        for word in sorted(words):
+            f.write(word)
+            f.write("\n")
+    return run_path, len(lines), invalid
+
+
+def _split_ranges(file_path: str, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """Cut the file into [start, end) byte ranges of about chunk_bytes that end on a newline."""
+    size = os.path.getsize(file_path)
+    ranges = []
+    with open(file_path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()  # Finish the line the cut fell into
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _iter_run(run_path: str) -> Iterator[str]:
+    with open(run_path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def _merge_runs(run_paths: List[str]) -> Iterator[str]:
+    """K-way merge sorted runs, dropping duplicates."""
+    previous = None
+    for word in heapq.merge(*(_iter_run(p) for p in run_paths)):
+        if word != previous:
+            previous = word
+            yield word
+
+
+def _write_index(words: Iterable[str], output_file: str) -> Tuple[int, int, int]:
+    """Stream sorted unique words into the first -> [seconds] JSON index.
+
+    Words sharing a first syllable are contiguous in sorted order, so each
+    group is written as soon as it is complete.
+
+    Returns:
+        (total_words, two_syllable_words, starting_syllables)
+    """
+    total = 0
+    two_syllable = 0
+    groups = 0
+
+    def two_syllable_pairs() -> Iterator[Tuple[str, str]]:
+        nonlocal total, two_syllable
+        for word in words:
+            total += 1
+            parts = word.split(" ")
+            if len(parts) == 2:
+                two_syllable += 1
+                yield parts[0], parts[1]
+
+    tmp_output = f"{output_file}.tmp"
+    with open(tmp_output, "w", encoding="utf-8") as f:
+        f.write("{")
+        for first, pairs in itertools.groupby(two_syllable_pairs(), key=lambda p: p[0]):
+            seconds = [second for _, second in pairs]
+            f.write("," if groups else "")
+            f.write(f"\n  {json.dumps(first, ensure_ascii=False)}: ")
+            f.write(json.dumps(seconds, ensure_ascii=False))
+            groups += 1
+        f.write("\n}\n")
+    os.replace(tmp_output, output_file)
+    return total, two_syllable, groups
+
+
+def build_words_dict_streaming(
+    input_file: str,
+    output_file: str,
+    workers: Optional[int] = None,
+    chunk_bytes: int = CHUNK_BYTES,
+    verbose: bool = True,
+) -> Tuple[int, int, int]:
+    """Build the index with a process pool and an external sort-merge.
+
+    Returns:
+        (total_words, two_syllable_words, starting_syllables),
+        or (0, 0, 0) if the input file is missing or empty.
+    """
+    if not os.path.exists(input_file):
+        print(f"[ERROR] Dictionary file not found: {input_file}")
+        return 0, 0, 0
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    run_dir = tempfile.mkdtemp(prefix="words_dict_runs_")
+    run_paths: List[str] = []
+    lines_done = 0
+    invalid_total = 0
+    chunks_done = 0
+    start = time.perf_counter()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+
+            def collect(done) -> None:
+                nonlocal lines_done, invalid_total, chunks_done
+                for future in done:
+                    run_path, n_lines, n_invalid = future.result()
+                    run_paths.append(run_path)
+                    lines_done += n_lines
+                    invalid_total += n_invalid
+                    chunks_done += 1
+                    if verbose and chunks_done % PROGRESS_EVERY == 0:
+                        elapsed = time.perf_counter() - start
+                        rate = lines_done / elapsed if elapsed else 0
+                        print(f"[PROGRESS] {chunks_done} chunks, {lines_done:,} lines ({rate:,.0f} lines/s)")
+
+            for chunk_id, (range_start, range_end) in enumerate(_split_ranges(input_file, chunk_bytes)):
+                # Bound the number of chunks held in memory at once
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(pool.submit(_process_range, (chunk_id, input_file, range_start, range_end, run_dir)))
+
+            done, _ = wait(pending)
+            collect(done)
+
+        parse_elapsed = time.perf_counter() - start
+        if verbose:
+            print(f"[OK] Parsed {lines_done:,} lines into {len(run_paths)} runs in {parse_elapsed:.2f}s")
+            if invalid_total:
+                print(f"[WARNING] Skipped {invalid_total:,} invalid lines")
+
+        stats = _write_index(_merge_runs(run_paths), output_file)
+        if verbose:
+            print(f"[OK] Merged and saved to: {output_file} in {time.perf_counter() - parse_elapsed - start:.2f}s")
+        return stats
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
 
 def load_words_from_jsonl(file_path: str) -> set:
     """Load all words from JSONL dictionary file.
-    
+
     Each line format: {"text": "word", "source": ["source1", "source2"]}
+    Words are NFC-normalized so they compare equal to the built index.
     """
     words = set()
+    invalid = 0
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
                 try:
-                    entry = json.loads(line)
-                    word = entry.get("text", "").strip()
+                    word = _parse_line(line)
                     if word:
                         words.add(word)
-                except json.JSONDecodeError as e:
-                    print(f"[WARNING] Line {line_num}: Invalid JSON - {e}")
+                except ValueError as e:
+                    invalid += 1
+                    print(f"[WARNING] Line {line_num}: Invalid entry - {e}")
                     continue
     except FileNotFoundError:
         print(f"[ERROR] Dictionary file not found: {file_path}")
         return set()
-    
+
+    if invalid:
+        print(f"[WARNING] Skipped {invalid:,} invalid lines")
     return words
 
 
-def build_words_dict_from_jsonl(input_file: str, output_file: str) -> dict:
+def build_words_dict_from_jsonl(input_file: str, output_file: str, workers: Optional[int] = None) -> dict:
     """Build dictionary mapping first syllable -> [second syllables].
-    
+
     Only processes 2-syllable words (words with one space).
     """
     print("[BUILDING WORDS DICT FROM JSONL]")
-    
-    # Load all words
-    words = load_words_from_jsonl(input_file)
-    
-    if not words:
+
+    total, two_syllable_count, starting = build_words_dict_streaming(input_file, output_file, workers=workers)
+    if not total:
         print("[ERROR] No words loaded from dictionary file")
         return {}
-    
-    print(f"[OK] Loaded {len(words)} total words")
-    
-    # Build mapping: first_syllable -> [second_syllables]
+
+    # Print statistics
+    print("\n[STATS] Dictionary Statistics:")
+    print(f"  * Total words: {total}")
+    print(f"  * 2-syllable words: {two_syllable_count}")
+    print(f"  * Starting syllables: {starting}")
+
+    with open(output_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _build_in_memory(input_file: str) -> dict:
+    """Reference single-process builder, used as the benchmark baseline."""
     words_dict = defaultdict(set)
-    two_syllable_count = 0
-    
-    for word in words:
-        # Split by space to get syllables
+    for word in load_words_from_jsonl(input_file):
         parts = word.split()
-        
-        # Only process 2-syllable words
         if len(parts) == 2:
-            first, second = parts
-            words_dict[first].add(second)
-            two_syllable_count += 1
-    
-    # Convert sets to sorted lists for better JSON and consistency
-    words_dict_json = {
-        k: sorted(list(v)) for k, v in words_dict.items()
-    }
-    
-    # Save to file
+            words_dict[parts[0]].add(parts[1])
+    return {k: sorted(v) for k, v in words_dict.items()}
+
+
+def _generate_synthetic_dictionary(path: str, lines: int, seed: int = 42) -> None:
+    """Write a synthetic JSONL dictionary with Vietnamese-looking syllables.
+
+    Roughly 10% of the lines are NFD duplicates of NFC entries, so the
+    normalization and dedupe paths are exercised too.
+    """
+    rng = random.Random(seed)
+    onsets = ["b", "c", "ch", "d", "đ", "g", "h", "kh", "l", "m", "n", "ng", "nh", "ph", "qu", "s", "t", "th", "tr", "v", "x"]
+    vowels = ["a", "ă", "â", "e", "ê", "i", "o", "ô", "ơ", "u", "ư", "y", "oa", "uô", "ươ", "iê"]
+    tones = ["", "̀", "́", "̃", "̉", "̣"]
+    codas = ["", "c", "ch", "m", "n", "ng", "nh", "p", "t", "i", "o", "u"]
+    syllables = [
+        unicodedata.normalize("NFC", o + v + t + c)
+        for o in onsets for v in vowels for t in tones for c in codas
+    ]
+    rng.shuffle(syllables)
+    syllables = syllables[:4000]
+
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(lines):
+            word = f"{rng.choice(syllables)} {rng.choice(syllables)}"
+            if rng.random() < 0.1:
+                word = unicodedata.normalize("NFD", word)
+            f.write(json.dumps({"text": word, "source": ["synthetic"]}, ensure_ascii=False))
+            f.write("\n")
+
+
+def run_benchmark(lines: int, workers: Optional[int] = None) -> None:
+    """Compare the in-memory baseline with the streaming builder."""
+    bench_dir = tempfile.mkdtemp(prefix="words_dict_bench_")
     try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(words_dict_json, f, ensure_ascii=False, indent=2)
-        print(f"[OK] Saved to: {output_file}")
-    except IOError as e:
-        print(f"[ERROR] Error writing output file: {e}")
-        return {}
-    
-    # Print statistics
-    print(f"\n[STATS] Dictionary Statistics:")
-    print(f"  * Total words: {len(words)}")
-    print(f"  * 2-syllable words: {two_syllable_count}")
-    print(f"  * Starting syllables: {len(words_dict_json)}")
-    
-    return words_dict_json
+        source = os.path.join(bench_dir, "tu_dien.txt")
+        output = os.path.join(bench_dir, "words_dict.json")
+
+        print(f"[BENCH] Generating {lines:,} synthetic lines...")
+        _generate_synthetic_dictionary(source, lines)
+        size_mb = os.path.getsize(source) / (1024 * 1024)
+        print(f"[BENCH] Source size: {size_mb:.1f} MB")
+
+        start = time.perf_counter()
+        baseline = _build_in_memory(source)
+        baseline_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        total, two_syllable, starting = build_words_dict_streaming(source, output, workers=workers)
+        streaming_elapsed = time.perf_counter() - start
+
+        with open(output, "r", encoding="utf-8") as f:
+            streamed = json.load(f)
+        matches = streamed == baseline
+
+        print(f"\n[BENCH] Results ({lines:,} lines, {total:,} unique words, {starting:,} starting syllables)")
+        print(f"  * In-memory baseline: {baseline_elapsed:.2f}s ({lines / baseline_elapsed:,.0f} lines/s)")
+        print(f"  * Streaming builder:  {streaming_elapsed:.2f}s ({lines / streaming_elapsed:,.0f} lines/s)")
+        print(f"  * Speedup: {baseline_elapsed / streaming_elapsed:.2f}x")
+        print(f"  * Output identical: {matches}")
+    finally:
+        shutil.rmtree(bench_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the noi_tu words index from tu_dien.txt")
+    parser.add_argument("--input", default=DICT_FILE)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--benchmark", type=int, metavar="LINES", help="Benchmark on a synthetic dictionary of LINES lines")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, workers=args.workers)
+    else:
+        build_words_dict_from_jsonl(args.input, args.output, workers=args.workers)
 
 
 if __name__ == "__main__":
-    build_words_dict_from_jsonl(DICT_FILE, OUTPUT_FILE)
+    main()
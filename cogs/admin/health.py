@@ -5,6 +5,7 @@ Provides /healthcheck command for admins to monitor:
 - Active Views count (detect leaks)
 - Background tasks
 - Open files (resource leaks)
+- Query cache hit rate
 - Uptime
 """
 
@@ -18,6 +19,7 @@ import datetime
 import psutil
 import os
 
+from core.database import db_manager
 from core.logger import setup_logger
 
 logger = setup_logger("HealthCheck", "logs/cogs/health.log")
@@ -142,6 +144,17 @@ class HealthCheckCog(commands.Cog):
                 inline=True
             )
             
+            # Query result cache (core/query_cache.py)
+            cache = db_manager.cache_stats()
+            embed.add_field(
+                name="🗄️ DB Cache",
+                value=(
+                    f"**{cache['hit_rate']:.0%}** hit rate ({cache['hits']}/{cache['hits'] + cache['misses']})\n"
+                    f"{cache['size']}/{cache['maxsize']} keys, {cache['evictions']} evicted"
+                ),
+                inline=True
+            )
+            
             # View breakdown (if any)
             if view_counts:
                 breakdown = "\n".join(
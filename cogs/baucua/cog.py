@@ -7,14 +7,12 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
-from database_manager import batch_update_seeds
 
 from .game_logic import GameManager
 from .statistics import StatisticsTracker
 from .views import BauCuaBetView
 from .helpers import (
     create_betting_embed,
-    create_result_display,
     create_summary_text
 )
 from .constants import BETTING_TIME_SECONDS
@@ -93,16 +91,16 @@ class BauCuaCog(commands.Cog):
             self.active_views[channel_id] = view  # Store for cleanup
             
             if is_slash:
-                game_message = await ctx_or_interaction.followup.send(embed=embed, view=view)
+                game_state.message = await ctx_or_interaction.followup.send(embed=embed, view=view)
             else:
-                game_message = await ctx_or_interaction.send(embed=embed, view=view)
+                game_state.message = await ctx_or_interaction.send(embed=embed, view=view)
             
             logger.info(
                 f"[GAME_START] game_id={game_state.game_id} channel={channel.name}"
             )
             
             # Betting phase - just wait, Discord handles countdown
-            await self._run_betting_phase(game_message, view)
+            await self._run_betting_phase(game_state, view)
             
             # Check if anyone bet
             if not game_state.has_bets():
@@ -121,14 +119,12 @@ class BauCuaCog(commands.Cog):
                 f"bets={game_state.get_total_bets_count()}"
             )
             
-            # Copy bets before cleanup
-            bets_data = game_state.bets.copy()
-            
-            # Roll dice and show results
-            results = await self._run_dice_roll(channel)
+            # Roll dice and score every bet once
+            results = await self._run_dice_roll(game_state, channel)
+            outcome = self.game_manager.calculate_results(game_state, results)
             
             # Display results and summary
-            await self._display_results(channel, results, bets_data)
+            await self._display_results(channel, outcome)
             
             # Clean up game state and view
             if channel_id in self.active_views:
@@ -139,7 +135,7 @@ class BauCuaCog(commands.Cog):
             
             # Update results in background
             asyncio.create_task(
-                self._process_game_results(channel_id, results, bets_data)
+                self._process_game_results(game_state, outcome)
             )
             
             logger.info(f"[GAME_COMPLETE] game_id={game_state.game_id}")
@@ -159,20 +155,23 @@ class BauCuaCog(commands.Cog):
                 except Exception:
                     pass
             
-            # Remove active game and view
+            # Remove active game and view, giving escrowed bets back
             if channel.id in self.active_views:
                 self.active_views[channel.id].stop()
                 del self.active_views[channel.id]
+            failed_game = self.game_manager.get_game(channel.id)
+            if failed_game:
+                await failed_game.ledger.void()
             self.game_manager.end_game(channel.id)
     
-    async def _run_betting_phase(self, game_message, view):
+    async def _run_betting_phase(self, game_state, view):
         """Run the betting countdown phase.
         
         Uses Discord timestamp for countdown (auto-updates client-side).
         Only edits message once at the end to disable buttons.
         
         Args:
-            game_message: Discord message to update
+            game_state: GameState holding the betting message
             view: BauCuaBetView instance
         """
         # Wait for betting duration
@@ -183,79 +182,53 @@ class BauCuaCog(commands.Cog):
         try:
             for item in view.children:
                 item.disabled = True
-            await game_message.edit(view=view)
+            await game_state.message.edit(view=view)
             logger.info("[BETTING_PHASE] Betting ended, buttons disabled")
         except Exception as e:
             logger.error(f"Error disabling bet buttons: {e}")
     
-    async def _run_dice_roll(self, channel):
+    async def _run_dice_roll(self, game_state, channel):
         """Roll dice with animation.
         
         Args:
+            game_state: GameState being rolled (keeps the roll message)
             channel: Discord channel for sending roll message
             
         Returns:
             Tuple of (result1, result2, result3)
         """
         await asyncio.sleep(1)  # Brief pause before rolling
-        
-        # Initial roll display
-        initial_roll = await self.game_manager.roll_dice()
-        from .helpers import create_rolling_text
-        rolling_text = create_rolling_text(*initial_roll)
-        rolling_message = await channel.send(rolling_text)
-        
-        # Animate
-        results = await self.game_manager.animate_roll(rolling_message)
-        
-        return results
+        return await self.game_manager.animate_roll(game_state, channel)
     
-    async def _display_results(self, channel, results, bets_data):
-        """Display final results and summary.
+    async def _display_results(self, channel, outcome):
+        """Send the results summary.
+        
+        The roll message already shows the final dice (last animation frame),
+        so only the summary is sent.
         
         Args:
             channel: Discord channel
-            results: Tuple of (result1, result2, result3)
-            bets_data: Dictionary of bets
+            outcome: RoundOutcome of the roll
         """
-        result_display = create_result_display(*results)
-        summary_text = create_summary_text(*results, bets_data)
-        
-        # Find and update rolling message, send summary
-        async for message in channel.history(limit=5):
-            if message.author == self.bot.user:
-                await asyncio.gather(
-                    message.edit(content=result_display),
-                    channel.send(f"**TỔNG KẾT:**\n{summary_text}")
-                )
-                break
+        summary_text = create_summary_text(outcome.net_by_user())
+        await channel.send(f"**TỔNG KẾT:**\n{summary_text}")
     
-    async def _process_game_results(self, channel_id, results, bets_data):
-        """Process game results: update balances and statistics.
+    async def _process_game_results(self, game_state, outcome):
+        """Process game results: settle balances and update statistics.
         
-        Runs in background via asyncio.create_task().
+        Runs in background via asyncio.create_task(). Two transactions per
+        round whatever the number of bets: the settlement and the stat upsert.
         
         Args:
-            channel_id: Discord channel ID
-            results: Tuple of dice results
-            bets_data: Dictionary of user bets
+            game_state: Finished GameState (holds the escrowed bets)
+            outcome: RoundOutcome from GameManager.calculate_results
         """
         try:
-            # Calculate payouts
-            from .models import GameState
-            temp_game = GameState(
-                game_id="temp",
-                channel_id=channel_id,
-                start_time=0,
-                bets=bets_data
-            )
-            payouts = await self.game_manager.calculate_results(temp_game, results)
-            
-            # Update balances
-            await self.game_manager.update_game_results_batch(payouts)
+            # Commit bets and payouts in one transaction
+            await self.game_manager.settle_round(game_state, outcome)
             
             # Update statistics
-            await self.stats_tracker.update_game_stats(channel_id, results, bets_data)
+            await self.stats_tracker.update_game_stats(outcome, game_state.channel_id)
             
         except Exception as e:
             logger.error(f"Error processing game results: {e}", exc_info=True)
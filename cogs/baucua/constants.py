@@ -17,11 +17,14 @@ ANIMALS = {
 # List of all animal keys for random selection
 ANIMAL_LIST = list(ANIMALS.keys())
 
+# Slot of each animal in per-round vectors (bet arrays, payout multipliers)
+ANIMAL_INDEX = {key: i for i, key in enumerate(ANIMAL_LIST)}
+
 # Game timing configuration
 BETTING_TIME_SECONDS = 45  # Duration of betting phase
-ROLL_ANIMATION_DURATION = 6.0  # Duration of dice rolling animation
-ROLL_ANIMATION_INTERVAL = 0.5  # Update interval during animation
-DICE_STOP_INTERVAL = 0.8  # Pause between each dice stopping (for suspense)
+ROLL_SPIN_FRAMES = 2  # Frames with all 3 dice rolling (the first is the sent message)
+ROLL_ANIMATION_INTERVAL = 1.5  # Seconds between spinning frames
+DICE_STOP_INTERVAL = 1.0  # Pause between each dice stopping (for suspense)
 
 # Game rules
 MAX_BET_AMOUNT = 250000  # Maximum seeds allowed per single bet
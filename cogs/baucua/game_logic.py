@@ -8,20 +8,21 @@ import random
 import asyncio
 import time
 from typing import Dict, Optional
+from core.discord_scheduler import Priority, discord_scheduler
 from core.logger import setup_logger
-from core.logger import setup_logger
-from database_manager import get_user_balance, add_seeds, get_or_create_user, batch_update_seeds
+from database_manager import get_user_balance
 
 from .constants import (
     ANIMAL_LIST,
     BETTING_TIME_SECONDS,
-    ROLL_ANIMATION_DURATION,
+    ROLL_SPIN_FRAMES,
     ROLL_ANIMATION_INTERVAL,
+    DICE_STOP_INTERVAL,
     MAX_BET_AMOUNT,
     MIN_TIME_BEFORE_CUTOFF
 )
-from .models import GameState
-from .helpers import create_rolling_text, create_result_display, calculate_payout
+from .models import GameState, RoundOutcome
+from .helpers import build_roll_frames, payout_vector
 
 logger = setup_logger("BauCuaGame", "logs/cogs/baucua.log")
 
@@ -118,29 +119,6 @@ class GameManager:
         """
         return await get_user_balance(user_id)
     
-    async def update_seeds(self, user_id: int, amount: int) -> None:
-        """Update user's seed balance (can be negative).
-        
-        Ensures user exists before updating and logs the transaction.
-        
-        Args:
-            user_id: Discord user ID
-            amount: Seeds to add (negative to deduct)
-        """
-        # Ensure user exists
-        await get_or_create_user(user_id, f"User#{user_id}")
-        
-        # Track balance before/after
-        balance_before = await get_user_balance(user_id)
-        reason = 'baucua_bet' if amount < 0 else 'baucua_win'
-        await add_seeds(user_id, amount, reason, 'baucua')
-        balance_after = balance_before + amount
-        
-        logger.info(
-            f"[SEED_UPDATE] user_id={user_id} change={amount:+d} "
-            f"before={balance_before} after={balance_after}"
-        )
-    
     async def add_bet(
         self,
         interaction: discord.Interaction,
@@ -194,18 +172,15 @@ class GameManager:
             await interaction.followup.send("❌ Số tiền cược không hợp lệ!", ephemeral=True)
             return
         
-        # Check if user has enough seeds
-        user_seeds = await self.get_user_seeds(user_id)
-        if user_seeds < bet_amount:
+        # Escrow the bet FIRST (fails if the user has too few seeds)
+        if not await game_state.ledger.hold(user_id, bet_amount, 'baucua_bet'):
+            user_seeds = await self.get_user_seeds(user_id)
             await interaction.followup.send(
                 f"❌ Bạn không đủ hạt!\nCần: {bet_amount:,} | Hiện có: {user_seeds:,}",
                 ephemeral=True
             )
             return
         
-        # Deduct seeds FIRST
-        await self.update_seeds(user_id, -bet_amount)
-        
         # THEN add to bets dictionary with safety check
         try:
             # Verify game still exists (race condition check)
@@ -213,7 +188,7 @@ class GameManager:
                 game_state.add_bet(user_id, animal_key, bet_amount)
             else:
                 # Game was deleted, refund the user
-                await self.update_seeds(user_id, bet_amount)
+                await game_state.ledger.release(user_id, bet_amount)
                 await interaction.followup.send(
                     "❌ Game đã kết thúc khi bạn cược! Tiền đã hoàn lại.",
                     ephemeral=True
@@ -222,7 +197,7 @@ class GameManager:
                 
         except Exception as e:
             # If adding bet fails, refund the user
-            await self.update_seeds(user_id, bet_amount)
+            await game_state.ledger.release(user_id, bet_amount)
             logger.error(f"Error adding bet: {e}", exc_info=True)
             await interaction.followup.send(
                 "❌ Lỗi khi xử lý cược! Tiền đã hoàn lại.",
@@ -253,167 +228,121 @@ class GameManager:
     
     async def animate_roll(
         self,
-        message: discord.Message,
-        duration: float = ROLL_ANIMATION_DURATION
+        game_state: GameState,
+        channel: discord.abc.Messageable
     ) -> tuple:
-        """Animate dice rolling with sequential stopping for dramatic effect.
-        
-        Animation phases:
-        1. All 3 dice roll together (first 50% of duration)
-        2. Dice 1 stops, 2 & 3 continue (pause 1s)
-        3. Dice 2 stops, only 3 continues (pause 1s)
-        4. Dice 3 stops (final result)
+        """Roll the dice and play the pre-rendered animation.
         
-        Display: Always shows exactly 3 emojis (no extra symbols)
+        The outcome is decided first and every frame is rendered up front
+        (see build_roll_frames): spinning dice, then dice 1, 2 and 3 stopping
+        in turn. The first frame is sent as the roll message, kept in
+        game_state.roll_message; the rest are edits queued on the shared
+        Discord scheduler. A frame still waiting behind rate limits is replaced
+        by the next one, so a busy bucket skips frames instead of falling behind.
         
         Args:
-            message: Discord message to edit
-            duration: Animation duration in seconds
+            game_state: Game being rolled
+            channel: Channel to send the roll message to
             
         Returns:
             Final dice results as tuple (result1, result2, result3)
         """
-        from .constants import DICE_STOP_INTERVAL
-        from .helpers import create_partial_result_text
-        
-        # Phase 1: All dice rolling (first half of duration)
-        phase1_duration = duration * 0.5
-        start_time = time.time()
-        
-        while time.time() - start_time < phase1_duration:
-            r1, r2, r3 = await self.roll_dice()
-            rolling_text = create_rolling_text(r1, r2, r3)
-            
-            try:
-                await message.edit(content=rolling_text, embed=None)
-            except discord.HTTPException as e:
-                logger.error(f"Error updating roll animation: {e}")
-            
-            await asyncio.sleep(ROLL_ANIMATION_INTERVAL)
-        
-        # Determine final results
-        final_result1, final_result2, final_result3 = await self.roll_dice()
-        
-        # Phase 2: Stop dice 1, continue 2 & 3
-        partial_text = create_partial_result_text(
-            result1=final_result1,
-            result2=None,
-            result3=None
-        )
-        try:
-            await message.edit(content=partial_text, embed=None)
-        except discord.HTTPException as e:
-            logger.error(f"Error showing dice 1 stop: {e}")
-        
-        # Brief animation with dice 2 & 3 still rolling
-        dice_2_3_start = time.time()
-        while time.time() - dice_2_3_start < DICE_STOP_INTERVAL:
-            r2, r3 = random.choices(ANIMAL_LIST, k=2)
-            partial_text = create_partial_result_text(
-                result1=final_result1,
-                result2=r2,
-                result3=r3
-            )
-            try:
-                await message.edit(content=partial_text, embed=None)
-            except discord.HTTPException:
-                pass
-            await asyncio.sleep(ROLL_ANIMATION_INTERVAL)
-        
-        # Phase 3: Stop dice 2, continue dice 3
-        partial_text = create_partial_result_text(
-            result1=final_result1,
-            result2=final_result2,
-            result3=None
-        )
-        try:
-            await message.edit(content=partial_text, embed=None)
-        except discord.HTTPException as e:
-            logger.error(f"Error showing dice 2 stop: {e}")
-        
-        # Brief animation with only dice 3 rolling
-        dice_3_start = time.time()
-        while time.time() - dice_3_start < DICE_STOP_INTERVAL:
-            r3 = random.choice(ANIMAL_LIST)
-            partial_text = create_partial_result_text(
-                result1=final_result1,
-                result2=final_result2,
-                result3=r3
-            )
-            try:
-                await message.edit(content=partial_text, embed=None)
-            except discord.HTTPException:
-                pass
-            await asyncio.sleep(ROLL_ANIMATION_INTERVAL)
-        
-        # Phase 4: All dice stopped - show final result (only 3 emojis)
-        final_text = create_result_display(final_result1, final_result2, final_result3)
-        try:
-            await message.edit(content=final_text, embed=None)
-        except discord.HTTPException as e:
-            logger.error(f"Error showing final result: {e}")
+        results = await self.roll_dice()
+        frames = build_roll_frames(results)
+        delays = [ROLL_ANIMATION_INTERVAL] * (ROLL_SPIN_FRAMES - 1) + [DICE_STOP_INTERVAL] * 3
+        
+        message = await channel.send(frames[0])
+        game_state.roll_message = message
+        
+        edits = []
+        for frame, delay in zip(frames[1:], delays):
+            await asyncio.sleep(delay)
+            edits.append(discord_scheduler.submit(
+                "message_edit",
+                lambda frame=frame: message.edit(content=frame, embed=None),
+                major=channel.id,
+                target=message.id,
+                priority=Priority.NORMAL,
+                label=f"baucua roll game_id={game_state.game_id}",
+            ))
+        
+        # Coalesced frames resolve with the newest edit, so this waits for the final result
+        for result in await asyncio.gather(*edits, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error updating roll animation: {result}")
         
         logger.info(
-            f"[DICE_ROLL] Sequential animation complete: "
-            f"{final_result1}, {final_result2}, {final_result3}"
+            f"[DICE_ROLL] game_id={game_state.game_id} {len(frames)} frames, "
+            f"{len(edits)} edits: {', '.join(results)}"
         )
         
-        return (final_result1, final_result2, final_result3)
+        return results
     
-    async def calculate_results(
+    def calculate_results(
         self,
         game_state: GameState,
         results: tuple
-    ) -> Dict[int, int]:
-        """Calculate payouts for all bets based on results.
+    ) -> RoundOutcome:
+        """Calculate payouts and stat totals for all bets in one pass.
         
-        Formula: payout = bet_amount * (matches + 1)
-        - 0 matches = 0 payout (loss)
-        - 1 match = bet_amount * 2
-        - 2 matches = bet_amount * 3
-        - 3 matches = bet_amount * 4
+        The roll is turned once into a 6-slot multiplier vector
+        (payout = bet_amount * (matches + 1), 0 on a miss), then every bet
+        is read straight from the round's parallel arrays.
         
         Args:
             game_state: Active game state with bets
             results: Tuple of (result1, result2, result3)
             
         Returns:
-            Dictionary mapping user_id to total payout amount
+            RoundOutcome with per-player payouts, stakes and stat totals
         """
-        result1, result2, result3 = results
-        final_result = [result1, result2, result3]
-        payouts = {}
-        
-        for user_id, bet_list in game_state.bets.items():
-            total_payout = 0
-            
-            for animal_key, bet_amount in bet_list:
-                matches = sum(1 for r in final_result if r == animal_key)
-                payout = calculate_payout(bet_amount, matches)
-                total_payout += payout
-            
-            if total_payout > 0:
-                payouts[user_id] = total_payout
-        
-        return payouts
+        multipliers = payout_vector(results)
+        count = len(game_state.players)
+        staked = [0] * count
+        payout = [0] * count
+        won = [0] * count
+        lost = [0] * count
+        triple = bytearray(count)
+        
+        for player, animal, amount in zip(game_state.bet_player, game_state.bet_animal, game_state.bet_amount):
+            multiplier = multipliers[animal]
+            staked[player] += amount
+            if multiplier:
+                payout[player] += amount * multiplier
+                won[player] += amount * (multiplier - 1)
+                if multiplier == 4:
+                    triple[player] = 1
+            else:
+                lost[player] += amount
+        
+        return RoundOutcome(
+            results=tuple(results),
+            players=list(game_state.players),
+            staked=staked,
+            payout=payout,
+            won=won,
+            lost=lost,
+            triple=triple
+        )
     
-    async def update_game_results_batch(
+    async def settle_round(
         self,
-        payouts: Dict[int, int]
+        game_state: GameState,
+        outcome: RoundOutcome
     ) -> None:
-        """Update seed balances for all winners in a single batch operation.
-        
-        Uses optimized batch_update_seeds for performance.
+        """Commit the round: escrowed bets and all payouts in one transaction.
         
         Args:
-            payouts: Dictionary mapping user_id to payout amount
+            game_state: Finished game (its ledger holds the escrowed bets)
+            outcome: Results from calculate_results
         """
-        if not payouts:
-            logger.debug("[RESULTS] No payouts to process")
-            return
+        payouts = outcome.payouts()
+        for user_id, amount in payouts.items():
+            game_state.ledger.credit(user_id, amount, 'baucua_win')
         
         try:
-            await batch_update_seeds(payouts)
-            logger.info(f"[RESULTS] Batch updated seeds for {len(payouts)} users")
+            await game_state.ledger.settle()
+            logger.info(f"[RESULTS] Settled game {game_state.game_id}: {len(payouts)} winners")
         except Exception as e:
-            logger.error(f"Error batch updating seeds: {e}", exc_info=True)
+            logger.error(f"Error settling game {game_state.game_id}: {e}", exc_info=True)
+            await game_state.ledger.void()
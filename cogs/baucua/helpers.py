@@ -4,9 +4,11 @@ Contains functions for building embeds, formatting text, and displaying results.
 """
 
 import discord
+import itertools
+import random
 from typing import Dict, List, Tuple
 
-from .constants import ANIMALS, MAX_BET_AMOUNT
+from .constants import ANIMALS, ANIMAL_INDEX, ANIMAL_LIST, MAX_BET_AMOUNT, ROLL_SPIN_FRAMES
 
 
 def create_betting_embed(end_timestamp: int) -> discord.Embed:
@@ -86,6 +88,31 @@ def create_partial_result_text(
     return f"{emoji1} {emoji2} {emoji3}"
 
 
+def build_roll_frames(
+    results: Tuple[str, str, str],
+    spin_frames: int = ROLL_SPIN_FRAMES
+) -> List[str]:
+    """Pre-render every frame of the roll animation for a known outcome.
+    
+    Frames: spin_frames with all dice rolling, dice 1 stopped, dice 1 & 2
+    stopped, then the final result. One message edit per frame, so the
+    animation costs a fixed number of API calls however long it runs.
+    
+    Args:
+        results: Final (result1, result2, result3)
+        spin_frames: Number of all-rolling frames
+        
+    Returns:
+        List of frame texts, first one to be sent, the rest edited in
+    """
+    result1, result2, result3 = results
+    frames = [create_rolling_text(*random.choices(ANIMAL_LIST, k=3)) for _ in range(spin_frames)]
+    frames.append(create_partial_result_text(result1, *random.choices(ANIMAL_LIST, k=2)))
+    frames.append(create_partial_result_text(result1, result2, random.choice(ANIMAL_LIST)))
+    frames.append(create_result_display(result1, result2, result3))
+    return frames
+
+
 def create_result_display(result1: str, result2: str, result3: str) -> str:
     """Create final result display with large emojis.
     
@@ -104,31 +131,21 @@ def create_result_display(result1: str, result2: str, result3: str) -> str:
     return f"{emoji1} {emoji2} {emoji3}"
 
 
-def create_summary_text(
-    result1: str,
-    result2: str,
-    result3: str,
-    bets_data: Dict[int, List[Tuple[str, int]]]
-) -> str:
+def create_summary_text(net_by_user: Dict[int, int]) -> str:
     """Create detailed summary text of results per user.
     
-    Shows each player's bets and their winnings/losses.
+    Shows each player's net winnings/losses for the round.
     
     Args:
-        result1: First dice result
-        result2: Second dice result
-        result3: Third dice result
-        bets_data: Dictionary mapping user_id to list of (animal_key, amount) tuples
+        net_by_user: Dictionary mapping user_id to net profit (negative = loss),
+            in betting order
         
     Returns:
         Formatted multi-line string with summary for each user
     """
-    final_result = [result1, result2, result3]
     summary_lines = []
     
     # Gen Z templates
-    import random
-    
     WIN_MSGS = [
         "{user} đã hốt bạc **{amount}** 🌱. Flex nhẹ cái nhân phẩm!",
         "{user} làm giàu không khó, ẵm trọn **{amount}** 🌱. Mời cả làng đi ăn đi!",
@@ -163,23 +180,10 @@ def create_summary_text(
         "{user} về bờ an toàn. Hú hồn chim én!"
     ]
 
-    for user_id, bet_list in bets_data.items():
+    for user_id, net_profit in net_by_user.items():
         # Use user ID mention format (no fetch needed, instant)
         user_mention = f"<@{user_id}>"
         
-        # Calculate NET profit/loss
-        total_payout = 0
-        total_bet = 0
-        
-        for animal_key, bet_amount in bet_list:
-            total_bet += bet_amount
-            matches = sum(1 for r in final_result if r == animal_key)
-            if matches > 0:
-                # Payout includes original bet
-                total_payout += bet_amount * (matches + 1)
-        
-        net_profit = total_payout - total_bet
-        
         if net_profit > 0:
             msg_template = random.choice(WIN_MSGS)
             summary = msg_template.format(user=user_mention, amount=net_profit)
@@ -229,3 +233,29 @@ def calculate_net_profit(bet_amount: int, matches: int) -> int:
     """
     payout = calculate_payout(bet_amount, matches)
     return payout - bet_amount
+
+
+def payout_vector(results: Tuple[str, str, str]) -> Tuple[int, ...]:
+    """Payout multiplier of every animal slot (ANIMAL_INDEX order) for a roll.
+    
+    Same formula as calculate_payout: matches + 1, or 0 when the animal
+    did not come up.
+    
+    Args:
+        results: Tuple of (result1, result2, result3) animal keys
+        
+    Returns:
+        Tuple of 6 multipliers
+    """
+    return PAYOUT_VECTORS[tuple(ANIMAL_INDEX[r] for r in results)]
+
+
+def _build_payout_vectors() -> Dict[Tuple[int, int, int], Tuple[int, ...]]:
+    vectors = {}
+    for roll in itertools.product(range(len(ANIMAL_LIST)), repeat=3):
+        vectors[roll] = tuple(calculate_payout(1, roll.count(slot)) for slot in range(len(ANIMAL_LIST)))
+    return vectors
+
+
+# All 216 rolls -> multiplier vector, keyed by animal slots
+PAYOUT_VECTORS = _build_payout_vectors()
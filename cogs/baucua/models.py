@@ -3,10 +3,18 @@
 Contains dataclasses for managing game state, bets, and results.
 """
 
+from array import array
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 import time
 
+from core.settlement import RoundLedger
+
+from .constants import ANIMAL_INDEX, ANIMAL_LIST
+
+if TYPE_CHECKING:
+    import discord
+
 
 @dataclass
 class BetData:
@@ -29,16 +37,37 @@ class GameState:
     Tracks all game information including game ID, timing, and placed bets.
     Uses in-memory storage for active games only.
     
+    Bets are kept as parallel arrays (one slot per bet) so a round with
+    hundreds of bets is settled in a single pass over flat arrays instead of
+    nested per-user lists.
+    
     Attributes:
         game_id: Unique identifier for this game session
         channel_id: Discord channel ID where game is running
         start_time: Unix timestamp when game started
-        bets: Dictionary mapping user_id to list of (animal_key, amount) tuples
+        players: User IDs in betting order; a bet refers to its player by index
+        bet_player: Player index of each bet
+        bet_animal: Animal slot (ANIMAL_INDEX) of each bet
+        bet_amount: Seeds of each bet
+        ledger: Escrowed bets and payouts, settled once after the roll
+        message: Betting message (embed + bet buttons)
+        roll_message: Dice message, animated then left showing the result
     """
     game_id: str
     channel_id: int
     start_time: float
-    bets: Dict[int, List[Tuple[str, int]]] = field(default_factory=dict)
+    players: List[int] = field(default_factory=list)
+    bet_player: array = field(default_factory=lambda: array('I'))
+    bet_animal: bytearray = field(default_factory=bytearray)
+    bet_amount: array = field(default_factory=lambda: array('q'))
+    ledger: Optional[RoundLedger] = None
+    message: Optional["discord.Message"] = None
+    roll_message: Optional["discord.Message"] = None
+    _player_index: Dict[int, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        if self.ledger is None:
+            self.ledger = RoundLedger(f"baucua:{self.game_id}", "baucua")
     
     @classmethod
     def create_new(cls, channel_id: int) -> 'GameState':
@@ -56,24 +85,34 @@ class GameState:
         return cls(
             game_id=game_id,
             channel_id=channel_id,
-            start_time=time.time(),
-            bets={}
+            start_time=time.time()
         )
     
     def add_bet(self, user_id: int, animal_key: str, amount: int) -> None:
         """Add a bet for the specified user.
         
-        If user has no prior bets, creates new entry in bets dict.
-        Allows multiple bets per user on different animals.
+        Allows multiple bets per user on the same or different animals.
         
         Args:
             user_id: Discord user ID
             animal_key: Animal to bet on
             amount: Number of seeds to bet
         """
-        if user_id not in self.bets:
-            self.bets[user_id] = []
-        self.bets[user_id].append((animal_key, amount))
+        index = self._player_index.get(user_id)
+        if index is None:
+            index = self._player_index[user_id] = len(self.players)
+            self.players.append(user_id)
+        self.bet_player.append(index)
+        self.bet_animal.append(ANIMAL_INDEX[animal_key])
+        self.bet_amount.append(amount)
+    
+    @property
+    def bets(self) -> Dict[int, List[Tuple[str, int]]]:
+        """Bets grouped per user as (animal_key, amount) tuples (built on demand)."""
+        grouped: Dict[int, List[Tuple[str, int]]] = {user_id: [] for user_id in self.players}
+        for player, animal, amount in zip(self.bet_player, self.bet_animal, self.bet_amount):
+            grouped[self.players[player]].append((ANIMAL_LIST[animal], amount))
+        return grouped
     
     def get_user_bets(self, user_id: int) -> List[Tuple[str, int]]:
         """Retrieve all bets placed by a user.
@@ -84,7 +123,14 @@ class GameState:
         Returns:
             List of (animal_key, amount) tuples, empty list if no bets
         """
-        return self.bets.get(user_id, [])
+        index = self._player_index.get(user_id)
+        if index is None:
+            return []
+        return [
+            (ANIMAL_LIST[animal], amount)
+            for player, animal, amount in zip(self.bet_player, self.bet_animal, self.bet_amount)
+            if player == index
+        ]
     
     def get_total_bet_amount(self, user_id: int) -> int:
         """Calculate total seeds bet by a user across all their bets.
@@ -103,23 +149,56 @@ class GameState:
         Returns:
             True if at least one bet exists
         """
-        return len(self.bets) > 0
+        return len(self.bet_amount) > 0
     
     def get_total_players(self) -> int:
         """Get count of unique players who placed bets.
         
         Returns:
-            Number of unique user IDs in bets dict
+            Number of unique user IDs that placed a bet
         """
-        return len(self.bets)
+        return len(self.players)
     
     def get_total_bets_count(self) -> int:
         """Get total number of individual bets placed.
         
         Returns:
-            Sum of all bet counts across all users
+            Number of bets across all users
         """
-        return sum(len(user_bets) for user_bets in self.bets.values())
+        return len(self.bet_amount)
+
+
+@dataclass
+class RoundOutcome:
+    """Per-player results of a rolled round, indexed like GameState.players.
+    
+    Attributes:
+        results: Tuple of (result1, result2, result3)
+        players: User IDs in betting order
+        staked: Total seeds bet per player
+        payout: Total payout per player (stakes of winning bets included)
+        won: Profit of the player's winning bets
+        lost: Seeds of the player's losing bets
+        triple: 1 if the player hit an animal that came up three times
+    """
+    results: Tuple[str, str, str]
+    players: List[int]
+    staked: List[int]
+    payout: List[int]
+    won: List[int]
+    lost: List[int]
+    triple: bytearray
+
+    def payouts(self) -> Dict[int, int]:
+        """Dictionary mapping user_id to payout, winners only."""
+        return {user_id: amount for user_id, amount in zip(self.players, self.payout) if amount > 0}
+
+    def net_by_user(self) -> Dict[int, int]:
+        """Dictionary mapping user_id to net profit (negative = loss), in betting order."""
+        return {
+            user_id: payout - staked
+            for user_id, payout, staked in zip(self.players, self.payout, self.staked)
+        }
 
 
 @dataclass
@@ -289,6 +289,7 @@ class ConfigCog(commands.Cog):
                 int(guild_id), new_logs, new_noitu, new_fishing, new_bump, 
                 bump_start_time, new_log_bot, new_ping_user, new_log_level
             ))
+            db_manager.clear_cache_by_prefix(f"config_{guild_id}_")
             
             if kenh_cay:
                 # UPSERT for server_tree
@@ -331,10 +332,7 @@ class ConfigCog(commands.Cog):
                     # Stop old game if channel changed
                     if old_noitu and old_noitu != kenh_noitu.id:
                         if guild_id in game_cog.games:
-                            del game_cog.games[guild_id]
-                            # Also clean up lock
-                            if guild_id in game_cog.game_locks:
-                                del game_cog.game_locks[guild_id]
+                            game_cog.stop_game(guild_id)
                             print(f"GAME_STOP [Guild {guild_id}] Stopped old game at channel {old_noitu}")
                     
                     # Start new game
@@ -404,6 +402,7 @@ class ConfigCog(commands.Cog):
                     noitu_channel_id = EXCLUDED.noitu_channel_id,
                     fishing_channel_id = EXCLUDED.fishing_channel_id
             """, (int(guild_id), new_logs, new_noitu, new_fishing))
+            db_manager.clear_cache_by_prefix(f"config_{guild_id}_")
             
             # Get channel mention for confirmation
             channel_mention = f"<#{channel.id}>"
@@ -418,10 +417,7 @@ class ConfigCog(commands.Cog):
                     # Stop old game if channel changed
                     if current_noitu and current_noitu != channel.id:
                         if guild_id in game_cog.games:
-                            del game_cog.games[guild_id]
-                            # Also clean up lock
-                            if guild_id in game_cog.game_locks:
-                                del game_cog.game_locks[guild_id]
+                            game_cog.stop_game(guild_id)
                             print(f"GAME_STOP [Guild {guild_id}] Stopped old game at channel {current_noitu}")
                     
                     # Start new game
@@ -499,6 +495,7 @@ class ConfigCog(commands.Cog):
                 INSERT INTO server_config (guild_id, exclude_chat_channels) VALUES ($1, $2)
                 ON CONFLICT(guild_id) DO UPDATE SET exclude_chat_channels = EXCLUDED.exclude_chat_channels
             """, (int(guild_id), json.dumps(excluded)))
+            db_manager.clear_cache_by_prefix(f"config_{guild_id}_")
             
             await interaction.followup.send(msg, ephemeral=True)
             print(f"[EXCLUDE] {interaction.user.name} {action}ed {channel.name}")
@@ -12,6 +12,8 @@ from database_manager import (
     get_leaderboard,
     batch_update_seeds
 )
+from core.database import balance_cache_key, get_cached_balance, harvest_buff_cache_key
+from core.ledger import Ledger, write_batch
 from core.logger import setup_logger
 
 logger = setup_logger("EconomyCog", "cogs/economy.log")
@@ -25,6 +27,9 @@ CHAT_REWARD_MAX = 3
 CHAT_REWARD_COOLDOWN = 60  # seconds
 VOICE_REWARD_INTERVAL = 10  # minutes
 VOICE_REWARD = 2  # Seeds per 10 minutes in voice
+REACTION_REWARD_COOLDOWN = 120  # seconds
+REWARD_FLUSH_INTERVAL = 5  # seconds between bulk writes of buffered rewards
+REWARD_CATEGORY = "social"  # transaction_logs category of activity rewards
 
 class EconomyCog(commands.Cog):
     """Cog handling the economy system.
@@ -35,13 +40,21 @@ class EconomyCog(commands.Cog):
         self.bot = bot
         self.chat_cooldowns = {}  # {user_id: last_reward_time}
         self.reaction_cooldowns = {}  # {user_id: last_reaction_reward_time}
+        # Chat/reaction rewards are buffered here and written by reward_flush_task
+        self.rewards = Ledger(REWARD_CATEGORY)
+        self.reward_flush_lock = asyncio.Lock()
+        self.reward_flush_task.start()
         self.voice_reward_task.start()
         self.weekly_welfare_task.start()  # Weekly welfare for poor active users
 
 
-    def cog_unload(self):
+    async def cog_unload(self):
+        # stop(), not cancel(): a flush in progress must not lose its drained batch
+        self.reward_flush_task.stop()
         self.voice_reward_task.cancel()
         self.weekly_welfare_task.cancel()
+        # Write whatever is still buffered instead of dropping it
+        await self.flush_rewards()
 
 
     # ==================== HELPER FUNCTIONS ====================
@@ -73,7 +86,7 @@ class EconomyCog(commands.Cog):
                 "SELECT harvest_buff_until FROM server_config WHERE guild_id = $1",
                 (int(guild_id),),
                 use_cache=True,
-                cache_key=f"harvest_buff_{guild_id}",
+                cache_key=harvest_buff_cache_key(guild_id),
                 cache_ttl=60
             )
             
@@ -120,15 +133,7 @@ class EconomyCog(commands.Cog):
             "UPDATE users SET last_daily = CURRENT_TIMESTAMP WHERE user_id = $1",
             (int(user_id),)
         )
-        db_manager.clear_cache_by_prefix(f"seeds_{user_id}")
-
-    async def update_last_chat_reward(self, user_id: int):
-        """Update last chat reward time"""
-        await db_manager.execute(
-            "UPDATE users SET last_chat_reward = CURRENT_TIMESTAMP WHERE user_id = $1",
-            (int(user_id),)
-        )
-        db_manager.clear_cache_by_prefix(f"seeds_{user_id}")
+        db_manager.clear_cache_keys([balance_cache_key(user_id)])
 
     async def get_last_daily(self, user_id: int) -> datetime:
         """Get last daily reward time"""
@@ -155,7 +160,7 @@ class EconomyCog(commands.Cog):
                 "SELECT logs_channel_id, exclude_chat_channels FROM server_config WHERE guild_id = $1",
                 (int(guild_id),),
                 use_cache=True,
-                cache_key=f"excluded_channels_{guild_id}",
+                cache_key=f"config_{guild_id}_excluded_channels",
                 cache_ttl=600
             )
             
@@ -234,7 +239,7 @@ class EconomyCog(commands.Cog):
         target_user = user or interaction.user
         await self.get_or_create_user_local(target_user.id, target_user.name)
         
-        seeds = await self.get_user_balance_local(target_user.id)
+        seeds = await get_cached_balance(target_user.id)
         
         # Get inventory
         from database_manager import get_stat
@@ -287,7 +292,7 @@ class EconomyCog(commands.Cog):
         target_user = user or ctx.author
         await self.get_or_create_user_local(target_user.id, target_user.name)
         
-        seeds = await self.get_user_balance_local(target_user.id)
+        seeds = await get_cached_balance(target_user.id)
         
         # Get inventory
         from database_manager import get_stat
@@ -546,8 +551,8 @@ class EconomyCog(commands.Cog):
             if now - last_reward < CHAT_REWARD_COOLDOWN:
                 return
         
-        # Get or create user
-        await self.get_or_create_user_local(user_id, message.author.name)
+        # Claim the cooldown before awaiting so a burst of messages rewards once
+        self.chat_cooldowns[user_id] = now
         
         # Award random seeds
         reward = random.randint(CHAT_REWARD_MIN, CHAT_REWARD_MAX)
@@ -557,16 +562,15 @@ class EconomyCog(commands.Cog):
         if is_buff_active:
             reward = reward * 2
         
-        logger.info(
+        logger.debug(
             f"[ECONOMY] [CHAT_REWARD] user_id={user_id} username={message.author.name} "
             f"reward={reward} buff_active={is_buff_active}"
         )
         
-        await self.add_seeds_local(user_id, reward, 'chat_reward', 'social')
-        await self.update_last_chat_reward(user_id)
-        
-        # Update cooldown
-        self.chat_cooldowns[user_id] = now
+        # Buffered; user creation, seeds, logs and last_chat_reward are written by reward_flush_task
+        self.rewards.remember_user(user_id, message.author.name)
+        self.rewards.add_seeds(user_id, reward, 'chat_reward')
+        self.rewards.stamp_chat(user_id)
 
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
@@ -606,12 +610,11 @@ class EconomyCog(commands.Cog):
         cooldown_key = f"{author_id}_reaction"
         if cooldown_key in self.reaction_cooldowns:
             last_reward = self.reaction_cooldowns[cooldown_key]
-            # Use longer cooldown for reactions (120 seconds)
-            if now - last_reward < 120:
+            # Use longer cooldown for reactions
+            if now - last_reward < REACTION_REWARD_COOLDOWN:
                 return
         
-        # Get or create user
-        await self.get_or_create_user_local(author_id, message.author.name)
+        self.reaction_cooldowns[cooldown_key] = now
         
         # Award seeds - same as chat reward
         reward = random.randint(CHAT_REWARD_MIN, CHAT_REWARD_MAX)
@@ -623,53 +626,86 @@ class EconomyCog(commands.Cog):
         
         # Log with context
         location = "forum_post" if is_forum_post else "message"
-        logger.info(
+        logger.debug(
             f"[ECONOMY] [REACTION_REWARD] user_id={author_id} username={message.author.name} "
             f"reward={reward} buff_active={is_buff_active} location={location}"
         )
         
-        await self.add_seeds_local(author_id, reward, 'reaction_reward', 'social')
-        self.reaction_cooldowns[cooldown_key] = now
+        self.rewards.remember_user(author_id, message.author.name)
+        self.rewards.add_seeds(author_id, reward, 'reaction_reward')
+
+    # ==================== BUFFERED REWARDS ====================
+
+    async def flush_rewards(self):
+        """Write buffered activity rewards in one transaction.
+
+        On failure the batch is merged back and retried on the next flush.
+        """
+        async with self.reward_flush_lock:
+            if self.rewards.is_empty():
+                return
+            batch = self.rewards.drain()
+            try:
+                await write_batch(batch)
+            except Exception as e:
+                self.rewards.restore(batch)
+                logger.error(f"[ECONOMY] Reward flush failed, {len(batch.usernames)} users re-queued: {e}", exc_info=True)
+                return
+        
+        logger.info(
+            f"[ECONOMY] [REWARD_FLUSH] users={len(batch.usernames)} rows={len(batch.seeds)} "
+            f"rewards={batch.grant_count()} seeds={batch.total_seeds()}"
+        )
+
+    @tasks.loop(seconds=REWARD_FLUSH_INTERVAL)
+    async def reward_flush_task(self):
+        """Periodically write buffered chat/reaction rewards"""
+        await self.flush_rewards()
+
+    @reward_flush_task.before_loop
+    async def before_reward_flush_task(self):
+        """Wait for bot to be ready before starting task"""
+        await self.bot.wait_until_ready()
 
     @tasks.loop(minutes=VOICE_REWARD_INTERVAL)
     async def voice_reward_task(self):
-        """Check voice channels and reward members every 5 minutes - ONLY if speaking"""
+        """Reward speaking voice members every interval with one bulk write.
+
+        Eligible members are collected across all guilds in memory, then
+        users, seeds and logs are written in a single transaction.
+        """
         try:
+            batch = Ledger(REWARD_CATEGORY)
+            buffed_guilds = 0
             for guild in self.bot.guilds:
-                is_buff_active = await self.is_harvest_buff_active(guild.id)
+                # Get members in voice (exclude bots) who are SPEAKING
+                speaking_members = [
+                    m for voice_channel in guild.voice_channels
+                    for m in voice_channel.members
+                    if not m.bot and m.voice and m.voice.self_mute == False
+                ]
+                
+                if not speaking_members:
+                    continue
                 
-                for voice_channel in guild.voice_channels:
-                    # Get members in voice (exclude bots) who are SPEAKING
-                    speaking_members = [m for m in voice_channel.members if not m.bot and m.voice and m.voice.self_mute == False]
-                    
-                    if not speaking_members:
-                        continue
-                    
-                    # Award seeds to each speaking member
-                    for member in speaking_members:
-                        await self.get_or_create_user_local(member.id, member.name)
-                        
-                        # Get user rod level (affects reward bonus)
-                        try:
-                            # get_rod_data returns (level, durability) tuple, NOT dict
-                            rod_data = await self.bot.get_cog("FishingCog").get_rod_data(member.id)
-                            if rod_data:
-                                rod_level, rod_durability = rod_data
-                            else:
-                                rod_level = 0
-                        except Exception as e:
-                            rod_level = 0
-                            # logger.error(f"[ECONOMY] Error fetching rod data for {member.name}: {e}")
-                        
-                        reward = VOICE_REWARD
-                        if is_buff_active:
-                            reward = reward * 2
-                        
-                        logger.info(
-                            f"[ECONOMY] [VOICE_REWARD] user_id={member.id} username={member.name} "
-                            f"reward={reward} buff_active={is_buff_active}"
-                        )
-                        await self.add_seeds_local(member.id, reward, 'voice_reward', 'social')
+                reward = VOICE_REWARD
+                if await self.is_harvest_buff_active(guild.id):
+                    reward = reward * 2
+                    buffed_guilds += 1
+                
+                for member in speaking_members:
+                    batch.remember_user(member.id, member.name)
+                    batch.add_seeds(member.id, reward, 'voice_reward')
+            
+            voice_batch = batch.drain()
+            if voice_batch.is_empty():
+                return
+            
+            await write_batch(voice_batch)
+            logger.info(
+                f"[ECONOMY] [VOICE_REWARD] users={len(voice_batch.usernames)} "
+                f"seeds={voice_batch.total_seeds()} buffed_guilds={buffed_guilds}"
+            )
         
         except Exception as e:
             logger.error(f"[ECONOMY] Voice reward error: {e}", exc_info=True)
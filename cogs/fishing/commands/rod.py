@@ -2,6 +2,7 @@
 import logging
 import discord
 from database_manager import db_manager, get_user_balance, add_seeds, increment_stat, get_stat
+from core.database import balance_cache_key
 from ..constants import ROD_LEVELS
 from ..mechanics.rod_system import get_rod_data, update_rod_data
 from core.utils import format_currency
@@ -113,6 +114,7 @@ async def nangcap_action(ctx_or_interaction):
 
                 # 4. Deduct Money
                 await conn.execute("UPDATE users SET seeds = seeds - $1 WHERE user_id = $2", (cost, user_id))
+                conn.invalidate_keys_on_commit([balance_cache_key(user_id)])
                 
                 # 5. Update Rod
                 new_durability = next_rod_info['durability'] # Reset durable
@@ -8,6 +8,7 @@ from discord import app_commands
 from typing import Optional
 from core.logger import setup_logger
 from database_manager import db_manager
+from core.database import balance_cache_key
 
 logger = setup_logger("SellCommand", "cogs/fishing/fishing.log")
 
@@ -242,6 +243,7 @@ async def sell_fish_action(cog, ctx_or_interaction, fish_types: Optional[str] =
                 "UPDATE users SET seeds = seeds + ? WHERE user_id = ?",
                 (total_value, user_id)
             )
+            conn.invalidate_keys_on_commit([balance_cache_key(user_id)])
             
             # Transaction log
             await conn.execute(
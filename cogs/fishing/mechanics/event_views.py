@@ -9,6 +9,7 @@ from datetime import datetime
 import discord
 
 from database_manager import add_seeds, get_stat, increment_stat, db_manager
+from core.database import balance_cache_key
 from .legendary_quest_helper import increment_manh_sao_bang
 
 logger = logging.getLogger("fishing")
@@ -210,6 +211,7 @@ class GenericActionView(discord.ui.View):
                                     "UPDATE users SET seeds = seeds - $1 WHERE user_id = $2",
                                     (money_cost, user_id)
                                 )
+                                conn.invalidate_keys_on_commit([balance_cache_key(user_id)])
                                 # Manual Log for ACID Transaction
                                 await conn.execute(
                                     "INSERT INTO transaction_logs (user_id, amount, reason, category) VALUES ($1, $2, $3, $4)",
@@ -312,6 +314,7 @@ class GenericActionView(discord.ui.View):
                                             "UPDATE users SET seeds = seeds + ? WHERE user_id = ?",
                                             (ramount, user_id)
                                         )
+                                        conn.invalidate_keys_on_commit([balance_cache_key(user_id)])
                                         await conn.execute(
                                             "INSERT INTO transaction_logs (user_id, amount, reason, category) VALUES (?, ?, ?, ?)",
                                             (user_id, ramount, reason, "fishing")
@@ -331,6 +334,7 @@ class GenericActionView(discord.ui.View):
                                         "UPDATE users SET seeds = seeds + $1 WHERE user_id = $2",
                                         (ramount, user_id)
                                     )
+                                    conn.invalidate_keys_on_commit([balance_cache_key(user_id)])
                                     await conn.execute(
                                         "INSERT INTO transaction_logs (user_id, amount, reason, category) VALUES ($1, $2, $3, $4)",
                                         (user_id, ramount, reason, "fishing")
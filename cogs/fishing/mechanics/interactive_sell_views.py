@@ -7,6 +7,7 @@ import random
 import asyncio
 from typing import Dict, Any, Optional
 from database_manager import db_manager, increment_stat, get_stat
+from core.database import balance_cache_key
 from core.logger import setup_logger
 
 logger = setup_logger("InteractiveSellViews", "cogs/fishing/fishing.log")
@@ -220,6 +221,7 @@ class InteractiveSellEventView(discord.ui.View):
                                 "UPDATE users SET seeds = seeds + ? WHERE user_id = ?",
                                 (final_value, self.user_id)
                             )
+                            conn.invalidate_keys_on_commit([balance_cache_key(self.user_id)])
                             # Manual Log for ACID Transaction
                             event_key = self.event_data.get('key', 'unknown')
                             await conn.execute(
@@ -598,6 +600,7 @@ class InteractiveSellEventView(discord.ui.View):
                                 "UPDATE users SET seeds = seeds + ? WHERE user_id = ?",
                                 (final_value, self.user_id)
                             )
+                            conn.invalidate_keys_on_commit([balance_cache_key(self.user_id)])
                             # Manual Log for ACID Transaction
                             event_key = self.event_data.get('key', 'unknown')
                             await conn.execute(
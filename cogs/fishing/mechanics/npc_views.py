@@ -7,6 +7,7 @@ import random
 import asyncio
 from typing import Dict, Any, Optional, List
 from database_manager import db_manager, increment_stat, get_stat
+from core.database import balance_cache_key
 from core.logger import setup_logger
 
 logger = setup_logger("NPCViews", "cogs/fishing/fishing.log")
@@ -151,6 +152,7 @@ class InteractiveNPCView(discord.ui.View):
                                 "UPDATE users SET seeds = seeds - ? WHERE user_id = ?",
                                 (cost_type, self.user_id)
                             )
+                            conn.invalidate_keys_on_commit([balance_cache_key(self.user_id)])
                             # Manual Log for ACID Transaction
                             await conn.execute(
                                 "INSERT INTO transaction_logs (user_id, amount, reason, category) VALUES (?, ?, ?, ?)",
@@ -213,6 +215,7 @@ class InteractiveNPCView(discord.ui.View):
                 "UPDATE users SET seeds = seeds + ? WHERE user_id = ?",
                 (amt, self.user_id)
             )
+            conn.invalidate_keys_on_commit([balance_cache_key(self.user_id)])
             # Manual Log
             await conn.execute(
                 "INSERT INTO transaction_logs (user_id, amount, reason, category) VALUES (?, ?, ?, ?)",
@@ -235,6 +238,7 @@ class InteractiveNPCView(discord.ui.View):
                 "UPDATE users SET seeds = seeds + ? WHERE user_id = ?",
                 (total_val, self.user_id)
             )
+            conn.invalidate_keys_on_commit([balance_cache_key(self.user_id)])
             # Manual Log
             await conn.execute(
                 "INSERT INTO transaction_logs (user_id, amount, reason, category) VALUES (?, ?, ?, ?)",
@@ -2,19 +2,63 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
-from PIL import Image, ImageDraw, ImageFont
 import io
-import asyncio
-import functools
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+import aiohttp
 
 
 from core.logger import setup_logger
+from core.profile_card import render_profile_card
+from core.render_service import render_service
 
 logger = setup_logger("GeneralCog", "cogs/general.log")
 
+# Profile card caches (bounded by total bytes)
+AVATAR_CACHE_BYTES = 16 * 1024 * 1024
+CARD_CACHE_BYTES = 32 * 1024 * 1024
+AVATAR_FETCH_SIZE = 256  # Drawn at 200px, no need for the full-size asset
+
+
+class _BytesLRU:
+    """LRU of bytes payloads, evicting the oldest once max_bytes is exceeded."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: "OrderedDict[Hashable, Tuple[Hashable, bytes]]" = OrderedDict()
+
+    def get(self, key: Hashable, tag: Hashable = None) -> Optional[bytes]:
+        """Cached payload for key if it was stored with the same tag."""
+        entry = self._data.get(key)
+        if entry is None or entry[0] != tag:
+            return None
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, payload: bytes, tag: Hashable = None) -> None:
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.size -= len(old[1])
+        self._data[key] = (tag, payload)
+        self.size += len(payload)
+        while self.size > self.max_bytes and self._data:
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.size -= len(evicted)
+
+
 class General(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Avatars by asset hash (a new avatar has a new hash); cards by user until seeds/rank/name/avatar change
+        self._avatars = _BytesLRU(AVATAR_CACHE_BYTES)
+        self._profile_cards = _BytesLRU(CARD_CACHE_BYTES)
+        self._http: Optional[aiohttp.ClientSession] = None
+
+    async def cog_unload(self):
+        if self._http and not self._http.closed:
+            await self._http.close()
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -303,9 +347,10 @@ class General(commands.Cog):
         target_user = user or interaction.user
         
         try:
-            from database_manager import get_user_balance, get_leaderboard
+            from database_manager import get_leaderboard
+            from core.database import get_cached_balance
             
-            seeds = await get_user_balance(target_user.id)
+            seeds = await get_cached_balance(target_user.id)
             
             # Get rank
             leaderboard = await get_leaderboard(1000)  # Get enough to find rank
@@ -332,9 +377,10 @@ class General(commands.Cog):
         target_user = user or ctx.author
         
         try:
-            from database_manager import get_user_balance, get_leaderboard
+            from database_manager import get_leaderboard
+            from core.database import get_cached_balance
             
-            seeds = await get_user_balance(target_user.id)
+            seeds = await get_cached_balance(target_user.id)
             
             # Get rank
             leaderboard = await get_leaderboard(1000)  # Get enough to find rank
@@ -355,152 +401,39 @@ class General(commands.Cog):
             await ctx.send(f"Lỗi tạo profile: {e}")
             logger.error(f"[PROFILE] Error: {e}", exc_info=True)
 
-    def _generate_profile_image_sync(self, user_data, avatar_bytes):
-        """Synchronous CPU-bound Pillow image generation (runs in executor)"""
-        import os
-        
-        # Unpack user data
-        display_name = user_data['display_name']
-        seeds = user_data['seeds']
-        rank = user_data['rank']
-        
-        # --- CONFIGURATION ---
-        COLOR_BG = (245, 240, 235)
-        COLOR_BORDER = (139, 90, 43)
-        COLOR_TEXT_MAIN = (74, 59, 42)
-        COLOR_TEXT_ACCENT = (92, 138, 69)
-        COLOR_BAR_BG = (224, 224, 224)
-        COLOR_BAR_FILL = (118, 200, 147)
-        COLOR_HEART = (255, 107, 107)
-        
-        WIDTH, HEIGHT = 900, 300
-        
-        # Load fonts
-        def load_font(name, size, fallback_font="arial.ttf"):
-            font_path = f"./assets/{name}"
-            try:
-                return ImageFont.truetype(font_path, size)
-            except Exception as e:
-                try:
-                    return ImageFont.truetype(fallback_font, size)
-                except Exception as e:
-                    return ImageFont.load_default()
-
-        font_main = load_font("PatrickHand-Regular.ttf", 45)
-        font_rank = load_font("PatrickHand-Regular.ttf", 18)
-        font_info = load_font("Nunito-Bold.ttf", 16)
-        font_small = load_font("Nunito-Bold.ttf", 14)
-        
-        # Create base image
-        bg_path = "./assets/card_bg_ghibli.png"
-        if os.path.exists(bg_path):
-            try:
-                img = Image.open(bg_path).resize((WIDTH, HEIGHT))
-            except Exception as e:
-                img = Image.new('RGB', (WIDTH, HEIGHT), color=COLOR_BG)
-        else:
-            img = Image.new('RGB', (WIDTH, HEIGHT), color=COLOR_BG)
-            
-        draw = ImageDraw.Draw(img, 'RGBA')
-        
-        if not os.path.exists(bg_path):
-            draw.rectangle((5, 5, WIDTH-5, HEIGHT-5), outline=COLOR_BORDER, width=3)
-        
-        # --- AVATAR SECTION ---
-        avatar_size = 200
-        avatar = Image.open(avatar_bytes).convert('RGBA').resize((avatar_size, avatar_size))
-        
-        mask = Image.new('L', (avatar_size, avatar_size), 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.ellipse((0, 0, avatar_size, avatar_size), fill=255)
-        
-        avatar_x, avatar_y = 25, 50
-        img.paste(avatar, (avatar_x, avatar_y), mask)
-        draw.ellipse((avatar_x-5, avatar_y-5, avatar_x+avatar_size+5, avatar_y+avatar_size+5), 
-                     outline=COLOR_BORDER, width=4)
-        
-        # --- INFO SECTION ---
-        info_x = 280
-        
-        draw.text((info_x, 90), display_name, font=font_main, fill=COLOR_TEXT_MAIN)
-        
-        rank_title = self._get_rank_title_no_emoji(seeds)
-        draw.text((info_x, 145), f"Hạng: {rank_title} (#{rank})", font=font_rank, fill=COLOR_TEXT_ACCENT)
-        
-        # Progress Bar
-        next_milestone = 50
-        if seeds >= 5000: next_milestone = 10000
-        elif seeds >= 1000: next_milestone = 5000
-        elif seeds >= 500: next_milestone = 1000
-        elif seeds >= 200: next_milestone = 500
-        elif seeds >= 50: next_milestone = 200
-            
-        progress = min(seeds / next_milestone, 1.0)
-        
-        bar_x, bar_y = info_x, 175
-        bar_w, bar_h = 335, 15
-        
-        draw.text((info_x + bar_w - 100, 150), f"{seeds}/{next_milestone}", font=font_info, fill=COLOR_TEXT_MAIN)
-        draw.rounded_rectangle([(bar_x, bar_y), (bar_x + bar_w, bar_y + bar_h)], radius=12, fill=COLOR_BAR_BG)
-        
-        if progress > 0:
-            fill_w = int(bar_w * progress)
-            draw.rounded_rectangle([(bar_x, bar_y), (bar_x + fill_w, bar_y + bar_h)], radius=12, fill=COLOR_BAR_FILL)
-            
-
+    def _http_session(self) -> aiohttp.ClientSession:
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        return self._http
 
-        # Save to bytes
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, 'PNG')
-        img_bytes.seek(0)
-        return img_bytes
+    async def _fetch_avatar(self, user) -> bytes:
+        """Avatar image bytes, downloaded only the first time its hash is seen"""
+        asset = user.avatar or user.default_avatar
+        avatar_bytes = self._avatars.get(asset.key)
+        if avatar_bytes is None:
+            async with self._http_session().get(str(asset.with_size(AVATAR_FETCH_SIZE).url)) as resp:
+                resp.raise_for_status()
+                avatar_bytes = await resp.read()
+            self._avatars.put(asset.key, avatar_bytes)
+        return avatar_bytes
 
     async def _create_profile_card_new(self, user, seeds, rank):
-        """Download avatars then generate profile card in executor (non-blocking)"""
-        import aiohttp
-        
-        # Prepare user data
-        user_data = {
-            'display_name': user.display_name,
-            'seeds': seeds,
-            'rank': rank
-        }
-        
-        # Download user avatar
-        user_avatar_url = str(user.avatar.url if user.avatar else user.default_avatar.url)
-        async with aiohttp.ClientSession() as session:
-            async with session.get(user_avatar_url) as resp:
-                avatar_bytes = io.BytesIO(await resp.read())
-        
-
-        
-        # Run CPU-bound image generation in executor to avoid blocking
-        loop = asyncio.get_running_loop()
-        img_bytes = await loop.run_in_executor(
-            None,
-            self._generate_profile_image_sync,
-            user_data,
-            avatar_bytes
-        )
-        
-        return img_bytes
-
-
-
-    def _get_rank_title_no_emoji(self, seeds: int) -> str:
-        """Get rank title based on seeds earned (without emoji)"""
-        if seeds < 50:
-            return "Người Gieo Hạt"
-        elif seeds < 200:
-            return "Nảy Mầm"
-        elif seeds < 500:
-            return "Cây Non"
-        elif seeds < 1000:
-            return "Trưởng Thành"
-        elif seeds < 5000:
-            return "Ra Hoa"
-        else:
-            return "Cây Đại Thụ"
+        """Profile card PNG stream, re-rendered only when seeds, rank, name or avatar change"""
+        avatar = user.avatar or user.default_avatar
+        signature = (user.display_name, avatar.key, seeds, rank)
+        img_bytes = self._profile_cards.get(user.id, signature)
+        if img_bytes is None:
+            avatar_bytes = await self._fetch_avatar(user)
+            # CPU-bound Pillow work runs in a worker process with fonts preloaded
+            img_bytes = await render_service.submit(
+                render_profile_card,
+                user.display_name,
+                seeds,
+                rank,
+                avatar_bytes
+            )
+            self._profile_cards.put(user.id, img_bytes, signature)
+        return io.BytesIO(img_bytes)
 
     def _get_rank_title(self, seeds: int) -> str:
         """Get rank title based on seeds earned"""
@@ -312,6 +312,7 @@ class GiveawayCog(commands.Cog, name="Giveaway"):
                 "INSERT INTO user_invites (inviter_id, joined_user_id, is_valid) VALUES (?, ?, ?) ON CONFLICT (inviter_id, joined_user_id) DO NOTHING",
                 (inviter.id, member.id, 1 if is_valid else 0)
             )
+            db_manager.clear_cache_by_prefix(f"invites_{inviter.id}")
         except Exception as e:
             logger.error(f"Error saving invite: {e}", exc_info=True)
 
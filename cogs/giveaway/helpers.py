@@ -1,8 +1,11 @@
+import asyncio
 import json
 import random
 import discord
 from database_manager import db_manager, get_rod_data, get_user_balance
 
+from core.database import balance_cache_key
+from core.discord_scheduler import discord_scheduler
 from core.logger import setup_logger
 from .constants import COLOR_GIVEAWAY, EMOJI_WINNER
 from .models import Giveaway
@@ -42,6 +45,7 @@ async def join_giveaway_transaction(giveaway_id: int, user_id: int, cost: int) -
                     "UPDATE users SET seeds = seeds - $1 WHERE user_id = $2",
                     cost, user_id
                 )
+                conn.invalidate_keys_on_commit([balance_cache_key(user_id)])
                 
                 # Manual Log for ACID Transaction
                 await conn.execute(
@@ -55,10 +59,7 @@ async def join_giveaway_transaction(giveaway_id: int, user_id: int, cost: int) -
                 giveaway_id, user_id
             )
             
-            # Clear caches (outside transaction logic effectively, but good to do here if successful)
-            if cost > 0:
-                db_manager.clear_cache_by_prefix(f"balance_{user_id}")
-            
+            # Cached balance is dropped on commit (invalidate_keys_on_commit above)
             return True, "Tham gia thành công!"
             
     except Exception as e:
@@ -132,37 +133,47 @@ async def end_giveaway(giveaway_id: int, bot: discord.Client):
     dm_failed = []
     
     if winners_ids:
-        import asyncio
-        for winner_id in winners_ids:
-            try:
-                user = await bot.fetch_user(winner_id)
-                
-                # Create DM embed
-                dm_embed = discord.Embed(
-                    title="🎉 Chúc Mừng - Bạn Đã Thắng Giveaway!",
-                    description=f"Bạn đã thắng **{ga.prize}**!",
-                    color=COLOR_GIVEAWAY
-                )
-                dm_embed.add_field(
-                    name="🔗 Link Giveaway",
-                    value=f"[Nhấn để xem kết quả](https://discord.com/channels/{ga.guild_id}/{ga.channel_id}/{ga.message_id})",
-                    inline=False
-                )
-                dm_embed.set_footer(text=f"Giveaway ID: {giveaway_id}")
-                
-                await user.send(embed=dm_embed)
-                dm_success.append(winner_id)
-                print(f"[Giveaway] ✅ DM sent to winner {user.name} ({winner_id})")
-                
-                # Small delay to avoid rate limits
-                await asyncio.sleep(0.3)
-                
-            except discord.Forbidden:
+        async def _dm_winner(winner_id: int):
+            user = await bot.fetch_user(winner_id)
+            
+            # Create DM embed
+            dm_embed = discord.Embed(
+                title="🎉 Chúc Mừng - Bạn Đã Thắng Giveaway!",
+                description=f"Bạn đã thắng **{ga.prize}**!",
+                color=COLOR_GIVEAWAY
+            )
+            dm_embed.add_field(
+                name="🔗 Link Giveaway",
+                value=f"[Nhấn để xem kết quả](https://discord.com/channels/{ga.guild_id}/{ga.channel_id}/{ga.message_id})",
+                inline=False
+            )
+            dm_embed.set_footer(text=f"Giveaway ID: {giveaway_id}")
+            
+            await user.send(embed=dm_embed)
+            return user
+        
+        # DMs go through the shared scheduler instead of a fixed sleep between sends
+        dm_futures = [
+            discord_scheduler.submit(
+                "dm_send",
+                lambda winner_id=winner_id: _dm_winner(winner_id),
+                # No coalescing target: every DM must be delivered
+                label=f"giveaway {giveaway_id} dm {winner_id}",
+            )
+            for winner_id in winners_ids
+        ]
+        results = await asyncio.gather(*dm_futures, return_exceptions=True)
+        
+        for winner_id, result in zip(winners_ids, results):
+            if isinstance(result, discord.Forbidden):
                 dm_failed.append(winner_id)
                 print(f"[Giveaway] ❌ Failed to DM winner {winner_id} (DMs closed)")
-            except Exception as e:
+            elif isinstance(result, Exception):
                 dm_failed.append(winner_id)
-                print(f"[Giveaway] ❌ Error DMing winner {winner_id}: {e}")
+                print(f"[Giveaway] ❌ Error DMing winner {winner_id}: {result}")
+            else:
+                dm_success.append(winner_id)
+                print(f"[Giveaway] ✅ DM sent to winner {result.name} ({winner_id})")
         
         print(f"[Giveaway] DM Results - Success: {len(dm_success)}/{len(winners_ids)}, Failed: {len(dm_failed)}")
     
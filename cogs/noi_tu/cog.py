@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import aiosqlite
 import asyncio
@@ -9,27 +9,36 @@ import time
 import os
 import traceback
 from datetime import datetime
-from database_manager import db_manager, get_stat, get_or_create_user, get_server_config
+from database_manager import db_manager, get_server_config
 from core.logger import setup_logger
+from core.ledger import Ledger, write_batch
+from .word_index import WordIndex, UNKNOWN, word_key, normalize, is_reduplicative
 
 logger = setup_logger("NoiTu", "cogs/noitu.log")
 
 DB_PATH = os.path.abspath("./data/database.db")
 WORDS_DICT_PATH = os.path.abspath("./data/words_dict.json")
+LEDGER_FLUSH_INTERVAL = 5  # seconds between debounced stat/seed writes
+GAME_ID = "noitu"  # stats game_id and transaction_logs category
 
 class GameNoiTu(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         # Game state per server (Guild ID -> Data)
         self.games = {}
-        # Lock to prevent race condition (Guild ID -> asyncio.Lock)
-        self.game_locks = {}
+        # Per-guild word queues with a single consumer each (Guild ID -> Queue / Task)
+        self.word_queues = {}
+        self.word_consumers = {}
+        # Background Discord side effects dispatched after a decision
+        self._side_effect_tasks = set()
         # Words dictionary (memory-based): {first_syllable: [possible_second_syllables]}
         self.words_dict = {}
         # All words for random selection
         self.all_words = set()
         # Cached list for faster random selection (avoid O(n) conversion)
         self.all_words_list = []
+        # Interned syllable index used by the per-message hot path
+        self.word_index = WordIndex({})
         # Flag to track if dictionary is loaded
         self.dict_loaded = False
         # Lock for dictionary loading to prevent race conditions
@@ -38,12 +47,61 @@ class GameNoiTu(commands.Cog):
         self.streak = {}
         # Track if we've already initialized
         self._initialized = False
+        # Pending stat/seed writes, flushed in one transaction
+        self.ledger = Ledger(GAME_ID)
+        self.ledger_flush_lock = asyncio.Lock()
+        # Game state saves run one at a time per guild (Guild ID -> Lock); guilds with a save waiting for the lock
+        self._save_locks = {}
+        self._save_queued = set()
 
     async def cog_load(self):
         """Called when the cog is loaded - initialize games here"""
         logger.info("Cog loaded, scheduling game initialization")
         # Schedule initialization as a background task
         asyncio.create_task(self._initialize_games_on_load())
+        self.ledger_flush_task.start()
+
+    async def cog_unload(self):
+        for consumer in self.word_consumers.values():
+            consumer.cancel()
+        # stop(), not cancel(): a flush in progress must not lose its drained batch
+        self.ledger_flush_task.stop()
+        await self.flush_ledger()
+
+    @tasks.loop(seconds=LEDGER_FLUSH_INTERVAL)
+    async def ledger_flush_task(self):
+        await self.flush_ledger()
+
+    async def flush_ledger(self):
+        """Write pending stats and seeds in one transaction, then check achievements.
+
+        Achievement checks use the values returned by the bulk upserts, so no
+        stat is read back from the database.
+        """
+        async with self.ledger_flush_lock:
+            if self.ledger.is_empty():
+                return
+            batch = self.ledger.drain()
+            try:
+                changed = await write_batch(batch, GAME_ID)
+            except Exception as e:
+                logger.error(f"ERROR flushing ledger, will retry: {e}")
+                self.ledger.restore(batch)
+                return
+
+        logger.info(
+            f"LEDGER_FLUSH seeds={batch.grant_count()} grants/{batch.total_seeds()} total "
+            f"stats={len(batch.stat_deltas)} max_stats={len(batch.max_stats)}"
+        )
+
+        achievement_manager = getattr(self.bot, "achievement_manager", None)
+        if not achievement_manager:
+            return
+        for (user_id, stat_key), value in changed.items():
+            try:
+                await achievement_manager.check_unlock(user_id, GAME_ID, stat_key, value, batch.channels.get(user_id))
+            except Exception as e:
+                logger.error(f"ERROR checking {stat_key} achievement for {user_id}: {e}")
 
     async def _initialize_games_on_load(self):
         """Initialize games after cog is loaded - called as background task"""
@@ -108,26 +166,11 @@ class GameNoiTu(commands.Cog):
             loop = asyncio.get_running_loop()
             self.words_dict = await loop.run_in_executor(None, load_json)
             
-            # Clear old lists
-            self.all_words.clear()
-            self.all_words_list.clear()
-            
-            # Build set of all words for random selection (CPU intensive, run in executor too?)
-            # Ideally yes, but let's do it in the same executor call for simplicity next time. 
-            # For now, we'll keep it here but note it might be slightly blocking if dict is HUGE.
-            # actually better to move all processing to executor
-            
-            def process_words(words_dict):
-                all_words = set()
-                all_words_list = []
-                for first, seconds in words_dict.items():
-                    for second in seconds:
-                        word = f"{first} {second}"
-                        all_words.add(word)
-                        all_words_list.append(word)
-                return all_words, all_words_list
-
-            self.all_words, self.all_words_list = await loop.run_in_executor(None, process_words, self.words_dict)
+            # Build word set, random-selection list and syllable index off the event loop
+            self.all_words, self.all_words_list, self.word_index = await loop.run_in_executor(
+                None, self._build_word_tables, self.words_dict
+            )
+            self._resync_game_keys()
             
             self.dict_loaded = True
             logger.info(f"✅ Loaded words dict: {len(self.words_dict)} starting syllables, {len(self.all_words)} total words")
@@ -142,6 +185,28 @@ class GameNoiTu(commands.Cog):
             return False
 
 
+    @staticmethod
+    def _build_word_tables(words_dict):
+        """Build the word set, random-selection list and syllable index (CPU bound)"""
+        all_words = set()
+        all_words_list = []
+        for first, seconds in words_dict.items():
+            for second in seconds:
+                word = f"{first} {second}"
+                all_words.add(word)
+                all_words_list.append(word)
+        return all_words, all_words_list, WordIndex(words_dict)
+
+    def _sync_game_keys(self, game):
+        """Derive the index-backed fields (used word keys, last syllable ID) of a game"""
+        game['used_keys'] = self.word_index.used_keys_for(game.get('used_words', ()))
+        game['last_id'] = self.word_index.last_syllable_id(game.get('current_word') or "")
+
+    def _resync_game_keys(self):
+        """Syllable IDs change when the index is rebuilt, so re-derive every game's keys"""
+        for game in self.games.values():
+            self._sync_game_keys(game)
+
     # --- Helper Functions ---
     async def get_config_channel(self, guild_id):
         from database_manager import get_server_config
@@ -190,44 +255,47 @@ class GameNoiTu(commands.Cog):
         
         return False
 
-    def get_game_lock(self, guild_id):
-        """Get or create a lock for this guild"""
-        if guild_id not in self.game_locks:
-            self.game_locks[guild_id] = asyncio.Lock()
-        return self.game_locks[guild_id]
-    
     async def reload_words_dict(self):
         """Reload dictionary from file (after new words added)"""
         try:
             with open(WORDS_DICT_PATH, "r", encoding="utf-8") as f:
                 self.words_dict = json.load(f)
             
-            # Rebuild set and list
-            self.all_words.clear()
-            self.all_words_list.clear()
-            
-            for first, seconds in self.words_dict.items():
-                for second in seconds:
-                    word = f"{first} {second}"
-                    self.all_words.add(word)
-                    self.all_words_list.append(word)
+            # Rebuild set, list and syllable index
+            self.all_words, self.all_words_list, self.word_index = self._build_word_tables(self.words_dict)
+            self._resync_game_keys()
             
             logger.info(f"Reloaded words dict: {len(self.all_words)} total words")
         except Exception as e:
             logger.error(f"ERROR reloading words dict: {e}")
     
-    def cleanup_game_lock(self, guild_id):
-        """Clean up lock after game ends (prevent memory leak)
+    async def save_game_state(self, guild_id, channel_id):
+        """Save NoiTu game state to database for resume after restart.
         
-        NOTE: Actually, deleting locks is dangerous while async operations might be waiting on them.
-        For now, we will NOT delete them. A few lock objects (one per active guild) is negligible memory.
+        Saves of one guild are serialized: the SELECT-then-INSERT below must not
+        interleave with another save, or it inserts duplicate session rows.
         """
-        pass
-        # if guild_id in self.game_locks:
-        #     del self.game_locks[guild_id]
+        async with self._save_locks.setdefault(guild_id, asyncio.Lock()):
+            await self._write_game_state(guild_id, channel_id)
     
-    async def save_game_state(self, guild_id, channel_id):
-        """Save NoiTu game state to database for resume after restart"""
+    def _request_save(self, guild_id, channel_id):
+        """Save from the word hot path without piling up writes.
+        
+        At most one save per guild waits behind the running one; it snapshots
+        the game when it gets the lock, so it writes the latest state for every
+        word accepted in the meantime.
+        """
+        if guild_id in self._save_queued:
+            return
+        self._save_queued.add(guild_id)
+        self._dispatch(self._queued_save(guild_id, channel_id), "save_state")
+    
+    async def _queued_save(self, guild_id, channel_id):
+        async with self._save_locks.setdefault(guild_id, asyncio.Lock()):
+            self._save_queued.discard(guild_id)
+            await self._write_game_state(guild_id, channel_id)
+    
+    async def _write_game_state(self, guild_id, channel_id):
         try:
             if guild_id not in self.games:
                 return
@@ -307,6 +375,7 @@ class GameNoiTu(commands.Cog):
                 "start_message_content": resume_content,
                 "players": new_players
             }
+            self._sync_game_keys(self.games[guild_id])
             
             # Smart message handling
             resume_msg = None
@@ -361,21 +430,11 @@ class GameNoiTu(commands.Cog):
             return False
 
     
-    async def update_player_stats(self, user_id, username, is_winner=False):
-        """Update player stats: wins and correct words count"""
-        try:
-            # Ensure user exists in database
-            user = await get_or_create_user(user_id, username)
-            if not user:
-                logger.error(f"ERROR: Failed to create/get user {username} ({user_id})")
-                return
-            
-            # Update correct_words
-            await self.increment_stat(user_id, 'correct_words', 1)
-            
-            logger.info(f"STATS_UPDATE [User {username}] WordsCorrect: +1")
-        except Exception as e:
-            logger.error(f"ERROR updating player stats: {e}")
+    async def update_player_stats(self, user_id, username, is_winner=False, channel=None):
+        """Update player stats: wins and correct words count (buffered in the ledger)"""
+        self.ledger.remember_user(user_id, username, channel)
+        self.ledger.increment(user_id, 'correct_words', 1)
+        logger.info(f"STATS_UPDATE [User {username}] WordsCorrect: +1")
     
     
     async def distribute_streak_rewards(self, guild_id, all_players, final_streak, channel):
@@ -397,34 +456,30 @@ class GameNoiTu(commands.Cog):
             # Calculate base reward: 5 seeds per word in final streak (INCREASED from 2)
             base_reward = max(20, final_streak * 5) * buff_multiplier
             
-            # Distribute rewards to all participants
+            # Compute every payout in memory, then settle in one transaction
             player_display_list = []
             for user_id, player_data in all_players.items():
-                try:
-                    # Handle both old format (string) and new format (dict)
-                    if isinstance(player_data, dict):
-                        username = player_data.get("username", "Unknown")
-                        correct_words = player_data.get("correct_words", 0)
-                    else:
-                        username = player_data
-                        correct_words = 0
-                    
-                    # Calculate reward: base + bonus for each correct word (INCREASED x3)
-                    bonus_reward = correct_words * 3 * buff_multiplier
-                    total_reward = base_reward + bonus_reward
-                    
-                    await economy_cog.add_seeds_local(user_id, total_reward, 'noitu_streak_reward', 'noitu')
-                    
-                    # Format for display: @mention - X từ (Y Hạt)
-                    try:
-                        user = await self.bot.fetch_user(user_id)
-                        player_display_list.append(f"{user.mention} - {correct_words} từ")
-                    except Exception as e:
-                        player_display_list.append(f"{username} - {correct_words} từ")
-                    
-                    logger.info(f"REWARD [Guild {guild_id}] {username}: {base_reward} base + {bonus_reward} bonus = {total_reward} total")
-                except Exception as e:
-                    logger.error(f"ERROR distributing reward: {e}")
+                # Handle both old format (string) and new format (dict)
+                if isinstance(player_data, dict):
+                    username = player_data.get("username", "Unknown")
+                    correct_words = player_data.get("correct_words", 0)
+                else:
+                    username = player_data
+                    correct_words = 0
+                
+                # Calculate reward: base + bonus for each correct word (INCREASED x3)
+                bonus_reward = correct_words * 3 * buff_multiplier
+                total_reward = base_reward + bonus_reward
+                
+                self.ledger.remember_user(user_id, username, channel)
+                self.ledger.add_seeds(user_id, total_reward, 'noitu_streak_reward')
+                
+                # Format for display: @mention - X từ (mention markup needs no API call)
+                player_display_list.append(f"<@{user_id}> - {correct_words} từ")
+                
+                logger.info(f"REWARD [Guild {guild_id}] {username}: {base_reward} base + {bonus_reward} bonus = {total_reward} total")
+            
+            await self.flush_ledger()
             
             # Create reward notification embed
             embed = discord.Embed(
@@ -484,15 +539,18 @@ class GameNoiTu(commands.Cog):
             winner_name = None
             loser_names = []
             
-            # Distribute rewards
+            # Distribute rewards (one batched settlement)
             for user_id, username in all_players.items():
+                self.ledger.remember_user(user_id, username, channel)
                 if user_id == winner_id:
-                    await economy_cog.add_seeds_local(user_id, winner_reward, 'noitu_win_reward', 'noitu')
+                    self.ledger.add_seeds(user_id, winner_reward, 'noitu_win_reward')
                     winner_name = username
                 else:
-                    await economy_cog.add_seeds_local(user_id, loser_reward, 'noitu_loss_consolation', 'noitu')
+                    self.ledger.add_seeds(user_id, loser_reward, 'noitu_loss_consolation')
                     loser_names.append(username)
             
+            await self.flush_ledger()
+            
             # Create reward notification embed
             embed = discord.Embed(
                 title="🎮 Phần Thưởng Nối Từ",
@@ -534,11 +592,19 @@ class GameNoiTu(commands.Cog):
             logger.error(f"ERROR distributing rewards: {e}")
     
     async def update_ranking_roles(self, guild):
-        """Update ranking roles based on current standings"""
+        """Update ranking roles based on current standings.
+        
+        Computes the desired holder of each top-3 role and only calls the
+        Discord API for members whose rank actually changed.
+        """
         # Role IDs for top 3
         TOP_1_ROLE_ID = await get_server_config(guild.id, "role_top1_noitu")
         TOP_2_ROLE_ID = await get_server_config(guild.id, "role_top2_noitu")
         TOP_3_ROLE_ID = await get_server_config(guild.id, "role_top3_noitu")
+        role_ids = [TOP_1_ROLE_ID, TOP_2_ROLE_ID, TOP_3_ROLE_ID]
+        
+        if not any(role_ids):
+            return
         
         try:
             # Get bot member and check permissions
@@ -555,12 +621,11 @@ class GameNoiTu(commands.Cog):
             rows = await db_manager.fetchall(
                 "SELECT user_id, value FROM user_stats WHERE game_id = 'noitu' AND stat_key = 'correct_words' ORDER BY value DESC LIMIT 3"
             )
-            
             top_players = [row[0] for row in rows]
-            role_ids = [TOP_1_ROLE_ID, TOP_2_ROLE_ID, TOP_3_ROLE_ID]
             
-            # Remove all ranking roles from all members
-            for role_id in role_ids:
+            for idx, role_id in enumerate(role_ids):
+                if not role_id:
+                    continue
                 role = guild.get_role(role_id)
                 if not role:
                     logger.info(f"WARNING: Role {role_id} not found in guild {guild.id}")
@@ -571,7 +636,12 @@ class GameNoiTu(commands.Cog):
                     logger.error(f"ERROR: Role {role.name} ({role_id}) is above or equal to bot's highest role in guild {guild.id}")
                     continue
                 
+                desired_id = top_players[idx] if idx < len(top_players) else None
+                
+                # Remove only from members who no longer hold this rank
                 for member in role.members:
+                    if member.id == desired_id:
+                        continue
                     try:
                         await member.remove_roles(role)
                         logger.info(f"ROLE_REMOVE [Guild {guild.id}] Removed {role.name} from {member.name}")
@@ -579,25 +649,19 @@ class GameNoiTu(commands.Cog):
                         logger.error(f"ERROR: No permission to remove {role.name} from {member.name}")
                     except Exception as e:
                         logger.error(f"ERROR removing role from {member.name}: {e}")
-            
-            # Assign roles to top 3
-            for idx, user_id in enumerate(top_players):
+                
+                if desired_id is None:
+                    continue
+                
+                member = guild.get_member(desired_id)
+                if not member:
+                    logger.info(f"WARNING: User {desired_id} not found in guild {guild.id}")
+                    continue
+                
+                # Assign only if the member does not already hold it
+                if role in member.roles:
+                    continue
                 try:
-                    member = guild.get_member(user_id)
-                    if not member:
-                        logger.info(f"WARNING: User {user_id} not found in guild {guild.id}")
-                        continue
-                    
-                    role = guild.get_role(role_ids[idx])
-                    if not role:
-                        logger.info(f"WARNING: Role {role_ids[idx]} not found in guild {guild.id}")
-                        continue
-                    
-                    # Check if role is above bot
-                    if role.position >= bot_member.top_role.position:
-                        logger.error(f"ERROR: Role {role.name} is above or equal to bot's highest role")
-                        continue
-                    
                     await member.add_roles(role)
                     logger.info(f"ROLE_ASSIGN [Guild {guild.id}] Top {idx+1}: {member.name} <- {role.name}")
                 except discord.Forbidden as e:
@@ -641,6 +705,7 @@ class GameNoiTu(commands.Cog):
             "start_message_content": f"Từ khởi đầu: **{word}**\nChờ người chơi nhập vào...",
             "players": {}  # Track players: {user_id: {'username': name, 'correct_words': count}}
         }
+        self._sync_game_keys(self.games[guild_id])
         
         logger.info(f"GAME_START [Guild {guild_id}] Starting word: '{word}'")
         msg = await channel.send(self.games[guild_id]["start_message_content"])
@@ -776,131 +841,231 @@ class GameNoiTu(commands.Cog):
         if message.channel.id != game['channel_id']:
             return
 
-        # Use lock to prevent race condition when multiple users send messages at the same time
-        lock = self.get_game_lock(guild_id)
-        async with lock:
-            # Process word validation and game logic
-            result = await self._process_word(message, guild_id, game)
-            
-            # Auto-save game state after each valid move (persistence)
-            if result == "valid_move":
-                try:
-                    await self.save_game_state(guild_id, message.channel.id)
-                except Exception as e:
-                    logger.error(f"ERROR auto-saving game state: {e}")
+        # 3. Hand off to the guild's single consumer (preserves message order without a lock)
+        self._enqueue_word(guild_id, message)
+
+    # --- Per-guild word queue ---
+    def stop_game(self, guild_id):
+        """Drop a guild's game and its word consumer (messages still queued are discarded)."""
+        self.games.pop(guild_id, None)
+        consumer = self.word_consumers.pop(guild_id, None)
+        if consumer is not None:
+            consumer.cancel()
+        self.word_queues.pop(guild_id, None)
+
+    def _enqueue_word(self, guild_id, message):
+        """Queue a message for the guild's consumer, starting the consumer if needed."""
+        queue = self.word_queues.get(guild_id)
+        if queue is None:
+            queue = self.word_queues[guild_id] = asyncio.Queue()
+        
+        consumer = self.word_consumers.get(guild_id)
+        if consumer is None or consumer.done():
+            self.word_consumers[guild_id] = asyncio.create_task(self._consume_words(guild_id, queue))
+        
+        queue.put_nowait(message)
+
+    async def _consume_words(self, guild_id, queue):
+        """Single consumer per guild: decisions run in order, Discord I/O is dispatched.
+        
+        Validation and state transitions in _process_word never await the
+        network, so one slow reply or reaction cannot stall other players.
+        """
+        while True:
+            message = await queue.get()
+            try:
+                game = self.games.get(guild_id)
+                if game and message.channel.id == game['channel_id']:
+                    self._process_word(message, guild_id, game)
+            except Exception as e:
+                logger.error(f"ERROR [Guild {guild_id}] Word consumer: {e}", exc_info=True)
+            finally:
+                queue.task_done()
+
+    def _dispatch(self, coro, label):
+        """Run a Discord/DB side effect in the background after a decision was made."""
+        task = asyncio.create_task(self._run_side_effect(coro, label))
+        self._side_effect_tasks.add(task)
+        task.add_done_callback(self._side_effect_tasks.discard)
+
+    async def _run_side_effect(self, coro, label):
+        try:
+            await coro
+        except Exception as e:
+            logger.error(f"SIDE_EFFECT_ERROR [{label}] {e}")
+
+    async def _reject(self, message, reply_text, delete_after, view=None):
+        """React ❌ and reply with a self-deleting hint."""
+        try:
+            await message.add_reaction("❌")
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+        if view is not None:
+            await message.reply(reply_text, view=view, delete_after=delete_after)
+        else:
+            await message.reply(reply_text, delete_after=delete_after)
+
+    async def _refresh_start_message(self, guild_id, channel):
+        """Re-post the sticky start message so it stays at the bottom of the channel"""
+        game = self.games.get(guild_id)
+        if not game:
+            return
+        try:
+            if game.get('start_message'):
+                await game['start_message'].delete()
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+        msg = await channel.send(game["start_message_content"])
+        game['start_message'] = msg
+
+    async def _delete_message(self, msg):
+        try:
+            await msg.delete()
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+
+    async def _send_not_in_dict(self, message, content):
+        try:
+            await message.add_reaction("❌")
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+        # Import QuickAddWordView from add_word cog
+        try:
+            from cogs.noi_tu.add_word import QuickAddWordView
+            view = QuickAddWordView(content, message.author, self.bot)
+            await message.reply(
+                f"Từ **{content}** không có trong từ điển. Bạn muốn gửi admin thêm từ này?",
+                view=view,
+                delete_after=10
+            )
+        except Exception as e:
+            logger.error(f"ERROR showing add word view: {e}")
+            await message.reply("Từ này ko có trong từ điển, bruh", delete_after=3)
+
+    async def _award_milestone(self, guild_id, channel, current_streak, player_ids):
+        """Announce and queue the every-10-words milestone reward"""
+        economy_cog = self.bot.get_cog("EconomyCog")
+        is_buff_active = await economy_cog.is_harvest_buff_active(guild_id) if economy_cog else False
+        milestone_reward = 20 * (2 if is_buff_active else 1)
+        
+        # Queue milestone reward for all players (written with the next ledger flush)
+        for player_id in player_ids:
+            self.ledger.add_seeds(player_id, milestone_reward, 'noitu_milestone_reward')
+        
+        await channel.send(f"🔥 **MILESTONE! Chuỗi {current_streak}!** Cả phòng nhận được **{milestone_reward} Hạt**! 🎉")
+
+    async def _finish_round(self, guild_id, channel, last_syllable, current_streak, last_player, players):
+        """Dead-end: announce, settle rewards and start the next round"""
+        # Embed for end-of-streak
+        embed = discord.Embed(
+            title="🛑 BÍ TỪ!",
+            description=f"Không có từ nào bắt đầu bằng **{last_syllable}**.",
+            color=discord.Color.orange()
+        )
+        embed.add_field(
+            name="🔥 Chuỗi Cộng Đồng",
+            value=f"Chuỗi **{current_streak}** từ kết thúc!",
+            inline=False
+        )
+        embed.add_field(
+            name="👤 Người cuối cùng",
+            value=last_player.mention,
+            inline=False
+        )
+        
+        try:
+            await channel.send(embed=embed)
+        except Exception as e:
+            logger.error(f"ERROR sending dead-end embed: {e}")
+        
+        # Distribute rewards to all participants (settles the whole ledger in one transaction)
+        if players:
+            await self.distribute_streak_rewards(guild_id, players, current_streak, channel)
+        
+        await self.start_new_round(guild_id, channel)
     
-    async def _process_word(self, message, guild_id, game):
-        """Process word validation and game logic. Returns 'valid_move' if word was accepted."""
+    def _process_word(self, message, guild_id, game):
+        """Validate a word and apply the game state transition.
+        
+        Runs without awaiting anything: every Discord reply, reaction and DB
+        write is dispatched as a background task after the decision.
+        Returns a result string ('valid_move' if the word was accepted).
+        """
         try:
-            # Re-check game state after acquiring lock (game might have ended)
+            # Re-check game state (game might have ended while queued)
             if guild_id not in self.games:
                 return "game_ended"
             
             game = self.games[guild_id]
+            if game.get('ended'):
+                return "game_ended"
+            
+            channel = message.channel
+            index = self.word_index
 
             # --- GAME LOGIC ---
             
-            content = message.content.lower().strip()
+            # Normalize once and map to interned syllable IDs
+            parsed = index.parse(message.content)
             
             # Validation: Only process 2-word inputs (ignore commands and other formats)
-            if len(content.split()) != 2:
-                logger.info(f"SKIP [Guild {guild_id}] {message.author.name}: '{content}' (not 2 words)")
+            if parsed is None:
+                logger.info(f"SKIP [Guild {guild_id}] {message.author.name}: '{message.content}' (not 2 words)")
                 # Refresh sticky start message if game is in round 1
                 if game['player_count'] == 0:
-                    try:
-                        if game.get('start_message'):
-                            await game['start_message'].delete()
-                    except Exception as e:
-                        logger.error(f"Unexpected error: {e}")
-                    msg = await message.channel.send(game["start_message_content"])
-                    game['start_message'] = msg
+                    self._dispatch(self._refresh_start_message(guild_id, channel), "refresh_start")
                 return "invalid_format"
             
+            first_id, second_id, content = parsed
+            
             # Skip if starts with command prefix
             if content.startswith(('!', '/')):
                 logger.info(f"SKIP [Guild {guild_id}] {message.author.name}: '{content}' (command prefix)")
                 # Refresh sticky start message if game is in round 1
                 if game['player_count'] == 0:
-                    try:
-                        if game.get('start_message'):
-                            await game['start_message'].delete()
-                    except Exception as e:
-                        logger.error(f"Unexpected error: {e}")
-                    msg = await message.channel.send(game["start_message_content"])
-                    game['start_message'] = msg
+                    self._dispatch(self._refresh_start_message(guild_id, channel), "refresh_start")
                 return "command_prefix"
 
             # Anti-Self-Play
             if message.author.id == game['last_author_id']:
                 logger.info(f"SELF_PLAY [Guild {guild_id}] {message.author.name} tried self-play")
-                try:
-                    await message.add_reaction("❌")
-                except Exception as e:
-                    logger.error(f"Unexpected error: {e}")
-                await message.reply("Ko được tự reply, chờ người khác nhé", delete_after=5)
+                self._dispatch(self._reject(message, "Ko được tự reply, chờ người khác nhé", 5), "self_play")
                 return "self_play"
 
-            current_word = game['current_word']
-            last_syllable = current_word.split()[-1].lower()
-            first_syllable = content.split()[0].lower()
-
-            # Check connection
-            if first_syllable != last_syllable:
+            # Check connection. A current word whose last syllable is not in the
+            # index (e.g. restored from an older dictionary) has no ID to match:
+            # compare the text instead, as before the index
+            last_syllable = game['current_word'].split()[-1]
+            if game['last_id'] == UNKNOWN:
+                connects = content.split()[0] == normalize(last_syllable)
+            else:
+                connects = first_id == game['last_id']
+            if not connects:
                 logger.info(f"WRONG_CONNECTION [Guild {guild_id}] {message.author.name}: '{content}' needs to start with '{last_syllable}'")
-                try:
-                    await message.add_reaction("❌")
-                except Exception as e:
-                    logger.error(f"Unexpected error: {e}")
-                await message.reply(f"Từ phải bắt đầu bằng **{last_syllable}**", delete_after=3)
+                self._dispatch(self._reject(message, f"Từ phải bắt đầu bằng **{last_syllable}**", 3), "wrong_connection")
                 return "wrong_connection"
 
+            key = word_key(first_id, second_id) if UNKNOWN not in (first_id, second_id) else UNKNOWN
+
             # Check used
-            if content in game['used_words']:
+            if key in game['used_keys']:
                 logger.info(f"ALREADY_USED [Guild {guild_id}] {message.author.name}: '{content}'")
-                try:
-                    await message.add_reaction("❌")
-                except Exception as e:
-                    logger.error(f"Unexpected error: {e}")
-                await message.reply("Từ này dùng rồi, tìm từ khác đi", delete_after=3)
+                self._dispatch(self._reject(message, "Từ này dùng rồi, tìm từ khác đi", 3), "already_used")
                 return "already_used"
 
             # Check dictionary
-            if not await self.check_word_in_db(content):
+            if key not in index.words:
                 logger.info(f"NOT_IN_DICT [Guild {guild_id}] {message.author.name}: '{content}'")
-                try:
-                    await message.add_reaction("❌")
-                except Exception as e:
-                    logger.error(f"Unexpected error: {e}")
-                
-                # Track invalid words for achievement
-                await self.increment_stat(message.author.id, 'invalid_words', 1)
                 
-                # Check invalid words achievement
-                try:
-                    current_invalid = await get_stat(message.author.id, 'noitu', 'invalid_words')
-                    await self.bot.achievement_manager.check_unlock(message.author.id, "noitu", "invalid_words", current_invalid, message.channel)
-                except Exception as e:
-                    logger.error(f"ERROR checking invalid_words achievement: {e}")
+                # Track invalid words for achievement (checked when the ledger flushes)
+                self.ledger.remember_user(message.author.id, message.author.name, channel)
+                self.ledger.increment(message.author.id, 'invalid_words', 1)
                 
-                # Import QuickAddWordView from add_word cog
-                try:
-                    from cogs.noi_tu.add_word import QuickAddWordView
-                    view = QuickAddWordView(content, message.author, self.bot)
-                    await message.reply(
-                        f"Từ **{content}** không có trong từ điển. Bạn muốn gửi admin thêm từ này?",
-                        view=view,
-                        delete_after=10
-                    )
-                except Exception as e:
-                    logger.error(f"ERROR showing add word view: {e}")
-                    await message.reply("Từ này ko có trong từ điển, bruh", delete_after=3)
+                self._dispatch(self._send_not_in_dict(message, content), "not_in_dict")
                 return "not_in_dict"
 
             # === VALID MOVE ===
-            try:
-                await message.add_reaction("✅")
-            except Exception as e:
-                logger.error(f"Unexpected error: {e}")
+            self._dispatch(message.add_reaction("✅"), "valid_reaction")
             
             # Initialize streak counter if not exists
             if guild_id not in self.streak:
@@ -919,74 +1084,39 @@ class GameNoiTu(commands.Cog):
             # Increment correct word count for this player (only for end-of-game bonus, not for immediate reward)
             game['players'][message.author.id]["correct_words"] += 1
             
-            # Update player stats (correct word count)
-            await self.update_player_stats(message.author.id, message.author.name, is_winner=False)
-            
-            # Track additional achievement stats
+            # Update player stats (buffered in the ledger, achievements checked on flush)
             user_id = message.author.id
+            self.ledger.remember_user(user_id, message.author.name, channel)
+            self.ledger.increment(user_id, 'correct_words', 1)
             
             # 1. Track game starters (first player in new game)
             if game['player_count'] == 0:  # First player
-                await self.increment_stat(user_id, 'game_starters', 1)
+                self.ledger.increment(user_id, 'game_starters', 1)
             
             # 2. Track low time answers (clutch moments) - under 3 seconds left (Timer is 60s)
+            #    and fast answers - under 5 seconds
             if game.get('last_message_time'):
                 time_since_last = time.time() - game['last_message_time']
                 if time_since_last > 57.0:  # More than 57 seconds passed (less than 3s left)
-                    await self.increment_stat(user_id, 'low_time_answers', 1)
-            
-            # 2.5. Track fast answers - under 5 seconds
-            if game.get('last_message_time'):
-                time_since_last = time.time() - game['last_message_time']
+                    self.ledger.increment(user_id, 'low_time_answers', 1)
                 if time_since_last < 5.0:  # Less than 5 seconds
-                    await self.increment_stat(user_id, 'fast_answers', 1)
+                    self.ledger.increment(user_id, 'fast_answers', 1)
             
             # 3. Track night answers (0-5 AM)
             current_hour = datetime.now().hour
             if current_hour >= 0 and current_hour <= 5:
-                await self.increment_stat(user_id, 'night_answers', 1)
+                self.ledger.increment(user_id, 'night_answers', 1)
             
-            # 4. Track reduplicative words (từ láy)
-            if await self.is_reduplicative_word(content):
-                await self.increment_stat(user_id, 'reduplicative_words', 1)
-            
-            # Check achievements
-            try:
-                current_words = await get_stat(user_id, 'noitu', 'correct_words')
-                await self.bot.achievement_manager.check_unlock(user_id, "noitu", "correct_words", current_words, message.channel)
-                
-                if game['player_count'] == 0:  # First player
-                    current_starters = await get_stat(user_id, 'noitu', 'game_starters')
-                    await self.bot.achievement_manager.check_unlock(user_id, "noitu", "game_starters", current_starters, message.channel)
-                
-                if game.get('last_message_time') and (time.time() - game['last_message_time']) > 57.0:
-                    current_low_time = await get_stat(user_id, 'noitu', 'low_time_answers')
-                    await self.bot.achievement_manager.check_unlock(user_id, "noitu", "low_time_answers", current_low_time, message.channel)
-                
-                if game.get('last_message_time') and (time.time() - game['last_message_time']) < 5.0:
-                    current_fast = await get_stat(user_id, 'noitu', 'fast_answers')
-                    await self.bot.achievement_manager.check_unlock(user_id, "noitu", "fast_answers", current_fast, message.channel)
-                
-                if current_hour >= 0 and current_hour <= 5:
-                    current_night = await get_stat(user_id, 'noitu', 'night_answers')
-                    await self.bot.achievement_manager.check_unlock(user_id, "noitu", "night_answers", current_night, message.channel)
-                
-                if await self.is_reduplicative_word(content):
-                    current_reduplicative = await get_stat(user_id, 'noitu', 'reduplicative_words')
-                    await self.bot.achievement_manager.check_unlock(user_id, "noitu", "reduplicative_words", current_reduplicative, message.channel)
-                    
-            except Exception as e:
-                logger.error(f"ERROR checking achievements for {user_id}: {e}")
+            # 4. Track reduplicative words (từ láy) - flag precomputed in the index
+            if key in index.reduplicative:
+                self.ledger.increment(user_id, 'reduplicative_words', 1)
             
             # Cancel old timer
             if game['timer_task']:
                 game['timer_task'].cancel()
-                try:
-                    if game.get('timer_message'):
-                        await game['timer_message'].delete()
-                        game['timer_message'] = None
-                except Exception as e:
-                    logger.error(f"Unexpected error: {e}")
+                if game.get('timer_message'):
+                    self._dispatch(self._delete_message(game['timer_message']), "timer_delete")
+                    game['timer_message'] = None
                 logger.info(f"TIMER_RESET [Guild {guild_id}] Old timer cancelled")
             
             # Update player count
@@ -994,116 +1124,53 @@ class GameNoiTu(commands.Cog):
             
             # Notify when Player 2 joins
             if game['player_count'] == 2:
-                try:
-                    await message.channel.send("🎮 Nối từ bắt đầu!")
-                except Exception as e:
-                    logger.error(f"Unexpected error: {e}")
+                self._dispatch(channel.send("🎮 Nối từ bắt đầu!"), "p2_joined")
             
             # Update game state
             game['current_word'] = content
             game['used_words'].add(content)
+            game['used_keys'].add(key)
+            game['last_id'] = second_id
             game['last_author_id'] = message.author.id
             game['last_message_time'] = time.time()
             
             # === MILESTONE REWARD (Cứ 10 từ thành công) ===
             if current_streak > 0 and current_streak % 10 == 0:
-                try:
-                    economy_cog = self.bot.get_cog("EconomyCog")
-                    is_buff_active = await economy_cog.is_harvest_buff_active(guild_id)
-                    milestone_reward = 20 * (2 if is_buff_active else 1)
-                    
-                    await message.channel.send(f"🔥 **MILESTONE! Chuỗi {current_streak}!** Cả phòng nhận được **{milestone_reward} Hạt**! 🎉")
-                    # Distribute milestone reward to all players
-                    for player_id in game['players'].keys():
-                        await economy_cog.add_seeds_local(player_id, milestone_reward)
-                except Exception as e:
-                    logger.error(f"ERROR awarding milestone: {e}")
-            
-            # Save game state
-            await self.save_game_state(guild_id, message.channel.id)
+                self._dispatch(
+                    self._award_milestone(guild_id, channel, current_streak, list(game['players'].keys())),
+                    "milestone"
+                )
             
             # Check Dead End
-            has_next = await self.check_if_word_has_next(content, game['used_words'])
-            
-            if not has_next:
-                last_syllable = content.split()[-1]
+            if not index.has_next(second_id, game['used_keys']):
+                last_syllable = index.syllables[second_id]
                 logger.info(f"DEAD_END [Guild {guild_id}] No words starting with '{last_syllable}' - Streak ended at {current_streak}")
                 
-                # Embed for end-of-streak
-                embed = discord.Embed(
-                    title="🛑 BÍ TỪ!",
-                    description=f"Không có từ nào bắt đầu bằng **{last_syllable}**.",
-                    color=discord.Color.orange()
-                )
-                embed.add_field(
-                    name="🔥 Chuỗi Cộng Đồng",
-                    value=f"Chuỗi **{current_streak}** từ kết thúc!",
-                    inline=False
-                )
-                embed.add_field(
-                    name="👤 Người cuối cùng",
-                    value=message.author.mention,
-                    inline=False
-                )
-                
-                await message.channel.send(embed=embed)
-                
                 # Track game ending words for the last player
-                await self.increment_stat(message.author.id, 'game_ending_words', 1)
-                
-                # Check game ending words achievement
-                try:
-                    current_ending = await get_stat(message.author.id, 'noitu', 'game_ending_words')
-                    await self.bot.achievement_manager.check_unlock(message.author.id, "noitu", "game_ending_words", current_ending, message.channel)
-                except Exception as e:
-                    logger.error(f"ERROR checking game_ending_words achievement: {e}")
+                self.ledger.increment(message.author.id, 'game_ending_words', 1)
                 
                 # Track long chain participation if streak >= 50
                 if current_streak >= 50:
                     for player_id in game['players'].keys():
-                        await self.increment_stat(player_id, 'long_chain_participation', 1)
-                        # Check long chain participation achievement
-                        try:
-                            current_long_chain = await get_stat(player_id, 'noitu', 'long_chain_participation')
-                            await self.bot.achievement_manager.check_unlock(player_id, "noitu", "long_chain_participation", current_long_chain, message.channel)
-                        except Exception as e:
-                            logger.error(f"ERROR checking long_chain_participation achievement for {player_id}: {e}")
-                
+                        self.ledger.increment(player_id, 'long_chain_participation', 1)
                 
                 # Update max_streak ONLY for the winner (last player standing)
-                try:
-                    winner_id = message.author.id
-                    updated = await self.update_max_stat(winner_id, 'max_streak', current_streak)
-                    if updated:
-                        # Check max_streak achievement for winner only
-                        new_max_streak = await get_stat(winner_id, 'noitu', 'max_streak')
-                        await self.bot.achievement_manager.check_unlock(winner_id, "noitu", "max_streak", new_max_streak, message.channel)
-                except Exception as e:
-                    logger.error(f"ERROR updating max_streak for winner {winner_id}: {e}")
-
+                self.ledger.set_max(message.author.id, 'max_streak', current_streak)
                 
-                # Distribute rewards to all participants
-                if game.get('players'):
-                    await self.distribute_streak_rewards(guild_id, game['players'], current_streak, message.channel)
-                
-                # Reset and start new round
+                # Close this round now; messages queued behind it are ignored until the next round starts
+                game['ended'] = True
                 self.streak[guild_id] = 0
-                self.cleanup_game_lock(guild_id)
-                await self.start_new_round(guild_id, message.channel)
-                await self.save_game_state(guild_id, message.channel.id)
+                self._dispatch(
+                    self._finish_round(guild_id, channel, last_syllable, current_streak, message.author, game['players']),
+                    "finish_round"
+                )
                 return "valid_move"
             
+            # Save game state (persistence)
+            self._request_save(guild_id, channel.id)
+            
             # DISABLED: 60s timer removed per user request - game only ends on dead-end word
             # Timer was causing pressure on small servers
-            # if game['player_count'] >= 2:
-            #     logger.info(f"TIMER_START [Guild {guild_id}] ({game['player_count']} players) - 60s countdown")
-            #     game['timer_task'] = asyncio.create_task(self.game_timer(guild_id, message.channel, time.time()))
-            # else:
-            #     logger.info(f"WAITING_P2 [Guild {guild_id}] ({game['player_count']}/2)")
-            #     try:
-            #         await message.channel.send(f"👥 Chờ người chơi thứ 2... ({game['player_count']}/2)")
-            #     except Exception as e:
-            #         logger.error(f"Unexpected error: {e}")
             
             # Just log player count without timer
             logger.info(f"PLAYER_JOINED [Guild {guild_id}] ({game['player_count']} players) - No timer")
@@ -1116,72 +1183,19 @@ class GameNoiTu(commands.Cog):
 
     # Helper functions for achievement stats tracking
     async def increment_stat(self, user_id, stat_key, value):
-        """Tăng giá trị stat cho user trong game noitu"""
-        try:
-            game_id = 'noitu'
-            logger.info(f"[NoiTu] Incrementing stat {stat_key} for user {user_id} by {value}")
-            
-            # Đảm bảo record tồn tại
-            sql_check = "SELECT value FROM user_stats WHERE user_id = ? AND game_id = ? AND stat_key = ?"
-            row = await db_manager.fetchone(sql_check, (user_id, game_id, stat_key))
-            
-            if row:
-                current_value = row[0]
-                new_value = current_value + value
-                sql_update = "UPDATE user_stats SET value = value + ? WHERE user_id = ? AND game_id = ? AND stat_key = ?"
-                await db_manager.modify(sql_update, (value, user_id, game_id, stat_key))
-                logger.info(f"[NoiTu] Updated stat {stat_key} from {current_value} to {new_value}")
-            else:
-                sql_insert = "INSERT INTO user_stats (user_id, game_id, stat_key, value) VALUES (?, ?, ?, ?)"
-                await db_manager.modify(sql_insert, (user_id, game_id, stat_key, value))
-                logger.info(f"[NoiTu] Inserted new stat {stat_key} with value {value}")
-        except Exception as e:
-            logger.error(f"[NoiTu] Error updating stat {stat_key} for {user_id}: {e}")
+        """Tăng giá trị stat cho user trong game noitu (buffered, written on ledger flush)"""
+        self.ledger.increment(user_id, stat_key, value)
     
     async def update_max_stat(self, user_id, stat_key, new_value):
-        """Update stat to max value (only if new_value > current_value)"""
-        try:
-            game_id = 'noitu'
-            logger.info(f"[NoiTu] Updating max stat {stat_key} for user {user_id} to {new_value}")
-            
-            # Check current value
-            sql_check = "SELECT value FROM user_stats WHERE user_id = ? AND game_id = ? AND stat_key = ?"
-            row = await db_manager.fetchone(sql_check, (user_id, game_id, stat_key))
-            
-            if row:
-                current_value = row[0]
-                if new_value > current_value:
-                    sql_update = "UPDATE user_stats SET value = ? WHERE user_id = ? AND game_id = ? AND stat_key = ?"
-                    await db_manager.modify(sql_update, (new_value, user_id, game_id, stat_key))
-                    logger.info(f"[NoiTu] Updated max stat {stat_key} from {current_value} to {new_value}")
-                    return True
-                else:
-                    logger.info(f"[NoiTu] Max stat {stat_key} not updated (current: {current_value}, new: {new_value})")
-                    return False
-            else:
-                sql_insert = "INSERT INTO user_stats (user_id, game_id, stat_key, value) VALUES (?, ?, ?, ?)"
-                await db_manager.modify(sql_insert, (user_id, game_id, stat_key, new_value))
-                logger.info(f"[NoiTu] Inserted new max stat {stat_key} with value {new_value}")
-                return True
-        except Exception as e:
-            logger.error(f"[NoiTu] Error updating max stat {stat_key} for {user_id}: {e}")
-            return False
+        """Update stat to max value (GREATEST() upsert on ledger flush)"""
+        self.ledger.set_max(user_id, stat_key, new_value)
     
     async def is_reduplicative_word(self, word):
-        """Check if word is reduplicative (từ láy) like 'xinh xắn', 'lung linh'"""
-        try:
-            parts = word.split()
-            if len(parts) != 2:
-                return False
-            
-            first, second = parts
-            # Simple check: if both parts have same consonants and similar vowels
-            # This is a basic implementation - can be improved
-            if len(first) == len(second) and first[0] == second[0]:  # Same starting consonant
-                return True
-            return False
-        except Exception as e:
+        """Check if word is reduplicative (từ láy) like 'lung linh', 'đo đỏ'"""
+        parts = normalize(word).split()
+        if len(parts) != 2:
             return False
+        return is_reduplicative(parts[0], parts[1])
 
     @app_commands.command(name="resetnoitu", description="Reset game nối từ (mọi người đều dùng được)")
     async def reset_noitu(self, interaction: discord.Interaction):
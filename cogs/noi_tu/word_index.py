@@ -0,0 +1,155 @@
+"""Interned syllable index for NoiTu word validation.
+
+Every message used to be lowered, stripped and split several times, the
+current word re-split to find its last syllable, and dead-end checks built
+an f-string per candidate. The index maps each syllable to an integer ID
+once, at dictionary load time, and encodes a two-syllable word as a single
+int key. The per-message hot path is then one normalize + split of the input
+followed by dict/set lookups on small ints.
+"""
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Combining marks for the five Vietnamese tones (huyền, sắc, ngã, hỏi, nặng)
+TONE_MARKS = frozenset("\u0300\u0301\u0303\u0309\u0323")
+
+# Multi-letter onsets, longest first so "ngh" wins over "ng"
+MULTI_ONSETS = ("ngh", "ng", "nh", "ch", "tr", "th", "kh", "ph", "gh", "gi", "qu")
+
+VOWELS = frozenset("aăâeêioôơuưy")
+
+# Syllable IDs fit in 20 bits, so (first, second) packs into one int
+_SHIFT = 20
+
+UNKNOWN = -1
+
+ParsedWord = Tuple[int, int, str]
+
+
+def normalize(text: str) -> str:
+    """NFC-normalize, lowercase and trim a word.
+
+    Vietnamese input can arrive pre-composed or with combining tone marks
+    depending on the keyboard; both must map to the same syllable ID.
+    """
+    return unicodedata.normalize("NFC", text).lower().strip()
+
+
+def strip_tones(syllable: str) -> str:
+    """Remove tone marks but keep vowel quality (ă, â, ê, ô, ơ, ư, đ)."""
+    decomposed = unicodedata.normalize("NFD", syllable)
+    return unicodedata.normalize("NFC", "".join(c for c in decomposed if c not in TONE_MARKS))
+
+
+def onset(syllable: str) -> str:
+    """Initial consonant cluster of a tone-stripped syllable ('' if it starts with a vowel)."""
+    for cluster in MULTI_ONSETS:
+        if syllable.startswith(cluster) and len(syllable) > len(cluster):
+            return cluster
+    if syllable and syllable[0] not in VOWELS:
+        return syllable[0]
+    return ""
+
+
+def is_reduplicative(first: str, second: str) -> bool:
+    """Tone-aware check for reduplicative words (từ láy) like 'lung linh', 'đo đỏ'.
+
+    Full reduplication: identical syllables once tones are removed.
+    Partial reduplication: same onset cluster and same syllable length,
+    which keeps the old heuristic but no longer confuses 'nh' with 'ng'.
+    """
+    base_first, base_second = strip_tones(first), strip_tones(second)
+    if base_first == base_second:
+        return True
+    first_onset = onset(base_first)
+    return bool(first_onset) and first_onset == onset(base_second) and len(first) == len(second)
+
+
+def word_key(first_id: int, second_id: int) -> int:
+    return (first_id << _SHIFT) | second_id
+
+
+class WordIndex:
+    """Dictionary index keyed by interned syllable IDs.
+
+    Attributes:
+        syllable_ids: syllable text -> ID.
+        syllables: ID -> syllable text.
+        words: set of packed word keys present in the dictionary.
+        continuations: first syllable ID -> tuple of word keys starting with it.
+        reduplicative: set of word keys flagged as từ láy.
+    """
+
+    __slots__ = ("syllable_ids", "syllables", "words", "continuations", "reduplicative")
+
+    def __init__(self, words_dict: Dict[str, Iterable[str]]):
+        self.syllable_ids: Dict[str, int] = {}
+        self.syllables: List[str] = []
+        words = set()
+        continuations: Dict[int, List[int]] = {}
+        reduplicative = set()
+
+        for first, seconds in words_dict.items():
+            first_id = self._intern(normalize(first))
+            for second in seconds:
+                second_norm = normalize(second)
+                key = word_key(first_id, self._intern(second_norm))
+                if key in words:
+                    continue
+                words.add(key)
+                continuations.setdefault(first_id, []).append(key)
+                if is_reduplicative(self.syllables[first_id], second_norm):
+                    reduplicative.add(key)
+
+        self.words = frozenset(words)
+        self.continuations = {k: tuple(v) for k, v in continuations.items()}
+        self.reduplicative = frozenset(reduplicative)
+
+    def _intern(self, syllable: str) -> int:
+        syllable_id = self.syllable_ids.get(syllable)
+        if syllable_id is None:
+            syllable_id = len(self.syllables)
+            self.syllable_ids[syllable] = syllable_id
+            self.syllables.append(syllable)
+        return syllable_id
+
+    def parse(self, text: str) -> Optional[ParsedWord]:
+        """Map raw input to (first_id, second_id, normalized_text).
+
+        Returns None unless the input has exactly two syllables. Syllables
+        missing from the dictionary get UNKNOWN.
+        """
+        content = normalize(text)
+        parts = content.split()
+        if len(parts) != 2:
+            return None
+        get = self.syllable_ids.get
+        return get(parts[0], UNKNOWN), get(parts[1], UNKNOWN), content
+
+    def key_of(self, word: str) -> int:
+        """Packed key for a stored word, or UNKNOWN if it is not in the dictionary."""
+        parsed = self.parse(word)
+        if parsed is None or parsed[0] == UNKNOWN or parsed[1] == UNKNOWN:
+            return UNKNOWN
+        key = word_key(parsed[0], parsed[1])
+        return key if key in self.words else UNKNOWN
+
+    def last_syllable_id(self, word: str) -> int:
+        parts = normalize(word).split()
+        return self.syllable_ids.get(parts[-1], UNKNOWN) if parts else UNKNOWN
+
+    def has_next(self, last_id: int, used_keys) -> bool:
+        """True if some dictionary word starts with last_id and is not used yet."""
+        for key in self.continuations.get(last_id, ()):
+            if key not in used_keys:
+                return True
+        return False
+
+    def used_keys_for(self, used_words: Iterable[str]) -> set:
+        """Packed keys for a persisted used-words list (unknown words are dropped)."""
+        keys = set()
+        for word in used_words:
+            key = self.key_of(word)
+            if key != UNKNOWN:
+                keys.add(key)
+        return keys
@@ -6,6 +6,7 @@ from database_manager import (
     get_user_balance,
     add_seeds
 )
+from core.database import balance_cache_key
 
 from .fishing.mechanics.legendary_quest_helper import is_legendary_caught
 from .fishing.utils.consumables import CONSUMABLE_ITEMS
@@ -175,6 +176,7 @@ class ShopCog(commands.Cog):
                     "UPDATE users SET seeds = seeds - $1 WHERE user_id = $2",
                     (total_cost, user_id)
                 )
+                conn.invalidate_keys_on_commit([balance_cache_key(user_id)])
                 
                 # Log transaction
                 await conn.execute(
@@ -289,6 +291,7 @@ class ShopCog(commands.Cog):
                     "UPDATE users SET seeds = seeds - $1 WHERE user_id = $2",
                     (total_cost, user_id)
                 )
+                conn.invalidate_keys_on_commit([balance_cache_key(user_id)])
                 
                 await conn.execute(
                     "INSERT INTO transaction_logs (user_id, amount, reason, category) VALUES ($1, $2, $3, $4)",
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from typing import Optional, List, Tuple, Dict
 from core.logger import setup_logger
 from database_manager import db_manager
+from core.database import harvest_buff_cache_key
 
 from .constants import BASE_LEVEL_REQS, SEASON_SCALING, HARVEST_BUFF_HOURS
 
@@ -346,10 +347,14 @@ class HarvestBuff:
             True if buff is active
         """
         try:
-            # FIX: Remove use_cache argument, not supported by asyncpg manager
-            row = await db_manager.fetchone(
+            # Cached per guild; set_server_config drops it when the buff is activated
+            # fetchrow like EconomyCog.is_harvest_buff_active, which shares the cache entry
+            row = await db_manager.fetchrow(
                 "SELECT harvest_buff_until FROM server_config WHERE guild_id = ?",
-                (guild_id,)
+                (guild_id,),
+                use_cache=True,
+                cache_key=harvest_buff_cache_key(guild_id),
+                cache_ttl=60
             )
             
             if not row or not row[0]:
@@ -8,16 +8,21 @@ import logging
 import random
 from collections import Counter
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Set
 
 import discord
 from discord import abc as discord_abc
 
-from .role_config import RoleConfig
 from database_manager import db_manager
+from core.discord_scheduler import Priority, discord_scheduler, gather_actions
 from ..roles import get_role_class, load_all_roles
 from ..roles.base import Alignment, Expansion, Role
+from .infrastructure import GameInfrastructure, infrastructure_pool
+from .messaging import DMFanout
+from .night import NightRules
+from .replay import ReplayLog, append_record, settings_snapshot
 from .state import GameSettings, Phase, PlayerState
+from .timers import PhaseTimers
 from .voting import VoteSession
 from core.logger import setup_logger
 
@@ -31,7 +36,7 @@ load_all_roles()
 logger = setup_logger("WerewolfGame", "cogs/werewolf/werewolf.log")
 
 
-class WerewolfGame:
+class WerewolfGame(NightRules):
     """Single running match of Werewolf."""
 
     def __init__(
@@ -51,6 +56,9 @@ class WerewolfGame:
         self.category: Optional[discord.CategoryChannel] = None
         self.voice_channel: Optional[discord.VoiceChannel] = None
         self.text_channel: Optional[discord.TextChannel] = None  # Bot-only event log
+        self._infrastructure: Optional[GameInfrastructure] = None  # Returned to the pool at the end
+        # Set by WerewolfManager: told the voice channel id while the game holds one (None when released)
+        self.voice_route: Optional[Callable[["WerewolfGame", Optional[int]], None]] = None
         
         # NEW: Threads for communication
         self.thread_wolves: Optional[discord.Thread] = None  # Wolf discussion
@@ -71,43 +79,17 @@ class WerewolfGame:
         self._lobby_view: Optional[_LobbyView] = None
         # NOTE: _wolf_thread removed - now using self.thread_wolves
         # NOTE: _player_role removed - using permissions instead of roles
-        # (player_id, cause) where cause in {wolves, white_wolf, witch, pyro, hunter, lynch, lover, scapegoat}
-        self._pending_deaths: List[Tuple[int, str]] = []
-        self._lovers: Set[int] = set()
-        self._charmed: Set[int] = set()
-        self._piper_id: Optional[int] = None
+        # Night order, role actions and death cascades (NightRules) talk to Discord through this port
+        self.port = _DiscordPort(self)
+        self._init_rule_state()
+        # DMs: cached DM channels, scheduled sends, one fallback message for closed DMs
+        self._dm = DMFanout(guild.id, lambda: self.channel)
+        # Every phase deadline of this game (countdowns, votes) runs on one timer wheel
+        self._timers = PhaseTimers()
+        # Assignments, choices, votes, deaths and phase timings, appended to the replay files at the end
+        self._replay = ReplayLog(guild.id)
         self._stop_event = asyncio.Event()
-        self._death_log: List[Tuple[int, str, str]] = []
-        self._little_girl_peeking: Optional[int] = None  # Little girl user_id if peeking this night
-        self._sisters_ids: List[int] = []  # Two Sisters player IDs
         self._sisters_thread: Optional[discord.Thread] = None  # Sisters have their own thread
-        # Pyromaniac state: set of player IDs soaked in oil (max 6)
-        self._pyro_soaked: Set[int] = set()
-        self._pyro_id: Optional[int] = None  # Pyromaniac player ID
-        self._angel_won = False  # Track if Angel won on Day 1
-        self._scapegoat_target: Optional[int] = None  # Target chosen by Scapegoat on tie vote
-        self._demon_wolf_curse_target: Optional[int] = None  # Target cursed by Demon Wolf
-        self._moon_maiden_disabled: Optional[int] = None  # Player disabled by Moon Maiden this night
-        self._hypnotist_charm_target: Optional[int] = None  # Player charmed by Hypnotist this night
-        self._pharmacist_antidote_target: Optional[int] = None  # Player targeted by Pharmacist's antidote this night
-        self._pharmacist_slept_target: Optional[int] = None  # Player targeted by Pharmacist's sleeping potion this night
-        self._assassin_votes_day1: Dict[int, int] = {}  # Track votes day 1 of assassin cycle
-        self._assassin_votes_day2: Dict[int, int] = {}  # Track votes day 2 of assassin cycle
-        self._wolves_died_today: List[int] = []  # Track which wolves died during day (for Fire Wolf)
-        self._wolf_brother_id: Optional[int] = None  # Wolf Brother player ID
-        self._wolf_sister_id: Optional[int] = None  # Wolf Sister player ID
-        self._judge_activated_double_lynch: bool = False  # Judge activated double lynch this day
-        self._actor_protected_target: Optional[int] = None  # Target protected by Actor using Guard ability
-        self._actor_heal_target: Optional[int] = None  # Target healed by Actor using Witch Heal ability
-        self._actor_hunt_target: Optional[int] = None  # Target to hunt if Actor killed using Hunter ability
-        self._actor_raven_target: Optional[int] = None  # Target cursed by Actor using Raven ability
-        self._actor_harp_target: Optional[int] = None  # Target charmed by Actor using Hypnotist ability
-        self._elder_man_id: Optional[int] = None  # Elder Man player ID
-        self._elder_man_group1: List[int] = []  # Group 1 player IDs
-        self._elder_man_group2: List[int] = []  # Group 2 player IDs
-        self._devoted_servant_id: Optional[int] = None  # Devoted Servant player ID
-        self._devoted_servant_stolen_role: Optional[Role] = None  # Stolen role by Devoted Servant
-        self._devoted_servant_original_target: Optional[int] = None  # Original target of Devoted Servant swap
         
         # NOTE: Voice state listener is now handled centrally by WerewolfManager
         # to avoid listener overwrites in multi-game scenarios
@@ -155,9 +137,11 @@ class WerewolfGame:
             pass
 
     async def _create_game_infrastructure(self) -> None:
-        """Create category, channels, and threads for game.
+        """Set up category, channels, and threads for game.
         
-        Creates:
+        Takes a pre-built category from the infrastructure pool when one is
+        ready (otherwise builds it) and opens it to all current players with
+        one bulk overwrite update per channel:
         - Category: "🐺 Ma Sói #{game_id} - {host[:10]}"
         - Voice Channel: "🔊 Bàn Tròn"
         - Text Channel: "📜 diễn-biến" (bot-only messages)
@@ -168,84 +152,40 @@ class WerewolfGame:
         host_short = self.host.display_name[:10]
         category_name = f"🐺 Ma Sói #{game_id} - {host_short}"
         
-        # Create Category (VIEWABLE for spectators, no interaction)
-        overwrites = {
-            self.guild.default_role: discord.PermissionOverwrite(
-                view_channel=True,       # Everyone can SEE
-                connect=False,           # Cannot join voice
-                speak=False,             # Cannot speak
-                send_messages=False      # Cannot chat
-            ),
-            self.guild.me: discord.PermissionOverwrite(
-                view_channel=True,
-                manage_channels=True,
-                manage_permissions=True,
-                manage_threads=True
-            )
-        }
-        
-        self.category = await self.guild.create_category(
-            name=category_name,
-            overwrites=overwrites,
+        self._infrastructure = await infrastructure_pool.acquire(
+            self.guild,
+            category_name,
+            [player.member for player in self.list_players()],
             reason=f"Werewolf Game #{game_id} - Host: {self.host.name}"
         )
-        logger.info("✅ Created category | guild=%s id=%s name=%s", 
-                   self.guild.id, self.category.id, category_name)
-        
-        # Create Voice Channel
-        self.voice_channel = await self.category.create_voice_channel(
-            name="🔊 Bàn Tròn",
-            reason="Werewolf: Main voice channel"
-        )
-        logger.info("✅ Created voice channel | guild=%s id=%s name=%s", 
-                   self.guild.id, self.voice_channel.id, self.voice_channel.name)
-        
-        # Create Text Channel (spectators can watch events)
-        text_overwrites = {
-            self.guild.default_role: discord.PermissionOverwrite(
-                view_channel=True,       # Everyone can WATCH
-                send_messages=False      # Cannot chat
-            ),
-            self.guild.me: discord.PermissionOverwrite(
-                view_channel=True,
-                send_messages=True,
-                manage_messages=True
-            )
-        }
-        
-        self.text_channel = await self.category.create_text_channel(
-            name="📜 diễn-biến",
-            overwrites=text_overwrites,
-            reason="Werewolf: Game events channel (bot-only messages)"
-        )
-        logger.info("✅ Created text channel | guild=%s id=%s name=%s", 
-                   self.guild.id, self.text_channel.id, self.text_channel.name)
+        self.category = self._infrastructure.category
+        self.voice_channel = self._infrastructure.voice_channel
+        self.text_channel = self._infrastructure.text_channel
+        self._publish_voice_channel(self.voice_channel.id)
+        logger.info("✅ Game channels ready | guild=%s category=%s voice=%s text=%s name=%s", 
+                   self.guild.id, self.category.id, self.voice_channel.id, self.text_channel.id, category_name)
         
         # Create Threads (Private)
         # CRITICAL: Threads must override parent permissions!
-        self.thread_wolves = await self.text_channel.create_thread(
-            name="Hang Sói",
-            type=discord.ChannelType.private_thread,
-            reason="Werewolf: Wolf communication"
-        )
-        logger.info("✅ Created thread WOLVES | guild=%s id=%s name=%s", 
-                   self.guild.id, self.thread_wolves.id, self.thread_wolves.name)
-        
-        self.thread_dead = await self.text_channel.create_thread(
-            name="Nghĩa Địa", 
-            type=discord.ChannelType.private_thread,
-            reason="Werewolf: Dead player spectator area"
-        )
-        logger.info("✅ Created thread DEAD | guild=%s id=%s name=%s", 
-                   self.guild.id, self.thread_dead.id, self.thread_dead.name)
-        
-        self.thread_main = await self.text_channel.create_thread(
-            name="Bàn Tròn",
-            type=discord.ChannelType.private_thread,
-            reason="Werewolf: Main discussion"
+        self.thread_wolves, self.thread_dead, self.thread_main = await asyncio.gather(
+            self.text_channel.create_thread(
+                name="Hang Sói",
+                type=discord.ChannelType.private_thread,
+                reason="Werewolf: Wolf communication"
+            ),
+            self.text_channel.create_thread(
+                name="Nghĩa Địa", 
+                type=discord.ChannelType.private_thread,
+                reason="Werewolf: Dead player spectator area"
+            ),
+            self.text_channel.create_thread(
+                name="Bàn Tròn",
+                type=discord.ChannelType.private_thread,
+                reason="Werewolf: Main discussion"
+            ),
         )
-        logger.info("✅ Created thread MAIN | guild=%s id=%s name=%s", 
-                   self.guild.id, self.thread_main.id, self.thread_main.name)
+        logger.info("✅ Created threads | guild=%s wolves=%s dead=%s main=%s", 
+                   self.guild.id, self.thread_wolves.id, self.thread_dead.id, self.thread_main.id)
         
         # Send metadata message for cleanup
         await self.text_channel.send(
@@ -261,34 +201,54 @@ class WerewolfGame:
             self.guild.id, self.category.id, game_id
         )
 
+    def _publish_voice_channel(self, channel_id: Optional[int]) -> None:
+        if self.voice_route is not None:
+            self.voice_route(self, channel_id)
+
+    async def _release_game_infrastructure(self, reason: str) -> None:
+        """Return the category to the pool (or delete it if the pool is full)."""
+        infrastructure, self._infrastructure = self._infrastructure, None
+        if infrastructure is None:
+            return
+        # The pooled voice channel goes to the next game: stop routing its events here first
+        self._publish_voice_channel(None)
+        try:
+            await infrastructure_pool.release(infrastructure, reason=reason)
+            logger.info("Released game category | guild=%s category=%s", 
+                       self.guild.id, infrastructure.category.id)
+        except discord.HTTPException as e:
+            logger.error("Failed to release game category | guild=%s error=%s", 
+                       self.guild.id, e)
+            await infrastructure_pool._discard(infrastructure, reason)
+
     async def _grant_player_access(self, member: discord.Member) -> None:
         """Grant player access to game infrastructure.
         
         Args:
             member: Player to grant access to
         """
-        # Grant category access
-        await self.category.set_permissions(
-            member,
-            view_channel=True,
-            reason="Werewolf: Player access"
-        )
-        
-        # Grant voice access
-        await self.voice_channel.set_permissions(
-            member,
-            view_channel=True,
-            connect=True,
-            speak=True,
-            reason="Werewolf: Player voice access"
-        )
-        
-        # Grant text channel VIEW (but not send - bot only)
-        await self.text_channel.set_permissions(
-            member,
-            view_channel=True,
-            send_messages=False,
-            reason="Werewolf: Player can view events"
+        await asyncio.gather(
+            # Grant category access
+            self._schedule_permissions(
+                self.category, member, Priority.HIGH,
+                view_channel=True,
+                reason="Werewolf: Player access"
+            ),
+            # Grant voice access
+            self._schedule_permissions(
+                self.voice_channel, member, Priority.HIGH,
+                view_channel=True,
+                connect=True,
+                speak=True,
+                reason="Werewolf: Player voice access"
+            ),
+            # Grant text channel VIEW (but not send - bot only)
+            self._schedule_permissions(
+                self.text_channel, member, Priority.HIGH,
+                view_channel=True,
+                send_messages=False,
+                reason="Werewolf: Player can view events"
+            ),
         )
         
         logger.info("Granted infrastructure access | guild=%s player=%s", 
@@ -297,6 +257,8 @@ class WerewolfGame:
     async def cleanup(self) -> None:
         """Cleanup game infrastructure."""
         self._stop_event.set()
+        self._dm.clear()
+        self._timers.close()
         
         # Cancel game loop
         if self._loop_task and not self._loop_task.done():
@@ -311,13 +273,8 @@ class WerewolfGame:
             except discord.HTTPException:
                 pass
         
-        # Delete entire category (this deletes all channels/threads inside)
-        if self.category:
-            try:
-                await self.category.delete(reason="Werewolf: Game ended")
-                logger.info("Deleted game category | guild=%s", self.guild.id)
-            except discord.HTTPException as e:
-                logger.error("Failed to delete category: %s", e)
+        # Return the category to the pool (its event channel and threads are replaced)
+        await self._release_game_infrastructure("Werewolf: Game ended")
         
         # NOTE: Old role deletion code removed - using permissions now
         # NOTE: Old wolf thread deletion removed - deleted with category
@@ -347,42 +304,6 @@ class WerewolfGame:
         except Exception as e:
             logger.error("Error deleting game state: %s", str(e), exc_info=True)
 
-    def list_players(self) -> Sequence[PlayerState]:
-        return list(self.players.values())
-
-    def alive_players(self) -> List[PlayerState]:
-        return [p for p in self.players.values() if p.alive and not p.death_pending]
-
-    def _is_player_eligible_for_action(self, player: PlayerState) -> bool:
-        """Check if player can take night/day actions (alive, not pending death, and not disabled by Fire Wolf)."""
-        return player.alive and not player.death_pending and not player.skills_disabled
-
-    def alive_by_alignment(self, alignment: Alignment) -> List[PlayerState]:
-        result = [p for p in self.alive_players() if any(r.alignment == alignment for r in p.roles)]
-        logger.info(">>> alive_by_alignment | guild=%s alignment=%s count=%s", 
-                     self.guild.id, alignment.value, len(result))
-        return result
-
-    def get_active_werewolves(self, filter_alive: bool = True) -> List[PlayerState]:
-        """Get werewolves excluding Avengers on werewolf side (they don't participate in wolf votes/actions)."""
-        players_to_check = self.alive_players() if filter_alive else self.players.values()
-        wolves = []
-        for p in players_to_check:
-            if any(r.alignment == Alignment.WEREWOLF for r in p.roles):
-                # Check if this is an Avenger on werewolf side
-                is_avenger_wolf_side = False
-                for role in p.roles:
-                    if hasattr(role, '__class__') and role.__class__.__name__ == 'Avenger':
-                        if hasattr(role, 'chosen_side') and role.chosen_side == Alignment.WEREWOLF:
-                            is_avenger_wolf_side = True
-                            break
-                
-                # Only add if not an Avenger on werewolf side
-                if not is_avenger_wolf_side:
-                    wolves.append(p)
-        
-        return wolves
-
     async def add_player(self, member: discord_abc.User) -> None:
         """Add player to game (lobby or late join with infrastructure access)."""
         if self.phase != Phase.LOBBY:
@@ -393,7 +314,9 @@ class WerewolfGame:
         if guild_member.id in self.players:
             return
         
-        self.players[guild_member.id] = PlayerState(member=guild_member)
+        player = PlayerState(member=guild_member)
+        self.players[guild_member.id] = player
+        self._index.track(player)
         
         # If infrastructure exists, grant access immediately
         # (This handles late joins after game started but before first night)
@@ -412,7 +335,9 @@ class WerewolfGame:
         guild_member = member if isinstance(member, discord.Member) else self.guild.get_member(member.id)
         if guild_member is None:
             return
-        self.players.pop(guild_member.id, None)
+        player = self.players.pop(guild_member.id, None)
+        if player is not None:
+            self._index.untrack(player)
         await self._refresh_lobby()
         logger.info("Player left lobby | guild=%s channel=%s player=%s", self.guild.id, self.channel.id, guild_member.id)
 
@@ -434,20 +359,14 @@ class WerewolfGame:
         if len(self.players) < MIN_PLAYERS:
             raise RuntimeError(f"Cần ít nhất {MIN_PLAYERS} người mới bắt đầu được")
         
-        # Create game infrastructure (category, channels, threads)
+        # Create game infrastructure (category, channels, threads); players get
+        # access through the bulk overwrites, no per-player permission calls
         await self._create_game_infrastructure()
         
-        # Grant all players access to infrastructure (PARALLEL for speed)
-        access_tasks = [
-            self._grant_player_access(player.member)
-            for player in self.list_players()
-        ]
-        await asyncio.gather(*access_tasks)
-        
         # Add all players to main thread for discussion (PARALLEL)
         # Note: Threads don't use set_permissions, they inherit from parent
         thread_tasks = [
-            self.thread_main.add_user(player.member)
+            self._schedule_thread_member(self.thread_main, player.member)
             for player in self.list_players()
         ]
         await asyncio.gather(*thread_tasks)
@@ -477,16 +396,15 @@ class WerewolfGame:
         ]
         if wolves:
             wolf_add_tasks = [
-                self.thread_wolves.add_user(wolf.member)
+                self._schedule_thread_member(self.thread_wolves, wolf.member)
                 for wolf in wolves
             ]
             await asyncio.gather(*wolf_add_tasks)
             logger.info("Added %s wolves to Hang Sói thread", len(wolves))
         
         # NOTE: Old _create_player_role() removed - using permissions now
-        await self._notify_roles()
         # NOTE: Old _create_wolf_thread() removed - created in infrastructure
-        await self._announce_role_composition()
+        await asyncio.gather(self._notify_roles(), self._announce_role_composition())
         
         if self._lobby_message:
             try:
@@ -501,7 +419,8 @@ class WerewolfGame:
     async def _game_loop(self) -> None:
         try:
             while not self.is_finished and not self._stop_event.is_set():
-                await self._run_night()
+                with self._replay.phase("night", self.night_number):
+                    await self._run_night()
                 logger.info("After night: checking win condition | guild=%s night=%s", 
                             self.guild.id, self.night_number)
                 try:
@@ -517,7 +436,8 @@ class WerewolfGame:
                 # Save game state after night
                 await self._save_game_state()
                 
-                await self._run_day()
+                with self._replay.phase("day", self.day_number + 1):
+                    await self._run_day()
                 logger.info("After day: checking win condition | guild=%s day=%s", 
                             self.guild.id, self.day_number)
                 try:
@@ -537,8 +457,8 @@ class WerewolfGame:
             await self._force_unmute_all()
             await self._enable_text_chat()
             await self._announce_winner()
-            # Clear all channel permissions to reset for next game
-            await self._clear_channel_permissions()
+            await self._write_replay()
+            # Player overwrites are reset in bulk when the category goes back to the pool
             self.is_finished = True
             if self.thread_wolves:
                 with contextlib.suppress(discord.HTTPException):
@@ -550,17 +470,11 @@ class WerewolfGame:
             # Delete saved game state when game finishes
             await self._delete_game_state()
             
-            # DELETE ENTIRE CATEGORY (this deletes voice, text channels and remaining threads)
-            if self.category:
-                try:
-                    # Wait a bit for final messages to be sent
-                    await asyncio.sleep(5)
-                    await self.category.delete(reason="Werewolf: Game ended - cleanup")
-                    logger.info("Deleted game category | guild=%s category=%s", 
-                               self.guild.id, self.category.id)
-                except discord.HTTPException as e:
-                    logger.error("Failed to delete category | guild=%s error=%s", 
-                               self.guild.id, e)
+            # RECYCLE CATEGORY (hidden and returned to the pool; event channel and threads replaced)
+            if self._infrastructure:
+                # Wait a bit for final messages to be read
+                await asyncio.sleep(5)
+                await self._release_game_infrastructure("Werewolf: Game ended - cleanup")
 
     async def _run_night(self) -> None:
         """Execute night phase with new architecture."""
@@ -584,27 +498,20 @@ class WerewolfGame:
         # Disable text chat (bot-only channel already, this is for threads)
         await self._disable_text_chat()
         
-        # Mute all alive players in voice (PARALLEL with asyncio.gather)
+        # Mute alive players, lock thread_main and unlock thread_wolves as one
+        # scheduled burst: mutes go first, all of it paced by the route buckets
+        actions = []
         if self.voice_channel:
-            mute_tasks = []
             for member in self.voice_channel.members:
                 player = self.players.get(member.id)
                 if player and player.alive:
-                    mute_tasks.append(
-                        member.edit(mute=True, reason="Werewolf: Night phase")
-                    )
-            if mute_tasks:
-                await asyncio.gather(*mute_tasks, return_exceptions=True)
-        
-        # LOCK thread_main - Read-only for all players during night
+                    actions.append(self._schedule_mute(member, True, "Werewolf: Night phase"))
         if self.thread_main:
-            await self.thread_main.edit(locked=True, reason="Werewolf: Night phase - locked")
-            logger.info("Locked thread_main for night | guild=%s", self.guild.id)
-        
-        # UNLOCK thread_wolves - Wolves can chat during night
+            actions.append(self._schedule_thread_lock(self.thread_main, True, "Werewolf: Night phase - locked"))
         if self.thread_wolves:
-            await self.thread_wolves.edit(locked=False, reason="Werewolf: Night phase - wolves active")
-            logger.info("Unlocked thread_wolves for night | guild=%s", self.guild.id)
+            actions.append(self._schedule_thread_lock(self.thread_wolves, False, "Werewolf: Night phase - wolves active"))
+        await self._await_actions(actions, "night transition")
+        logger.info("Night transition applied | guild=%s actions=%s", self.guild.id, len(actions))
         
         # NOTE: Old werewolf_role muting removed - using threads now
         
@@ -633,27 +540,19 @@ class WerewolfGame:
         # Enable text chat and unmute voice channel for day phase
         await self._enable_text_chat()
         
-        # Unmute all alive players in voice (PARALLEL with asyncio.gather)
+        # Unmute alive players, unlock thread_main and lock thread_wolves
+        actions = []
         if self.voice_channel:
-            unmute_tasks = []
             for member in self.voice_channel.members:
                 player = self.players.get(member.id)
                 if player and player.alive:
-                    unmute_tasks.append(
-                        member.edit(mute=False, reason="Werewolf: Day phase")
-                    )
-            if unmute_tasks:
-                await asyncio.gather(*unmute_tasks, return_exceptions=True)
-        
-        # UNLOCK thread_main - Players can discuss during day
+                    actions.append(self._schedule_mute(member, False, "Werewolf: Day phase"))
         if self.thread_main:
-            await self.thread_main.edit(locked=False, reason="Werewolf: Day phase - open discussion")
-            logger.info("Unlocked thread_main for day | guild=%s", self.guild.id)
-        
-        # LOCK thread_wolves - Wolves cannot chat during day
+            actions.append(self._schedule_thread_lock(self.thread_main, False, "Werewolf: Day phase - open discussion"))
         if self.thread_wolves:
-            await self.thread_wolves.edit(locked=True, reason="Werewolf: Day phase - wolves silent")
-            logger.info("Locked thread_wolves for day | guild=%s", self.guild.id)
+            actions.append(self._schedule_thread_lock(self.thread_wolves, True, "Werewolf: Day phase - wolves silent"))
+        await self._await_actions(actions, "day transition")
+        logger.info("Day transition applied | guild=%s actions=%s", self.guild.id, len(actions))
         
         announcements = []
         new_deaths = [p for p in self.list_players() if not p.alive and p.death_pending]
@@ -677,7 +576,8 @@ class WerewolfGame:
         discussion_time = self.settings.calculate_discussion_time(alive_count)
         
         # NEW: Run discussion with skip vote feature
-        await self._run_discussion_phase(alive_count, discussion_time)
+        with self._replay.phase("discussion", self.day_number, discussion_time):
+            await self._run_discussion_phase(alive_count, discussion_time)
         
         # Execute day phase role actions (e.g., Cavalry) before voting
         for player in self.alive_players():
@@ -703,111 +603,6 @@ class WerewolfGame:
             player.vote_disabled = False
         logger.info("Day start | guild=%s channel=%s day=%s deaths=%s", self.guild.id, self.channel.id, self.day_number, [p.user_id for p in new_deaths])
 
-    async def _resolve_pending_deaths(self, phase_label: str) -> None:
-        if not self._pending_deaths:
-            return
-        # Deduplicate by player id while keeping first cause
-        unique: Dict[int, str] = {}
-        for pid, cause in self._pending_deaths:
-            if pid not in unique:
-                unique[pid] = cause
-        
-        # Store the list of died player IDs for wild child check BEFORE clearing
-        died_players = list(unique.keys())
-        
-        # SECURITY: Only clear after we have copied the list
-        self._pending_deaths.clear()
-        
-        try:
-            for pid, cause in unique.items():
-                player = self.players.get(pid)
-                if not player:
-                    logger.warning("Player not found for death resolution | guild=%s pid=%s", 
-                                   self.guild.id, pid)
-                    continue
-                # SECURITY: Double-check player is alive and not already marked dead
-                if not player.alive or player.death_pending:
-                    logger.warning("Skipping death resolution for already-dead player | guild=%s player=%s", 
-                                   self.guild.id, pid)
-                    continue
-                player.alive = False
-                player.death_pending = True
-                try:
-                    await self._handle_death(player, cause=cause)
-                except Exception as e:
-                    logger.error(
-                        "Error in _handle_death | guild=%s player=%s cause=%s error=%s",
-                        self.guild.id, pid, cause, str(e), exc_info=True
-                    )
-                    # Continue processing other deaths even if one fails
-        except Exception as e:
-            logger.error(
-                "Error in _resolve_pending_deaths | guild=%s error=%s",
-                self.guild.id, str(e), exc_info=True
-            )
-        
-        # Check if any wild children should transform
-        try:
-            await self._check_wild_child_transformation(died_players)
-        except Exception as e:
-            logger.error(
-                "Error in _check_wild_child_transformation | guild=%s error=%s",
-                self.guild.id, str(e), exc_info=True
-            )
-
-    async def _check_wild_child_transformation(self, died_player_ids: List[int]) -> None:
-        """Check if any Wild Child should transform into werewolf."""
-        from ..roles.villagers.wild_child import WildChild
-        
-        for player in self.players.values():
-            if not player.alive or not player.roles:
-                continue
-            
-            # Check if this player is a Wild Child
-            wild_child = None
-            for role in player.roles:
-                if role.metadata.name == "Đứa Con Hoang":
-                    wild_child = role
-                    break
-            
-            if not wild_child:
-                continue
-            
-            # Get the wild child role and check if chosen one died
-            if not isinstance(wild_child, WildChild):
-                continue
-            
-            # Check if the chosen one died
-            if wild_child.chosen_one_id in died_player_ids:
-                await wild_child.check_transformation(self, player, wild_child.chosen_one_id)
-
-        # Check if Demon Wolf cursed someone
-        if self._demon_wolf_curse_target:
-            target_id = self._demon_wolf_curse_target
-            target = self.players.get(target_id)
-            
-            if target and target.alive:
-                # Add Werewolf role to the cursed player
-                from ..roles.werewolves.werewolf import Werewolf
-                target.add_role(Werewolf())
-                
-                # Add to wolf thread
-                if self.thread_wolves:
-                    await self.thread_wolves.add_user(target.member)
-                
-                # Notify the cursed player
-                await target.member.send(
-                    "Bạn đã bị Sói Quỷ nguyền rủa! Bạn sẽ trở thành Ma Sói từ đêm tiếp theo. Bạn vẫn giữ vai trò cũ."
-                )
-                
-                # Notify wolves about new member
-                if self.thread_wolves:
-                    await self.thread_wolves.send(
-                        f"{target.display_name()} đã được nguyền rủa thành Ma Sói! Họ sẽ gia nhập bầy từ đêm tiếp theo."
-                    )
-            
-            self._demon_wolf_curse_target = None
-
     async def _run_day_vote(self) -> None:
         alive = self.alive_players()
         eligible: List[int] = []
@@ -840,6 +635,8 @@ class WerewolfGame:
             options=options,
             eligible_voters=eligible,
             duration=self.settings.day_vote_duration,
+            timers=self._timers,
+            replay=self._replay,
             allow_skip=True,
             vote_weights={p.user_id: p.vote_weight for p in alive},
             disabled_voters=disabled,
@@ -991,6 +788,8 @@ class WerewolfGame:
                         options=options_second,
                         eligible_voters=[p.user_id for p in alive_after_first],
                         duration=30,  # Shorter vote time for second lynch
+                        timers=self._timers,
+                        replay=self._replay,
                         allow_skip=True,
                         vote_weights={p.user_id: p.vote_weight for p in alive_after_first},
                     )
@@ -1042,7 +841,7 @@ class WerewolfGame:
         
         embed = discord.Embed(
             title=f"⏱️ Thảo luận ngày {self.day_number}",
-            description=f"👥 **{alive_count} người sống** • ⏳ **{discussion_time}s**\n\n"
+            description=f"👥 **{alive_count} người sống** • ⏳ Kết thúc {PhaseTimers.relative(discussion_time)}\n\n"
                        f"💬 Hãy thảo luận về ai là Ma Sói!\n\n"
                        f"🔘 **Phiếu bỏ qua:** Nếu **TẤT CẢ** người chơi đều chọn bỏ qua, "
                        f"sẽ kết thúc thảo luận và đi thẳng đến treo cổ.",
@@ -1057,40 +856,15 @@ class WerewolfGame:
         
         skip_message = await self.thread_main.send(embed=embed, view=skip_vote_view)
         skip_vote_view.message = skip_message
+        skip_vote_view.deadline_ts = PhaseTimers.timestamp(discussion_time)
         
         logger.info("Discussion phase started with skip voting | guild=%s day=%s time=%s alive=%s", 
                    self.guild.id, self.day_number, discussion_time, alive_count)
         
-        # Run countdown while monitoring skip votes
-        start_time = asyncio.get_event_loop().time()
-        remaining_time = discussion_time
-        
-        while remaining_time > 0:
-            # Check if all players voted to skip
-            if skip_vote_view.can_skip():
-                await self.thread_main.send("✅ **Tất cả người chơi đều bỏ qua thảo luận!**\n💨 Chuyển sang giai đoạn treo cổ...")
-                logger.info("Discussion skipped by all players | guild=%s day=%s", self.guild.id, self.day_number)
-                skip_vote_view.stop()
-                break
-            
-            # Sleep and check remaining time
-            await asyncio.sleep(1)
-            elapsed = asyncio.get_event_loop().time() - start_time
-            remaining_time = discussion_time - int(elapsed)
-            
-            # Update countdown every 5 seconds
-            if int(elapsed) % 5 == 0 and remaining_time > 0:
-                skip_votes = len(skip_vote_view.skip_votes)
-                skip_embed = discord.Embed(
-                    title=f"⏱️ Thảo luận ngày {self.day_number}",
-                    description=f"⏳ **{remaining_time}s** còn lại\n"
-                               f"🔘 Bỏ qua: {skip_votes}/{alive_count}",
-                    colour=discord.Colour.blue()
-                )
-                try:
-                    await skip_message.edit(embed=skip_embed, view=skip_vote_view)
-                except discord.HTTPException:
-                    pass
+        # Wait for the deadline or for every alive player to vote skip, whichever comes first
+        if await self._timers.wait_for_event(skip_vote_view.all_skipped, discussion_time):
+            await self.thread_main.send("✅ **Tất cả người chơi đều bỏ qua thảo luận!**\n💨 Chuyển sang giai đoạn treo cổ...")
+            logger.info("Discussion skipped by all players | guild=%s day=%s", self.guild.id, self.day_number)
         
         skip_vote_view.stop()
         
@@ -1155,6 +929,8 @@ class WerewolfGame:
             options=judgment_options,
             eligible_voters=[p.user_id for p in alive_players if not p.vote_disabled],
             duration=judgment_time,
+            timers=self._timers,
+            replay=self._replay,
             allow_skip=False,
             vote_weights={p.user_id: p.vote_weight for p in alive_players},
         )
@@ -1206,117 +982,27 @@ class WerewolfGame:
         
         await self.channel.send(f"💀 **{target_player.display_name()} đã bị xử tử.** 🪦")
 
-    async def _assign_roles(self) -> None:
-        player_ids = list(self.players.keys())
-        random.shuffle(player_ids)
-        
-        # First, build layout without thief bonus to check if thief is in the game
-        role_layout = self._build_role_layout(len(player_ids), has_thief=False)
-        random.shuffle(role_layout)
-        
-        # Check if thief was randomly assigned in the layout
-        has_thief_role = any(cls().metadata.name == "Tên Trộm" for cls in role_layout)
-        
-        if has_thief_role:
-            # Rebuild layout with 2 extra cards for thief
-            role_layout = self._build_role_layout(len(player_ids), has_thief=True)
-            random.shuffle(role_layout)
-        
-        extra_cards: List[Role] = []
-        thief_id: Optional[int] = None
-        
-        # Assign first N roles to players
-        for player_id, role_cls in zip(player_ids, role_layout[:len(player_ids)]):
-            role = role_cls()
-            if role.metadata.name == "Tên Trộm":
-                thief_id = player_id
-            self.players[player_id].roles = [role]
-            logger.info(
-                "Role assigned | guild=%s player=%s name=%s alignment=%s",
-                self.guild.id,
-                player_id,
-                role.metadata.name,
-                role.alignment,
-            )
-        
-        # If thief exists, the last 2 roles become extra cards
-        if thief_id is not None and len(role_layout) > len(player_ids):
-            thief = self.players[thief_id]
-            extra_role_classes = role_layout[len(player_ids):]
-            extra_cards = [role_cls() for role_cls in extra_role_classes]
-            thief.role.extra_cards = extra_cards  # type: ignore[attr-defined]
-            logger.info(
-                "Thief extra cards generated | guild=%s cards=%s",
-                self.guild.id,
-                [role.metadata.name for role in extra_cards]
-            )
-        for player in self.players.values():
-            # Call on_assign for all roles
-            for role in player.roles:
-                await role.on_assign(self, player)
-        
-        # Detect Two Sisters and notify them of each other
-        sisters = [p for p in self.players.values() if getattr(p, "is_sister", False)]
-        if len(sisters) == 2:
-            self._sisters_ids = [s.user_id for s in sisters]
-            try:
-                await sisters[0].member.send(f"👯 Bạn là Hai Chị Em cùng với: {sisters[1].display_name()}")
-                await sisters[1].member.send(f"👯 Bạn là Hai Chị Em cùng với: {sisters[0].display_name()}")
-            except discord.HTTPException:
-                pass
-            logger.info("Two Sisters identified | guild=%s sisters=%s", self.guild.id, self._sisters_ids)
-        
-        # Detect Wolf Brother & Sister and pair them
-        wolf_siblings = [(p, p.roles[0]) for p in self.players.values() if p.roles and p.roles[0].metadata.name in ("Sói Anh", "Sói Em")]
-        
-        # VALIDATION: Ensure both Wolf Brother and Sister are present together (not partial assignment)
-        wolf_brother_count = sum(1 for p, r in wolf_siblings if r.metadata.name == "Sói Anh")
-        wolf_sister_count = sum(1 for p, r in wolf_siblings if r.metadata.name == "Sói Em")
-        
-        if wolf_brother_count != wolf_sister_count:
-            logger.error(
-                "CRITICAL: Incomplete Wolf Sibling assignment | guild=%s brothers=%s sisters=%s",
-                self.guild.id, wolf_brother_count, wolf_sister_count
-            )
-            # If we have one but not the other, log the error and continue (shouldn't happen with new role_config logic)
-        elif wolf_brother_count == 1 and wolf_sister_count == 1:
-            # Both are present - proceed with pairing
-            player1, role1 = wolf_siblings[0]
-            player2, role2 = wolf_siblings[1]
-            
-            # Randomly decide who is brother and who is sister
-            if random.random() < 0.5:
-                brother_player, sister_player = player1, player2
-                brother_role, sister_role = role1, role2
-            else:
-                brother_player, sister_player = player2, player1
-                brother_role, sister_role = role2, role1
-            
-            # If we need to swap roles (if assigned wrong), do it now
-            if brother_role.metadata.name != "Sói Anh":
-                # Swap roles
-                brother_player.roles = [sister_role]
-                sister_player.roles = [brother_role]
-                brother_role, sister_role = sister_role, brother_role
-            
-            # Link them together
-            self._wolf_brother_id = brother_player.user_id
-            self._wolf_sister_id = sister_player.user_id
-            brother_role.sister_id = sister_player.user_id
-            sister_role.brother_id = brother_player.user_id
-            
-            logger.info(
-                "Wolf siblings paired | guild=%s brother=%s sister=%s",
-                self.guild.id,
-                brother_player.user_id,
-                sister_player.user_id,
-            )
-
-        # NOTE: Werewolf role creation removed - using permissions instead of roles in new architecture
+    async def _write_replay(self) -> None:
+        """Append this game's replay record (never fails the game's teardown)."""
+        record = self._replay.finish(
+            winner=self._winner.value if self._winner else ("angel" if self._angel_won else None),
+            players=self.players,
+            expansions=[e.name for e in self.settings.expansions],
+            settings=settings_snapshot(self.settings),
+            nights=self.night_number,
+            days=self.day_number,
+        )
+        try:
+            path = await append_record(record)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Failed to write replay | guild=%s error=%s", self.guild.id, str(e))
+            return
+        logger.info("Replay written | guild=%s path=%s events=%s", self.guild.id, path, len(record["events"]))
 
     async def _notify_roles(self) -> None:
         wolf_players = [p for p in self.players.values() if any(r.alignment == Alignment.WEREWOLF for r in p.roles)]
         wolf_names = ", ".join(p.display_name() for p in wolf_players) or "Không có"
+        messages = []
         for player in self.players.values():
             roles = player.roles
             if not roles:
@@ -1336,10 +1022,10 @@ class WerewolfGame:
             embed.add_field(name="Phe", value=player.faction_view(), inline=True)
             embed.add_field(name="Đồng đội", value=wolf_names if any(r.alignment == Alignment.WEREWOLF for r in roles) else "Ẩn danh", inline=True)
             embed.set_image(url=role.metadata.card_image_url)
-            # SECURITY: Use safe DM with error handling
-            await self._safe_send_dm(player.member, embed=embed)
-            # Rate limit protection: small delay between DMs
-            await asyncio.sleep(0.1)
+            messages.append((player.member, None, embed))
+        # Sent concurrently within the DM rate limits; closed DMs share one fallback message
+        failed = await self._dm.fan_out(messages, priority=Priority.HIGH)
+        logger.info("Role DMs sent | guild=%s sent=%s failed=%s", self.guild.id, len(messages) - len(failed), len(failed))
 
     async def _announce_role_composition(self) -> None:
         """Announce all roles in the game at the start."""
@@ -1433,34 +1119,21 @@ class WerewolfGame:
         async def _run_countdown() -> None:
             embed = discord.Embed(
                 title=f"{role.metadata.name} Dậy đi!",
-                description=f"Đang hành động... (Thời gian: {duration}s)",
+                description=f"Đang hành động... (kết thúc {PhaseTimers.relative(duration)})",
                 colour=discord.Colour.purple(),
             )
             embed.set_thumbnail(url=role.metadata.card_image_url)
             try:
                 message = await self.channel.send(embed=embed)
-                # Show countdown with fixed time - cannot skip
-                remaining = duration
-                step = 5
-                while remaining > 0:
-                    await asyncio.sleep(min(step, remaining))
-                    remaining -= step
-                    if remaining < 0:
-                        remaining = 0
-                    try:
-                        embed.description = f"Đang hành động... (Thời gian: {remaining}s)"
-                        await message.edit(embed=embed)
-                    except discord.HTTPException:
-                        pass
-                # Final message when time is up
-                try:
-                    embed.description = "Đã hoàn thành."
-                    await message.edit(embed=embed)
-                except discord.HTTPException:
-                    pass
             except discord.HTTPException as e:
                 logger.warning("Failed to announce role action | guild=%s role=%s error=%s", 
                               self.guild.id, role.metadata.name, str(e))
+                return
+            # Fixed time, cannot skip; the client renders the countdown itself
+            await self._timers.sleep(duration)
+            embed.description = "Đã hoàn thành."
+            with contextlib.suppress(discord.HTTPException):
+                await self._schedule_message_edit(message, embed=embed)
         
         # Return the background task
         return asyncio.create_task(_run_countdown())
@@ -1502,18 +1175,17 @@ class WerewolfGame:
     async def _fallback_individual_permissions(self) -> None:
         """Fallback: Set individual permissions for each player (rate-limited)."""
         logger.warning("Using fallback individual permissions | guild=%s players=%s", self.guild.id, len(self.players))
+        actions = []
         for player in self.players.values():
-            try:
-                await self.channel.set_permissions(
-                    player.member,
-                    send_messages=True,
-                    read_messages=True,
-                    reason="Werewolf: Allow player to chat in game channel"
-                )
-                await asyncio.sleep(0.1)  # Rate limit protection
-            except discord.HTTPException as e:
-                logger.warning("Failed to set permissions for player | guild=%s player=%s error=%s",
-                             self.guild.id, player.user_id, str(e))
+            actions.append(self._schedule_permissions(
+                self.channel,
+                player.member,
+                Priority.HIGH,
+                send_messages=True,
+                read_messages=True,
+                reason="Werewolf: Allow player to chat in game channel"
+            ))
+        await self._await_actions(actions, "fallback permissions")
 
     async def _create_wolf_thread(self) -> None:
         # Get wolves but exclude Avengers on werewolf side (they don't join wolf thread)
@@ -1546,6 +1218,56 @@ class WerewolfGame:
         wolf_mentions = " ".join(p.member.mention for p in wolves)
         await self.thread_wolves.send(f"{wolf_mentions} đây là nơi bàn kế hoạch. Hãy dùng menu để chọn mục tiêu mỗi đêm.")
 
+    # ==================== SCHEDULED DISCORD ACTIONS ====================
+
+    def _schedule_mute(self, member: discord.Member, mute: bool, reason: str) -> asyncio.Future:
+        """Queue a voice mute change; a newer change for the same member replaces a queued one."""
+        return discord_scheduler.submit(
+            "member_edit",
+            lambda: member.edit(mute=mute, reason=reason),
+            major=self.guild.id,
+            target=member.id,
+            priority=Priority.CRITICAL,
+            label=f"werewolf mute={mute} member={member.id}",
+        )
+
+    def _schedule_thread_lock(self, thread: discord.Thread, locked: bool, reason: str) -> asyncio.Future:
+        return discord_scheduler.submit(
+            "channel_edit",
+            lambda: thread.edit(locked=locked, reason=reason),
+            major=thread.id,
+            target="locked",
+            priority=Priority.HIGH,
+            label=f"werewolf locked={locked} thread={thread.id}",
+        )
+
+    def _schedule_thread_member(self, thread: discord.Thread, member: discord.Member) -> asyncio.Future:
+        return discord_scheduler.submit(
+            "thread_members",
+            lambda: thread.add_user(member),
+            major=thread.id,
+            target=member.id,
+            priority=Priority.HIGH,
+            label=f"werewolf add thread={thread.id} member={member.id}",
+        )
+
+    def _schedule_permissions(self, channel, target, priority: Priority, **kwargs) -> asyncio.Future:
+        return discord_scheduler.submit(
+            "channel_permissions",
+            lambda: channel.set_permissions(target, **kwargs),
+            major=channel.id,
+            target=target.id,
+            priority=priority,
+            label=f"werewolf permissions channel={channel.id} target={target.id}",
+        )
+
+    async def _await_actions(self, actions: List[asyncio.Future], context: str) -> int:
+        """Wait for scheduled actions, log failures and return the success count."""
+        succeeded, errors = await gather_actions(actions)
+        for error in errors:
+            logger.warning("Scheduled action failed | guild=%s context=%s error=%s", self.guild.id, context, str(error))
+        return succeeded
+
     async def _mute_voice(self) -> None:
         """Mute all players in voice channel during night phase, keep dead players muted."""
         if not self.voice_channel.id:
@@ -1557,14 +1279,10 @@ class WerewolfGame:
                 return
             
             # Mute all players currently in the voice channel
-            muted_count = 0
-            for member in voice_channel.members:
-                try:
-                    await member.edit(mute=True, reason="Werewolf: Night phase - mute")
-                    muted_count += 1
-                except discord.HTTPException as e:
-                    logger.warning("Failed to mute member | guild=%s member=%s error=%s", 
-                                 self.guild.id, member.id, str(e))
+            muted_count = await self._await_actions(
+                [self._schedule_mute(member, True, "Werewolf: Night phase - mute") for member in voice_channel.members],
+                "mute voice",
+            )
             
             logger.info("Voice muted | guild=%s voice_channel=%s muted_count=%s", 
                        self.guild.id, self.voice_channel.id, muted_count)
@@ -1586,25 +1304,21 @@ class WerewolfGame:
                 return
             
             # Unmute only alive players in the voice channel
-            unmuted_count = 0
+            reason = "Werewolf: Day phase - unmute" if not force_unmute_all else "Werewolf: Game ended - unmute all"
+            unmutes = []
+            keep_muted = []
             for member in voice_channel.members:
                 # Check if player is alive
                 player = self.players.get(member.id)
                 if not force_unmute_all and player and not player.alive:
                     # Keep dead players muted (unless force_unmute_all)
-                    try:
-                        if member.voice and not member.voice.mute:
-                            await member.edit(mute=True, reason="Werewolf: Dead player must stay muted")
-                    except discord.HTTPException:
-                        pass
+                    if member.voice and not member.voice.mute:
+                        keep_muted.append(self._schedule_mute(member, True, "Werewolf: Dead player must stay muted"))
                     continue
-                
-                try:
-                    await member.edit(mute=False, reason="Werewolf: Day phase - unmute" if not force_unmute_all else "Werewolf: Game ended - unmute all")
-                    unmuted_count += 1
-                except discord.HTTPException as e:
-                    logger.warning("Failed to unmute member | guild=%s member=%s error=%s", 
-                                 self.guild.id, member.id, str(e))
+                unmutes.append(self._schedule_mute(member, False, reason))
+            
+            await self._await_actions(keep_muted, "keep dead muted")
+            unmuted_count = await self._await_actions(unmutes, "unmute voice")
             
             logger.info("Voice unmuted | guild=%s voice_channel=%s unmuted_count=%s force_unmute_all=%s", 
                        self.guild.id, self.voice_channel.id, unmuted_count, force_unmute_all)
@@ -1633,27 +1347,6 @@ class WerewolfGame:
         logger.info("Text chat enabled (threads mode) | guild=%s channel=%s", 
                    self.guild.id, self.text_channel.id)
 
-    async def _run_wolf_vote(self) -> Optional[int]:
-        """Run wolf vote to choose a target for the night kill."""
-        wolves = [p for p in self.alive_players() if any(r.alignment == Alignment.WEREWOLF for r in p.roles)]
-        candidates = self.alive_players()
-        if not wolves or not candidates:
-            return None
-        channel = self.thread_wolves or self.channel
-        options = {p.user_id: p.display_name() for p in candidates}
-        vote = VoteSession(
-            self.bot,
-            channel,
-            title=f"Ma Sói chọn con mồi (Đêm {self.night_number})",
-            description="Chọn người muốn tấn công. Hòa phiếu thì đêm yên bình.",
-            options=options,
-            eligible_voters=[w.user_id for w in wolves],
-            duration=self.settings.night_vote_duration,
-            allow_skip=True,
-        )
-        result = await vote.start()
-        return result.winning_target_id if not result.is_tie else None
-
     def _calculate_night_action_duration(self, *, first_night: bool) -> int:
         """Calculate estimated total duration for all night role actions."""
         duration = 0
@@ -1664,8 +1357,7 @@ class WerewolfGame:
         if first_night and self._find_role_holder("Thần Tình Yêu"):
             duration += 120  # 2 lovers
         # Wolf vote
-        wolves = [p for p in self.alive_players() if any(r.alignment == Alignment.WEREWOLF for r in p.roles)]
-        if wolves:
+        if self._index.count(Alignment.WEREWOLF):
             duration += self.settings.night_vote_duration
         # Guard
         if self._find_role_holder("Bảo Vệ"):
@@ -1693,383 +1385,6 @@ class WerewolfGame:
         duration += self.settings.night_intro_duration
         return max(duration, 60)  # Minimum 60s
 
-    async def _resolve_role_sequence(self, *, first_night: bool) -> None:
-        try:
-            # Reset Moon Maiden disabled flag each night
-            self._moon_maiden_disabled = None
-            # Reset Hypnotist charm target each night
-            self._hypnotist_charm_target = None
-            # Reset Pharmacist targets each night
-            self._pharmacist_antidote_target = None
-            self._pharmacist_slept_target = None
-            # Reset Assassin votes on even nights (after 2-day cycle ends)
-            if self.night_number % 2 == 0:
-                self._assassin_votes_day1 = {}
-                self._assassin_votes_day2 = {}
-                logger.info("Assassin votes reset for new cycle | guild=%s night=%s", self.guild.id, self.night_number)
-            
-            announce_task = None
-            thief = self._find_role_holder("Tên Trộm")
-            if first_night and thief and self._is_player_eligible_for_action(thief):
-                announce_task = self._announce_role_action(thief.role)
-                await self._handle_thief(thief)
-                if announce_task:
-                    await announce_task
-                logger.info("Thief resolved | guild=%s player=%s", self.guild.id, thief.user_id)
-            cupid = self._find_role_holder("Thần Tình Yêu")
-            if first_night and cupid and self._is_player_eligible_for_action(cupid):
-                announce_task = self._announce_role_action(cupid.role)
-                await self._handle_cupid(cupid)
-                if announce_task:
-                    await announce_task
-                logger.info("Cupid resolved | guild=%s player=%s", self.guild.id, cupid.user_id)
-            
-            # Handle Wolf Brother & Sister first-night recognition
-            if first_night and self._wolf_brother_id and self._wolf_sister_id:
-                brother = self.players.get(self._wolf_brother_id)
-                sister = self.players.get(self._wolf_sister_id)
-                if brother and sister and brother.alive and sister.alive:
-                    # Call on_first_night for both siblings
-                    for role in brother.roles:
-                        if hasattr(role, 'on_first_night'):
-                            try:
-                                await role.on_first_night(self, brother)
-                                logger.info("Wolf Brother first-night resolved | guild=%s player=%s", self.guild.id, brother.user_id)
-                            except Exception as e:
-                                logger.error("Error in Wolf Brother first-night | guild=%s player=%s error=%s", 
-                                           self.guild.id, brother.user_id, str(e), exc_info=True)
-                    
-                    for role in sister.roles:
-                        if hasattr(role, 'on_first_night'):
-                            try:
-                                await role.on_first_night(self, sister)
-                                logger.info("Wolf Sister first-night resolved | guild=%s player=%s", self.guild.id, sister.user_id)
-                            except Exception as e:
-                                logger.error("Error in Wolf Sister first-night | guild=%s player=%s error=%s", 
-                                           self.guild.id, sister.user_id, str(e), exc_info=True)
-            
-            wolves = [p for p in self.alive_players() if any(r.alignment == Alignment.WEREWOLF for r in p.roles)]
-            announce_task = None
-            wolves = self.get_active_werewolves()
-            if wolves:
-                announce_task = self._announce_role_action(wolves[0].roles[0])
-            
-            # Handle little girl peeking before wolf vote (so wolves can see the discovery message)
-            little_girl = self._find_role_holder("Cô Bé")
-            if little_girl and self._is_player_eligible_for_action(little_girl):
-                await self._handle_little_girl(little_girl)
-            
-            # Run wolf vote - if little girl was discovered, wolves can choose to kill her instead
-            target_id = await self._run_wolf_vote()
-            if announce_task:
-                await announce_task
-            logger.info("Wolf vote target | guild=%s night=%s target=%s", self.guild.id, self.night_number, target_id)
-            
-            # If little girl was discovered, ask wolves quickly if they want to switch kill to her
-            if self._little_girl_peeking:
-                try:
-                    # Run a quick yes/no vote in wolf thread - NO COUNTDOWN, IMMEDIATE
-                    channel = self.thread_wolves or self.channel
-                    options = {
-                        self._little_girl_peeking: "Giết người hé mắt (Cô Bé)",
-                        target_id if target_id is not None else -1: "Giữ mục tiêu cũ",
-                    }
-                    vote = VoteSession(
-                        self.bot,
-                        channel,
-                        title=f"Ma Sói xác nhận mục tiêu (Đêm {self.night_number})",
-                        description="Bạn có muốn đổi sang giết người hé mắt không?",
-                        options=options,
-                        eligible_voters=[w.user_id for w in wolves],
-                        duration=15,
-                        allow_skip=False,
-                    )
-                    confirm = await vote.start()
-                    if not confirm.is_tie and confirm.winning_target_id in options:
-                        target_id = confirm.winning_target_id if confirm.winning_target_id != -1 else target_id
-                        logger.info("Wolves confirmation applied | guild=%s night=%s target=%s", self.guild.id, self.night_number, target_id)
-                finally:
-                    # Reset peeking flag regardless
-                    self._little_girl_peeking = None
-            
-            guard = self._find_role_holder("Bảo Vệ")
-            announce_task = None
-            if guard and self._is_player_eligible_for_action(guard):
-                announce_task = self._announce_role_action(guard.role)
-            protected_id = await self._handle_guard(guard) if guard and self._is_player_eligible_for_action(guard) else None
-            if announce_task:
-                await announce_task
-            logger.info("Guard protected | guild=%s night=%s target=%s", self.guild.id, self.night_number, protected_id)
-            killed_id = target_id if target_id != protected_id else None
-            # Track bodyguard save achievement
-            if guard and target_id == protected_id and killed_id is None:
-                guard.bodyguard_saves += 1
-                logger.info("Bodyguard save counted | guild=%s bodyguard=%s saves=%s", self.guild.id, guard.user_id, guard.bodyguard_saves)
-            if killed_id and self._handle_elder_resistance(killed_id):
-                killed_id = None
-            
-            white_wolf = self._find_role_holder("Sói Trắng")
-            announce_task = None
-            if white_wolf and self.night_number % 2 == 0 and self._is_player_eligible_for_action(white_wolf):
-                announce_task = self._announce_role_action(white_wolf.role)
-            betrayer_kill = await self._handle_white_wolf(white_wolf) if white_wolf and self.night_number % 2 == 0 and self._is_player_eligible_for_action(white_wolf) else None
-            if announce_task:
-                await announce_task
-            
-            seer = self._find_role_holder("Tiên Tri")
-            if seer and self._is_player_eligible_for_action(seer):
-                announce_task = self._announce_role_action(seer.role)
-                await self._handle_seer(seer)
-                if announce_task:
-                    await announce_task
-            
-            witch = self._find_role_holder("Phù Thủy")
-            if witch and self._is_player_eligible_for_action(witch):
-                announce_task = self._announce_role_action(witch.role)
-                killed_id = await self._handle_witch(witch, killed_id)
-                if announce_task:
-                    await announce_task
-            
-            raven = self._find_role_holder("Con Quạ")
-            if raven and self._moon_maiden_disabled != raven.user_id and self._is_player_eligible_for_action(raven):
-                announce_task = self._announce_role_action(raven.role)
-                await self._handle_raven(raven)
-                if announce_task:
-                    await announce_task
-            
-            piper = self._find_role_holder("Thổi Sáo")
-            if piper and self._moon_maiden_disabled != piper.user_id and self._is_player_eligible_for_action(piper):
-                announce_task = self._announce_role_action(piper.role)
-                await self._handle_piper(piper)
-                if announce_task:
-                    await announce_task
-            
-            pyro = self._find_role_holder("Kẻ Phóng Hỏa")
-            if pyro and not getattr(pyro.role, "ignited", False) and self._is_player_eligible_for_action(pyro):
-                announce_task = self._announce_role_action(pyro.role)
-                await self._handle_pyromaniac(pyro)
-                if announce_task:
-                    await announce_task
-            
-            hypnotist = self._find_role_holder("Cổ Hoặc Sư")
-            if hypnotist and self._is_player_eligible_for_action(hypnotist):
-                announce_task = self._announce_role_action(hypnotist.role)
-                await self._handle_hypnotist(hypnotist)
-                if announce_task:
-                    await announce_task
-            
-            moon_maiden = self._find_role_holder("Nguyệt Nữ")
-            if moon_maiden and self._is_player_eligible_for_action(moon_maiden):
-                announce_task = self._announce_role_action(moon_maiden.role)
-                await self._handle_moon_maiden(moon_maiden)
-                if announce_task:
-                    await announce_task
-            
-            # Fire Wolf ability - trigger if wolves died during the day
-            fire_wolf = self._find_role_holder("Sói Lửa")
-            if fire_wolf and self._is_player_eligible_for_action(fire_wolf):
-                # Check if any wolves died today (first ability trigger)
-                if len(self._wolves_died_today) >= 1 and not getattr(fire_wolf.role, 'has_used_ability_first', False):
-                    # Mark that first wolf death triggered the ability
-                    fire_wolf._fire_wolf_trigger_first = True
-                    announce_task = self._announce_role_action(fire_wolf.role)
-                    await fire_wolf.role.on_night(self, fire_wolf, self.night_number)
-                    if announce_task:
-                        await announce_task
-                    logger.info(
-                        "Fire Wolf triggered (first wolf death) | guild=%s fire_wolf=%s wolves_died=%s",
-                        self.guild.id, fire_wolf.user_id, len(self._wolves_died_today)
-                    )
-                # Check if 2+ wolves died today (second ability trigger)
-                elif len(self._wolves_died_today) >= 2 and not getattr(fire_wolf.role, 'has_used_ability_second', False):
-                    fire_wolf.role.can_use_again = True
-                    announce_task = self._announce_role_action(fire_wolf.role)
-                    await fire_wolf.role.on_night(self, fire_wolf, self.night_number)
-                    if announce_task:
-                        await announce_task
-                    logger.info(
-                        "Fire Wolf triggered (2+ wolves died) | guild=%s fire_wolf=%s wolves_died=%s",
-                        self.guild.id, fire_wolf.user_id, len(self._wolves_died_today)
-                    )
-            
-            if killed_id:
-                self._pending_deaths.append((killed_id, "wolves"))
-            if betrayer_kill:
-                self._pending_deaths.append((betrayer_kill, "white_wolf"))
-            
-            # Call on_night for roles with night actions
-            for player in self.alive_players():
-                if self._is_player_eligible_for_action(player):
-                    for role in player.roles:
-                        if hasattr(role, 'on_night') and role.night_order > 0:
-                            try:
-                                await role.on_night(self, player, self.night_number)
-                                logger.info("Role on_night called | guild=%s player=%s role=%s", self.guild.id, player.user_id, role.metadata.name)
-                            except Exception as e:
-                                logger.error("Error in role on_night | guild=%s player=%s role=%s error=%s", self.guild.id, player.user_id, role.metadata.name, str(e), exc_info=True)
-            
-            logger.info("Night resolution | guild=%s night=%s killed=%s extra=%s", self.guild.id, self.night_number, killed_id, betrayer_kill)
-        except Exception as e:
-            logger.error("CRITICAL: Exception in _resolve_role_sequence | guild=%s night=%s error=%s", 
-                        self.guild.id, self.night_number, str(e), exc_info=True)
-            raise
-
-    async def _handle_thief(self, thief: PlayerState) -> None:
-        role = thief.role
-        extra_cards = getattr(role, "extra_cards", [])
-        if not extra_cards:
-            return
-        
-        # Check if any of the extra cards is a werewolf
-        wolf_indices = [idx for idx, card in enumerate(extra_cards) if card.alignment == Alignment.WEREWOLF]
-        has_wolf = len(wolf_indices) > 0
-        
-        # Build options - if has wolf, only show wolf cards
-        if has_wolf:
-            options = {idx: card.metadata.name for idx, card in enumerate(extra_cards) if card.alignment == Alignment.WEREWOLF}
-            description = "⚠️ Có ít nhất một lá Sói! Bạn BẮT BUỘC phải chọn Sói.\n\nChọn một trong các lá bài Sói:"
-        else:
-            options = {idx: card.metadata.name for idx, card in enumerate(extra_cards)}
-            description = "Chọn một trong hai lá bài bỏ dư:"
-        
-        result = await self._prompt_dm_choice(
-            thief,
-            title="Tên trộm chọn vai mới",
-            description=description,
-            options=options,
-            allow_skip=False,
-        )
-        if result is None:
-            return
-        
-        new_role = extra_cards[result]
-        old_role_name = thief.role.metadata.name
-        thief.role = new_role
-        await new_role.on_assign(self, thief)
-        
-        # If thief becomes a werewolf, add to wolf thread
-        if new_role.alignment == Alignment.WEREWOLF and self.thread_wolves:
-            try:
-                await self.thread_wolves.add_user(thief.member)
-                # Notify other wolves
-                wolf_players = [p for p in self.players.values() 
-                               if p.alive and any(r.alignment == Alignment.WEREWOLF for r in p.roles) and p.user_id != thief.user_id]
-                wolf_mention = " ".join(p.member.mention for p in wolf_players)
-                if wolf_mention:
-                    await self.thread_wolves.send(f"{wolf_mention} - {thief.display_name()} đã trở thành {new_role.metadata.name} và gia nhập bầy sói!")
-                logger.info("Thief joined wolf thread | guild=%s player=%s", self.guild.id, thief.user_id)
-            except discord.HTTPException as e:
-                logger.warning("Failed to add thief to wolf thread | guild=%s player=%s error=%s", 
-                             self.guild.id, thief.user_id, str(e))
-        
-        try:
-            await thief.member.send(f"Bạn đã chọn '{new_role.metadata.name}'.")
-        except discord.HTTPException:
-            pass
-        logger.info("Thief chose role | guild=%s player=%s old_role=%s new_role=%s", 
-                   self.guild.id, thief.user_id, old_role_name, new_role.metadata.name)
-
-    async def _handle_cupid(self, cupid: PlayerState) -> None:
-        logger.info("_handle_cupid START | guild=%s cupid=%s", self.guild.id, cupid.user_id)
-        available = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != cupid.user_id}
-        lovers: List[int] = []
-        while len(lovers) < 2 and available:
-            choice = await self._prompt_dm_choice(
-                cupid,
-                title="Thần tình yêu",
-                description=f"Chọn người yêu thứ {len(lovers) + 1}.",
-                options=available,
-                allow_skip=False,
-            )
-            if choice is None or choice not in available:
-                logger.info("Cupid skipped lover selection | guild=%s cupid=%s lovers_count=%s night=%s", 
-                            self.guild.id, cupid.user_id, len(lovers), self.night_number)
-                break
-            lovers.append(choice)
-            available.pop(choice, None)
-        
-        if len(lovers) == 2:
-            a = self.players[lovers[0]]
-            b = self.players[lovers[1]]
-            a.lover_id = b.user_id
-            b.lover_id = a.user_id
-            self._lovers = {a.user_id, b.user_id}
-            try:
-                await a.member.send(f"Bạn và {b.display_name()} đã trúng mũi tên tình ái.")
-                await b.member.send(f"Bạn và {a.display_name()} đã trúng mũi tên tình ái.")
-            except discord.HTTPException:
-                pass
-            logger.info("Cupid linked lovers | guild=%s cupid=%s lovers=%s", self.guild.id, cupid.user_id, self._lovers)
-        else:
-            logger.info("Cupid incomplete lovers | guild=%s cupid=%s lovers_count=%s", 
-                        self.guild.id, cupid.user_id, len(lovers))
-        logger.info("_handle_cupid END | guild=%s cupid=%s", self.guild.id, cupid.user_id)
-
-    async def _handle_guard(self, guard: PlayerState) -> Optional[int]:
-        """Handle Guard night action with retry logic and filtering of unavailable targets."""
-        max_attempts = 3
-        attempt = 0
-        
-        while attempt < max_attempts:
-            attempt += 1
-            
-            # Build available options - exclude last protected target
-            last_target = getattr(guard.role, "last_protected", None)
-            options = {
-                p.user_id: p.display_name() 
-                for p in self.alive_players() 
-                if p.user_id != last_target  # Hide person protected last night
-            }
-            
-            if not options:
-                # No valid targets left (shouldn't happen, but safety check)
-                await guard.member.send("Không có người nào có thể bảo vệ.")
-                return None
-            
-            choice = await self._prompt_dm_choice(
-                guard,
-                title="Bảo vệ thức giấc",
-                description="Chọn người cần bảo vệ đêm nay.\n*(Người được bảo vệ đêm trước đã bị ẩn)*" if last_target else "Chọn người cần bảo vệ đêm nay.",
-                options=options,
-                allow_skip=True,
-            )
-            
-            if choice is None:
-                # Player skipped
-                return None
-            
-            target_id = choice
-            target = self.players.get(target_id)
-            
-            if not target:
-                await guard.member.send("Lựa chọn không hợp lệ. Vui lòng thử lại.")
-                continue
-            
-            # Validate choice
-            if target_id == guard.user_id and not guard.role.can_self_target():
-                await guard.member.send(
-                    "❌ Bạn không thể tiếp tục tự bảo vệ đêm này.\n"
-                    "💡 Vui lòng chọn người khác."
-                )
-                continue  # Ask again instead of returning None
-            
-            # All validations passed
-            target.protected_last_night = True
-            if target_id == guard.user_id:
-                guard.role.mark_self_target()
-                await guard.member.send(
-                    "✅ Bạn đã chọn bảo vệ chính mình đêm nay.\n"
-                    "⚠️ Bạn sẽ không thể tự bảo vệ nữa."
-                )
-            guard.role.last_protected = target_id
-            logger.info("Guard protected | guild=%s player=%s target=%s", self.guild.id, guard.user_id, target_id)
-            return target_id
-        
-        # Max attempts reached
-        await guard.member.send("⏱️ Hết thời gian, bảo vệ bị bỏ qua.")
-        logger.info("Guard timeout | guild=%s player=%s attempts=%s", self.guild.id, guard.user_id, attempt)
-        return None
-
     async def _check_devoted_servant_power(self, target_player: PlayerState) -> None:
         """Check if Devoted Servant wants to take the role of the lynched player.
         
@@ -2176,590 +1491,26 @@ class WerewolfGame:
                         self.guild.id, servant.user_id, target_player.user_id, str(e), exc_info=True)
 
 
-    async def _handle_seer(self, seer: PlayerState) -> None:
-        options = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != seer.user_id}
-        if not options:
-            logger.info("Seer has no targets | guild=%s seer=%s night=%s", 
-                        self.guild.id, seer.user_id, self.night_number)
-            return
-        
-        choice = await self._prompt_dm_choice(
-            seer,
-            title="Tiên tri soi",
-            description="Chọn một người để soi đêm nay.",
-            options=options,
-            allow_skip=True,
-        )
-        if choice is None:
-            logger.info("Seer skipped peeking | guild=%s seer=%s night=%s", 
-                        self.guild.id, seer.user_id, self.night_number)
-            return
-        
-        target_id = choice
-        target = self.players.get(target_id)
-        if not target or not target.role:
-            logger.warning("Seer target not found | guild=%s seer=%s target=%s", 
-                           self.guild.id, seer.user_id, target_id)
-            return
-        
-        # Check if target is Wolf Sister and Wolf Brother is still alive - hide her alignment
-        is_hidden_wolf_sister = False
-        if self._wolf_sister_id == target_id and self._wolf_brother_id:
-            brother = self.players.get(self._wolf_brother_id)
-            if brother and brother.alive:
-                # Sister is hidden - report her as villager
-                faction = Alignment.VILLAGE
-                is_hidden_wolf_sister = True
-                logger.info("Wolf Sister hidden from Seer | guild=%s seer=%s sister=%s brother_alive=true", 
-                           self.guild.id, seer.user_id, target_id)
-            else:
-                # Brother is dead, report actual alignment (WEREWOLF)
-                faction = target.role.alignment
-        else:
-            # Check if target is Avenger - use their chosen side (or NEUTRAL if not chosen yet)
-            faction = target.role.alignment
-            for role in target.roles:
-                if hasattr(role, '__class__') and role.__class__.__name__ == 'Avenger':
-                    if hasattr(role, 'chosen_side') and role.chosen_side:
-                        faction = role.chosen_side
-                        logger.info("Seer peeks Avenger as %s | guild=%s seer=%s avenger=%s", 
-                                   faction.value, self.guild.id, seer.user_id, target_id)
-                    break
+    def _check_win_condition(self) -> bool:
+        # CRITICAL: Log entry point
+        logger.info(">>> _check_win_condition called | guild=%s", self.guild.id)
         
-        message = "Người đó thuộc phe Dân Làng." if faction == Alignment.VILLAGE else "Người đó thuộc phe Ma Sói." if faction == Alignment.WEREWOLF else "Người đó thuộc phe Trung Lập."
+        logger.debug("Win check counts | guild=%s alive=%s village=%s werewolf=%s neutral=%s",
+                     self.guild.id, len(self._index.alive), self._index.count(Alignment.VILLAGE),
+                     self._index.count(Alignment.WEREWOLF), self._index.count(Alignment.NEUTRAL))
         
-        logger.info("Seer peek | guild=%s seer=%s target=%s faction=%s night=%s hidden=%s", 
-                    self.guild.id, seer.user_id, target_id, faction.value, self.night_number, is_hidden_wolf_sister)
+        result = self._win_result()
+        if result is None:
+            logger.info(">>> No win condition met - returning False | guild=%s", self.guild.id)
+            return False
         
-        try:
-            await seer.member.send(message)
-        except discord.HTTPException:
-            pass
-        
-        # Track seer wolf streak for achievement
-        if faction == Alignment.WEREWOLF:
-            seer.seer_wolf_streak += 1
-        else:
-            seer.seer_wolf_streak = 0
-        
-        logger.info("Seer peek | guild=%s seer=%s target=%s faction=%s streak=%s", self.guild.id, seer.user_id, target_id, faction, seer.seer_wolf_streak)
-
-    async def _handle_witch(self, witch: PlayerState, killed_id: Optional[int]) -> Optional[int]:
-        role = witch.role
-        heal_available = getattr(role, "heal_available", True)
-        kill_available = getattr(role, "kill_available", True)
-        saved = False
-        
-        logger.info("Witch action start | guild=%s witch=%s night=%s heal_available=%s kill_available=%s killed_id=%s", 
-                    self.guild.id, witch.user_id, self.night_number, heal_available, kill_available, killed_id)
-        
-        if killed_id and heal_available:
-            logger.info("Witch asking to heal | guild=%s witch=%s killed_id=%s", 
-                        self.guild.id, witch.user_id, killed_id)
-            choice = await self._prompt_dm_choice(
-                witch,
-                title="Phù thủy",
-                description="Một người vừa bị tấn công. Bạn có muốn cứu?",
-                options={1: "Cứu"},
-                allow_skip=True,
-            )
-            if choice == 1:
-                saved = True
-                role.heal_available = False  # type: ignore[attr-defined]
-                witch.witch_used_save = True  # Track for achievement
-                await witch.member.send("Bạn đã dùng bình hồi sinh.")
-                logger.info("Witch used heal potion | guild=%s witch=%s target=%s night=%s", 
-                            self.guild.id, witch.user_id, killed_id, self.night_number)
-            else:
-                logger.info("Witch skipped healing | guild=%s witch=%s night=%s", 
-                            self.guild.id, witch.user_id, self.night_number)
-        else:
-            logger.info("Witch no heal needed | guild=%s witch=%s heal_available=%s killed_id=%s", 
-                        self.guild.id, witch.user_id, heal_available, killed_id)
-        
-        kill_target = None
-        if kill_available:
-            logger.info("Witch asking to poison | guild=%s witch=%s night=%s", 
-                        self.guild.id, witch.user_id, self.night_number)
-            options = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != witch.user_id}
-            logger.info("Witch poison options | guild=%s witch=%s options_count=%s", 
-                        self.guild.id, witch.user_id, len(options))
-            choice = await self._prompt_dm_choice(
-                witch,
-                title="Phù thủy",
-                description="Bạn muốn sử dụng bình độc?",
-                options=options,
-                allow_skip=True,
-            )
-            logger.info("Witch poison choice | guild=%s witch=%s choice=%s", 
-                        self.guild.id, witch.user_id, choice)
-            if choice is not None and choice in options:
-                if choice == witch.user_id and not witch.role.can_self_target():
-                    logger.info("Witch tried self-target without permission | guild=%s witch=%s", 
-                                self.guild.id, witch.user_id)
-                    return None if saved else killed_id
-                kill_target = choice
-                role.kill_available = False  # type: ignore[attr-defined]
-                witch.witch_used_kill = True  # Track for achievement
-                if kill_target == witch.user_id:
-                    witch.role.mark_self_target()
-                    await witch.member.send("Bạn đã tự kết liễu chính mình.")
-                    logger.info("Witch self-targeted with poison | guild=%s witch=%s night=%s", 
-                                self.guild.id, witch.user_id, self.night_number)
-                logger.info("Witch poison target chosen | guild=%s witch=%s target=%s night=%s", 
-                            self.guild.id, witch.user_id, kill_target, self.night_number)
-            else:
-                logger.info("Witch skipped poison | guild=%s witch=%s night=%s", 
-                            self.guild.id, witch.user_id, self.night_number)
-        else:
-            logger.info("Witch no poison available | guild=%s witch=%s night=%s", 
-                        self.guild.id, witch.user_id, self.night_number)
-        
-        if kill_target:
-            # Check if Pharmacist's antidote saves this target
-            if kill_target == self._pharmacist_antidote_target:
-                await self.channel.send(f"💊 Bình hồi phục của Dược Sĩ đã cứu sống <@{kill_target}> khỏi bình độc của Phù thủy!")
-                logger.info("Pharmacist antidote saved target | guild=%s witch=%s target=%s pharmacist_antidote=%s", 
-                            self.guild.id, witch.user_id, kill_target, self._pharmacist_antidote_target)
-            else:
-                self._pending_deaths.append((kill_target, "witch"))
-                logger.info("Witch used poison | guild=%s witch=%s target=%s", self.guild.id, witch.user_id, kill_target)
-        
-        return None if saved else killed_id
-
-    async def _handle_little_girl(self, little: PlayerState) -> Optional[bool]:
-        """Handle little girl peeking. Returns True if discovered, False/None if not.
-        
-        From night 2, little girl can peek when wolves wake up.
-        There's a small chance (20%) she's discovered if peeking.
-        """
-        # Can only peek from night 2 onwards
-        if self.night_number < 2:
-            return None
-        
-        wolves = [p for p in self.alive_players() if any(r.alignment == Alignment.WEREWOLF for r in p.roles)]
-        if not wolves:
-            return None
-        
-        # Ask if she wants to peek
-        can_peek = await self._prompt_dm_choice(
-            little,
-            title="Cô bé - Hé mắt nhìn",
-            description="Bạn có muốn hé mắt nhìn khi các Ma Sói thức giấc không?",
-            options={1: "Có, hé mắt", 0: "Không, ngủ tiếp"},
-            allow_skip=False,
-        )
-        
-        if not can_peek:
-            logger.info("Little girl chose not to peek | guild=%s night=%s", self.guild.id, self.night_number)
-            return None
-        
-        wolf_names = ", ".join(p.display_name() for p in wolves)
-        message = "Bạn hé mắt và thấy: " + wolf_names
-        with contextlib.suppress(discord.HTTPException):
-            await little.member.send(message)
-        
-        # 20% chance of being discovered while peeking
-        discovered = random.random() < 0.2
-        
-        if discovered:
-            self._little_girl_peeking = little.user_id
-            logger.info("Little girl discovered peeking | guild=%s night=%s chance=20%%", self.guild.id, self.night_number)
-            # Notify wolves that they spotted someone peeking
-            if self.thread_wolves:
-                await self.thread_wolves.send(
-                    "⚠️ **Cảnh báo:** Các bạn phát hiện có ai đó đang hé mắt nhìn các bạn! "
-                    "Bạn muốn thay đổi mục tiêu và giết người đó thay thế không?"
-                )
-            return True
-        else:
-            logger.info("Little girl peeked undetected | guild=%s night=%s", self.guild.id, self.night_number)
-            return False
-
-    async def _handle_raven(self, raven: PlayerState) -> None:
-        options = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != raven.user_id}
-        if not options:
-            return
-        choice = await self._prompt_dm_choice(
-            raven,
-            title="Con quạ nguyền rủa",
-            description="Chọn một người sẽ bị cộng thêm 2 phiếu vào sáng mai.",
-            options=options,
-            allow_skip=True,
-        )
-        if choice is None or choice not in options:
-            return
-        target = self.players.get(choice)
-        if target:
-            target.marked_by_raven = True
-            with contextlib.suppress(discord.HTTPException):
-                await raven.member.send(f"Bạn đã nguyền {target.display_name()}.")
-            logger.info("Raven marked target | guild=%s raven=%s target=%s", self.guild.id, raven.user_id, target.user_id)
-
-    async def _handle_piper(self, piper: PlayerState) -> None:
-        self._piper_id = piper.user_id
-        available = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != piper.user_id and p.user_id not in self._charmed}
-        charmed_now: List[int] = []
-        while available and len(charmed_now) < 2:
-            choice = await self._prompt_dm_choice(
-                piper,
-                title="Thổi sáo",
-                description="Chọn người để thôi miên.",
-                options=available,
-                allow_skip=True,
-            )
-            if choice is None or choice not in available:
-                break
-            self._charmed.add(choice)
-            charmed_now.append(choice)
-            available.pop(choice, None)
-        for pid in charmed_now:
-            target = self.players.get(pid)
-            if target:
-                with contextlib.suppress(discord.HTTPException):
-                    await target.member.send("Bạn nghe tiếng sáo lạ và thấy mình như bị thôi miên.")
-        if charmed_now:
-            logger.info("Piper charmed | guild=%s piper=%s targets=%s", self.guild.id, piper.user_id, charmed_now)
-
-    async def _handle_white_wolf(self, white_wolf: PlayerState) -> Optional[int]:
-        if not white_wolf.alive:
-            return None
-        if (self.night_number % 2) != 0:
-            return None
-        options = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != white_wolf.user_id and any(r.alignment == Alignment.WEREWOLF for r in p.roles)}
-        if not options:
-            return None
-        choice = await self._prompt_dm_choice(
-            white_wolf,
-            title="Sói trắng",
-            description="Bạn có thể loại bỏ một đồng loại.",
-            options=options,
-            allow_skip=True,
-        )
-        if choice is None or choice not in options:
-            return None
-        if choice == white_wolf.user_id and not white_wolf.role.can_self_target():
-            return None
-        if choice == white_wolf.user_id:
-            white_wolf.role.mark_self_target()
-        logger.info("White wolf acted | guild=%s player=%s target=%s", self.guild.id, white_wolf.user_id, choice)
-        return choice
-
-    async def _handle_pyromaniac(self, pyro: PlayerState) -> None:
-        role = pyro.role
-        if not role or getattr(role, "ignited", False):
-            return
-        options = {p.user_id: p.display_name() for p in self.alive_players()}
-        choice = await self._prompt_dm_choice(
-            pyro,
-            title="Kẻ phóng hỏa",
-            description="Bạn muốn thiêu rụi ngôi nhà của ai? (chỉ một lần)",
-            options=options,
-            allow_skip=True,
-        )
-        if choice is None or choice not in options:
-            return
-        if choice == pyro.user_id and not pyro.role.can_self_target():
-            return
-        role.ignited = True  # type: ignore[attr-defined]
-        if choice == pyro.user_id:
-            pyro.role.mark_self_target()
-            await pyro.member.send("Bạn đã đốt chính ngôi nhà của mình.")
-        self._pending_deaths.append((choice, "pyro"))
-        logger.info("Pyromaniac ignited | guild=%s pyro=%s target=%s", self.guild.id, pyro.user_id, choice)
-
-    async def _handle_moon_maiden(self, moon_maiden: PlayerState) -> None:
-        """Handle Moon Maiden's ability to disable a target's night abilities."""
-        role = moon_maiden.role
-        if not role:
-            return
-        
-        # Get alive players, excluding self and last target
-        alive = self.alive_players()
-        options = {
-            p.user_id: p.display_name() 
-            for p in alive 
-            if p.user_id != moon_maiden.user_id 
-            and p.user_id != getattr(role, "last_target_id", None)
-        }
-        
-        if not options:
-            return
-        
-        choice = await self._prompt_dm_choice(
-            moon_maiden,
-            title="Nguyệt Nữ",
-            description="Đêm nay, bạn muốn vô hiệu hóa kĩ năng ban đêm của ai?",
-            options=options,
-            allow_skip=True,
-        )
-        
-        if choice is None or choice not in options:
-            return
-        
-        role.last_target_id = choice  # type: ignore[attr-defined]
-        self._moon_maiden_disabled = choice
-        
-        target = self.players.get(choice)
-        if target:
-            await self._safe_send_dm(
-                target.member,
-                f"Nguyệt Nữ đã chọn bạn làm mục tiêu. Kĩ năng ban đêm của bạn sẽ bị vô hiệu hóa!"
-            )
-        
-        logger.info("Moon Maiden disabled | guild=%s maiden=%s target=%s", self.guild.id, moon_maiden.user_id, choice)
-
-    async def _handle_hypnotist(self, hypnotist: PlayerState) -> None:
-        """Handle Hypnotist's ability to charm a target. If Hypnotist dies, charmed target dies instead."""
-        role = hypnotist.role
-        if not role:
-            return
-        
-        # Get alive players, excluding self and last target
-        alive = self.alive_players()
-        options = {
-            p.user_id: p.display_name() 
-            for p in alive 
-            if p.user_id != hypnotist.user_id 
-            and p.user_id != getattr(role, "last_target_id", None)
-        }
-        
-        if not options:
-            return
-        
-        choice = await self._prompt_dm_choice(
-            hypnotist,
-            title="Cổ Hoặc Sư",
-            description="Hãy chọn 1 người để mê hoặc. Nếu bạn chết đêm nay, họ sẽ chết thay bạn.",
-            options=options,
-            allow_skip=True,
-        )
-        
-        if choice is None or choice not in options:
-            return
-        
-        role.last_target_id = choice  # type: ignore[attr-defined]
-        role.charmed_target_id = choice  # type: ignore[attr-defined]
-        self._hypnotist_charm_target = choice
-        
-        target = self.players.get(choice)
-        if target:
-            await self._safe_send_dm(
-                hypnotist.member,
-                f"Bạn đã mê hoặc {target.display_name()}. Nếu bạn chết đêm nay, họ sẽ chết thay bạn."
-            )
-            await self._safe_send_dm(
-                target.member,
-                "Bạn đã bị Cổ Hoặc Sư mê hoặc! Nếu Cổ Hoặc Sư chết đêm nay, bạn sẽ chết thay họ."
-            )
-        
-        logger.info("Hypnotist charmed | guild=%s hypnotist=%s target=%s", self.guild.id, hypnotist.user_id, choice)
-
-    def _handle_elder_resistance(self, target_id: int) -> bool:
-        target = self.players.get(target_id)
-        if not target:
-            return False
-        
-        # Find Elder role
-        elder_role = None
-        for role in target.roles:
-            if role.metadata.name == "Già Làng":
-                elder_role = role
-                break
-        
-        if not elder_role:
-            return False
-        
-        remaining = getattr(elder_role, "wolf_hits", 0)
-        if remaining >= 1:
-            return False
-        elder_role.wolf_hits = remaining + 1  # type: ignore[attr-defined]
-        
-        # Track elder bitten for achievement
-        target.elder_bitten = True
-
-        async def notify() -> None:
-            with contextlib.suppress(discord.HTTPException):
-                await target.member.send("Bạn bị ma sói tấn công nhưng vẫn sống.")
-
-        asyncio.create_task(notify())
-        logger.info("Elder resisted wolf attack | guild=%s elder=%s", self.guild.id, target.user_id)
+        # Angel's solo win leaves _winner unset
+        if result.winner is not None:
+            self._winner = result.winner
+        logger.info("Win condition met | guild=%s winner=%s reason=%s",
+                    self.guild.id, result.winner.value if result.winner else "angel", result.reason)
         return True
 
-    def _find_role_holder(self, role_name: str) -> Optional[PlayerState]:
-        """Find role holder - includes dead players to show action for all roles."""
-        for player in self.players.values():
-            for role in player.roles:
-                if role.metadata.name == role_name:
-                    return player
-        return None
-
-    def _build_role_layout(self, player_count: int, has_thief: bool = False) -> List[type[Role]]:
-        """Build role layout using RoleConfig's dynamic distribution."""
-        # If thief is present, we need player_count + 2 roles (2 extra for thief to choose from)
-        target_count = player_count + 2 if has_thief else player_count
-        
-        # Get role distribution from RoleConfig
-        role_names = RoleConfig.get_role_list(player_count, self.settings.expansions)
-        
-        # Add extra cards for thief if needed
-        if has_thief:
-            villager_cls = get_role_class("Dân Làng")
-            role_names.extend(["Dân Làng", "Dân Làng"])  # Add 2 extra villagers
-        
-        # Convert role names to role classes
-        layout: List[type[Role]] = []
-        for role_name in role_names[:target_count]:
-            try:
-                role_cls = get_role_class(role_name)
-                layout.append(role_cls)
-            except KeyError:
-                logger.warning("Role not found in registry: %s", role_name)
-                # Fallback to villager
-                layout.append(get_role_class("Dân Làng"))
-        
-        # Log balance info
-        balance = RoleConfig.get_balance_info(player_count, self.settings.expansions)
-        logger.info(
-            "Role layout | guild=%s player_count=%s werewolves=%s village=%s neutral=%s",
-            self.guild.id,
-            player_count,
-            balance.get(Alignment.WEREWOLF, 0),
-            balance.get(Alignment.VILLAGE, 0),
-            balance.get(Alignment.NEUTRAL, 0),
-        )
-        
-        return layout
-
-    async def _prompt_dm_choice(
-        self,
-        player: PlayerState,
-        *,
-        title: str,
-        description: str,
-        options: Dict[int, str],
-        allow_skip: bool,
-        timeout: int = 30,
-    ) -> Optional[int]:
-        view = _ChoiceView(options, allow_skip)
-        embed = discord.Embed(title=title, description=description)
-        embed.colour = discord.Colour.blurple()
-        embed.add_field(name="Lựa chọn", value="\n".join(f"{idx}. {label}" for idx, label in options.items()))
-        try:
-            dm = player.member.dm_channel or await player.member.create_dm()
-            message = await dm.send(embed=embed, view=view)
-        except discord.HTTPException:
-            return None
-        try:
-            await asyncio.wait_for(view.wait(), timeout=timeout)
-        except asyncio.TimeoutError:
-            view.stop()
-        finally:
-            with contextlib.suppress(discord.HTTPException):
-                await message.edit(view=None)
-        return view.selected
-
-    def _check_win_condition(self) -> bool:
-        # CRITICAL: Log entry point
-        logger.info(">>> _check_win_condition called | guild=%s", self.guild.id)
-        
-        # Check if Angel won on Day 1 (voted out)
-        if self._angel_won:
-            logger.info("Win condition met: Angel wins | guild=%s", self.guild.id)
-            return True
-        
-        villagers = self.alive_by_alignment(Alignment.VILLAGE)
-        wolves = self.alive_by_alignment(Alignment.WEREWOLF)
-        neutrals = self.alive_by_alignment(Alignment.NEUTRAL)
-        
-        # Debug: check for death_pending players not included
-        all_alive = len(self.alive_players())
-        pending_deaths = sum(1 for p in self.players.values() if p.death_pending and not p.alive)
-        all_players_count = len([p for p in self.players.values() if not p.death_pending])
-        
-        logger.info(">>> Win condition check | guild=%s villagers=%s wolves=%s neutrals=%s alive=%s pending_deaths=%s", 
-                     self.guild.id, len(villagers), len(wolves), len(neutrals), all_alive, pending_deaths)
-        
-        # Info: list all players and their status
-        for player in self.players.values():
-            logger.info("Player status | guild=%s player=%s alive=%s death_pending=%s roles=%s",
-                        self.guild.id, player.user_id, player.alive, player.death_pending, 
-                        ", ".join(r.metadata.name for r in player.roles) if player.roles else "None")
-        
-        if not wolves and villagers:
-            self._winner = Alignment.VILLAGE
-            logger.info("Win condition met: Village wins | guild=%s (no wolves left)", self.guild.id)
-            return True
-        
-        # Wolves win if equal to or greater than villagers
-        if len(wolves) >= len(villagers) and villagers:
-            self._winner = Alignment.WEREWOLF
-            logger.info("Win condition met: Werewolf wins | guild=%s (wolves=%s >= villagers=%s)", self.guild.id, len(wolves), len(villagers))
-            return True
-        
-        # Special case: 1 wolf vs 1 elder - wolf wins if elder has been hit once already
-        if len(wolves) == 1 and len(villagers) == 1 and not neutrals:
-            elder_role = None
-            for role in villagers[0].roles:
-                if role.metadata.name == "Cụ Già":
-                    elder_role = role
-                    break
-            
-            if elder_role:
-                wolf_hits = getattr(elder_role, "wolf_hits", 0)
-                if wolf_hits >= 1:  # Elder has been hit once, will die next attack
-                    self._winner = Alignment.WEREWOLF
-                    logger.info("Win condition met: Werewolf wins | guild=%s (1v1 vs Elder already hit %s time)", self.guild.id, wolf_hits)
-                    return True
-        
-        if not villagers and wolves:
-            self._winner = Alignment.WEREWOLF
-            logger.info("Win condition met: Werewolf wins | guild=%s (no villagers left)", self.guild.id)
-            return True
-        
-        if len(self._lovers) == 2:
-            alive_lovers = [pid for pid in self._lovers if self.players.get(pid, None) and self.players[pid].alive]
-            if len(alive_lovers) == 2 and len(self.alive_players()) == 2:
-                self._winner = Alignment.NEUTRAL
-                logger.info("Win condition met: Lovers win | guild=%s lovers=%s", 
-                            self.guild.id, alive_lovers)
-                return True
-        
-        if self._piper_id:
-            piper = self.players.get(self._piper_id)
-            if piper and piper.alive:
-                # Pied Piper wins if all other players are charmed (must have at least 1 charmed)
-                others = {p.user_id for p in self.alive_players() if p.user_id != piper.user_id}
-                if len(self._charmed) > 0 and others.issubset(self._charmed):
-                    self._winner = Alignment.NEUTRAL
-                    logger.info("Win condition met: Pied Piper wins | guild=%s piper=%s charmed=%s", 
-                                self.guild.id, piper.user_id, len(self._charmed))
-                    return True
-                else:
-                    logger.info(">>> Pied Piper not winning | guild=%s charmed=%s others=%s", 
-                                 self.guild.id, len(self._charmed), len(others))
-        
-        # Check Elder Man win condition
-        if self._elder_man_id and self._elder_man_group1 and self._elder_man_group2:
-            elder_man = self.players.get(self._elder_man_id)
-            if elder_man and elder_man.alive:
-                # Find which group Elder Man is in
-                if self._elder_man_id in self._elder_man_group1:
-                    opposing_group = self._elder_man_group2
-                else:
-                    opposing_group = self._elder_man_group1
-                
-                # Check if all members of opposing group are dead
-                opposing_alive = [pid for pid in opposing_group if self.players.get(pid) and self.players[pid].alive]
-                if not opposing_alive:
-                    self._winner = Alignment.NEUTRAL
-                    logger.info("Win condition met: Elder Man wins | guild=%s elder_man=%s opposing_group_dead=%s", 
-                                self.guild.id, self._elder_man_id, len(opposing_group))
-                    return True
-        
-        logger.info(">>> No win condition met - returning False | guild=%s", self.guild.id)
-        return False
-
     async def _force_unmute_all(self) -> None:
         """Force unmute all players in voice channel when game ends."""
         if not self.voice_channel.id:
@@ -2769,16 +1520,15 @@ class WerewolfGame:
             if not voice_channel or not isinstance(voice_channel, discord.VoiceChannel):
                 return
             
-            # Unmute all players currently in the voice channel
-            unmuted_count = 0
-            for member in voice_channel.members:
-                try:
-                    if member.voice and member.voice.mute:  # Only unmute if currently muted
-                        await member.edit(mute=False, reason="Werewolf: Game ended - force unmute")
-                        unmuted_count += 1
-                except discord.HTTPException as e:
-                    logger.warning("Failed to unmute member on game end | guild=%s member=%s error=%s", 
-                                 self.guild.id, member.id, str(e))
+            # Unmute all players currently in the voice channel (only if currently muted)
+            unmuted_count = await self._await_actions(
+                [
+                    self._schedule_mute(member, False, "Werewolf: Game ended - force unmute")
+                    for member in voice_channel.members
+                    if member.voice and member.voice.mute
+                ],
+                "force unmute",
+            )
             
             if unmuted_count > 0:
                 logger.info("Force unmuted all players | guild=%s voice_channel=%s unmuted_count=%s", 
@@ -2786,34 +1536,6 @@ class WerewolfGame:
         except discord.HTTPException as e:
             logger.error("Failed to force unmute all players | guild=%s error=%s", self.guild.id, str(e), exc_info=True)
 
-    async def _clear_channel_permissions(self) -> None:
-        """Clear all individual player permissions in game channel when game ends."""
-        try:
-            # Get all permission overwrites in the channel
-            overwrites = dict(self.channel.overwrites)
-            
-            cleared_count = 0
-            for target, permission_overwrite in overwrites.items():
-                # Skip if target is a role (we only want to clear player permissions)
-                if isinstance(target, discord.Role):
-                    continue
-                
-                try:
-                    # Delete individual player's permission overwrite
-                    await self.channel.set_permissions(target, overwrite=None, reason="Werewolf: Game ended - reset permissions")
-                    cleared_count += 1
-                except discord.HTTPException as e:
-                    logger.warning("Failed to clear permissions for player in game channel | guild=%s player=%s error=%s",
-                                 self.guild.id, target.id if hasattr(target, 'id') else target, str(e))
-            
-            if cleared_count > 0:
-                logger.info("Cleared channel permissions for all players | guild=%s channel=%s cleared_count=%s",
-                           self.guild.id, self.channel.id, cleared_count)
-        except discord.HTTPException as e:
-            logger.error("Failed to clear channel permissions | guild=%s error=%s", self.guild.id, str(e), exc_info=True)
-
-
-
     async def _distribute_rewards(self) -> None:
         """Distribute seed rewards based on game outcome"""
         if self._winner is None:
@@ -3124,52 +1846,13 @@ class WerewolfGame:
         embed.set_image(url=CARD_BACK_URL)
         await self.channel.send(embed=embed)
 
-    async def _transform_wolf_sister(self, sister: PlayerState, dead_brother: PlayerState) -> None:
-        """Transform Wolf Sister into full werewolf when her brother dies."""
-        if not sister.roles:
-            return
-        
-        # Get the sister's role
-        from ..roles.werewolves.wolf_sister import WolfSister
-        sister_role = sister.roles[0]
-        
-        if not isinstance(sister_role, WolfSister):
-            return
-        
-        # Mark sister as transformed
-        sister_role.is_transformed = True
-        
-        # Change alignment to werewolf
-        sister_role.metadata.alignment = Alignment.WEREWOLF
-        
-        # Notify the sister
-        try:
-            await sister.member.send(
-                f"🐺💢 **TỨC GIẬN!** Anh sói {dead_brother.display_name()} đã chết!\n"
-                f"Bạn giận dữ gia nhập phe sói ngay lập tức. Bây giờ bạn sẽ dậy cùng phe sói mỗi đêm để giết người!"
-            )
-        except discord.HTTPException:
-            pass
-        
-        # Notify all wolves about the new member
-        wolves = [p for p in self.alive_players() if any(r.alignment == Alignment.WEREWOLF for r in p.roles)]
-        wolf_names = ", ".join(p.display_name() for p in wolves)
-        
-        if self.thread_wolves:
-            try:
-                await self.thread_wolves.send(
-                    f"🐺💢 **Sói Em {sister.display_name()} tức giận gia nhập phe sói!**\n"
-                    f"Đồng đội sói hiện tại: {wolf_names}"
-                )
-            except discord.HTTPException:
-                pass
-        
-        logger.info(
-            "Wolf Sister transformed to werewolf | guild=%s sister=%s brother=%s",
-            self.guild.id,
-            sister.user_id,
-            dead_brother.user_id,
-        )
+    def _record_assignments(self) -> None:
+        super()._record_assignments()
+        self._replay.assign(self.players)
+
+    def _record_death(self, player_id: int, cause: str, phase_label: str) -> None:
+        super()._record_death(player_id, cause, phase_label)
+        self._replay.death(player_id, cause, phase_label)
 
     async def _restrict_dead_player(self, player: PlayerState) -> None:
         """Prevent dead player from unmuting, messaging in channels and threads."""
@@ -3177,241 +1860,59 @@ class WerewolfGame:
             return
         
         try:
+            actions = []
             # 1. Mute dead player in voice channel
-            if self.voice_channel:
-                voice_channel = self.voice_channel
-                if voice_channel and isinstance(voice_channel, discord.VoiceChannel):
-                    try:
-                        if player.member.voice:
-                            await player.member.edit(mute=True, reason="Werewolf: Player died - mute voice")
-                    except discord.HTTPException:
-                        pass
+            if isinstance(self.voice_channel, discord.VoiceChannel) and player.member.voice:
+                actions.append(self._schedule_mute(player.member, True, "Werewolf: Player died - mute voice"))
             
             # 2. Prevent dead player from messaging in main game channel
             
             # 3. Prevent dead player from messaging in werewolf thread
-            if self.thread_wolves:
-                try:
-                    await self.thread_wolves.set_permissions(
-                        player.member,
-                        send_messages=False,
-                        reason="Werewolf: Player died - mute werewolf thread"
-                    )
-                except (discord.HTTPException, AttributeError):
-                    pass
+            if self.thread_wolves and hasattr(self.thread_wolves, "set_permissions"):
+                actions.append(self._schedule_permissions(
+                    self.thread_wolves, player.member, Priority.HIGH,
+                    send_messages=False, reason="Werewolf: Player died - mute werewolf thread"
+                ))
             
             # 4. Prevent dead player from messaging in sisters thread if it exists
-            if self._sisters_thread:
-                try:
-                    await self._sisters_thread.set_permissions(
-                        player.member,
-                        send_messages=False,
-                        reason="Werewolf: Player died - mute sisters thread"
-                    )
-                except (discord.HTTPException, AttributeError):
-                    pass
+            if self._sisters_thread and hasattr(self._sisters_thread, "set_permissions"):
+                actions.append(self._schedule_permissions(
+                    self._sisters_thread, player.member, Priority.HIGH,
+                    send_messages=False, reason="Werewolf: Player died - mute sisters thread"
+                ))
+            await self._await_actions(actions, "restrict dead player")
         except discord.HTTPException as e:
             logger.error("Failed to restrict dead player | guild=%s player=%s error=%s", 
                         self.guild.id, player.user_id, str(e), exc_info=True)
 
-    async def _handle_mayor_succession(self, player: PlayerState) -> None:
-        """Transfer Mayor status to another player if dying player is a Mayor."""
-        if not player.mayor:
-            return
-        
-        alive = [p for p in self.alive_players() if p.user_id != player.user_id]
-        if not alive:
-            return
-        
-        # Remove mayor status from dying player
-        player.mayor = False
-        player.vote_weight = 1
-        
-        options = {p.user_id: p.display_name() for p in alive}
-        choice = await self._prompt_dm_choice(
-            player,
-            title="Trưởng Làng - Chọn người kế nhiệm",
-            description="Bạn sắp chết. Hãy chọn người kế nhiệm chức Trưởng Làng.",
-            options=options,
-            allow_skip=False,
-            timeout=30,
-        )
-        
-        if choice and choice in options:
-            successor = self.players.get(choice)
-            if successor and successor.alive:
-                successor.mayor = True
-                successor.vote_weight = 2
-                
-                try:
-                    await successor.member.send(f"Bạn đã được {player.display_name()} chỉ định làm Trưởng Làng kế nhiệm! Phiếu bạn tính x2 và bạn phá vỡ hòa phiếu.")
-                    await self.channel.send(f"{successor.display_name()} đã trở thành Trưởng Làng mới!")
-                except discord.HTTPException as e:
-                    logger.error(f"Unexpected error: {e}")
-
-    async def _handle_death(self, player: PlayerState, *, cause: str) -> None:
-        """Handle player death: mark as dead, disable permissions, trigger role death effects."""
-        # Check if Hypnotist has charmed someone - if so, swap deaths
-        from ..roles.villagers.hypnotist import Hypnotist
-        
-        hypnotist_role = None
-        for role in player.roles:
-            if isinstance(role, Hypnotist):
-                hypnotist_role = role
-                break
-        
-        # If this Hypnotist has a charmed target, the charmed target dies instead
-        if hypnotist_role and hasattr(hypnotist_role, 'charmed_target_id') and hypnotist_role.charmed_target_id:
-            charmed_id = hypnotist_role.charmed_target_id
-            charmed_player = self.players.get(charmed_id)
-            
-            # Only swap if charmed player is alive and not already dead
-            if charmed_player and charmed_player.alive and not charmed_player.death_pending:
-                # Kill the charmed player instead of the Hypnotist
-                charmed_player.alive = False
-                charmed_player.death_pending = True
-                
-                # Notify the Hypnotist that charm protected them
-                await self._safe_send_dm(
-                    player.member,
-                    f"Nước cờ mê hoặc của bạn đã hoạt động! {charmed_player.display_name()} chết thay bạn."
-                )
-                
-                # Trigger death effects for charmed player
-                try:
-                    await self._handle_death(charmed_player, cause="hypnotist_charm")
-                except Exception as e:
-                    logger.error(
-                        "Error in charmed target death | guild=%s hypnotist=%s target=%s error=%s",
-                        self.guild.id, player.user_id, charmed_id, str(e), exc_info=True
-                    )
-                
-                # Hypnotist survives this death, return without marking them dead
-                return
-        
-        # Record death for end-of-game summary with phase label and number
-        if self.phase == Phase.NIGHT:
-            phase_label = f"Đêm {self.night_number}"
-        else:
-            phase_label = f"Ngày {self.day_number}"
-        self._death_log.append((player.user_id, cause, phase_label))
-        
-        # Mark player as dead
-        player.alive = False
-        
-        # Track if a werewolf dies during the day (for Fire Wolf ability)
-        if self.phase == Phase.DAY and any(r.alignment == Alignment.WEREWOLF for r in player.roles):
-            self._wolves_died_today.append(player.user_id)
-            logger.info("Wolf died during day | guild=%s player=%s day=%s total_wolves_today=%s", 
-                       self.guild.id, player.user_id, self.day_number, len(self._wolves_died_today))
-        
-        # Disable dead player permissions immediately
-        await self._restrict_dead_player(player)
-        
-        # Handle Mayor succession if player is a Mayor (must be before role on_death for prompt)
-        if player.mayor:
-            await self._handle_mayor_succession(player)
-        
-        # Trigger role death effects for all roles
-        for role in player.roles:
-            await role.on_death(self, player, cause)
-        
-        # If lover exists and is alive, they also die
-        if player.lover_id:
-            lover = self.players.get(player.lover_id)
-            if lover and lover.alive:
-                # DRAMATIC LOVER DEATH REVEAL
-                try:
-                    await self.text_channel.send(
-                        f"💔 **TÌNH NHÂNself.text_channel.send (*\n\n"
-                        f"_Khi một người chết, người còn lại không thể sống thiếu nhau..._ \n\n"
-                        f"💀 Cả hai cùng ra đi..."
-                    )
-                except discord.HTTPException:
-                    pass
-                
-                lover.alive = False
-                lover.death_pending = True
-                await self._handle_death(lover, cause="lover")
-        
-        # Check if Wolf Brother died - trigger Wolf Sister transformation if alive
-        wolf_brother_role = None
-        for role in player.roles:
-            if hasattr(role, '__class__') and role.__class__.__name__ == 'WolfBrother':
-                wolf_brother_role = role
-                break
-        
-        if wolf_brother_role and self._wolf_sister_id:
-            sister = self.players.get(self._wolf_sister_id)
-            if sister and sister.alive:
-                logger.info("Wolf Brother died, triggering sister transformation | guild=%s brother=%s sister=%s", 
-                           self.guild.id, player.user_id, sister.user_id)
-                await self._transform_wolf_sister(sister, player)
-        
-        logger.info("Player died | guild=%s player=%s cause=%s", self.guild.id, player.display_name(), cause)
-
-    async def _run_countdown(self, channel: discord.abc.Messageable, label: str, seconds: int, step: int = 3) -> None:
+    async def _run_countdown(self, channel: discord.abc.Messageable, label: str, seconds: int) -> None:
+        """Post a countdown that Discord renders live (<t:...:R>) and wait for it on the timer wheel.
+
+        Two API calls per countdown: the message and the final "hết giờ" edit.
+        """
         if seconds <= 0:
             return
         try:
-            message = await channel.send(f"{label}: {seconds}s")
+            message = await channel.send(f"{label}: kết thúc {PhaseTimers.relative(seconds)}")
         except discord.HTTPException:
             return
-        remaining = seconds
         try:
-            while remaining > 0:
-                await asyncio.sleep(min(step, remaining))
-                remaining -= step
-                if remaining < 0:
-                    remaining = 0
-                with contextlib.suppress(discord.HTTPException):
-                    await message.edit(content=f"{label}: {remaining}s")
+            await self._timers.sleep(seconds)
         except asyncio.CancelledError:
             return
         with contextlib.suppress(discord.HTTPException):
-            await message.edit(content=f"{label}: hết giờ")
-
-    async def _safe_send_dm(self, member: discord.Member, content: Optional[str] = None, embed: Optional[discord.Embed] = None, max_retries: int = 2) -> bool:
-        """Send DM to player with retry logic and fallback notification. Returns True if sent successfully."""
-        if not member:
-            return False
-        
-        for attempt in range(max_retries):
-            try:
-                await member.send(content=content, embed=embed)
-                return True
-            except discord.Forbidden:
-                # User has DMs disabled - notify in game channel if possible
-                try:
-                    fallback_msg = embed.title if embed else content
-                    await self.channel.send(
-                        f"⚠️ Không thể gửi DM cho {member.mention} - họ đã tắt DMs. "
-                        f"Thông tin: {fallback_msg}"
-                    )
-                except discord.HTTPException:
-                    pass
-                logger.warning(
-                    "User has DMs disabled | guild=%s member=%s",
-                    self.guild.id, member.id
-                )
-                return False
-            except discord.HTTPException as e:
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(1)  # Retry after 1 second
-                    continue
-                logger.error(
-                    "Failed to send DM after %d attempts | guild=%s member=%s error=%s",
-                    max_retries, self.guild.id, member.id, str(e)
-                )
-                return False
-            except Exception as e:
-                logger.error(
-                    "Unexpected error sending DM | guild=%s member=%s error=%s",
-                    self.guild.id, member.id, str(e), exc_info=True
-                )
-                return False
-        return False
-
+            await self._schedule_message_edit(message, content=f"{label}: hết giờ")
+
+    def _schedule_message_edit(self, message: discord.Message, **kwargs) -> asyncio.Future:
+        """Queue a message edit; a newer edit of the same message replaces a queued one."""
+        return discord_scheduler.submit(
+            "message_edit",
+            lambda: message.edit(**kwargs),
+            major=message.channel.id,
+            target=message.id,
+            priority=Priority.LOW,
+            label=f"werewolf edit message={message.id}",
+        )
 
 class _LobbyView(discord.ui.View):
     def __init__(self, game: WerewolfGame) -> None:
@@ -3509,6 +2010,21 @@ class _DiscussionSkipVoteView(discord.ui.View):
         self.skip_votes: Set[int] = set()
         self.dont_skip_votes: Set[int] = set()
         self.message: Optional[discord.Message] = None
+        self.all_skipped = asyncio.Event()
+        self.deadline_ts: Optional[int] = None
+    
+    def _publish_progress(self) -> None:
+        """Show the skip count on the discussion message (edits coalesce, so bursts cost one call)."""
+        if not self.message or self.deadline_ts is None:
+            return
+        embed = discord.Embed(
+            title=f"⏱️ Thảo luận ngày {self.game.day_number}",
+            description=f"⏳ Kết thúc <t:{self.deadline_ts}:R>\n"
+                       f"🔘 Bỏ qua: {len(self.skip_votes)}/{len(self.alive_players)}",
+            colour=discord.Colour.blue()
+        )
+        update = self.game._schedule_message_edit(self.message, embed=embed, view=self)
+        update.add_done_callback(lambda f: f.cancelled() or f.exception())
     
     def can_skip(self) -> bool:
         """Check if all alive players voted to skip."""
@@ -3535,6 +2051,9 @@ class _DiscussionSkipVoteView(discord.ui.View):
         
         logger.info("Discussion skip vote | guild=%s player=%s skip_count=%s total=%s", 
                    self.game.guild.id, interaction.user.id, skip_count, total)
+        self._publish_progress()
+        if self.can_skip():
+            self.all_skipped.set()
     
     @discord.ui.button(label="Không Bỏ", style=discord.ButtonStyle.red, emoji="🛑")
     async def dont_skip_button(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
@@ -3556,6 +2075,96 @@ class _DiscussionSkipVoteView(discord.ui.View):
         
         logger.info("Discussion no-skip vote | guild=%s player=%s skip_count=%s total=%s", 
                    self.game.guild.id, interaction.user.id, skip_count, total)
+        self._publish_progress()
+
+
+class _DiscordPort:
+    """GamePort of a live match: DM prompts, wolf-thread votes and channel messages."""
+
+    def __init__(self, game: WerewolfGame) -> None:
+        self.game = game
+
+    async def choose(
+        self,
+        player: PlayerState,
+        *,
+        title: str,
+        description: str,
+        options: Dict[int, str],
+        allow_skip: bool,
+        timeout: int = 30,
+    ) -> Optional[int]:
+        game = self.game
+        view = _ChoiceView(options, allow_skip)
+        embed = discord.Embed(title=title, description=description)
+        embed.colour = discord.Colour.blurple()
+        embed.add_field(name="Lựa chọn", value="\n".join(f"{idx}. {label}" for idx, label in options.items()))
+        try:
+            message = await game._dm.submit(player.member, embed=embed, view=view, priority=Priority.HIGH)
+        except discord.HTTPException:
+            return None
+        started = asyncio.get_running_loop().time()
+        try:
+            await asyncio.wait_for(view.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            view.stop()
+        finally:
+            with contextlib.suppress(discord.HTTPException):
+                await message.edit(view=None)
+        game._replay.choice(player.user_id, title, view.selected, timeout, asyncio.get_running_loop().time() - started)
+        return view.selected
+
+    async def vote(
+        self,
+        *,
+        title: str,
+        description: str,
+        voters: Sequence[int],
+        options: Dict[int, str],
+        duration: int,
+        allow_skip: bool,
+    ) -> Optional[int]:
+        game = self.game
+        vote = VoteSession(
+            game.bot,
+            game.thread_wolves or game.channel,
+            title=title,
+            description=description,
+            options=options,
+            eligible_voters=list(voters),
+            duration=duration,
+            timers=game._timers,
+            replay=game._replay,
+            allow_skip=allow_skip,
+        )
+        result = await vote.start()
+        return result.winning_target_id if not result.is_tie else None
+
+    async def notify(self, player: PlayerState, text: Optional[str] = None, *, embed: Optional[discord.Embed] = None, urgent: bool = False) -> bool:
+        if urgent:
+            try:
+                await self.game._dm.submit(player.member, text, embed=embed, priority=Priority.HIGH)
+            except discord.HTTPException:
+                return False
+            return True
+        return await self.game._dm.send(player.member, text, embed)
+
+    async def announce(self, text: Optional[str] = None, *, embed: Optional[discord.Embed] = None) -> None:
+        with contextlib.suppress(discord.HTTPException):
+            await self.game.text_channel.send(text, embed=embed)
+
+    async def tell_wolves(self, text: str) -> None:
+        if self.game.thread_wolves:
+            with contextlib.suppress(discord.HTTPException):
+                await self.game.thread_wolves.send(text)
+
+    async def join_wolves(self, player: PlayerState) -> None:
+        if self.game.thread_wolves:
+            try:
+                await self.game.thread_wolves.add_user(player.member)
+            except discord.HTTPException as e:
+                logger.warning("Failed to add player to wolf thread | guild=%s player=%s error=%s",
+                               self.game.guild.id, player.user_id, str(e))
 
 
 class _ChoiceView(discord.ui.View):
@@ -0,0 +1,258 @@
+"""Warm pool of Werewolf game categories.
+
+Every game plays in a category with a voice channel and an event text channel.
+Building those from scratch and then granting each player access costs a
+create call per channel plus three permission calls per player, all on the
+lobby start path. The pool keeps a few hidden, pre-built categories per guild
+instead: a game takes one and opens it to its players with one bulk
+`edit(overwrites=...)` per channel, and gives it back at the end, where it is
+hidden again and its event channel replaced so no game history carries over.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+import discord
+
+from core.discord_scheduler import Priority, discord_scheduler
+from core.logger import setup_logger
+
+logger = setup_logger("WerewolfGame", "cogs/werewolf/werewolf.log")
+
+# Idle categories kept per guild
+POOL_SIZE = 1
+POOL_CATEGORY_NAME = "🐺 Ma Sói • đang chờ"
+VOICE_CHANNEL_NAME = "🔊 Bàn Tròn"
+TEXT_CHANNEL_NAME = "📜 diễn-biến"
+
+Overwrites = Dict[discord.abc.Snowflake, discord.PermissionOverwrite]
+
+
+@dataclass(slots=True)
+class GameInfrastructure:
+    category: discord.CategoryChannel
+    voice_channel: discord.VoiceChannel
+    text_channel: discord.TextChannel
+
+
+def _bot_overwrites(guild: discord.Guild) -> Tuple[discord.PermissionOverwrite, discord.PermissionOverwrite]:
+    """Bot overwrites for (category/voice, text channel)."""
+    category = discord.PermissionOverwrite(
+        view_channel=True,
+        manage_channels=True,
+        manage_permissions=True,
+        manage_threads=True
+    )
+    text = discord.PermissionOverwrite(
+        view_channel=True,
+        send_messages=True,
+        manage_messages=True
+    )
+    return category, text
+
+
+def idle_overwrites(guild: discord.Guild) -> Tuple[Overwrites, Overwrites]:
+    """(category/voice, text) overwrites of a pooled category: hidden from everyone."""
+    bot_category, bot_text = _bot_overwrites(guild)
+    hidden = discord.PermissionOverwrite(view_channel=False, connect=False)
+    return (
+        {guild.default_role: hidden, guild.me: bot_category},
+        {guild.default_role: hidden, guild.me: bot_text},
+    )
+
+
+def game_overwrites(
+    guild: discord.Guild, members: Iterable[discord.Member]
+) -> Tuple[Overwrites, Overwrites, Overwrites]:
+    """(category, voice, text) overwrites of a running game.
+
+    Spectators can see the category and the event channel but not join voice
+    or chat; players can see everything, use voice, and read (not write) the
+    event channel. Same permissions _grant_player_access gives one by one.
+    """
+    bot_category, bot_text = _bot_overwrites(guild)
+    members = list(members)
+    category: Overwrites = {
+        guild.default_role: discord.PermissionOverwrite(
+            view_channel=True,       # Everyone can SEE
+            connect=False,           # Cannot join voice
+            speak=False,             # Cannot speak
+            send_messages=False      # Cannot chat
+        ),
+        guild.me: bot_category,
+    }
+    voice: Overwrites = dict(category)
+    text: Overwrites = {
+        guild.default_role: discord.PermissionOverwrite(
+            view_channel=True,       # Everyone can WATCH
+            send_messages=False      # Cannot chat
+        ),
+        guild.me: bot_text,
+    }
+    for member in members:
+        category[member] = discord.PermissionOverwrite(view_channel=True)
+        voice[member] = discord.PermissionOverwrite(view_channel=True, connect=True, speak=True)
+        text[member] = discord.PermissionOverwrite(view_channel=True, send_messages=False)
+    return category, voice, text
+
+
+class InfrastructurePool:
+    """Per-guild pool of hidden game categories."""
+
+    def __init__(self, size: int = POOL_SIZE) -> None:
+        self.size = size
+        self._idle: Dict[int, List[GameInfrastructure]] = {}
+        self._warming: Dict[int, asyncio.Task] = {}
+
+    def idle_count(self, guild_id: int) -> int:
+        return len(self._idle.get(guild_id, ()))
+
+    @staticmethod
+    def is_pooled(category: discord.CategoryChannel) -> bool:
+        return category.name == POOL_CATEGORY_NAME
+
+    def adopt(self, category: discord.CategoryChannel) -> bool:
+        """Take back an idle category left over from before a restart."""
+        voice = next((c for c in category.channels if isinstance(c, discord.VoiceChannel)), None)
+        text = next((c for c in category.channels if isinstance(c, discord.TextChannel)), None)
+        idle = self._idle.setdefault(category.guild.id, [])
+        if voice is None or text is None or len(idle) >= self.size:
+            return False
+        if any(infra.category.id == category.id for infra in idle):
+            return True
+        idle.append(GameInfrastructure(category, voice, text))
+        return True
+
+    def warm(self, guild: discord.Guild) -> None:
+        """Fill the guild's pool in the background (no-op if full or already filling)."""
+        task = self._warming.get(guild.id)
+        if self.idle_count(guild.id) >= self.size or (task and not task.done()):
+            return
+        self._warming[guild.id] = asyncio.create_task(self._fill(guild))
+
+    async def _fill(self, guild: discord.Guild) -> None:
+        try:
+            while self.idle_count(guild.id) < self.size:
+                category_ow, text_ow = idle_overwrites(guild)
+                infra = await self._build(guild, POOL_CATEGORY_NAME, category_ow, category_ow, text_ow, "Werewolf: Pre-built game category")
+                self._idle.setdefault(guild.id, []).append(infra)
+                logger.info("Pooled game category | guild=%s category=%s idle=%s",
+                            guild.id, infra.category.id, self.idle_count(guild.id))
+        except discord.HTTPException as e:
+            logger.warning("Failed to pre-build game category | guild=%s error=%s", guild.id, str(e))
+        finally:
+            self._warming.pop(guild.id, None)
+
+    async def acquire(
+        self,
+        guild: discord.Guild,
+        name: str,
+        members: Iterable[discord.Member],
+        reason: str,
+    ) -> GameInfrastructure:
+        """A category opened to members: a pooled one if available, else built now."""
+        category_ow, voice_ow, text_ow = game_overwrites(guild, members)
+        idle = self._idle.get(guild.id)
+        while idle:
+            infra = idle.pop()
+            # One bulk overwrite update per channel, all three in parallel
+            results = await asyncio.gather(
+                self._edit(infra.category, Priority.HIGH, name=name, overwrites=category_ow, reason=reason),
+                self._edit(infra.voice_channel, Priority.HIGH, overwrites=voice_ow, reason=reason),
+                self._edit(infra.text_channel, Priority.HIGH, overwrites=text_ow, reason=reason),
+                return_exceptions=True,
+            )
+            error = next((r for r in results if isinstance(r, BaseException)), None)
+            if error is None:
+                logger.info("Reused pooled game category | guild=%s category=%s", guild.id, infra.category.id)
+                return infra
+            # Deleted by hand while idle, or only partly opened: never hand it out or keep it
+            logger.warning("Discarding pooled game category | guild=%s category=%s error=%s",
+                           guild.id, infra.category.id, str(error))
+            await self._discard(infra, reason)
+            if not isinstance(error, discord.HTTPException):
+                raise error
+
+        # Pool empty (first game or still warming): build directly. Refilled by
+        # release() at the end of the game, not here, so the category recycles
+        return await self._build(guild, name, category_ow, voice_ow, text_ow, reason)
+
+    async def release(self, infra: GameInfrastructure, reason: str) -> None:
+        """Hide a finished game's category and return it to the pool (deleted if the pool is full)."""
+        guild = infra.category.guild
+        idle = self._idle.setdefault(guild.id, [])
+        if len(idle) >= self.size:
+            await self._discard(infra, reason)
+            return
+
+        category_ow, text_ow = idle_overwrites(guild)
+        # A fresh event channel: game messages and threads go with the old one
+        await infra.text_channel.delete(reason=reason)
+        infra.text_channel = await infra.category.create_text_channel(
+            name=TEXT_CHANNEL_NAME,
+            overwrites=text_ow,
+            reason=reason
+        )
+        await asyncio.gather(
+            self._edit(infra.category, Priority.LOW, name=POOL_CATEGORY_NAME, overwrites=category_ow, reason=reason),
+            self._edit(infra.voice_channel, Priority.LOW, overwrites=category_ow, reason=reason),
+            *[
+                discord_scheduler.submit(
+                    "member_edit",
+                    lambda member=member: member.move_to(None, reason=reason),
+                    major=guild.id,
+                    target=member.id,
+                    priority=Priority.LOW,
+                    label=f"werewolf pool disconnect member={member.id}",
+                )
+                for member in infra.voice_channel.members
+            ],
+        )
+        if len(idle) < self.size:
+            idle.append(infra)
+            logger.info("Returned game category to pool | guild=%s category=%s", guild.id, infra.category.id)
+        else:
+            await self._discard(infra, reason)
+
+    async def _build(
+        self,
+        guild: discord.Guild,
+        name: str,
+        category_ow: Overwrites,
+        voice_ow: Overwrites,
+        text_ow: Overwrites,
+        reason: str,
+    ) -> GameInfrastructure:
+        category = await guild.create_category(name=name, overwrites=category_ow, reason=reason)
+        voice_channel, text_channel = await asyncio.gather(
+            category.create_voice_channel(name=VOICE_CHANNEL_NAME, overwrites=voice_ow, reason=reason),
+            category.create_text_channel(name=TEXT_CHANNEL_NAME, overwrites=text_ow, reason=reason),
+        )
+        return GameInfrastructure(category, voice_channel, text_channel)
+
+    @staticmethod
+    async def _discard(infra: GameInfrastructure, reason: str) -> None:
+        """Best-effort delete of a category and its channels (deleting a category alone orphans them)."""
+        for channel in (infra.voice_channel, infra.text_channel, infra.category):
+            try:
+                await channel.delete(reason=reason)
+            except discord.HTTPException:
+                pass
+
+    @staticmethod
+    def _edit(channel: discord.abc.GuildChannel, priority: Priority, **kwargs) -> asyncio.Future:
+        return discord_scheduler.submit(
+            "channel_edit",
+            lambda: channel.edit(**kwargs),
+            major=channel.id,
+            target="setup",
+            priority=priority,
+            label=f"werewolf infrastructure channel={channel.id}",
+        )
+
+
+# Global instance
+infrastructure_pool = InfrastructurePool()
@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from typing import Dict, Optional, Set
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple
 
 import discord
 
 from ..roles.base import Expansion
+from . import snapshot
 from .game import WerewolfGame
+from .infrastructure import infrastructure_pool
 from database_manager import db_manager, get_server_config
 from core.logger import setup_logger
 
@@ -17,6 +19,13 @@ logger = setup_logger("WerewolfManager", "cogs/werewolf/werewolf.log")
 
 DB_PATH = "./data/database.db"
 
+# Phase deltas appended between two full snapshots of a game
+FULL_SNAPSHOT_EVERY = 6
+# game_sessions is unique on (guild_id, game_type, COALESCE(voice_channel_id, 0))
+# (index uq_game_sessions_key); text games store a NULL voice channel.
+SESSION_CONFLICT_TARGET = "(guild_id, game_type, (COALESCE(voice_channel_id, 0)))"
+SESSION_WHERE = "guild_id = ? AND game_type = ? AND COALESCE(voice_channel_id, 0) = ?"
+
 
 class WerewolfManager:
     """Entry point used by the cog to manage matches."""
@@ -25,6 +34,11 @@ class WerewolfManager:
         self.bot = bot
         self._games: Dict[Tuple[int, Optional[int]], WerewolfGame] = {}
         self._lock = asyncio.Lock()
+        # Last persisted snapshot per game key: (game, state, deltas written since)
+        self._snapshots: Dict[Tuple[int, Optional[int]], Tuple[WerewolfGame, dict, int]] = {}
+        # Voice channel id -> game, read by on_voice_state_update without the lock.
+        # Never mutated in place: _route_voice_channel swaps in a new mapping.
+        self._voice_games: Mapping[int, WerewolfGame] = MappingProxyType({})
         logger.info("[Werewolf] Manager initialized")
         
         # Setup centralized voice listener for all games
@@ -50,6 +64,10 @@ class WerewolfManager:
                     if not category.name.startswith("🐺 Ma Sói"):
                         continue
                     
+                    # Idle pooled categories are reused, not cleaned up
+                    if infrastructure_pool.is_pooled(category) and infrastructure_pool.adopt(category):
+                        continue
+                    
                     # Verify structure (has text channel)
                     text_channel = None
                     for channel in category.channels:
@@ -132,49 +150,54 @@ class WerewolfManager:
             if not after.channel:
                 return
             
-            # Check all active games to find matching voice channel
-            async with self._lock:
-                games_to_check = list(self._games.items())
+            # O(1) lookup in the current routing snapshot; most voice events are not game channels
+            game = self._voice_games.get(after.channel.id)
+            if game is None or game.is_finished:
+                return
             
-            for (guild_id, vc_id), game in games_to_check:
-                # Skip if game finished or not in this voice channel
-                if game.is_finished or vc_id != after.channel.id:
-                    continue
-                
-                # Check if member is a player in this game
-                player = game.players.get(member.id)
-                if not player:
-                    continue
-                
-                try:
-                    # CASE 1: Dead player reconnected → re-mute immediately
-                    if not player.alive:
-                        await member.edit(mute=True, reason="Werewolf: Dead player auto-muted on reconnect")
-                        logger.warning(
-                            "Re-muted dead player on reconnect | guild=%s player=%s",
-                            guild_id, member.id
-                        )
-                    
-                    # CASE 2: Alive player joined during night → mute immediately
-                    elif game.phase == Phase.NIGHT and not before.channel:
-                        # Player just joined (wasn't in voice before)
-                        await member.edit(mute=True, reason="Werewolf: Joined during night phase")
-                        logger.info(
-                            "Muted alive player joining during night | guild=%s player=%s phase=%s",
-                            guild_id, member.id, game.phase.name
-                        )
-                except discord.HTTPException as e:
-                    logger.error(
-                        "Failed to enforce voice mute | guild=%s player=%s error=%s",
-                        guild_id, member.id, str(e)
+            # Check if member is a player in this game
+            player = game.players.get(member.id)
+            if not player:
+                return
+            
+            guild_id = game.guild.id
+            try:
+                # CASE 1: Dead player reconnected → re-mute immediately
+                if not player.alive:
+                    await member.edit(mute=True, reason="Werewolf: Dead player auto-muted on reconnect")
+                    logger.warning(
+                        "Re-muted dead player on reconnect | guild=%s player=%s",
+                        guild_id, member.id
                     )
                 
-                # Found the game, no need to check others
-                break
+                # CASE 2: Alive player joined during night → mute immediately
+                elif game.phase == Phase.NIGHT and not before.channel:
+                    # Player just joined (wasn't in voice before)
+                    await member.edit(mute=True, reason="Werewolf: Joined during night phase")
+                    logger.info(
+                        "Muted alive player joining during night | guild=%s player=%s phase=%s",
+                        guild_id, member.id, game.phase.name
+                    )
+            except discord.HTTPException as e:
+                logger.error(
+                    "Failed to enforce voice mute | guild=%s player=%s error=%s",
+                    guild_id, member.id, str(e)
+                )
         
         self._voice_listener_registered = True
         logger.info("[Werewolf] Global voice state listener registered")
 
+    def _route_voice_channel(self, game: WerewolfGame, channel_id: Optional[int]) -> None:
+        """Point channel_id at game (None: drop the game's routes) by swapping the whole map.
+
+        Runs on the event loop with no await, so the copy and the swap are
+        atomic for the listener, which only ever sees a complete snapshot.
+        """
+        routes = {vc_id: routed for vc_id, routed in self._voice_games.items() if routed is not game}
+        if channel_id is not None:
+            routes[channel_id] = game
+        self._voice_games = MappingProxyType(routes)
+
     async def _get_voice_channel_id(self, guild_id: int) -> Optional[int]:
         """Retrieve voice channel ID from database for guild."""
         try:
@@ -222,6 +245,9 @@ class WerewolfManager:
                 raise RuntimeError("Đã có bàn ma sói đang chạy trong server này")
             
             self._games[temp_key] = game
+            game.voice_route = self._route_voice_channel
+            # Pre-build a hidden game category while the lobby fills up
+            infrastructure_pool.warm(guild)
             return game
 
     async def get_game(self, guild_id: int, voice_channel_id: Optional[int] = None) -> Optional[WerewolfGame]:
@@ -231,6 +257,7 @@ class WerewolfManager:
             game = self._games.get(key)
             if game and game.is_finished:
                 self._games.pop(key, None)
+                self._route_voice_channel(game, None)
                 return None
             return game
 
@@ -238,7 +265,9 @@ class WerewolfManager:
         async with self._lock:
             key = (guild_id, voice_channel_id)
             game = self._games.pop(key, None)
+            self._snapshots.pop(key, None)
             if game:
+                self._route_voice_channel(game, None)
                 await game.cleanup()
 
     async def stop_all(self) -> None:
@@ -246,6 +275,8 @@ class WerewolfManager:
         async with self._lock:
             games = list(self._games.values())
             self._games.clear()
+            self._snapshots.clear()
+            self._voice_games = MappingProxyType({})
         for game in games:
             try:
                 await asyncio.wait_for(game.cleanup(), timeout=10)
@@ -255,106 +286,70 @@ class WerewolfManager:
                 logger.error(f"[Werewolf] Error during game cleanup: {e}", exc_info=True)
 
     async def save_game_state(self, guild_id: int, voice_channel_id: Optional[int] = None) -> None:
-        """Save Werewolf game state to database for resume after restart"""
+        """Save Werewolf game state to database for resume after restart.
+
+        Writes a full snapshot with one upsert, then only appends the phase
+        delta (deaths, role changes, vote flags...) until FULL_SNAPSHOT_EVERY
+        deltas have piled up or a delta is no longer much smaller than a
+        snapshot.
+        """
         async with self._lock:
             try:
-                game = self._games.get((guild_id, voice_channel_id))
+                key = (guild_id, voice_channel_id)
+                game = self._games.get(key)
                 if not game or game.is_finished:
+                    self._snapshots.pop(key, None)
                     return
-            
-                # Build game state snapshot
-                game_state = {
-                    "phase": game.phase.name,
-                    "night_number": game.night_number,
-                    "day_number": game.day_number,
-                    "players": {
-                        str(pid): {
-                            "member_id": p.member.id,
-                            "member_name": p.display_name(),
-                            "alive": p.alive,
-                            "death_pending": p.death_pending,
-                            "roles": [{"name": role.metadata.name, "alignment": role.alignment.name} for role in p.roles],
-                            "lover_id": p.lover_id,
-                            "charmed": p.charmed,
-                            "vote_disabled": p.vote_disabled,
-                            "skills_disabled": p.skills_disabled,
-                            "mayor": p.mayor,
-                            "vote_weight": p.vote_weight,
-                            "protected_last_night": p.protected_last_night,
-                            "is_sister": p.is_sister,
-                            "marked_by_raven": p.marked_by_raven
-                        }
-                        for pid, p in game.players.items()
-                    },
-                    "host_id": game.host.id,
-                    "expansions": [e.name for e in game.settings.expansions],
-                    "piper_id": game._piper_id,
-                    "lovers": list(game._lovers),
-                    "charmed": list(game._charmed),
-                    "sisters_ids": game._sisters_ids,
-                    "pyro_soaked": list(game._pyro_soaked),
-                    "pyro_id": game._pyro_id,
-                    "angel_won": game._angel_won,
-                    "wolf_brother_id": game._wolf_brother_id,
-                    "wolf_sister_id": game._wolf_sister_id,
-                    "elder_man_id": game._elder_man_id,
-                    "elder_man_group1": game._elder_man_group1,
-                    "elder_man_group2": game._elder_man_group2,
-                    "devoted_servant_id": game._devoted_servant_id
-                }
-                
-                game_state_json = json.dumps(game_state)
-                
-                # Check if session exists (proper NULL handling)
-                if voice_channel_id is None:
-                    existing = await db_manager.fetchone(
-                        "SELECT id FROM game_sessions WHERE guild_id = ? AND game_type = ? AND voice_channel_id IS NULL",
-                        (guild_id, "werewolf")
-                    )
-                else:
-                    existing = await db_manager.fetchone(
-                        "SELECT id FROM game_sessions WHERE guild_id = ? AND game_type = ? AND voice_channel_id = ?",
-                        (guild_id, "werewolf", voice_channel_id)
-                    )
-                
-                if existing:
-                    # Update existing session
-                    if voice_channel_id is None:
-                        await db_manager.modify(
-                            "UPDATE game_sessions SET channel_id = ?, game_state = ?, last_saved = CURRENT_TIMESTAMP WHERE guild_id = ? AND game_type = ? AND voice_channel_id IS NULL",
-                            (game.channel.id, game_state_json, guild_id, "werewolf")
-                        )
-                    else:
-                        await db_manager.modify(
-                            "UPDATE game_sessions SET channel_id = ?, game_state = ?, last_saved = CURRENT_TIMESTAMP WHERE guild_id = ? AND game_type = ? AND voice_channel_id = ?",
-                            (game.channel.id, game_state_json, guild_id, "werewolf", voice_channel_id)
+
+                game_state = snapshot.build_snapshot(game)
+                previous = self._snapshots.get(key)
+
+                if previous and previous[0] is game and previous[2] < FULL_SNAPSHOT_EVERY:
+                    _, last_state, delta_count = previous
+                    delta = snapshot.diff_snapshot(last_state, game_state)
+                    if not delta:
+                        return
+                    delta_json = snapshot.encode(delta)
+                    if len(delta_json) * 2 < len(snapshot.encode(game_state)):
+                        status = await db_manager.modify(
+                            f"UPDATE game_sessions SET channel_id = ?, game_deltas = COALESCE(game_deltas, '') || ?, "
+                            f"last_saved = CURRENT_TIMESTAMP WHERE {SESSION_WHERE}",
+                            (game.channel.id, delta_json + "\n", guild_id, "werewolf", voice_channel_id or 0)
                         )
-                else:
-                    # Insert new session
-                    await db_manager.modify(
-                        "INSERT INTO game_sessions (guild_id, game_type, voice_channel_id, channel_id, game_state) VALUES (?, ?, ?, ?, ?)",
-                        (guild_id, "werewolf", voice_channel_id, game.channel.id, game_state_json)
-                    )
+                        if status and not status.endswith(" 0"):
+                            self._snapshots[key] = (game, game_state, delta_count + 1)
+                            logger.info(f"[Werewolf] GAME_DELTA_SAVED [Guild {guild_id}] Phase: {game.phase.name}, Night: {game.night_number}, Day: {game.day_number}, Bytes: {len(delta_json)}")
+                            return
+                        # Row vanished (deleted or never written): fall through to a full snapshot
+
+                game_state_json = snapshot.encode(game_state)
+                await db_manager.modify(
+                    "INSERT INTO game_sessions (guild_id, game_type, voice_channel_id, channel_id, game_state, game_deltas) "
+                    "VALUES (?, ?, ?, ?, ?, '') "
+                    f"ON CONFLICT {SESSION_CONFLICT_TARGET} DO UPDATE SET channel_id = EXCLUDED.channel_id, "
+                    "game_state = EXCLUDED.game_state, game_deltas = '', last_saved = CURRENT_TIMESTAMP",
+                    (guild_id, "werewolf", voice_channel_id, game.channel.id, game_state_json)
+                )
+                self._snapshots[key] = (game, game_state, 0)
                 
-                logger.info(f"[Werewolf] GAME_SAVED [Guild {guild_id}] Phase: {game.phase.name}, Night: {game.night_number}, Day: {game.day_number}, Players: {len(game.players)}")
+                logger.info(f"[Werewolf] GAME_SAVED [Guild {guild_id}] Phase: {game.phase.name}, Night: {game.night_number}, Day: {game.day_number}, Players: {len(game.players)}, Bytes: {len(game_state_json)}")
             except Exception as e:
                 logger.error(f"[Werewolf] ERROR saving game state: {e}", exc_info=True)
 
     async def restore_game_state(self, guild_id: int) -> List[dict]:
         """Retrieve saved Werewolf game states from database (returns list of state dicts)"""
         try:
-            rows = await db_manager.execute(
-                "SELECT game_state, channel_id, voice_channel_id FROM game_sessions WHERE guild_id = ? AND game_type = ?",
+            rows = await db_manager.fetchall(
+                "SELECT game_state, game_deltas, channel_id, voice_channel_id FROM game_sessions WHERE guild_id = ? AND game_type = ?",
                 (guild_id, "werewolf")
             )
             
             states = []
             for row in rows:
-                game_state = json.loads(row[0])
-                channel_id = row[1]
-                voice_channel_id = row[2]
-                game_state["channel_id"] = channel_id
-                game_state["voice_channel_id"] = voice_channel_id
+                # Last full snapshot with the phase deltas appended since
+                game_state = snapshot.replay(row[0], row[1])
+                game_state["channel_id"] = row[2]
+                game_state["voice_channel_id"] = row[3]
                 states.append(game_state)
             
             if states:
@@ -0,0 +1,144 @@
+"""Direct-message fan-out for a Werewolf game.
+
+All DMs of a game go through `DMFanout`: it keeps each member's DM channel for
+the game's lifetime (no create_dm round trip per message), sends through the
+shared Discord scheduler so a burst of DMs runs concurrently within the
+dm_send rate limits, and reports members whose DMs are closed in a single
+fallback message instead of one channel message per member.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import discord
+
+from core.discord_scheduler import Priority, discord_scheduler
+from core.logger import setup_logger
+
+logger = setup_logger("WerewolfGame", "cogs/werewolf/werewolf.log")
+
+# (member, content, embed) for one DM of a fan-out
+DirectMessage = Tuple[discord.Member, Optional[str], Optional[discord.Embed]]
+
+
+class DMFanout:
+    """Sends a game's DMs and batches the fallback for closed DMs."""
+
+    def __init__(self, guild_id: int, fallback_channel: Callable[[], Optional[discord.TextChannel]]) -> None:
+        self.guild_id = guild_id
+        self._fallback_channel = fallback_channel
+        self._channels: Dict[int, discord.DMChannel] = {}
+
+    async def channel_for(self, member: discord.Member) -> discord.DMChannel:
+        channel = self._channels.get(member.id)
+        if channel is None:
+            channel = member.dm_channel or await member.create_dm()
+            self._channels[member.id] = channel
+        return channel
+
+    def submit(
+        self,
+        member: discord.Member,
+        content: Optional[str] = None,
+        embed: Optional[discord.Embed] = None,
+        view: Optional[discord.ui.View] = None,
+        *,
+        priority: Priority = Priority.NORMAL,
+    ) -> asyncio.Future:
+        """Queue one DM; the future resolves to the sent message."""
+        async def _send() -> discord.Message:
+            channel = await self.channel_for(member)
+            if view is None:
+                return await channel.send(content=content, embed=embed)
+            return await channel.send(content=content, embed=embed, view=view)
+
+        # No coalescing target: every DM must be delivered
+        return discord_scheduler.submit(
+            "dm_send",
+            _send,
+            major=member.id,
+            priority=priority,
+            label=f"werewolf dm member={member.id}",
+        )
+
+    async def send(
+        self,
+        member: discord.Member,
+        content: Optional[str] = None,
+        embed: Optional[discord.Embed] = None,
+        *,
+        max_retries: int = 2,
+        priority: Priority = Priority.NORMAL,
+    ) -> bool:
+        """Send one DM (fallback posted if DMs are closed). Returns True if sent."""
+        failed = await self.fan_out([(member, content, embed)], max_retries=max_retries, priority=priority)
+        return not failed
+
+    async def fan_out(
+        self,
+        messages: Iterable[DirectMessage],
+        *,
+        max_retries: int = 2,
+        priority: Priority = Priority.NORMAL,
+    ) -> List[discord.Member]:
+        """Send all DMs concurrently and return the members that could not be reached.
+
+        Transient HTTP errors are resubmitted (the scheduler already retries
+        429s). Members with closed DMs get one combined fallback message.
+        """
+        pending = [message for message in messages if message[0] is not None]
+        closed: List[DirectMessage] = []
+        failed: List[discord.Member] = []
+
+        for attempt in range(max_retries):
+            if not pending:
+                break
+            futures = [self.submit(member, content, embed, priority=priority) for member, content, embed in pending]
+            results = await asyncio.gather(*futures, return_exceptions=True)
+            retry: List[DirectMessage] = []
+            for message, result in zip(pending, results):
+                member = message[0]
+                if not isinstance(result, BaseException):
+                    continue
+                if isinstance(result, discord.Forbidden):
+                    self._channels.pop(member.id, None)
+                    closed.append(message)
+                    logger.warning("User has DMs disabled | guild=%s member=%s", self.guild_id, member.id)
+                elif isinstance(result, discord.HTTPException) and attempt < max_retries - 1:
+                    retry.append(message)
+                else:
+                    failed.append(member)
+                    if isinstance(result, discord.HTTPException):
+                        logger.error(
+                            "Failed to send DM after %d attempts | guild=%s member=%s error=%s",
+                            max_retries, self.guild_id, member.id, str(result)
+                        )
+                    else:
+                        logger.error(
+                            "Unexpected error sending DM | guild=%s member=%s error=%s",
+                            self.guild_id, member.id, str(result), exc_info=result
+                        )
+            pending = retry
+
+        if closed:
+            await self._post_fallback(closed)
+        return [message[0] for message in closed] + failed
+
+    async def _post_fallback(self, closed: Sequence[DirectMessage]) -> None:
+        channel = self._fallback_channel()
+        if channel is None:
+            return
+        lines = [
+            f"• {member.mention}: {embed.title if embed else content}"
+            for member, content, embed in closed
+        ]
+        text = "⚠️ Không thể gửi DM cho những người sau - họ đã tắt DMs:\n" + "\n".join(lines)
+        try:
+            await channel.send(text[:2000])
+        except discord.HTTPException:
+            pass
+
+    def clear(self) -> None:
+        self._channels.clear()
@@ -0,0 +1,1264 @@
+"""Night sequence, role actions and death cascades of the Werewolf game.
+
+`NightRules` holds the rules state of a match and the handlers that drive it:
+role dealing (`_assign_roles`), the night order (`_resolve_role_sequence`),
+every `_handle_*` role action, the wolf vote, and death resolution with its
+cascades (Hypnotist charm, lovers, Mayor succession, Wolf Sister, Wild Child,
+Demon Wolf curse). All I/O goes
+through `self.port` (a `GamePort`), so `WerewolfGame` (Discord transport) and
+`simulation.HeadlessGame` (seeded fake transport) run the same code.
+
+Subclasses provide `players`, `port`, `settings`, `guild`, `phase`,
+`night_number` and `day_number`, call `_init_rule_state()` from their
+constructor, and may override the hooks (`_announce_role_action`,
+`_restrict_dead_player`, `_record_assignments`, `_record_death`) for
+transport-only side effects.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from . import rules
+from ..roles.base import Alignment, Role
+from .role_config import RoleConfig
+from .state import Phase, PlayerIndex, PlayerState
+
+# Configured by WerewolfGame (setup_logger); the headless engine leaves it unconfigured
+logger = logging.getLogger("WerewolfGame")
+
+
+class NightRules:
+    """Rules of one match, independent of the transport."""
+
+    def _init_rule_state(self, rng: Optional[random.Random] = None) -> None:
+        # Chance rolls (Little Girl discovery); seeded by the simulation
+        self.rng = rng or random.Random()
+        # (player_id, cause) where cause in {wolves, white_wolf, witch, pyro, hunter, lynch, lover, scapegoat}
+        self._pending_deaths: List[Tuple[int, str]] = []
+        self._lovers: Set[int] = set()
+        self._charmed: Set[int] = set()
+        # Alive/alignment/pack/role-holder lookups, kept current by PlayerState
+        self._index = PlayerIndex()
+        self._piper_id: Optional[int] = None
+        self._death_log: List[Tuple[int, str, str]] = []
+        self._little_girl_peeking: Optional[int] = None  # Little girl user_id if peeking this night
+        self._sisters_ids: List[int] = []  # Two Sisters player IDs
+        # Pyromaniac state: set of player IDs soaked in oil (max 6)
+        self._pyro_soaked: Set[int] = set()
+        self._pyro_id: Optional[int] = None  # Pyromaniac player ID
+        self._angel_won = False  # Track if Angel won on Day 1
+        self._scapegoat_target: Optional[int] = None  # Target chosen by Scapegoat on tie vote
+        self._demon_wolf_curse_target: Optional[int] = None  # Target cursed by Demon Wolf
+        self._moon_maiden_disabled: Optional[int] = None  # Player disabled by Moon Maiden this night
+        self._hypnotist_charm_target: Optional[int] = None  # Player charmed by Hypnotist this night
+        self._pharmacist_antidote_target: Optional[int] = None  # Player targeted by Pharmacist's antidote this night
+        self._pharmacist_slept_target: Optional[int] = None  # Player targeted by Pharmacist's sleeping potion this night
+        self._assassin_votes_day1: Dict[int, int] = {}  # Track votes day 1 of assassin cycle
+        self._assassin_votes_day2: Dict[int, int] = {}  # Track votes day 2 of assassin cycle
+        self._wolves_died_today: List[int] = []  # Track which wolves died during day (for Fire Wolf)
+        self._wolf_brother_id: Optional[int] = None  # Wolf Brother player ID
+        self._wolf_sister_id: Optional[int] = None  # Wolf Sister player ID
+        self._judge_activated_double_lynch: bool = False  # Judge activated double lynch this day
+        self._actor_protected_target: Optional[int] = None  # Target protected by Actor using Guard ability
+        self._actor_heal_target: Optional[int] = None  # Target healed by Actor using Witch Heal ability
+        self._actor_hunt_target: Optional[int] = None  # Target to hunt if Actor killed using Hunter ability
+        self._actor_raven_target: Optional[int] = None  # Target cursed by Actor using Raven ability
+        self._actor_harp_target: Optional[int] = None  # Target charmed by Actor using Hypnotist ability
+        self._elder_man_id: Optional[int] = None  # Elder Man player ID
+        self._elder_man_group1: List[int] = []  # Group 1 player IDs
+        self._elder_man_group2: List[int] = []  # Group 2 player IDs
+        self._devoted_servant_id: Optional[int] = None  # Devoted Servant player ID
+        self._devoted_servant_stolen_role: Optional[Role] = None  # Stolen role by Devoted Servant
+        self._devoted_servant_original_target: Optional[int] = None  # Original target of Devoted Servant swap
+
+    # ==================== TRANSPORT ====================
+
+    async def _prompt_dm_choice(
+        self,
+        player: PlayerState,
+        *,
+        title: str,
+        description: str,
+        options: Dict[int, str],
+        allow_skip: bool,
+        timeout: int = 30,
+    ) -> Optional[int]:
+        """Ask one player to pick an option (None = skipped / timed out). Also used by the roles."""
+        return await self.port.choose(
+            player, title=title, description=description, options=options, allow_skip=allow_skip, timeout=timeout
+        )
+
+    async def _safe_send_dm(self, member, content: Optional[str] = None, embed=None, max_retries: int = 2) -> bool:
+        """DM a player by member (used by the roles). Returns True if it was delivered."""
+        player = self.players.get(getattr(member, "id", None)) if member else None
+        if player is None:
+            return False
+        return await self.port.notify(player, content, embed=embed)
+
+    # ==================== HOOKS ====================
+
+    def _announce_role_action(self, role: Role, duration: int = 45) -> Optional[asyncio.Task]:
+        """Public "role X is awake" countdown; awaited after the role acted. None = no countdown."""
+        return None
+
+    async def _restrict_dead_player(self, player: PlayerState) -> None:
+        """Take a dead player's voice and chat rights away."""
+
+    def _record_assignments(self) -> None:
+        """Roles have been dealt and paired."""
+
+    def _record_death(self, player_id: int, cause: str, phase_label: str) -> None:
+        self._death_log.append((player_id, cause, phase_label))
+
+    # ==================== LOOKUPS ====================
+
+    def list_players(self) -> Sequence[PlayerState]:
+        return list(self.players.values())
+
+    def alive_players(self) -> List[PlayerState]:
+        return list(self._index.alive.values())
+
+    def _is_player_eligible_for_action(self, player: PlayerState) -> bool:
+        """Check if player can take night/day actions (alive, not pending death, and not disabled by Fire Wolf)."""
+        return rules.can_act(player)
+
+    def alive_by_alignment(self, alignment: Alignment) -> List[PlayerState]:
+        return list(self._index.alive_by_alignment[alignment].values())
+
+    def get_active_werewolves(self, filter_alive: bool = True) -> List[PlayerState]:
+        """Get werewolves excluding Avengers on werewolf side (they don't participate in wolf votes/actions)."""
+        if filter_alive:
+            return list(self._index.pack.values())
+        return [p for p in self.players.values() if rules.is_pack_wolf(p)]
+
+    def _find_role_holder(self, role_name: str) -> Optional[PlayerState]:
+        """Find role holder - includes dead players to show action for all roles."""
+        return self._index.role_holder(role_name)
+
+    def _charm(self, player_id: int) -> None:
+        """Mark a player as charmed by the Piper (tracked set and indexed flag)."""
+        self._charmed.add(player_id)
+        player = self.players.get(player_id)
+        if player is not None:
+            player.charmed = True
+
+    def _win_result(self) -> Optional[rules.WinResult]:
+        """Current win condition, or None if the game goes on."""
+        return rules.evaluate_win(
+            self.players,
+            angel_won=self._angel_won,
+            lovers=self._lovers,
+            charmed=self._charmed,
+            piper_id=self._piper_id,
+            elder_man_id=self._elder_man_id,
+            elder_man_groups=(self._elder_man_group1, self._elder_man_group2),
+            index=self._index,
+        )
+
+    # ==================== SETUP ====================
+
+    async def _assign_roles(self) -> None:
+        self._log_role_balance(len(self.players))
+        assignments, extra_cards = rules.deal_roles(self.players.keys(), self.settings.expansions, self.rng)
+        thief_id: Optional[int] = None
+        
+        for player_id, role in assignments.items():
+            if role.metadata.name == rules.THIEF:
+                thief_id = player_id
+            self.players[player_id].roles = [role]
+            logger.info(
+                "Role assigned | guild=%s player=%s name=%s alignment=%s",
+                self.guild.id,
+                player_id,
+                role.metadata.name,
+                role.alignment,
+            )
+        
+        # If thief exists, the last 2 roles become extra cards
+        if thief_id is not None and extra_cards:
+            thief = self.players[thief_id]
+            thief.role.extra_cards = extra_cards  # type: ignore[attr-defined]
+            logger.info(
+                "Thief extra cards generated | guild=%s cards=%s",
+                self.guild.id,
+                [role.metadata.name for role in extra_cards]
+            )
+        for player in self.players.values():
+            # Call on_assign for all roles
+            for role in player.roles:
+                await role.on_assign(self, player)
+        
+        # Detect Two Sisters and notify them of each other
+        sisters = [p for p in self.players.values() if getattr(p, "is_sister", False)]
+        if len(sisters) == 2:
+            self._sisters_ids = [s.user_id for s in sisters]
+            await self.port.notify(sisters[0], f"👯 Bạn là Hai Chị Em cùng với: {sisters[1].display_name()}")
+            await self.port.notify(sisters[1], f"👯 Bạn là Hai Chị Em cùng với: {sisters[0].display_name()}")
+            logger.info("Two Sisters identified | guild=%s sisters=%s", self.guild.id, self._sisters_ids)
+        
+        # Detect Wolf Brother & Sister and pair them
+        wolf_siblings = [(p, p.roles[0]) for p in self.players.values() if p.roles and p.roles[0].metadata.name in ("Sói Anh", "Sói Em")]
+        
+        # VALIDATION: Ensure both Wolf Brother and Sister are present together (not partial assignment)
+        wolf_brother_count = sum(1 for p, r in wolf_siblings if r.metadata.name == "Sói Anh")
+        wolf_sister_count = sum(1 for p, r in wolf_siblings if r.metadata.name == "Sói Em")
+        
+        if wolf_brother_count != wolf_sister_count:
+            logger.error(
+                "CRITICAL: Incomplete Wolf Sibling assignment | guild=%s brothers=%s sisters=%s",
+                self.guild.id, wolf_brother_count, wolf_sister_count
+            )
+            # If we have one but not the other, log the error and continue (shouldn't happen with new role_config logic)
+        elif wolf_brother_count == 1 and wolf_sister_count == 1:
+            # Both are present - proceed with pairing
+            player1, role1 = wolf_siblings[0]
+            player2, role2 = wolf_siblings[1]
+            
+            # Randomly decide who is brother and who is sister
+            if self.rng.random() < 0.5:
+                brother_player, sister_player = player1, player2
+                brother_role, sister_role = role1, role2
+            else:
+                brother_player, sister_player = player2, player1
+                brother_role, sister_role = role2, role1
+            
+            # If we need to swap roles (if assigned wrong), do it now
+            if brother_role.metadata.name != "Sói Anh":
+                # Swap roles
+                brother_player.roles = [sister_role]
+                sister_player.roles = [brother_role]
+                brother_role, sister_role = sister_role, brother_role
+            
+            # Link them together
+            self._wolf_brother_id = brother_player.user_id
+            self._wolf_sister_id = sister_player.user_id
+            brother_role.sister_id = sister_player.user_id
+            sister_role.brother_id = brother_player.user_id
+            
+            logger.info(
+                "Wolf siblings paired | guild=%s brother=%s sister=%s",
+                self.guild.id,
+                brother_player.user_id,
+                sister_player.user_id,
+            )
+
+        # NOTE: Werewolf role creation removed - using permissions instead of roles in new architecture
+        self._record_assignments()
+
+    def _log_role_balance(self, player_count: int) -> None:
+        balance = RoleConfig.get_balance_info(player_count, self.settings.expansions)
+        logger.info(
+            "Role layout | guild=%s player_count=%s werewolves=%s village=%s neutral=%s",
+            self.guild.id,
+            player_count,
+            balance.get(Alignment.WEREWOLF, 0),
+            balance.get(Alignment.VILLAGE, 0),
+            balance.get(Alignment.NEUTRAL, 0),
+        )
+
+    # ==================== NIGHT ====================
+
+    async def _run_wolf_vote(self) -> Optional[int]:
+        """Run wolf vote to choose a target for the night kill."""
+        wolves = [p for p in self.alive_players() if any(r.alignment == Alignment.WEREWOLF for r in p.roles)]
+        candidates = self.alive_players()
+        if not wolves or not candidates:
+            return None
+        options = {p.user_id: p.display_name() for p in candidates}
+        return await self.port.vote(
+            title=f"Ma Sói chọn con mồi (Đêm {self.night_number})",
+            description="Chọn người muốn tấn công. Hòa phiếu thì đêm yên bình.",
+            voters=[w.user_id for w in wolves],
+            options=options,
+            duration=self.settings.night_vote_duration,
+            allow_skip=True,
+        )
+
+    async def _resolve_role_sequence(self, *, first_night: bool) -> None:
+        try:
+            # Reset Moon Maiden disabled flag each night
+            self._moon_maiden_disabled = None
+            # Reset Hypnotist charm target each night
+            self._hypnotist_charm_target = None
+            # Reset Pharmacist targets each night
+            self._pharmacist_antidote_target = None
+            self._pharmacist_slept_target = None
+            # Reset Assassin votes on even nights (after 2-day cycle ends)
+            if self.night_number % 2 == 0:
+                self._assassin_votes_day1 = {}
+                self._assassin_votes_day2 = {}
+                logger.info("Assassin votes reset for new cycle | guild=%s night=%s", self.guild.id, self.night_number)
+            
+            announce_task = None
+            thief = self._find_role_holder("Tên Trộm")
+            if first_night and thief and self._is_player_eligible_for_action(thief):
+                announce_task = self._announce_role_action(thief.role)
+                await self._handle_thief(thief)
+                if announce_task:
+                    await announce_task
+                logger.info("Thief resolved | guild=%s player=%s", self.guild.id, thief.user_id)
+            cupid = self._find_role_holder("Thần Tình Yêu")
+            if first_night and cupid and self._is_player_eligible_for_action(cupid):
+                announce_task = self._announce_role_action(cupid.role)
+                await self._handle_cupid(cupid)
+                if announce_task:
+                    await announce_task
+                logger.info("Cupid resolved | guild=%s player=%s", self.guild.id, cupid.user_id)
+            
+            # Handle Wolf Brother & Sister first-night recognition
+            if first_night and self._wolf_brother_id and self._wolf_sister_id:
+                brother = self.players.get(self._wolf_brother_id)
+                sister = self.players.get(self._wolf_sister_id)
+                if brother and sister and brother.alive and sister.alive:
+                    # Call on_first_night for both siblings
+                    for role in brother.roles:
+                        if hasattr(role, 'on_first_night'):
+                            try:
+                                await role.on_first_night(self, brother)
+                                logger.info("Wolf Brother first-night resolved | guild=%s player=%s", self.guild.id, brother.user_id)
+                            except Exception as e:
+                                logger.error("Error in Wolf Brother first-night | guild=%s player=%s error=%s", 
+                                           self.guild.id, brother.user_id, str(e), exc_info=True)
+                    
+                    for role in sister.roles:
+                        if hasattr(role, 'on_first_night'):
+                            try:
+                                await role.on_first_night(self, sister)
+                                logger.info("Wolf Sister first-night resolved | guild=%s player=%s", self.guild.id, sister.user_id)
+                            except Exception as e:
+                                logger.error("Error in Wolf Sister first-night | guild=%s player=%s error=%s", 
+                                           self.guild.id, sister.user_id, str(e), exc_info=True)
+            
+            wolves = [p for p in self.alive_players() if any(r.alignment == Alignment.WEREWOLF for r in p.roles)]
+            announce_task = None
+            wolves = self.get_active_werewolves()
+            if wolves:
+                announce_task = self._announce_role_action(wolves[0].roles[0])
+            
+            # Handle little girl peeking before wolf vote (so wolves can see the discovery message)
+            little_girl = self._find_role_holder("Cô Bé")
+            if little_girl and self._is_player_eligible_for_action(little_girl):
+                await self._handle_little_girl(little_girl)
+            
+            # Run wolf vote - if little girl was discovered, wolves can choose to kill her instead
+            target_id = await self._run_wolf_vote()
+            if announce_task:
+                await announce_task
+            logger.info("Wolf vote target | guild=%s night=%s target=%s", self.guild.id, self.night_number, target_id)
+            
+            # If little girl was discovered, ask wolves quickly if they want to switch kill to her
+            if self._little_girl_peeking:
+                try:
+                    # Run a quick yes/no vote in wolf thread - NO COUNTDOWN, IMMEDIATE
+                    options = {
+                        self._little_girl_peeking: "Giết người hé mắt (Cô Bé)",
+                        target_id if target_id is not None else -1: "Giữ mục tiêu cũ",
+                    }
+                    confirm = await self.port.vote(
+                        title=f"Ma Sói xác nhận mục tiêu (Đêm {self.night_number})",
+                        description="Bạn có muốn đổi sang giết người hé mắt không?",
+                        voters=[w.user_id for w in wolves],
+                        options=options,
+                        duration=15,
+                        allow_skip=False,
+                    )
+                    if confirm is not None and confirm in options:
+                        target_id = confirm if confirm != -1 else target_id
+                        logger.info("Wolves confirmation applied | guild=%s night=%s target=%s", self.guild.id, self.night_number, target_id)
+                finally:
+                    # Reset peeking flag regardless
+                    self._little_girl_peeking = None
+            
+            guard = self._find_role_holder("Bảo Vệ")
+            announce_task = None
+            if guard and self._is_player_eligible_for_action(guard):
+                announce_task = self._announce_role_action(guard.role)
+            protected_id = await self._handle_guard(guard) if guard and self._is_player_eligible_for_action(guard) else None
+            if announce_task:
+                await announce_task
+            logger.info("Guard protected | guild=%s night=%s target=%s", self.guild.id, self.night_number, protected_id)
+            killed_id = rules.resolve_wolf_attack(target_id, protected_id)
+            # Track bodyguard save achievement
+            if guard and target_id == protected_id and killed_id is None:
+                guard.bodyguard_saves += 1
+                logger.info("Bodyguard save counted | guild=%s bodyguard=%s saves=%s", self.guild.id, guard.user_id, guard.bodyguard_saves)
+            if killed_id and self._handle_elder_resistance(killed_id):
+                killed_id = None
+            
+            white_wolf = self._find_role_holder("Sói Trắng")
+            announce_task = None
+            if white_wolf and self.night_number % 2 == 0 and self._is_player_eligible_for_action(white_wolf):
+                announce_task = self._announce_role_action(white_wolf.role)
+            betrayer_kill = await self._handle_white_wolf(white_wolf) if white_wolf and self.night_number % 2 == 0 and self._is_player_eligible_for_action(white_wolf) else None
+            if announce_task:
+                await announce_task
+            
+            seer = self._find_role_holder("Tiên Tri")
+            if seer and self._is_player_eligible_for_action(seer):
+                announce_task = self._announce_role_action(seer.role)
+                await self._handle_seer(seer)
+                if announce_task:
+                    await announce_task
+            
+            witch = self._find_role_holder("Phù Thủy")
+            if witch and self._is_player_eligible_for_action(witch):
+                announce_task = self._announce_role_action(witch.role)
+                killed_id = await self._handle_witch(witch, killed_id)
+                if announce_task:
+                    await announce_task
+            
+            raven = self._find_role_holder("Con Quạ")
+            if raven and self._moon_maiden_disabled != raven.user_id and self._is_player_eligible_for_action(raven):
+                announce_task = self._announce_role_action(raven.role)
+                await self._handle_raven(raven)
+                if announce_task:
+                    await announce_task
+            
+            piper = self._find_role_holder("Thổi Sáo")
+            if piper and self._moon_maiden_disabled != piper.user_id and self._is_player_eligible_for_action(piper):
+                announce_task = self._announce_role_action(piper.role)
+                await self._handle_piper(piper)
+                if announce_task:
+                    await announce_task
+            
+            pyro = self._find_role_holder("Kẻ Phóng Hỏa")
+            if pyro and not getattr(pyro.role, "ignited", False) and self._is_player_eligible_for_action(pyro):
+                announce_task = self._announce_role_action(pyro.role)
+                await self._handle_pyromaniac(pyro)
+                if announce_task:
+                    await announce_task
+            
+            hypnotist = self._find_role_holder("Cổ Hoặc Sư")
+            if hypnotist and self._is_player_eligible_for_action(hypnotist):
+                announce_task = self._announce_role_action(hypnotist.role)
+                await self._handle_hypnotist(hypnotist)
+                if announce_task:
+                    await announce_task
+            
+            moon_maiden = self._find_role_holder("Nguyệt Nữ")
+            if moon_maiden and self._is_player_eligible_for_action(moon_maiden):
+                announce_task = self._announce_role_action(moon_maiden.role)
+                await self._handle_moon_maiden(moon_maiden)
+                if announce_task:
+                    await announce_task
+            
+            # Fire Wolf ability - trigger if wolves died during the day
+            fire_wolf = self._find_role_holder("Sói Lửa")
+            if fire_wolf and self._is_player_eligible_for_action(fire_wolf):
+                # Check if any wolves died today (first ability trigger)
+                if len(self._wolves_died_today) >= 1 and not getattr(fire_wolf.role, 'has_used_ability_first', False):
+                    # Mark that first wolf death triggered the ability
+                    fire_wolf._fire_wolf_trigger_first = True
+                    announce_task = self._announce_role_action(fire_wolf.role)
+                    await fire_wolf.role.on_night(self, fire_wolf, self.night_number)
+                    if announce_task:
+                        await announce_task
+                    logger.info(
+                        "Fire Wolf triggered (first wolf death) | guild=%s fire_wolf=%s wolves_died=%s",
+                        self.guild.id, fire_wolf.user_id, len(self._wolves_died_today)
+                    )
+                # Check if 2+ wolves died today (second ability trigger)
+                elif len(self._wolves_died_today) >= 2 and not getattr(fire_wolf.role, 'has_used_ability_second', False):
+                    fire_wolf.role.can_use_again = True
+                    announce_task = self._announce_role_action(fire_wolf.role)
+                    await fire_wolf.role.on_night(self, fire_wolf, self.night_number)
+                    if announce_task:
+                        await announce_task
+                    logger.info(
+                        "Fire Wolf triggered (2+ wolves died) | guild=%s fire_wolf=%s wolves_died=%s",
+                        self.guild.id, fire_wolf.user_id, len(self._wolves_died_today)
+                    )
+            
+            if killed_id:
+                self._pending_deaths.append((killed_id, "wolves"))
+            if betrayer_kill:
+                self._pending_deaths.append((betrayer_kill, "white_wolf"))
+            
+            # Call on_night for roles with night actions
+            for player in self.alive_players():
+                if self._is_player_eligible_for_action(player):
+                    for role in player.roles:
+                        if hasattr(role, 'on_night') and role.night_order > 0:
+                            try:
+                                await role.on_night(self, player, self.night_number)
+                                logger.info("Role on_night called | guild=%s player=%s role=%s", self.guild.id, player.user_id, role.metadata.name)
+                            except Exception as e:
+                                logger.error("Error in role on_night | guild=%s player=%s role=%s error=%s", self.guild.id, player.user_id, role.metadata.name, str(e), exc_info=True)
+            
+            logger.info("Night resolution | guild=%s night=%s killed=%s extra=%s", self.guild.id, self.night_number, killed_id, betrayer_kill)
+        except Exception as e:
+            logger.error("CRITICAL: Exception in _resolve_role_sequence | guild=%s night=%s error=%s", 
+                        self.guild.id, self.night_number, str(e), exc_info=True)
+            raise
+
+    async def _handle_thief(self, thief: PlayerState) -> None:
+        role = thief.role
+        extra_cards = getattr(role, "extra_cards", [])
+        if not extra_cards:
+            return
+        
+        # If any extra card is a werewolf, only the wolf cards are offered
+        options = rules.thief_options(extra_cards)
+        if any(card.alignment == Alignment.WEREWOLF for card in extra_cards):
+            description = "⚠️ Có ít nhất một lá Sói! Bạn BẮT BUỘC phải chọn Sói.\n\nChọn một trong các lá bài Sói:"
+        else:
+            description = "Chọn một trong hai lá bài bỏ dư:"
+        
+        result = await self._prompt_dm_choice(
+            thief,
+            title="Tên trộm chọn vai mới",
+            description=description,
+            options=options,
+            allow_skip=False,
+        )
+        if result is None:
+            return
+        
+        new_role = extra_cards[result]
+        old_role_name = thief.role.metadata.name
+        thief.role = new_role
+        await new_role.on_assign(self, thief)
+        
+        # If thief becomes a werewolf, add to wolf thread
+        if new_role.alignment == Alignment.WEREWOLF:
+            await self.port.join_wolves(thief)
+            # Notify other wolves
+            wolf_players = [p for p in self.players.values() 
+                           if p.alive and any(r.alignment == Alignment.WEREWOLF for r in p.roles) and p.user_id != thief.user_id]
+            wolf_mention = " ".join(p.member.mention for p in wolf_players)
+            if wolf_mention:
+                await self.port.tell_wolves(f"{wolf_mention} - {thief.display_name()} đã trở thành {new_role.metadata.name} và gia nhập bầy sói!")
+            logger.info("Thief joined wolf thread | guild=%s player=%s", self.guild.id, thief.user_id)
+        
+        await self.port.notify(thief, f"Bạn đã chọn '{new_role.metadata.name}'.")
+        logger.info("Thief chose role | guild=%s player=%s old_role=%s new_role=%s", 
+                   self.guild.id, thief.user_id, old_role_name, new_role.metadata.name)
+
+    async def _handle_cupid(self, cupid: PlayerState) -> None:
+        logger.info("_handle_cupid START | guild=%s cupid=%s", self.guild.id, cupid.user_id)
+        available = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != cupid.user_id}
+        lovers: List[int] = []
+        while len(lovers) < 2 and available:
+            choice = await self._prompt_dm_choice(
+                cupid,
+                title="Thần tình yêu",
+                description=f"Chọn người yêu thứ {len(lovers) + 1}.",
+                options=available,
+                allow_skip=False,
+            )
+            if choice is None or choice not in available:
+                logger.info("Cupid skipped lover selection | guild=%s cupid=%s lovers_count=%s night=%s", 
+                            self.guild.id, cupid.user_id, len(lovers), self.night_number)
+                break
+            lovers.append(choice)
+            available.pop(choice, None)
+        
+        if len(lovers) == 2:
+            a = self.players[lovers[0]]
+            b = self.players[lovers[1]]
+            a.lover_id = b.user_id
+            b.lover_id = a.user_id
+            self._lovers = {a.user_id, b.user_id}
+            await self.port.notify(a, f"Bạn và {b.display_name()} đã trúng mũi tên tình ái.")
+            await self.port.notify(b, f"Bạn và {a.display_name()} đã trúng mũi tên tình ái.")
+            logger.info("Cupid linked lovers | guild=%s cupid=%s lovers=%s", self.guild.id, cupid.user_id, self._lovers)
+        else:
+            logger.info("Cupid incomplete lovers | guild=%s cupid=%s lovers_count=%s", 
+                        self.guild.id, cupid.user_id, len(lovers))
+        logger.info("_handle_cupid END | guild=%s cupid=%s", self.guild.id, cupid.user_id)
+
+    async def _handle_guard(self, guard: PlayerState) -> Optional[int]:
+        """Handle Guard night action with retry logic and filtering of unavailable targets."""
+        max_attempts = 3
+        attempt = 0
+        
+        while attempt < max_attempts:
+            attempt += 1
+            
+            # Build available options - exclude last protected target
+            last_target = getattr(guard.role, "last_protected", None)
+            options = {
+                p.user_id: p.display_name() 
+                for p in self.alive_players() 
+                if p.user_id != last_target  # Hide person protected last night
+            }
+            
+            if not options:
+                # No valid targets left (shouldn't happen, but safety check)
+                await self.port.notify(guard, "Không có người nào có thể bảo vệ.")
+                return None
+            
+            choice = await self._prompt_dm_choice(
+                guard,
+                title="Bảo vệ thức giấc",
+                description="Chọn người cần bảo vệ đêm nay.\n*(Người được bảo vệ đêm trước đã bị ẩn)*" if last_target else "Chọn người cần bảo vệ đêm nay.",
+                options=options,
+                allow_skip=True,
+            )
+            
+            if choice is None:
+                # Player skipped
+                return None
+            
+            target_id = choice
+            target = self.players.get(target_id)
+            
+            if not target:
+                await self.port.notify(guard, "Lựa chọn không hợp lệ. Vui lòng thử lại.")
+                continue
+            
+            # Validate choice
+            if target_id == guard.user_id and not guard.role.can_self_target():
+                await self.port.notify(guard, 
+                    "❌ Bạn không thể tiếp tục tự bảo vệ đêm này.\n"
+                    "💡 Vui lòng chọn người khác."
+                )
+                continue  # Ask again instead of returning None
+            
+            # All validations passed
+            target.protected_last_night = True
+            if target_id == guard.user_id:
+                guard.role.mark_self_target()
+                await self.port.notify(guard, 
+                    "✅ Bạn đã chọn bảo vệ chính mình đêm nay.\n"
+                    "⚠️ Bạn sẽ không thể tự bảo vệ nữa."
+                )
+            guard.role.last_protected = target_id
+            logger.info("Guard protected | guild=%s player=%s target=%s", self.guild.id, guard.user_id, target_id)
+            return target_id
+        
+        # Max attempts reached
+        await self.port.notify(guard, "⏱️ Hết thời gian, bảo vệ bị bỏ qua.")
+        logger.info("Guard timeout | guild=%s player=%s attempts=%s", self.guild.id, guard.user_id, attempt)
+        return None
+
+    async def _handle_seer(self, seer: PlayerState) -> None:
+        options = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != seer.user_id}
+        if not options:
+            logger.info("Seer has no targets | guild=%s seer=%s night=%s", 
+                        self.guild.id, seer.user_id, self.night_number)
+            return
+        
+        choice = await self._prompt_dm_choice(
+            seer,
+            title="Tiên tri soi",
+            description="Chọn một người để soi đêm nay.",
+            options=options,
+            allow_skip=True,
+        )
+        if choice is None:
+            logger.info("Seer skipped peeking | guild=%s seer=%s night=%s", 
+                        self.guild.id, seer.user_id, self.night_number)
+            return
+        
+        target_id = choice
+        target = self.players.get(target_id)
+        if not target or not target.role:
+            logger.warning("Seer target not found | guild=%s seer=%s target=%s", 
+                           self.guild.id, seer.user_id, target_id)
+            return
+        
+        # Check if target is Wolf Sister and Wolf Brother is still alive - hide her alignment
+        is_hidden_wolf_sister = False
+        if self._wolf_sister_id == target_id and self._wolf_brother_id:
+            brother = self.players.get(self._wolf_brother_id)
+            if brother and brother.alive:
+                # Sister is hidden - report her as villager
+                faction = Alignment.VILLAGE
+                is_hidden_wolf_sister = True
+                logger.info("Wolf Sister hidden from Seer | guild=%s seer=%s sister=%s brother_alive=true", 
+                           self.guild.id, seer.user_id, target_id)
+            else:
+                # Brother is dead, report actual alignment (WEREWOLF)
+                faction = target.role.alignment
+        else:
+            # Check if target is Avenger - use their chosen side (or NEUTRAL if not chosen yet)
+            faction = target.role.alignment
+            for role in target.roles:
+                if hasattr(role, '__class__') and role.__class__.__name__ == 'Avenger':
+                    if hasattr(role, 'chosen_side') and role.chosen_side:
+                        faction = role.chosen_side
+                        logger.info("Seer peeks Avenger as %s | guild=%s seer=%s avenger=%s", 
+                                   faction.value, self.guild.id, seer.user_id, target_id)
+                    break
+        
+        message = "Người đó thuộc phe Dân Làng." if faction == Alignment.VILLAGE else "Người đó thuộc phe Ma Sói." if faction == Alignment.WEREWOLF else "Người đó thuộc phe Trung Lập."
+        
+        logger.info("Seer peek | guild=%s seer=%s target=%s faction=%s night=%s hidden=%s", 
+                    self.guild.id, seer.user_id, target_id, faction.value, self.night_number, is_hidden_wolf_sister)
+        
+        await self.port.notify(seer, message, urgent=True)
+        
+        # Track seer wolf streak for achievement
+        if faction == Alignment.WEREWOLF:
+            seer.seer_wolf_streak += 1
+        else:
+            seer.seer_wolf_streak = 0
+        
+        logger.info("Seer peek | guild=%s seer=%s target=%s faction=%s streak=%s", self.guild.id, seer.user_id, target_id, faction, seer.seer_wolf_streak)
+
+    async def _handle_witch(self, witch: PlayerState, killed_id: Optional[int]) -> Optional[int]:
+        role = witch.role
+        heal_available = getattr(role, "heal_available", True)
+        kill_available = getattr(role, "kill_available", True)
+        saved = False
+        
+        logger.info("Witch action start | guild=%s witch=%s night=%s heal_available=%s kill_available=%s killed_id=%s", 
+                    self.guild.id, witch.user_id, self.night_number, heal_available, kill_available, killed_id)
+        
+        if killed_id and heal_available:
+            logger.info("Witch asking to heal | guild=%s witch=%s killed_id=%s", 
+                        self.guild.id, witch.user_id, killed_id)
+            choice = await self._prompt_dm_choice(
+                witch,
+                title="Phù thủy",
+                description="Một người vừa bị tấn công. Bạn có muốn cứu?",
+                options={1: "Cứu"},
+                allow_skip=True,
+            )
+            if choice == 1:
+                saved = True
+                role.heal_available = False  # type: ignore[attr-defined]
+                witch.witch_used_save = True  # Track for achievement
+                await self.port.notify(witch, "Bạn đã dùng bình hồi sinh.", urgent=True)
+                logger.info("Witch used heal potion | guild=%s witch=%s target=%s night=%s", 
+                            self.guild.id, witch.user_id, killed_id, self.night_number)
+            else:
+                logger.info("Witch skipped healing | guild=%s witch=%s night=%s", 
+                            self.guild.id, witch.user_id, self.night_number)
+        else:
+            logger.info("Witch no heal needed | guild=%s witch=%s heal_available=%s killed_id=%s", 
+                        self.guild.id, witch.user_id, heal_available, killed_id)
+        
+        kill_target = None
+        if kill_available:
+            logger.info("Witch asking to poison | guild=%s witch=%s night=%s", 
+                        self.guild.id, witch.user_id, self.night_number)
+            options = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != witch.user_id}
+            logger.info("Witch poison options | guild=%s witch=%s options_count=%s", 
+                        self.guild.id, witch.user_id, len(options))
+            choice = await self._prompt_dm_choice(
+                witch,
+                title="Phù thủy",
+                description="Bạn muốn sử dụng bình độc?",
+                options=options,
+                allow_skip=True,
+            )
+            logger.info("Witch poison choice | guild=%s witch=%s choice=%s", 
+                        self.guild.id, witch.user_id, choice)
+            if choice is not None and choice in options:
+                if choice == witch.user_id and not witch.role.can_self_target():
+                    logger.info("Witch tried self-target without permission | guild=%s witch=%s", 
+                                self.guild.id, witch.user_id)
+                    return None if saved else killed_id
+                kill_target = choice
+                role.kill_available = False  # type: ignore[attr-defined]
+                witch.witch_used_kill = True  # Track for achievement
+                if kill_target == witch.user_id:
+                    witch.role.mark_self_target()
+                    await self.port.notify(witch, "Bạn đã tự kết liễu chính mình.", urgent=True)
+                    logger.info("Witch self-targeted with poison | guild=%s witch=%s night=%s", 
+                                self.guild.id, witch.user_id, self.night_number)
+                logger.info("Witch poison target chosen | guild=%s witch=%s target=%s night=%s", 
+                            self.guild.id, witch.user_id, kill_target, self.night_number)
+            else:
+                logger.info("Witch skipped poison | guild=%s witch=%s night=%s", 
+                            self.guild.id, witch.user_id, self.night_number)
+        else:
+            logger.info("Witch no poison available | guild=%s witch=%s night=%s", 
+                        self.guild.id, witch.user_id, self.night_number)
+        
+        if kill_target:
+            # Check if Pharmacist's antidote saves this target
+            if kill_target == self._pharmacist_antidote_target:
+                await self.port.announce(f"💊 Bình hồi phục của Dược Sĩ đã cứu sống <@{kill_target}> khỏi bình độc của Phù thủy!")
+                logger.info("Pharmacist antidote saved target | guild=%s witch=%s target=%s pharmacist_antidote=%s", 
+                            self.guild.id, witch.user_id, kill_target, self._pharmacist_antidote_target)
+            else:
+                self._pending_deaths.append((kill_target, "witch"))
+                logger.info("Witch used poison | guild=%s witch=%s target=%s", self.guild.id, witch.user_id, kill_target)
+        
+        return None if saved else killed_id
+
+    async def _handle_little_girl(self, little: PlayerState) -> Optional[bool]:
+        """Handle little girl peeking. Returns True if discovered, False/None if not.
+        
+        From night 2, little girl can peek when wolves wake up.
+        There's a small chance (20%) she's discovered if peeking.
+        """
+        # Can only peek from night 2 onwards
+        if self.night_number < 2:
+            return None
+        
+        wolves = [p for p in self.alive_players() if any(r.alignment == Alignment.WEREWOLF for r in p.roles)]
+        if not wolves:
+            return None
+        
+        # Ask if she wants to peek
+        can_peek = await self._prompt_dm_choice(
+            little,
+            title="Cô bé - Hé mắt nhìn",
+            description="Bạn có muốn hé mắt nhìn khi các Ma Sói thức giấc không?",
+            options={1: "Có, hé mắt", 0: "Không, ngủ tiếp"},
+            allow_skip=False,
+        )
+        
+        if not can_peek:
+            logger.info("Little girl chose not to peek | guild=%s night=%s", self.guild.id, self.night_number)
+            return None
+        
+        wolf_names = ", ".join(p.display_name() for p in wolves)
+        message = "Bạn hé mắt và thấy: " + wolf_names
+        await self.port.notify(little, message)
+        
+        # 20% chance of being discovered while peeking
+        discovered = self.rng.random() < 0.2
+        
+        if discovered:
+            self._little_girl_peeking = little.user_id
+            logger.info("Little girl discovered peeking | guild=%s night=%s chance=20%%", self.guild.id, self.night_number)
+            # Notify wolves that they spotted someone peeking
+            await self.port.tell_wolves(
+                "⚠️ **Cảnh báo:** Các bạn phát hiện có ai đó đang hé mắt nhìn các bạn! "
+                "Bạn muốn thay đổi mục tiêu và giết người đó thay thế không?"
+            )
+            return True
+        else:
+            logger.info("Little girl peeked undetected | guild=%s night=%s", self.guild.id, self.night_number)
+            return False
+
+    async def _handle_raven(self, raven: PlayerState) -> None:
+        options = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != raven.user_id}
+        if not options:
+            return
+        choice = await self._prompt_dm_choice(
+            raven,
+            title="Con quạ nguyền rủa",
+            description="Chọn một người sẽ bị cộng thêm 2 phiếu vào sáng mai.",
+            options=options,
+            allow_skip=True,
+        )
+        if choice is None or choice not in options:
+            return
+        target = self.players.get(choice)
+        if target:
+            target.marked_by_raven = True
+            await self.port.notify(raven, f"Bạn đã nguyền {target.display_name()}.")
+            logger.info("Raven marked target | guild=%s raven=%s target=%s", self.guild.id, raven.user_id, target.user_id)
+
+    async def _handle_piper(self, piper: PlayerState) -> None:
+        self._piper_id = piper.user_id
+        # The role picks and charms through the port (_prompt_dm_choice / _charm)
+        await piper.role.on_night(self, piper, self.night_number)
+
+    async def _handle_white_wolf(self, white_wolf: PlayerState) -> Optional[int]:
+        if not white_wolf.alive:
+            return None
+        if (self.night_number % 2) != 0:
+            return None
+        options = {p.user_id: p.display_name() for p in self.alive_players() if p.user_id != white_wolf.user_id and any(r.alignment == Alignment.WEREWOLF for r in p.roles)}
+        if not options:
+            return None
+        choice = await self._prompt_dm_choice(
+            white_wolf,
+            title="Sói trắng",
+            description="Bạn có thể loại bỏ một đồng loại.",
+            options=options,
+            allow_skip=True,
+        )
+        if choice is None or choice not in options:
+            return None
+        if choice == white_wolf.user_id and not white_wolf.role.can_self_target():
+            return None
+        if choice == white_wolf.user_id:
+            white_wolf.role.mark_self_target()
+        logger.info("White wolf acted | guild=%s player=%s target=%s", self.guild.id, white_wolf.user_id, choice)
+        return choice
+
+    async def _handle_pyromaniac(self, pyro: PlayerState) -> None:
+        role = pyro.role
+        if not role or getattr(role, "ignited", False):
+            return
+        options = {p.user_id: p.display_name() for p in self.alive_players()}
+        choice = await self._prompt_dm_choice(
+            pyro,
+            title="Kẻ phóng hỏa",
+            description="Bạn muốn thiêu rụi ngôi nhà của ai? (chỉ một lần)",
+            options=options,
+            allow_skip=True,
+        )
+        if choice is None or choice not in options:
+            return
+        if choice == pyro.user_id and not pyro.role.can_self_target():
+            return
+        role.ignited = True  # type: ignore[attr-defined]
+        if choice == pyro.user_id:
+            pyro.role.mark_self_target()
+            await self.port.notify(pyro, "Bạn đã đốt chính ngôi nhà của mình.")
+        self._pending_deaths.append((choice, "pyro"))
+        logger.info("Pyromaniac ignited | guild=%s pyro=%s target=%s", self.guild.id, pyro.user_id, choice)
+
+    async def _handle_moon_maiden(self, moon_maiden: PlayerState) -> None:
+        """Handle Moon Maiden's ability to disable a target's night abilities."""
+        role = moon_maiden.role
+        if not role:
+            return
+        
+        # Get alive players, excluding self and last target
+        alive = self.alive_players()
+        options = {
+            p.user_id: p.display_name() 
+            for p in alive 
+            if p.user_id != moon_maiden.user_id 
+            and p.user_id != getattr(role, "last_target_id", None)
+        }
+        
+        if not options:
+            return
+        
+        choice = await self._prompt_dm_choice(
+            moon_maiden,
+            title="Nguyệt Nữ",
+            description="Đêm nay, bạn muốn vô hiệu hóa kĩ năng ban đêm của ai?",
+            options=options,
+            allow_skip=True,
+        )
+        
+        if choice is None or choice not in options:
+            return
+        
+        role.last_target_id = choice  # type: ignore[attr-defined]
+        self._moon_maiden_disabled = choice
+        
+        target = self.players.get(choice)
+        if target:
+            await self.port.notify(
+                target,
+                "Nguyệt Nữ đã chọn bạn làm mục tiêu. Kĩ năng ban đêm của bạn sẽ bị vô hiệu hóa!"
+            )
+        
+        logger.info("Moon Maiden disabled | guild=%s maiden=%s target=%s", self.guild.id, moon_maiden.user_id, choice)
+
+    async def _handle_hypnotist(self, hypnotist: PlayerState) -> None:
+        """Handle Hypnotist's ability to charm a target. If Hypnotist dies, charmed target dies instead."""
+        role = hypnotist.role
+        if not role:
+            return
+        
+        # Get alive players, excluding self and last target
+        alive = self.alive_players()
+        options = {
+            p.user_id: p.display_name() 
+            for p in alive 
+            if p.user_id != hypnotist.user_id 
+            and p.user_id != getattr(role, "last_target_id", None)
+        }
+        
+        if not options:
+            return
+        
+        choice = await self._prompt_dm_choice(
+            hypnotist,
+            title="Cổ Hoặc Sư",
+            description="Hãy chọn 1 người để mê hoặc. Nếu bạn chết đêm nay, họ sẽ chết thay bạn.",
+            options=options,
+            allow_skip=True,
+        )
+        
+        if choice is None or choice not in options:
+            return
+        
+        role.last_target_id = choice  # type: ignore[attr-defined]
+        role.charmed_target_id = choice  # type: ignore[attr-defined]
+        self._hypnotist_charm_target = choice
+        
+        target = self.players.get(choice)
+        if target:
+            await self.port.notify(
+                hypnotist,
+                f"Bạn đã mê hoặc {target.display_name()}. Nếu bạn chết đêm nay, họ sẽ chết thay bạn."
+            )
+            await self.port.notify(
+                target,
+                "Bạn đã bị Cổ Hoặc Sư mê hoặc! Nếu Cổ Hoặc Sư chết đêm nay, bạn sẽ chết thay họ."
+            )
+        
+        logger.info("Hypnotist charmed | guild=%s hypnotist=%s target=%s", self.guild.id, hypnotist.user_id, choice)
+
+    def _handle_elder_resistance(self, target_id: int) -> bool:
+        target = self.players.get(target_id)
+        if not target:
+            return False
+        
+        # Consumes the Elder's free bite and tracks elder_bitten for achievements
+        if not rules.elder_resists(target):
+            return False
+
+        asyncio.create_task(self.port.notify(target, "Bạn bị ma sói tấn công nhưng vẫn sống."))
+        logger.info("Elder resisted wolf attack | guild=%s elder=%s", self.guild.id, target.user_id)
+        return True
+
+    # ==================== DEATHS ====================
+
+    async def _resolve_pending_deaths(self, phase_label: str) -> None:
+        if not self._pending_deaths:
+            return
+        # Deduplicate by player id while keeping first cause
+        unique = rules.unique_deaths(self._pending_deaths)
+        
+        # Store the list of died player IDs for wild child check BEFORE clearing
+        died_players = list(unique.keys())
+        
+        # SECURITY: Only clear after we have copied the list
+        self._pending_deaths.clear()
+        
+        try:
+            for pid, cause in unique.items():
+                player = self.players.get(pid)
+                if not player:
+                    logger.warning("Player not found for death resolution | guild=%s pid=%s", 
+                                   self.guild.id, pid)
+                    continue
+                # SECURITY: Double-check player is alive and not already marked dead
+                if not player.alive or player.death_pending:
+                    logger.warning("Skipping death resolution for already-dead player | guild=%s player=%s", 
+                                   self.guild.id, pid)
+                    continue
+                player.alive = False
+                player.death_pending = True
+                try:
+                    await self._handle_death(player, cause=cause)
+                except Exception as e:
+                    logger.error(
+                        "Error in _handle_death | guild=%s player=%s cause=%s error=%s",
+                        self.guild.id, pid, cause, str(e), exc_info=True
+                    )
+                    # Continue processing other deaths even if one fails
+        except Exception as e:
+            logger.error(
+                "Error in _resolve_pending_deaths | guild=%s error=%s",
+                self.guild.id, str(e), exc_info=True
+            )
+        
+        # Check if any wild children should transform
+        try:
+            await self._check_wild_child_transformation(died_players)
+        except Exception as e:
+            logger.error(
+                "Error in _check_wild_child_transformation | guild=%s error=%s",
+                self.guild.id, str(e), exc_info=True
+            )
+
+    async def _check_wild_child_transformation(self, died_player_ids: List[int]) -> None:
+        """Check if any Wild Child should transform into werewolf."""
+        from ..roles.villagers.wild_child import WildChild
+        
+        for player in self.players.values():
+            if not player.alive or not player.roles:
+                continue
+            
+            # Check if this player is a Wild Child
+            wild_child = None
+            for role in player.roles:
+                if role.metadata.name == "Đứa Con Hoang":
+                    wild_child = role
+                    break
+            
+            if not wild_child:
+                continue
+            
+            # Get the wild child role and check if chosen one died
+            if not isinstance(wild_child, WildChild):
+                continue
+            
+            # Check if the chosen one died
+            if wild_child.chosen_one_id in died_player_ids:
+                await wild_child.check_transformation(self, player, wild_child.chosen_one_id)
+
+        # Check if Demon Wolf cursed someone
+        if self._demon_wolf_curse_target:
+            target_id = self._demon_wolf_curse_target
+            target = self.players.get(target_id)
+            
+            if target and target.alive:
+                # Add Werewolf role to the cursed player
+                from ..roles.werewolves.werewolf import Werewolf
+                target.add_role(Werewolf())
+                
+                # Add to wolf thread
+                await self.port.join_wolves(target)
+                
+                # Notify the cursed player
+                await self.port.notify(
+                    target,
+                    "Bạn đã bị Sói Quỷ nguyền rủa! Bạn sẽ trở thành Ma Sói từ đêm tiếp theo. Bạn vẫn giữ vai trò cũ."
+                )
+                
+                # Notify wolves about new member
+                await self.port.tell_wolves(
+                    f"{target.display_name()} đã được nguyền rủa thành Ma Sói! Họ sẽ gia nhập bầy từ đêm tiếp theo."
+                )
+            
+            self._demon_wolf_curse_target = None
+
+    async def _transform_wolf_sister(self, sister: PlayerState, dead_brother: PlayerState) -> None:
+        """Transform Wolf Sister into full werewolf when her brother dies."""
+        if not sister.roles:
+            return
+        
+        # Get the sister's role
+        from ..roles.werewolves.wolf_sister import WolfSister
+        sister_role = sister.roles[0]
+        
+        if not isinstance(sister_role, WolfSister):
+            return
+        
+        # Mark sister as transformed: her alignment becomes werewolf (WolfSister.alignment)
+        sister_role.is_transformed = True
+        sister.refresh_index()
+        
+        # Notify the sister
+        await self.port.notify(
+            sister,
+            f"🐺💢 **TỨC GIẬN!** Anh sói {dead_brother.display_name()} đã chết!\n"
+            f"Bạn giận dữ gia nhập phe sói ngay lập tức. Bây giờ bạn sẽ dậy cùng phe sói mỗi đêm để giết người!"
+        )
+        
+        # Notify all wolves about the new member
+        wolves = [p for p in self.alive_players() if any(r.alignment == Alignment.WEREWOLF for r in p.roles)]
+        wolf_names = ", ".join(p.display_name() for p in wolves)
+        
+        await self.port.tell_wolves(
+            f"🐺💢 **Sói Em {sister.display_name()} tức giận gia nhập phe sói!**\n"
+            f"Đồng đội sói hiện tại: {wolf_names}"
+        )
+        
+        logger.info(
+            "Wolf Sister transformed to werewolf | guild=%s sister=%s brother=%s",
+            self.guild.id,
+            sister.user_id,
+            dead_brother.user_id,
+        )
+
+    async def _handle_mayor_succession(self, player: PlayerState) -> None:
+        """Transfer Mayor status to another player if dying player is a Mayor."""
+        if not player.mayor:
+            return
+        
+        alive = [p for p in self.alive_players() if p.user_id != player.user_id]
+        if not alive:
+            return
+        
+        # Remove mayor status from dying player
+        player.mayor = False
+        player.vote_weight = 1
+        
+        options = {p.user_id: p.display_name() for p in alive}
+        choice = await self._prompt_dm_choice(
+            player,
+            title="Trưởng Làng - Chọn người kế nhiệm",
+            description="Bạn sắp chết. Hãy chọn người kế nhiệm chức Trưởng Làng.",
+            options=options,
+            allow_skip=False,
+            timeout=30,
+        )
+        
+        if choice and choice in options:
+            successor = self.players.get(choice)
+            if successor and successor.alive:
+                successor.mayor = True
+                successor.vote_weight = 2
+                
+                await self.port.notify(successor, f"Bạn đã được {player.display_name()} chỉ định làm Trưởng Làng kế nhiệm! Phiếu bạn tính x2 và bạn phá vỡ hòa phiếu.")
+                await self.port.announce(f"{successor.display_name()} đã trở thành Trưởng Làng mới!")
+
+    async def _handle_death(self, player: PlayerState, *, cause: str) -> None:
+        """Handle player death: mark as dead, disable permissions, trigger role death effects."""
+        # If this player is a Hypnotist with a live charmed target, the charmed target dies instead
+        charmed_player = rules.charm_redirect(self.players, player)
+        if charmed_player:
+            charmed_id = charmed_player.user_id
+            # Kill the charmed player instead of the Hypnotist (already marked dead by the caller)
+            player.alive = True
+            player.death_pending = False
+            charmed_player.alive = False
+            charmed_player.death_pending = True
+            
+            # Notify the Hypnotist that charm protected them
+            await self.port.notify(
+                player,
+                f"Nước cờ mê hoặc của bạn đã hoạt động! {charmed_player.display_name()} chết thay bạn."
+            )
+            
+            # Trigger death effects for charmed player
+            try:
+                await self._handle_death(charmed_player, cause="hypnotist_charm")
+            except Exception as e:
+                logger.error(
+                    "Error in charmed target death | guild=%s hypnotist=%s target=%s error=%s",
+                    self.guild.id, player.user_id, charmed_id, str(e), exc_info=True
+                )
+            
+            # Hypnotist survives this death, return without marking them dead
+            return
+        
+        # Record death for end-of-game summary with phase label and number
+        if self.phase == Phase.NIGHT:
+            phase_label = f"Đêm {self.night_number}"
+        else:
+            phase_label = f"Ngày {self.day_number}"
+        self._record_death(player.user_id, cause, phase_label)
+        
+        # Mark player as dead
+        player.alive = False
+        
+        # Track if a werewolf dies during the day (for Fire Wolf ability)
+        if self.phase == Phase.DAY and any(r.alignment == Alignment.WEREWOLF for r in player.roles):
+            self._wolves_died_today.append(player.user_id)
+            logger.info("Wolf died during day | guild=%s player=%s day=%s total_wolves_today=%s", 
+                       self.guild.id, player.user_id, self.day_number, len(self._wolves_died_today))
+        
+        # Disable dead player permissions immediately
+        await self._restrict_dead_player(player)
+        
+        # Handle Mayor succession if player is a Mayor (must be before role on_death for prompt)
+        if player.mayor:
+            await self._handle_mayor_succession(player)
+        
+        # Trigger role death effects for all roles
+        for role in player.roles:
+            await role.on_death(self, player, cause)
+        
+        # If lover exists and is alive, they also die
+        lover = rules.lover_to_follow(self.players, player)
+        if lover:
+            # DRAMATIC LOVER DEATH REVEAL
+            await self.port.announce(
+                f"💔 **TÌNH NHÂN {lover.display_name()} đã đi theo {player.display_name()}!**\n\n"
+                "_Khi một người chết, người còn lại không thể sống thiếu nhau..._ \n\n"
+                "💀 Cả hai cùng ra đi..."
+            )
+            
+            lover.alive = False
+            lover.death_pending = True
+            await self._handle_death(lover, cause="lover")
+        
+        # Check if Wolf Brother died - trigger Wolf Sister transformation if alive
+        wolf_brother_role = None
+        for role in player.roles:
+            if hasattr(role, '__class__') and role.__class__.__name__ == 'WolfBrother':
+                wolf_brother_role = role
+                break
+        
+        if wolf_brother_role and self._wolf_sister_id:
+            sister = self.players.get(self._wolf_sister_id)
+            if sister and sister.alive:
+                logger.info("Wolf Brother died, triggering sister transformation | guild=%s brother=%s sister=%s", 
+                           self.guild.id, player.user_id, sister.user_id)
+                await self._transform_wolf_sister(sister, player)
+        
+        logger.info("Player died | guild=%s player=%s cause=%s", self.guild.id, player.display_name(), cause)
@@ -0,0 +1,119 @@
+"""I/O port between the Werewolf rules and whatever plays the game.
+
+The night sequence, role actions and death cascades (`night.NightRules`) only
+talk to a `GamePort`. `WerewolfGame` plugs in a Discord transport (DM prompts,
+vote sessions, channel and wolf thread messages); `RandomPort` is the fake
+transport used by the simulation harness: it answers every prompt from a
+seeded RNG and counts the calls a real transport would have made.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from typing import Any, Dict, Optional, Protocol, Sequence
+
+from .state import PlayerState
+
+
+class GamePort(Protocol):
+    """Everything the rules need from the outside world."""
+
+    async def choose(
+        self,
+        player: PlayerState,
+        *,
+        title: str,
+        description: str,
+        options: Dict[int, str],
+        allow_skip: bool,
+        timeout: int = 30,
+    ) -> Optional[int]:
+        """Ask one player to pick an option key (None = skipped / timed out)."""
+        ...
+
+    async def vote(
+        self,
+        *,
+        title: str,
+        description: str,
+        voters: Sequence[int],
+        options: Dict[int, str],
+        duration: int,
+        allow_skip: bool,
+    ) -> Optional[int]:
+        """Run a vote among the wolves. Returns the winning option key, or None on a tie."""
+        ...
+
+    async def notify(self, player: PlayerState, text: Optional[str] = None, *, embed: Any = None, urgent: bool = False) -> bool:
+        """Private message to one player. urgent jumps the DM queue. False if it could not be delivered."""
+        ...
+
+    async def announce(self, text: Optional[str] = None, *, embed: Any = None) -> None:
+        """Public message to the game channel."""
+        ...
+
+    async def tell_wolves(self, text: str) -> None:
+        """Message to the wolves' private channel."""
+        ...
+
+    async def join_wolves(self, player: PlayerState) -> None:
+        """Give a player access to the wolves' private channel."""
+        ...
+
+
+class RandomPort:
+    """Seeded fake transport: random choices, random votes, no I/O."""
+
+    def __init__(self, rng: random.Random, skip_chance: float = 0.1) -> None:
+        self.rng = rng
+        self.skip_chance = skip_chance
+        self.calls: Counter = Counter()
+
+    async def choose(
+        self,
+        player: PlayerState,
+        *,
+        title: str,
+        description: str = "",
+        options: Dict[int, str],
+        allow_skip: bool,
+        timeout: int = 30,
+    ) -> Optional[int]:
+        self.calls["choose"] += 1
+        if not options or (allow_skip and self.rng.random() < self.skip_chance):
+            return None
+        return self.rng.choice(list(options))
+
+    async def vote(
+        self,
+        *,
+        title: str,
+        description: str = "",
+        voters: Sequence[int],
+        options: Dict[int, str],
+        duration: int = 0,
+        allow_skip: bool = False,
+    ) -> Optional[int]:
+        self.calls["vote"] += 1
+        if not options or not voters:
+            return None
+        keys = list(options)
+        tally = Counter(self.rng.choice(keys) for _ in voters)
+        (top, top_count), *rest = tally.most_common()
+        if rest and rest[0][1] == top_count:
+            return None
+        return top
+
+    async def notify(self, player: PlayerState, text: Optional[str] = None, *, embed: Any = None, urgent: bool = False) -> bool:
+        self.calls["notify"] += 1
+        return True
+
+    async def announce(self, text: Optional[str] = None, *, embed: Any = None) -> None:
+        self.calls["announce"] += 1
+
+    async def tell_wolves(self, text: str) -> None:
+        self.calls["tell_wolves"] += 1
+
+    async def join_wolves(self, player: PlayerState) -> None:
+        self.calls["join_wolves"] += 1
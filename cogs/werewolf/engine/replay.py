@@ -0,0 +1,161 @@
+"""Compact replay log of a Werewolf game, for post-game analytics.
+
+A `ReplayLog` collects the events that matter for balancing: the role deal,
+every DM choice (night actions), every vote, every death with its cause, and
+how long each timed phase actually took against its configured duration. When
+the game ends the log becomes one JSON line appended to a gzip file per month
+under `REPLAY_DIR`; each append is its own gzip member, so the files are
+append-only and still read as one stream. `scripts/analyze_werewolf_replays.py`
+aggregates them into role win rates, phase timings and vote patterns for
+tuning `GameSettings`.
+
+Events are `[t, kind, payload]` with t in tenths of a second since the start
+of the game.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+from .state import GameSettings, PlayerState
+
+REPLAY_DIR = "./data/werewolf_replays"
+REPLAY_VERSION = 1
+# Serializes appends to the replay files (write_records runs in worker threads)
+_write_lock = threading.Lock()
+
+
+class ReplayLog:
+    """Events of one game, written out once at the end."""
+
+    def __init__(self, guild_id: int) -> None:
+        self.guild_id = guild_id
+        self.started_at = time.time()
+        self._t0 = time.monotonic()
+        self.events: List[list] = []
+
+    def _now(self) -> int:
+        return int((time.monotonic() - self._t0) * 10)
+
+    def record(self, kind: str, **payload: Any) -> None:
+        self.events.append([self._now(), kind, payload])
+
+    def assign(self, players: Mapping[int, PlayerState]) -> None:
+        self.record("assign", roles={str(pid): [r.metadata.name for r in p.roles] for pid, p in players.items()})
+
+    def choice(self, actor_id: int, title: str, choice: Optional[int], timeout: int, seconds: float) -> None:
+        """A DM prompt answered (or not) by actor_id after `seconds`."""
+        self.record("choice", actor=actor_id, title=title, choice=choice, timeout=timeout, secs=round(seconds, 1))
+
+    def vote(
+        self,
+        title: str,
+        votes_by_voter: Mapping[int, Optional[int]],
+        winner: Optional[int],
+        tie: bool,
+        duration: int,
+        last_vote: Optional[float],
+    ) -> None:
+        """A finished vote; last_vote is when the last ballot came in (seconds after start)."""
+        self.record(
+            "vote",
+            title=title,
+            votes={str(voter): target for voter, target in votes_by_voter.items()},
+            winner=winner,
+            tie=tie,
+            duration=duration,
+            last_vote=None if last_vote is None else round(last_vote, 1),
+        )
+
+    def death(self, player_id: int, cause: str, phase_label: str) -> None:
+        self.record("death", pid=player_id, cause=cause, phase=phase_label)
+
+    @contextlib.contextmanager
+    def phase(self, name: str, number: int, planned: Optional[int] = None) -> Iterator[None]:
+        """Time the enclosed block as one phase (planned = configured seconds, if any)."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record("phase", name=name, n=number, planned=planned, secs=round(time.monotonic() - start, 1))
+
+    def finish(
+        self,
+        *,
+        winner: Optional[str],
+        players: Mapping[int, PlayerState],
+        expansions: Sequence[str],
+        settings: Mapping[str, Any],
+        nights: int,
+        days: int,
+    ) -> Dict[str, Any]:
+        """The record written for this game."""
+        return {
+            "v": REPLAY_VERSION,
+            "guild_id": self.guild_id,
+            "started_at": int(self.started_at),
+            "secs": round(time.monotonic() - self._t0, 1),
+            "winner": winner,
+            "nights": nights,
+            "days": days,
+            "expansions": sorted(expansions),
+            "settings": dict(settings),
+            "players": {
+                str(pid): {
+                    "roles": [r.metadata.name for r in p.roles],
+                    "alignment": p.get_alignment_priority().value,
+                    "alive": p.alive,
+                }
+                for pid, p in players.items()
+            },
+            "events": self.events,
+        }
+
+
+def settings_snapshot(settings: GameSettings) -> Dict[str, Any]:
+    """The numeric/boolean GameSettings (durations and toggles) a game ran with."""
+    return {
+        f.name: getattr(settings, f.name)
+        for f in dataclasses.fields(settings)
+        if isinstance(getattr(settings, f.name), (int, float))
+    }
+
+
+def replay_path(directory: str = REPLAY_DIR, when: Optional[float] = None) -> str:
+    return os.path.join(directory, time.strftime("%Y-%m", time.gmtime(when)) + ".jsonl.gz")
+
+
+def write_records(records: Iterable[Dict[str, Any]], directory: str = REPLAY_DIR) -> str:
+    """Append records as JSON lines to this month's replay file. Returns its path."""
+    path = replay_path(directory)
+    os.makedirs(directory, exist_ok=True)
+    payload = "".join(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n" for record in records)
+    # Games finishing together append from several worker threads: one gzip member at a time
+    with _write_lock, gzip.open(path, "at", encoding="utf-8") as fh:
+        fh.write(payload)
+    return path
+
+
+async def append_record(record: Dict[str, Any], directory: str = REPLAY_DIR) -> str:
+    """write_records for one record, off the event loop."""
+    return await asyncio.to_thread(write_records, [record], directory)
+
+
+def iter_records(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Every game record in the given replay files (files or directories)."""
+    for path in paths:
+        files = sorted(glob.glob(os.path.join(path, "*.jsonl.gz"))) if os.path.isdir(path) else [path]
+        for file in files:
+            with gzip.open(file, "rt", encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        yield json.loads(line)
@@ -0,0 +1,302 @@
+"""Discord-free rules for the Werewolf game.
+
+Everything here is plain computation over `PlayerState` objects: no awaits,
+no Discord objects, no logging of guild context. `WerewolfGame` calls these
+for the decisions and keeps the messaging around them; the headless engine in
+`simulation.py` calls the same functions, so seeded simulations exercise the
+rules the live game uses.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from ..roles import get_role_class
+from ..roles.base import Alignment, Expansion, Role
+from .role_config import RoleConfig
+from .state import PlayerIndex, PlayerState
+
+# Role names used by the rules (must match RoleMetadata.name)
+VILLAGER = "Dân Làng"
+THIEF = "Tên Trộm"
+HYPNOTIST = "Cổ Hoặc Sư"
+ELDER = "Già Làng"
+# Neutral killers that win only as the last player alive -> WinResult reason
+SOLO_KILLERS = {"Sói Trắng": "white wolf", "Kẻ Phóng Hỏa": "pyromaniac"}
+
+
+# ==================== ROLE DEALING ====================
+
+def build_role_layout(player_count: int, expansions: Set[Expansion], has_thief: bool = False) -> List[type[Role]]:
+    """Role classes for a game, from RoleConfig's distribution.
+
+    With a thief in play the layout holds two extra villager cards for the
+    thief to choose from. Unknown role names fall back to villagers.
+    """
+    target_count = player_count + 2 if has_thief else player_count
+    role_names = RoleConfig.get_role_list(player_count, expansions)
+    if has_thief:
+        role_names.extend([VILLAGER, VILLAGER])
+
+    layout: List[type[Role]] = []
+    for role_name in role_names[:target_count]:
+        try:
+            layout.append(get_role_class(role_name))
+        except KeyError:
+            layout.append(get_role_class(VILLAGER))
+    return layout
+
+
+def deal_roles(
+    player_ids: Iterable[int],
+    expansions: Set[Expansion],
+    rng: Optional[random.Random] = None,
+) -> Tuple[Dict[int, Role], List[Role]]:
+    """Shuffle players and layout and deal one role each.
+
+    Returns:
+        (player_id -> role, thief extra cards). Extra cards are empty unless
+        a thief was dealt.
+    """
+    shuffle = (rng or random).shuffle
+    ids = list(player_ids)
+    shuffle(ids)
+
+    layout = build_role_layout(len(ids), expansions)
+    shuffle(layout)
+    if any(cls.metadata.name == THIEF for cls in layout):
+        # Rebuild with the two extra cards the thief chooses from
+        layout = build_role_layout(len(ids), expansions, has_thief=True)
+        shuffle(layout)
+
+    assignments = {player_id: role_cls() for player_id, role_cls in zip(ids, layout)}
+    extra_cards: List[Role] = []
+    if len(layout) > len(ids) and any(role.metadata.name == THIEF for role in assignments.values()):
+        extra_cards = [role_cls() for role_cls in layout[len(ids):]]
+    return assignments, extra_cards
+
+
+def thief_options(extra_cards: Sequence[Role]) -> Dict[int, str]:
+    """Cards the thief may pick: only the wolf cards if any are present."""
+    if any(card.alignment == Alignment.WEREWOLF for card in extra_cards):
+        return {idx: card.metadata.name for idx, card in enumerate(extra_cards) if card.alignment == Alignment.WEREWOLF}
+    return {idx: card.metadata.name for idx, card in enumerate(extra_cards)}
+
+
+# ==================== LOOKUPS ====================
+
+def is_alive(player: PlayerState) -> bool:
+    return player.alive and not player.death_pending
+
+
+def can_act(player: PlayerState) -> bool:
+    """Alive, not pending death and not disabled by Fire Wolf."""
+    return player.alive and not player.death_pending and not player.skills_disabled
+
+
+def has_alignment(player: PlayerState, alignment: Alignment) -> bool:
+    return any(r.alignment == alignment for r in player.roles)
+
+
+def is_pack_wolf(player: PlayerState) -> bool:
+    """Werewolf-aligned and part of the pack (an Avenger siding with wolves is not)."""
+    if not has_alignment(player, Alignment.WEREWOLF):
+        return False
+    for role in player.roles:
+        if role.__class__.__name__ == "Avenger" and getattr(role, "chosen_side", None) == Alignment.WEREWOLF:
+            return False
+    return True
+
+
+def find_role_holder(players: Mapping[int, PlayerState], role_name: str) -> Optional[PlayerState]:
+    """First player holding role_name, dead or alive."""
+    for player in players.values():
+        for role in player.roles:
+            if role.metadata.name == role_name:
+                return player
+    return None
+
+
+def find_role(player: PlayerState, role_name: str) -> Optional[Role]:
+    for role in player.roles:
+        if role.metadata.name == role_name:
+            return role
+    return None
+
+
+# ==================== NIGHT RESOLUTION ====================
+
+def resolve_wolf_attack(target_id: Optional[int], protected_id: Optional[int]) -> Optional[int]:
+    """The wolves' victim after the guard's protection (None if saved or no target)."""
+    if target_id is None or target_id == protected_id:
+        return None
+    return target_id
+
+
+def elder_resists(player: PlayerState) -> bool:
+    """Consume the Elder's one free wolf bite. True if this bite is survived."""
+    elder_role = find_role(player, ELDER)
+    if elder_role is None:
+        return False
+    hits = getattr(elder_role, "wolf_hits", 0)
+    if hits >= 1:
+        return False
+    elder_role.wolf_hits = hits + 1  # type: ignore[attr-defined]
+    player.elder_bitten = True
+    return True
+
+
+def unique_deaths(pending: Iterable[Tuple[int, str]]) -> Dict[int, str]:
+    """Deduplicate queued deaths by player, keeping the first cause."""
+    unique: Dict[int, str] = {}
+    for player_id, cause in pending:
+        unique.setdefault(player_id, cause)
+    return unique
+
+
+# ==================== DEATH CASCADES ====================
+
+def charm_redirect(players: Mapping[int, PlayerState], player: PlayerState) -> Optional[PlayerState]:
+    """The player who dies instead of a Hypnotist with an active charm, if any."""
+    for role in player.roles:
+        if role.metadata.name != HYPNOTIST:
+            continue
+        charmed_id = getattr(role, "charmed_target_id", None)
+        charmed = players.get(charmed_id) if charmed_id else None
+        if charmed and charmed.alive and not charmed.death_pending:
+            return charmed
+    return None
+
+
+def lover_to_follow(players: Mapping[int, PlayerState], player: PlayerState) -> Optional[PlayerState]:
+    """The still-alive lover who dies of grief with player, if any."""
+    if not player.lover_id:
+        return None
+    lover = players.get(player.lover_id)
+    return lover if lover and lover.alive else None
+
+
+# ==================== WIN CONDITIONS ====================
+
+@dataclass(slots=True)
+class WinResult:
+    """Outcome of a win check. winner is None for the Angel's solo win."""
+
+    winner: Optional[Alignment]
+    reason: str
+
+
+def evaluate_win(
+    players: Mapping[int, PlayerState],
+    *,
+    angel_won: bool = False,
+    lovers: Set[int] = frozenset(),
+    charmed: Set[int] = frozenset(),
+    piper_id: Optional[int] = None,
+    elder_man_id: Optional[int] = None,
+    elder_man_groups: Tuple[Sequence[int], Sequence[int]] = ((), ()),
+    index: Optional[PlayerIndex] = None,
+) -> Optional[WinResult]:
+    """Check every win condition in priority order. None if the game goes on.
+
+    With a PlayerIndex the alignment counts, alive count and charmed count come
+    straight from the index, so the check does not scan players (the Piper
+    check then relies on PlayerState.charmed matching `charmed`).
+    """
+    if angel_won:
+        return WinResult(None, "angel")
+
+    if index is not None:
+        alive_count = len(index.alive)
+        villagers = list(index.alive_by_alignment[Alignment.VILLAGE].values())
+        wolves = index.alive_by_alignment[Alignment.WEREWOLF]
+        neutrals = index.alive_by_alignment[Alignment.NEUTRAL]
+        charmed_alive = len(index.charmed_alive)
+    else:
+        alive = [p for p in players.values() if is_alive(p)]
+        alive_count = len(alive)
+        villagers = [p for p in alive if has_alignment(p, Alignment.VILLAGE)]
+        wolves = [p for p in alive if has_alignment(p, Alignment.WEREWOLF)]
+        neutrals = [p for p in alive if has_alignment(p, Alignment.NEUTRAL)]
+        charmed_alive = sum(1 for p in alive if p.user_id in charmed)
+
+    # White Wolf and Pyromaniac win as the last player alive; while one lives
+    # neither the village nor the wolves have won yet
+    solo_killers = [
+        SOLO_KILLERS[role.metadata.name]
+        for p in (neutrals.values() if index is not None else neutrals)
+        for role in p.roles
+        if role.metadata.name in SOLO_KILLERS
+    ]
+    if solo_killers and alive_count == 1:
+        return WinResult(Alignment.NEUTRAL, solo_killers[0])
+
+    if not solo_killers:
+        if not wolves and villagers:
+            return WinResult(Alignment.VILLAGE, "no wolves left")
+        if len(wolves) >= len(villagers) and villagers:
+            return WinResult(Alignment.WEREWOLF, f"wolves={len(wolves)} >= villagers={len(villagers)}")
+
+        # 1 wolf vs 1 elder who already used the free bite: the next bite kills
+        if len(wolves) == 1 and len(villagers) == 1 and not neutrals:
+            elder_role = find_role(villagers[0], ELDER)
+            if elder_role is not None and getattr(elder_role, "wolf_hits", 0) >= 1:
+                return WinResult(Alignment.WEREWOLF, "1v1 vs elder already bitten")
+
+        if not villagers and wolves:
+            return WinResult(Alignment.WEREWOLF, "no villagers left")
+
+    if len(lovers) == 2:
+        alive_lovers = [pid for pid in lovers if players.get(pid) and players[pid].alive]
+        if len(alive_lovers) == 2 and alive_count == 2:
+            return WinResult(Alignment.NEUTRAL, "lovers")
+
+    if piper_id:
+        piper = players.get(piper_id)
+        if piper and piper.alive:
+            # Every other living player is charmed
+            piper_counted = 1 if is_alive(piper) else 0
+            piper_charmed = 1 if piper_counted and (piper.charmed if index is not None else piper_id in charmed) else 0
+            if charmed and charmed_alive - piper_charmed == alive_count - piper_counted:
+                return WinResult(Alignment.NEUTRAL, "pied piper")
+
+    group1, group2 = elder_man_groups
+    if elder_man_id and group1 and group2:
+        elder_man = players.get(elder_man_id)
+        if elder_man and elder_man.alive:
+            opposing = group2 if elder_man_id in group1 else group1
+            if not any(players.get(pid) and players[pid].alive for pid in opposing):
+                return WinResult(Alignment.NEUTRAL, "elder man")
+
+    return None
+
+
+def winning_players(
+    players: Mapping[int, PlayerState],
+    result: WinResult,
+    *,
+    lovers: Set[int] = frozenset(),
+    piper_id: Optional[int] = None,
+    elder_man_id: Optional[int] = None,
+) -> Set[int]:
+    """Players (alive or dead) credited with a win.
+
+    An alignment win goes to every player of that alignment. A neutral win
+    goes only to whoever met its condition, not to every neutral.
+    """
+    if result.winner is None:
+        return set()
+    if result.winner != Alignment.NEUTRAL:
+        return {pid for pid, p in players.items() if p.get_alignment_priority() == result.winner}
+    if result.reason == "lovers":
+        return set(lovers)
+    if result.reason == "pied piper" and piper_id:
+        return {piper_id}
+    if result.reason == "elder man" and elder_man_id:
+        return {elder_man_id}
+    if result.reason in SOLO_KILLERS.values():
+        # The last player alive
+        return {pid for pid, p in players.items() if is_alive(p)}
+    return set()
@@ -0,0 +1,327 @@
+"""Headless Werewolf engine and seeded simulation harness.
+
+`HeadlessGame` is a `NightRules` subclass: it deals roles and plays every
+night through the same `_assign_roles`, `_resolve_role_sequence` and
+`_resolve_pending_deaths` as `WerewolfGame`, with all I/O going to a
+`GamePort`. With `RandomPort` there is no network at all, so
+`run_simulations` can play thousands of seeded games in process to measure
+rules throughput and per-phase CPU cost, and to catch regressions in role
+interactions through invariant checks.
+
+Days are reduced to a single lynch vote of the living players; discussion,
+defense, judgment and day-time powers (Judge, Scapegoat, Assassin, ...) are
+not modelled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..roles import load_all_roles
+from ..roles.base import Alignment, Expansion
+from . import rules
+from .night import NightRules, logger as rules_logger
+from .ports import GamePort, RandomPort
+from .state import GameSettings, Phase, PlayerState
+
+load_all_roles()
+
+MAX_ROUNDS = 40
+
+# Logger of the role classes (cogs/werewolf/roles)
+role_logger = logging.getLogger("werewolf")
+
+
+class InvariantError(AssertionError):
+    """A rules invariant was violated during a simulated game."""
+
+
+@dataclass(slots=True)
+class SimMember:
+    """Stand-in for discord.Member: PlayerState only needs id and display_name."""
+
+    id: int
+    display_name: str
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    async def send(self, *args: Any, **kwargs: Any) -> None:
+        """Roles DM some players directly; there is nobody to deliver to."""
+
+
+@dataclass(slots=True)
+class SimGuild:
+    """Stand-in for discord.Guild: the rules only log its id."""
+
+    id: int
+
+
+class _PortChannel:
+    """Stand-in for the game channel: roles post to it directly, forwarded to port.announce."""
+
+    def __init__(self, port: GamePort) -> None:
+        self._port = port
+
+    async def send(self, content: Optional[str] = None, *, embed: Any = None, **kwargs: Any) -> None:
+        await self._port.announce(content, embed=embed)
+
+
+class _ErrorCounter(logging.Handler):
+    """Collects the errors a logger recorded (the rules and roles log and swallow them)."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.ERROR)
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+@dataclass(slots=True)
+class GameRecord:
+    """Outcome of one simulated game."""
+
+    seed: int
+    player_count: int
+    winner: Optional[Alignment]
+    reason: str
+    nights: int
+    days: int
+    deaths: List[Tuple[int, str, str]]
+    roles: Dict[int, str]
+    winners: Set[int]
+    phase_seconds: Dict[str, float]
+
+
+class HeadlessGame(NightRules):
+    """One Werewolf match driven entirely through a GamePort."""
+
+    def __init__(
+        self,
+        player_count: int,
+        port: GamePort,
+        rng: random.Random,
+        expansions: Optional[Set[Expansion]] = None,
+        seed: int = 0,
+    ) -> None:
+        self.port = port
+        self.seed = seed
+        self.settings = GameSettings(expansions=set(expansions or {Expansion.BASIC}))
+        self.guild = SimGuild(seed)
+        self.text_channel = self.channel = _PortChannel(port)
+        self.bot = None
+        self._wolf_thread = None
+        self.phase = Phase.LOBBY
+        self.night_number = 0
+        self.day_number = 0
+        self._init_rule_state(rng)
+        self.players: Dict[int, PlayerState] = {}
+        for pid in range(1, player_count + 1):
+            player = PlayerState(member=SimMember(pid, f"P{pid}"))
+            self.players[pid] = player
+            self._index.track(player)
+        self.phase_seconds: Dict[str, float] = defaultdict(float)
+
+    # ==================== DRIVER ====================
+
+    async def play(self) -> GameRecord:
+        start = time.perf_counter()
+        await self._assign_roles()
+        self.phase_seconds["setup"] += time.perf_counter() - start
+
+        result: Optional[rules.WinResult] = None
+        for _ in range(MAX_ROUNDS):
+            start = time.perf_counter()
+            await self._run_night()
+            self.phase_seconds["night"] += time.perf_counter() - start
+            result = self._check_win()
+            if result:
+                break
+
+            start = time.perf_counter()
+            await self._run_day()
+            self.phase_seconds["day"] += time.perf_counter() - start
+            result = self._check_win()
+            if result:
+                break
+        else:
+            raise InvariantError(f"seed={self.seed}: no winner after {MAX_ROUNDS} rounds")
+
+        return GameRecord(
+            seed=self.seed,
+            player_count=len(self.players),
+            winner=result.winner,
+            reason=result.reason,
+            nights=self.night_number,
+            days=self.day_number,
+            deaths=self._death_log,
+            roles={pid: p.role.metadata.name for pid, p in self.players.items() if p.role},
+            winners=rules.winning_players(
+                self.players, result, lovers=self._lovers, piper_id=self._piper_id, elder_man_id=self._elder_man_id
+            ),
+            phase_seconds=dict(self.phase_seconds),
+        )
+
+    def _check_win(self) -> Optional[rules.WinResult]:
+        result = self._win_result()
+        scanned = rules.evaluate_win(
+            self.players,
+            angel_won=self._angel_won,
+            lovers=self._lovers,
+            charmed=self._charmed,
+            piper_id=self._piper_id,
+            elder_man_id=self._elder_man_id,
+            elder_man_groups=(self._elder_man_group1, self._elder_man_group2),
+        )
+        if result != scanned:
+            raise InvariantError(f"seed={self.seed}: indexed win check {result} != scanned {scanned}")
+        if result is None and not self._index.alive:
+            # evaluate_win has no rule for an empty board; report it instead of looping
+            return rules.WinResult(None, "no survivors")
+        return result
+
+    # ==================== PHASES ====================
+
+    async def _run_night(self) -> None:
+        """WerewolfGame._run_night without the channel, voice and thread transitions."""
+        self.phase = Phase.NIGHT
+        self.night_number += 1
+        for player in self.alive_players():
+            player.reset_night_flags()
+        await self._resolve_role_sequence(first_night=self.night_number == 1)
+        await self._resolve_pending_deaths("night")
+        self._check_invariants()
+
+    async def _run_day(self) -> None:
+        """Dawn bookkeeping of WerewolfGame._run_day, then one plain lynch vote."""
+        self.phase = Phase.DAY
+        self.day_number += 1
+        self._wolves_died_today = []
+        self._judge_activated_double_lynch = False
+        for player in self.list_players():
+            if not player.alive and player.death_pending:
+                player.death_pending = False
+
+        alive = self.alive_players()
+        voters = [p.user_id for p in alive if not p.vote_disabled]
+        target = await self.port.vote(
+            title=f"Ngày {self.day_number}",
+            description="",
+            voters=voters,
+            options={p.user_id: p.display_name() for p in alive},
+            duration=self.settings.day_vote_duration,
+            allow_skip=False,
+        )
+        for player in alive:
+            player.vote_disabled = False
+        if target is not None:
+            self._pending_deaths.append((target, "lynch"))
+        await self._resolve_pending_deaths("day")
+        self._check_invariants()
+
+    def _check_invariants(self) -> None:
+        if len(self._lovers) == 2:
+            first, second = (self.players[pid] for pid in self._lovers)
+            if first.alive != second.alive:
+                raise InvariantError(f"seed={self.seed}: lovers {sorted(self._lovers)} not dead together")
+        if list(self._index.alive) != [pid for pid, p in self.players.items() if rules.is_alive(p)]:
+            raise InvariantError(f"seed={self.seed}: player index out of sync with player states")
+        if list(self._index.pack) != [pid for pid, p in self.players.items() if rules.is_alive(p) and rules.is_pack_wolf(p)]:
+            raise InvariantError(f"seed={self.seed}: pack index out of sync or out of join order")
+        dead = [pid for pid, _, _ in self._death_log]
+        if len(dead) != len(set(dead)):
+            raise InvariantError(f"seed={self.seed}: a player died twice: {dead}")
+        for pid, player in self.players.items():
+            if player.alive == (pid in dead):
+                raise InvariantError(f"seed={self.seed}: player {pid} alive={player.alive} but death log says otherwise")
+
+
+# ==================== HARNESS ====================
+
+@dataclass
+class SimulationReport:
+    """Aggregate results of a simulation run."""
+
+    games: int = 0
+    elapsed: float = 0.0
+    wins: Counter = field(default_factory=Counter)
+    role_wins: Counter = field(default_factory=Counter)
+    role_games: Counter = field(default_factory=Counter)
+    phase_seconds: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    port_calls: Counter = field(default_factory=Counter)
+    rounds: int = 0
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def add(self, record: GameRecord, calls: Counter) -> None:
+        self.games += 1
+        self.rounds += record.nights
+        self.wins[record.winner.value if record.winner else record.reason] += 1
+        for phase, seconds in record.phase_seconds.items():
+            self.phase_seconds[phase] += seconds
+        self.port_calls.update(calls)
+        for pid, role_name in record.roles.items():
+            self.role_games[role_name] += 1
+            if pid in record.winners:
+                self.role_wins[role_name] += 1
+
+
+def run_simulations(
+    games: int,
+    player_counts: Sequence[int] = (8, 12, 16),
+    seed: int = 0,
+    expansions: Optional[Set[Expansion]] = None,
+) -> SimulationReport:
+    """Play `games` seeded games; game i uses seed + i and cycles player_counts.
+
+    The rules and the roles log and swallow handler errors: any error logged
+    during a game is reported as a failure of that game.
+    """
+
+    async def _run() -> SimulationReport:
+        report = SimulationReport()
+        watched = {rules_logger: _ErrorCounter(), role_logger: _ErrorCounter()}
+        levels = {log: log.level for log in watched}
+        for log, handler in watched.items():
+            log.addHandler(handler)
+            # Per-action INFO lines would dominate the measured CPU time
+            log.setLevel(logging.ERROR)
+        rule_errors, role_errors = watched[rules_logger].messages, watched[role_logger].messages
+        start = time.perf_counter()
+        try:
+            for i in range(games):
+                game_seed = seed + i
+                rng = random.Random(game_seed)
+                port = RandomPort(rng)
+                game = HeadlessGame(player_counts[i % len(player_counts)], port, rng, expansions, seed=game_seed)
+                rule_errors.clear()
+                role_errors.clear()
+                try:
+                    record = await game.play()
+                except InvariantError as e:
+                    report.failures.append(str(e))
+                    continue
+                errors = rule_errors + role_errors
+                if errors:
+                    report.failures.append(f"seed={game_seed}: {errors[0]}")
+                    continue
+                report.add(record, port.calls)
+        finally:
+            for log, handler in watched.items():
+                log.removeHandler(handler)
+                log.setLevel(levels[log])
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    return asyncio.run(_run())
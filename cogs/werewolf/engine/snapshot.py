@@ -0,0 +1,126 @@
+"""Werewolf game snapshots and the phase deltas persisted between them.
+
+A snapshot is the JSON-ready dict `WerewolfManager` writes to
+`game_sessions.game_state`. Between full snapshots only a delta is appended to
+`game_sessions.game_deltas` (one JSON object per line): the top-level keys that
+changed, plus the changed fields of each player. Restoring applies the deltas
+to the last snapshot in order.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
+
+if TYPE_CHECKING:
+    from .game import WerewolfGame
+
+PLAYERS_KEY = "players"
+
+
+def build_snapshot(game: "WerewolfGame") -> Dict[str, Any]:
+    """Full JSON-ready state of a game."""
+    return {
+        "phase": game.phase.name,
+        "night_number": game.night_number,
+        "day_number": game.day_number,
+        PLAYERS_KEY: {
+            str(pid): {
+                "member_id": p.member.id,
+                "member_name": p.display_name(),
+                "alive": p.alive,
+                "death_pending": p.death_pending,
+                "roles": [{"name": role.metadata.name, "alignment": role.alignment.name} for role in p.roles],
+                "lover_id": p.lover_id,
+                "charmed": p.charmed,
+                "vote_disabled": p.vote_disabled,
+                "skills_disabled": p.skills_disabled,
+                "mayor": p.mayor,
+                "vote_weight": p.vote_weight,
+                "protected_last_night": p.protected_last_night,
+                "is_sister": p.is_sister,
+                "marked_by_raven": p.marked_by_raven
+            }
+            for pid, p in game.players.items()
+        },
+        "host_id": game.host.id,
+        "expansions": [e.name for e in game.settings.expansions],
+        "piper_id": game._piper_id,
+        "lovers": list(game._lovers),
+        "charmed": list(game._charmed),
+        "sisters_ids": game._sisters_ids,
+        "pyro_soaked": list(game._pyro_soaked),
+        "pyro_id": game._pyro_id,
+        "angel_won": game._angel_won,
+        "wolf_brother_id": game._wolf_brother_id,
+        "wolf_sister_id": game._wolf_sister_id,
+        "elder_man_id": game._elder_man_id,
+        "elder_man_group1": game._elder_man_group1,
+        "elder_man_group2": game._elder_man_group2,
+        "devoted_servant_id": game._devoted_servant_id
+    }
+
+
+def diff_snapshot(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Delta turning old into new. Empty if nothing changed.
+
+    Players map to their changed fields only; a player missing from new maps
+    to None.
+    """
+    delta: Dict[str, Any] = {}
+    for key, value in new.items():
+        if key == PLAYERS_KEY:
+            continue
+        if old.get(key) != value:
+            delta[key] = value
+    for key in old.keys() - new.keys():
+        delta[key] = None
+
+    old_players = old.get(PLAYERS_KEY, {})
+    new_players = new.get(PLAYERS_KEY, {})
+    players: Dict[str, Optional[Dict[str, Any]]] = {}
+    for pid, fields in new_players.items():
+        before = old_players.get(pid)
+        if before is None:
+            players[pid] = fields
+            continue
+        changed = {name: value for name, value in fields.items() if before.get(name) != value}
+        if changed:
+            players[pid] = changed
+    for pid in old_players.keys() - new_players.keys():
+        players[pid] = None
+    if players:
+        delta[PLAYERS_KEY] = players
+    return delta
+
+
+def apply_delta(state: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    """Apply one delta from diff_snapshot to state, in place."""
+    for key, value in delta.items():
+        if key != PLAYERS_KEY:
+            state[key] = value
+            continue
+        players = state.setdefault(PLAYERS_KEY, {})
+        for pid, fields in value.items():
+            if fields is None:
+                players.pop(pid, None)
+            else:
+                players.setdefault(pid, {}).update(fields)
+
+
+def replay(snapshot_json: str, deltas_text: Optional[str]) -> Dict[str, Any]:
+    """Snapshot JSON plus its newline-separated deltas, as one state dict."""
+    state = json.loads(snapshot_json)
+    for delta in iter_deltas(deltas_text):
+        apply_delta(state, delta)
+    return state
+
+
+def iter_deltas(deltas_text: Optional[str]) -> Iterable[Dict[str, Any]]:
+    for line in (deltas_text or "").splitlines():
+        if line:
+            yield json.loads(line)
+
+
+def encode(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, separators=(",", ":"))
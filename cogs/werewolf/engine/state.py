@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 import discord
 
@@ -101,6 +101,21 @@ class PlayerState:
     witch_used_save: bool = False
     fool_hanged: bool = False
 
+    # Index notified when alive/death_pending/roles/charmed change (see PlayerIndex)
+    index: Optional["PlayerIndex"] = field(default=None, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if name in _INDEXED_FIELDS:
+            index = getattr(self, "index", None)
+            if index is not None:
+                index.refresh(self)
+
+    def refresh_index(self) -> None:
+        """Re-index after a change the setter cannot see (in-place role edits, Avenger side)."""
+        if self.index is not None:
+            self.index.refresh(self)
+
     @property
     def role(self) -> Optional[Role]:
         """Get primary (first) role for backward compatibility."""
@@ -109,20 +124,19 @@ class PlayerState:
     @role.setter
     def role(self, value: Optional[Role]) -> None:
         """Set role, replacing all existing roles."""
-        if value is None:
-            self.roles.clear()
-        else:
-            self.roles = [value]
+        self.roles = [] if value is None else [value]
 
     def add_role(self, role: Role) -> None:
         """Add an additional role to the player."""
         self.roles.append(role)
+        self.refresh_index()
 
     def remove_role(self, role_name: str) -> bool:
         """Remove a role by name. Returns True if removed."""
         for i, r in enumerate(self.roles):
             if r.metadata.name == role_name:
                 self.roles.pop(i)
+                self.refresh_index()
                 return True
         return False
 
@@ -159,4 +173,118 @@ class PlayerState:
         return self.member.display_name
 
     def is_alive(self) -> bool:
-        return self.alive and not self.death_pending
\ No newline at end of file
+        return self.alive and not self.death_pending
+
+
+_INDEXED_FIELDS = frozenset({"alive", "death_pending", "roles", "charmed"})
+
+
+class PlayerIndex:
+    """Incrementally maintained lookups over a game's players.
+
+    PlayerState notifies the index whenever alive, death_pending, roles or
+    charmed is assigned, and add_role/remove_role/refresh_index cover in-place
+    role changes. Each refresh re-indexes a single player, so deaths, role
+    swaps (Thief, Wild Child, Wolf Sister, curses) and charms cost O(roles)
+    and every lookup below is O(1).
+
+    "Alive" follows WerewolfGame.alive_players: alive and not death_pending.
+    """
+
+    __slots__ = ("_order", "_holders", "_entries", "alive", "alive_by_alignment", "pack", "charmed_alive")
+
+    def __init__(self) -> None:
+        self._order: Dict[int, int] = {}  # user_id -> join order, to keep lookups deterministic
+        self._holders: Dict[str, Dict[int, PlayerState]] = {}  # role name -> holders (dead included)
+        self._entries: Dict[int, Tuple[Tuple[str, ...], frozenset, bool, bool, bool]] = {}
+        self.alive: Dict[int, PlayerState] = {}
+        self.alive_by_alignment: Dict[Alignment, Dict[int, PlayerState]] = {a: {} for a in Alignment}
+        self.pack: Dict[int, PlayerState] = {}  # alive pack wolves (Avenger on wolf side excluded)
+        self.charmed_alive: Dict[int, PlayerState] = {}
+
+    def track(self, player: PlayerState) -> None:
+        self._order.setdefault(player.user_id, len(self._order))
+        player.index = self
+        self.refresh(player)
+
+    def untrack(self, player: PlayerState) -> None:
+        self._remove(player.user_id)
+        self._order.pop(player.user_id, None)
+        player.index = None
+
+    def refresh(self, player: PlayerState) -> None:
+        user_id = player.user_id
+        if user_id not in self._order:
+            return
+        role_names = tuple(r.metadata.name for r in player.roles)
+        alignments = frozenset(r.alignment for r in player.roles)
+        alive = player.alive and not player.death_pending
+        pack = alive and Alignment.WEREWOLF in alignments and not any(
+            r.__class__.__name__ == "Avenger" and getattr(r, "chosen_side", None) == Alignment.WEREWOLF
+            for r in player.roles
+        )
+        entry = (role_names, alignments, alive, pack, alive and player.charmed)
+        old = self._entries.get(user_id)
+        if old == entry:
+            return
+        self._entries[user_id] = entry
+
+        # Update each structure in place; _toggle keeps them in join order
+        for name in set(old[0] if old else ()) - set(role_names):
+            self._holders[name].pop(user_id, None)
+        for name in role_names:
+            self._holders.setdefault(name, {})[user_id] = player
+        order = self._order
+        _toggle(self.alive, user_id, player, alive, order)
+        for alignment, members in self.alive_by_alignment.items():
+            _toggle(members, user_id, player, alive and alignment in alignments, order)
+        _toggle(self.pack, user_id, player, pack, order)
+        _toggle(self.charmed_alive, user_id, player, entry[4], order)
+
+    def _remove(self, user_id: int) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return
+        for name in entry[0]:
+            holders = self._holders.get(name)
+            if holders is not None:
+                holders.pop(user_id, None)
+        self.alive.pop(user_id, None)
+        for members in self.alive_by_alignment.values():
+            members.pop(user_id, None)
+        self.pack.pop(user_id, None)
+        self.charmed_alive.pop(user_id, None)
+
+    def role_holder(self, role_name: str) -> Optional[PlayerState]:
+        """Earliest-joined holder of role_name, dead or alive."""
+        holders = self._holders.get(role_name)
+        if not holders:
+            return None
+        if len(holders) == 1:
+            return next(iter(holders.values()))
+        return min(holders.values(), key=lambda p: self._order[p.user_id])
+
+    def count(self, alignment: Alignment) -> int:
+        return len(self.alive_by_alignment[alignment])
+
+
+def _toggle(
+    members: Dict[int, PlayerState], user_id: int, player: PlayerState, present: bool, order: Dict[int, int]
+) -> None:
+    """Add or drop one player, keeping members in join order.
+
+    Players who join a structure late (Wild Child turning wolf, a new charm)
+    usually sort last and are appended; otherwise the dict is rebuilt, which
+    only happens on those rare role changes.
+    """
+    if not present:
+        members.pop(user_id, None)
+        return
+    if user_id in members:
+        return
+    if members and order[next(reversed(members))] > order[user_id]:
+        entries = sorted([*members.items(), (user_id, player)], key=lambda item: order[item[0]])
+        members.clear()
+        members.update(entries)
+    else:
+        members[user_id] = player
@@ -0,0 +1,118 @@
+"""Per-game timer wheel for Werewolf phase deadlines.
+
+Every countdown of a game (night intro, role actions, discussion, defense,
+votes) registers its deadline here, and a single task per game sleeps until
+the earliest one and fires it. Countdown messages show the deadline with
+Discord's relative timestamp markup (`<t:...:R>`), which the client renders as
+a live "in 30 seconds", so they are edited at milestones (usually just "time's
+up") instead of every few seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class TimerHandle:
+    """A scheduled deadline; cancel() stops it from firing."""
+
+    __slots__ = ("when", "callback", "cancelled")
+
+    def __init__(self, when: float, callback: Callable[[], None]) -> None:
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class PhaseTimers:
+    """Heap of deadlines driven by one task (started lazily, closed with the game)."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, TimerHandle]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.fired = 0
+
+    @staticmethod
+    def timestamp(seconds: float) -> int:
+        """Unix time `seconds` from now."""
+        return int(time.time() + seconds)
+
+    @classmethod
+    def relative(cls, seconds: float) -> str:
+        """Discord markup rendering as a live countdown to `seconds` from now."""
+        return f"<t:{cls.timestamp(seconds)}:R>"
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        loop = asyncio.get_running_loop()
+        handle = TimerHandle(loop.time() + max(0.0, delay), callback)
+        heapq.heappush(self._heap, (handle.when, next(self._seq), handle))
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        elif self._heap[0][2] is handle:
+            # New earliest deadline: re-arm the driver
+            self._wakeup.set()
+        return handle
+
+    async def sleep(self, delay: float) -> None:
+        """Sleep until a deadline `delay` seconds away."""
+        await self.wait_for_event(None, delay)
+
+    async def wait_for_event(self, event: Optional[asyncio.Event], delay: float) -> bool:
+        """Wait until event is set or the deadline passes. True if the event won."""
+        if event is not None and event.is_set():
+            return True
+        deadline = asyncio.get_running_loop().create_future()
+        handle = self.call_later(delay, lambda: deadline.done() or deadline.set_result(None))
+        waiters = [deadline]
+        event_task = None
+        if event is not None:
+            event_task = asyncio.ensure_future(event.wait())
+            waiters.append(event_task)
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            handle.cancel()
+            deadline.cancel()
+            if event_task is not None:
+                event_task.cancel()
+        return event is not None and event.is_set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._heap:
+            when, _, handle = self._heap[0]
+            if handle.cancelled:
+                heapq.heappop(self._heap)
+                continue
+            delay = when - loop.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._heap)
+            self.fired += 1
+            handle.callback()
+
+    def close(self) -> None:
+        """Fire every pending deadline now (nothing is left waiting) and stop the driver."""
+        pending, self._heap = self._heap, []
+        for _, _, handle in sorted(pending):
+            if not handle.cancelled:
+                handle.cancelled = True
+                handle.callback()
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
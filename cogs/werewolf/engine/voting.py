@@ -7,10 +7,17 @@ import logging
 from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Iterable, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
 
 import discord
 
+from core.discord_scheduler import Priority, discord_scheduler
+
+from .timers import PhaseTimers
+
+if TYPE_CHECKING:
+    from .replay import ReplayLog
+
 
 @dataclass(slots=True)
 class VoteResult:
@@ -38,6 +45,8 @@ class VoteSession:
         allow_skip: bool = True,
         vote_weights: Optional[Dict[int, int]] = None,
         disabled_voters: Optional[Iterable[int]] = None,
+        timers: Optional[PhaseTimers] = None,
+        replay: Optional["ReplayLog"] = None,
     ) -> None:
         self.bot = bot
         self.channel = channel
@@ -62,47 +71,56 @@ class VoteSession:
                     self.vote_weights[voter] = weight
         self._message: Optional[discord.Message] = None
         self._finished = asyncio.Event()
+        # Deadline runs on the game's timer wheel when given one
+        self.timers = timers
         self._timeout_task: Optional[asyncio.Task] = None
-        self._ticker_task: Optional[asyncio.Task] = None
         self._start_time: Optional[datetime] = None
+        self._deadline_ts: Optional[int] = None
+        # Finished votes go to the game's replay log, with when the last ballot arrived
+        self.replay = replay
+        self._last_vote_at: Optional[float] = None
 
     async def start(self) -> VoteResult:
         """Start the vote and wait for the result."""
 
         view = _VoteView(self)
         self._start_time = datetime.utcnow()
+        self._deadline_ts = PhaseTimers.timestamp(self.duration)
         embed = self._build_embed()
         self._message = await self.channel.send(embed=embed, view=view)
+        # The embed shows a live <t:...:R> countdown, so it is only edited when votes change
         self._timeout_task = asyncio.create_task(self._auto_finish())
-        self._ticker_task = asyncio.create_task(self._ticker())
         await self._finished.wait()
         if self._timeout_task:
             self._timeout_task.cancel()
-        if self._ticker_task:
-            self._ticker_task.cancel()
         view.stop()
         if self._message:
             try:
                 await self._message.edit(view=None)
             except discord.HTTPException:
                 pass
-        return self._compute_result()
+        result = self._compute_result()
+        if self.replay is not None:
+            self.replay.vote(
+                self.title,
+                result.votes_by_voter,
+                result.winning_target_id,
+                result.is_tie,
+                self.duration,
+                self._last_vote_at,
+            )
+        return result
 
     async def _auto_finish(self) -> None:
         try:
-            await asyncio.sleep(self.duration)
+            if self.timers is not None:
+                await self.timers.sleep(self.duration)
+            else:
+                await asyncio.sleep(self.duration)
         except asyncio.CancelledError:
             return
         self.end()
 
-    async def _ticker(self) -> None:
-        try:
-            while not self._finished.is_set():
-                await asyncio.sleep(5)
-                await self._refresh_message()
-        except asyncio.CancelledError:
-            return
-
     def end(self) -> None:
         if not self._finished.is_set():
             self._finished.set()
@@ -133,6 +151,8 @@ class VoteSession:
             return
         
         self._votes[voter_id] = target_id
+        if self._start_time:
+            self._last_vote_at = (datetime.utcnow() - self._start_time).total_seconds()
         await self._refresh_message()
         logging.getLogger("werewolf").info(
             "Vote recorded | voter=%s target=%s title=%s",
@@ -145,9 +165,18 @@ class VoteSession:
     async def _refresh_message(self) -> None:
         if not self._message:
             return
-        embed = self._build_embed()
+        message = self._message
+        # Coalesced per message: a burst of votes becomes one edit with the latest tally
+        update = discord_scheduler.submit(
+            "message_edit",
+            lambda: message.edit(embed=self._build_embed()),
+            major=message.channel.id,
+            target=message.id,
+            priority=Priority.LOW,
+            label=f"werewolf vote tally message={message.id}",
+        )
         try:
-            await self._message.edit(embed=embed)
+            await update
         except discord.HTTPException:
             pass
 
@@ -169,8 +198,9 @@ class VoteSession:
             skipped = len([v for v in self._votes.values() if v is None])
             details.append(f"Bỏ phiếu: {skipped} chưa chọn")
         embed.add_field(name="Kết quả tạm thời", value="\n".join(details) or "Chưa có phiếu", inline=False)
-        remaining = self._remaining_seconds()
-        embed.set_footer(text=f"Số phiếu đã ghi nhận: {total}/{len(self._votes)} | **Còn {remaining}s**")
+        if self._deadline_ts is not None:
+            embed.add_field(name="Thời gian", value=f"⏳ Kết thúc <t:{self._deadline_ts}:R>", inline=False)
+        embed.set_footer(text=f"Số phiếu đã ghi nhận: {total}/{len(self._votes)}")
         return embed
 
     def _remaining_seconds(self) -> int:
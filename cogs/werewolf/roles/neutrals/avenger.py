@@ -53,11 +53,13 @@ class Avenger(Role):
             if choice == 1:
                 # Choose werewolf side - will show as werewolf to seer/hunter/fox
                 self.chosen_side = Alignment.WEREWOLF
+                player.refresh_index()
                 await game._safe_send_dm(player.member, "✅ Bạn đã chọn theo Phe Sói! Khi chết, bạn sẽ báo thù lên Dân Làng.")
                 logger.info("Avenger chose werewolf side | guild=%s avenger=%s", game.guild.id, player.user_id)
             else:
                 # Choose village side
                 self.chosen_side = Alignment.VILLAGE
+                player.refresh_index()
                 await game._safe_send_dm(player.member, "✅ Bạn đã chọn theo Phe Dân Làng! Khi chết, bạn sẽ báo thù lên Ma Sói.")
                 logger.info("Avenger chose village side | guild=%s avenger=%s", game.guild.id, player.user_id)
         
@@ -34,7 +34,8 @@ class Pyromaniac(Role):
     async def on_assign(self, game: WerewolfGame, player: PlayerState) -> None:
         """Register pyromaniac in game state."""
         game._pyro_id = player.user_id
-        await player.send_dm(
+        await game._safe_send_dm(
+            player.member,
             embed=discord.Embed(
                 title="🔥 Kẻ Phóng Hỏa",
                 description=self.metadata.description,
@@ -77,17 +78,17 @@ class Pyromaniac(Role):
         elif choice == 2 and game._pyro_soaked:
             await self._ignite_all(game, player)
         else:
-            await player.send_dm("Bạn quyết định không làm gì đêm nay.")
+            await game._safe_send_dm(player.member, "Bạn quyết định không làm gì đêm nay.")
 
     async def _soak_oil(self, game: WerewolfGame, player: PlayerState) -> None:
         """Allow pyromaniac to soak up to 2 players in oil."""
         if len(game._pyro_soaked) >= 6:
-            await player.send_dm("⚠️ Đã đạt tối đa 6 người bị tưới dầu. Bạn phải đốt trước khi tưới thêm.")
+            await game._safe_send_dm(player.member, "⚠️ Đã đạt tối đa 6 người bị tưới dầu. Bạn phải đốt trước khi tưới thêm.")
             return
 
         alive_players = [p for p in game.alive_players() if p.user_id != player.user_id]
         if not alive_players:
-            await player.send_dm("Không còn ai để tưới dầu.")
+            await game._safe_send_dm(player.member, "Không còn ai để tưới dầu.")
             return
 
         options = {p.user_id: p.display_name() for p in alive_players}
@@ -103,7 +104,7 @@ class Pyromaniac(Role):
         )
 
         if not target1_id:
-            await player.send_dm("Bạn quyết định không tưới dầu đêm nay.")
+            await game._safe_send_dm(player.member, "Bạn quyết định không tưới dầu đêm nay.")
             return
 
         self.oil_targets_tonight.append(target1_id)
@@ -134,7 +135,8 @@ class Pyromaniac(Role):
         for target_id in self.oil_targets_tonight:
             target = game.players[target_id]
             if target.alive:
-                await target.send_dm(
+                await game._safe_send_dm(
+                    target.member,
                     embed=discord.Embed(
                         title="⚠️ Bạn bị tưới dầu!",
                         description="Một người nào đó đã tưới dầu cho bạn. Nếu họ quyết định đốt, bạn sẽ chết.",
@@ -147,7 +149,7 @@ class Pyromaniac(Role):
             description=f"Bạn đã tưới dầu cho: {', '.join(game.players[tid].display_name() for tid in self.oil_targets_tonight)}",
             color=discord.Color.orange(),
         )
-        await player.send_dm(embed=embed)
+        await game._safe_send_dm(player.member, embed=embed)
 
         logger.info(
             "Pyromaniac soaked | guild=%s players=%s total_soaked=%s",
@@ -159,7 +161,7 @@ class Pyromaniac(Role):
     async def _ignite_all(self, game: WerewolfGame, player: PlayerState) -> None:
         """Ignite all soaked players."""
         if not game._pyro_soaked:
-            await player.send_dm("Không có ai bị tưới dầu để đốt.")
+            await game._safe_send_dm(player.member, "Không có ai bị tưới dầu để đốt.")
             return
 
         # Confirm ignition
@@ -175,7 +177,7 @@ class Pyromaniac(Role):
         )
 
         if confirm != 1:
-            await player.send_dm("Bạn quyết định không đốt đêm nay.")
+            await game._safe_send_dm(player.member, "Bạn quyết định không đốt đêm nay.")
             return
 
         # Kill all soaked players
@@ -194,7 +196,7 @@ class Pyromaniac(Role):
             description=f"Bạn đã đốt {killed_count} người.",
             color=discord.Color.red(),
         )
-        await player.send_dm(embed=embed)
+        await game._safe_send_dm(player.member, embed=embed)
 
         logger.info(
             "Pyromaniac ignited | guild=%s killed=%s",
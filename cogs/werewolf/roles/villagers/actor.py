@@ -366,7 +366,7 @@ class Actor(Role):
         )
         
         if target_id and target_id in options:
-            game._charmed.add(target_id)
+            game._charm(target_id)  # pylint: disable=protected-access
             target = game.players.get(target_id)
             if target:
                 await game._safe_send_dm(player.member, f"🎭 Bạn đã mê hoặc {target.display_name()}")
@@ -109,7 +109,7 @@ class AngelOfDeath(Role):
                                 else:
                                     setattr(role_copy, attr, value)
                 
-                player.roles.append(role_copy)
+                player.add_role(role_copy)
                 inherited_names.append(target_role.metadata.name)
             
             # Update player's alignment to match target's primary alignment
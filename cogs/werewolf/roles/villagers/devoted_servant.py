@@ -146,7 +146,7 @@ class DevovedServant(Role):
                     game.guild.id, player.user_id
                 )
                 # Ex-Servant remains charmed
-                game._charmed.add(player.user_id)
+                game._charm(player.user_id)  # pylint: disable=protected-access
                 return
             
             # Default: Servant takes the stolen role
@@ -214,7 +214,7 @@ class DevovedServant(Role):
                     game.guild.id, player.user_id
                 )
                 # Ex-Servant remains charmed/infected
-                game._charmed.add(player.user_id)
+                game._charm(player.user_id)  # pylint: disable=protected-access
                 return
         
         except Exception as e:
@@ -111,6 +111,8 @@ class BigBadWolf(Role):
             options=options,
             eligible_voters=[player.user_id],
             duration=30,
+            timers=game._timers,  # pylint: disable=protected-access
+            replay=game._replay,  # pylint: disable=protected-access
             allow_skip=True,
         )
         result = await vote.start()
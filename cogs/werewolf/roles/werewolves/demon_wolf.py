@@ -70,6 +70,8 @@ class DemonWolf(Role):
             options=options,
             eligible_voters=[player.user_id],
             duration=20,
+            timers=game._timers,  # pylint: disable=protected-access
+            replay=game._replay,  # pylint: disable=protected-access
             allow_skip=False,
         )
         result = await vote.start()
@@ -31,6 +31,11 @@ class WolfSister(Role):
         self.brother_id: Optional[int] = None  # ID of Wolf Brother
         self.is_transformed: bool = False  # Becomes True when brother dies
 
+    @property
+    def alignment(self) -> Alignment:  # type: ignore[override]
+        """Werewolf once transformed; metadata is shared by every WolfSister and stays village."""
+        return Alignment.WEREWOLF if self.is_transformed else self.metadata.alignment
+
     async def on_first_night(self, game: WerewolfGame, player: PlayerState) -> None:
         """On first night, Wolf Sister meets her brother."""
         if self.brother_id:
@@ -41,9 +41,10 @@ class XiDachCog(commands.Cog):
         logger.info("[XIDACH] Cleanup task started")
 
     async def cog_unload(self):
-        """Cancel background tasks."""
+        """Cancel background tasks and let pending refunds finish."""
         if self.cleanup_task:
             self.cleanup_task.cancel()
+        await game_manager.wait_for_voids()
 
     async def cleanup_loop(self):
         """Periodically clean up stale tables."""
@@ -16,7 +16,7 @@ from typing import TYPE_CHECKING, Optional, List, Dict
 
 import discord
 from core.logger import setup_logger
-from database_manager import get_user_balance, add_seeds, batch_update_seeds
+from database_manager import get_user_balance
 
 from ..core.game_manager import game_manager
 from ..core.table import Table, TableStatus
@@ -31,10 +31,11 @@ from ..services.hand_service import (
     compare_hands,
     check_phase1_winner,
 )
-from ..services.ai_service import get_dealer_decision, get_smart_think_time
+from ..services.ai_service import get_dealer_decision, get_smart_think_time, summarize_survivors
 from ..ui.views import LobbyView, MultiGameView
 from ..ui.embeds import create_lobby_embed, create_multi_game_embed
 from ..ui.render import render_game_state, render_player_hand
+from ..ui.display import TableDisplay
 
 if TYPE_CHECKING:
     from ..cog import XiDachCog
@@ -44,6 +45,7 @@ logger = setup_logger("XiDachMulti", "cogs/xidach_multi.log")
 # Constants
 LOBBY_DURATION = 30  # seconds (betting time)
 TURN_TIMEOUT = 30  # seconds
+DEALER_FRAME_INTERVAL = 3.0  # seconds between dealer animation frames (draws in between merge)
 
 async def _safe_send(channel, **kwargs):
     """Retries sending a message up to 3 times."""
@@ -61,23 +63,11 @@ async def _safe_send(channel, **kwargs):
             logger.error(f"[SAFE_SEND] Critical error: {e}")
             return None
 
-async def _safe_edit(message, **kwargs):
-    """Retries editing a message up to 3 times."""
-    retries = 3
-    if not message: return None
-    for i in range(retries):
-        try:
-            return await message.edit(**kwargs)
-        except discord.HTTPException as e:
-            if i == retries - 1:
-                logger.error(f"[SAFE_EDIT] Failed after {retries} retries: {e}")
-                return None
-            logger.warning(f"[SAFE_EDIT] Retry {i+1}/{retries} due to error: {e}")
-            await asyncio.sleep(1 * (i + 1))
-        except Exception as e:
-            # Message might be deleted
-            logger.error(f"[SAFE_EDIT] Critical error (msg likely deleted): {e}")
-            return None
+def _display(table: Table) -> TableDisplay:
+    """The table's edit coalescer (created on first use)."""
+    if table.display is None:
+        table.display = TableDisplay()
+    return table.display
 
 
 # ==================== PHASE 0: LOBBY ====================
@@ -106,9 +96,9 @@ async def start_multiplayer(cog: "XiDachCog", ctx_or_interaction, initial_bet: i
 
     table.channel_id = channel_id
 
-    # Add host as first player with bet
-    balance = await get_user_balance(user.id)
-    if balance < initial_bet:
+    # Add host as first player with bet (held in escrow until the round settles)
+    if not await table.ledger.hold(user.id, initial_bet, 'xi_dach_bet'):
+        balance = await get_user_balance(user.id)
         msg = f"❌ Bạn không đủ hạt! (Cần {initial_bet:,}, có {balance:,})"
         if isinstance(ctx_or_interaction, discord.Interaction):
             await ctx_or_interaction.response.send_message(msg, ephemeral=True)
@@ -117,10 +107,6 @@ async def start_multiplayer(cog: "XiDachCog", ctx_or_interaction, initial_bet: i
         game_manager.remove_table(table.table_id)
         return
 
-    # Deduct bet immediately
-    # Deduct bet immediately
-    await add_seeds(user.id, -initial_bet, 'xi_dach_bet', 'xidach')
-
     host = table.add_player(user.id, user.display_name, initial_bet)
     host.is_ready = True
     logger.info(f"[LOBBY] Host {user.id} joined with bet {initial_bet}")
@@ -184,7 +170,6 @@ async def process_bet(cog: "XiDachCog", interaction: discord.Interaction, table:
 
         await interaction.response.defer(ephemeral=True)
 
-        balance = await get_user_balance(user_id)
         current_player = table.players.get(user_id)
         current_bet = current_player.bet if current_player else 0
         
@@ -192,14 +177,12 @@ async def process_bet(cog: "XiDachCog", interaction: discord.Interaction, table:
         new_total = current_bet + amount
         additional_needed = amount  # Always add the clicked amount
 
-        if balance < additional_needed:
+        # Escrow the clicked amount
+        if not await table.ledger.hold(user_id, additional_needed, 'xi_dach_bet_add'):
+            balance = await get_user_balance(user_id)
             await interaction.followup.send(f"❌ Không đủ hạt! (Cần {additional_needed:,}, bạn có {balance:,})", ephemeral=True)
             return
 
-        # Deduct the clicked amount
-        # Deduct the clicked amount
-        await add_seeds(user_id, -additional_needed, 'xi_dach_bet_add', 'xidach')
-
         if current_player:
             current_player.bet = new_total  # Additive
             current_player.is_ready = True
@@ -228,11 +211,8 @@ async def cancel_bet(cog: "XiDachCog", interaction: discord.Interaction, table:
 
         await interaction.response.defer(ephemeral=True)
 
-        # Refund the bet
-        refund_amount = player.bet
-        # Refund the bet
-        refund_amount = player.bet
-        await add_seeds(user_id, refund_amount, 'xi_dach_refund', 'minigame')
+        # Refund the bet (straight out of escrow, nothing was logged yet)
+        refund_amount = await table.ledger.release(user_id)
 
         # Remove player from table
         table.remove_player(user_id)
@@ -318,7 +298,6 @@ async def _start_game(cog: "XiDachCog", channel, table: Table) -> None:
             phase1_ended = True
 
             results = []
-            seed_updates = {}
 
             for uid, player in table.players.items():
                 if player.bet <= 0:
@@ -327,8 +306,7 @@ async def _start_game(cog: "XiDachCog", channel, table: Table) -> None:
                 result, mul = check_phase1_winner(player.hand, table.dealer_hand)
                 payout = int(player.bet * mul)
 
-                if payout > 0:
-                    seed_updates[uid] = payout
+                table.ledger.credit(uid, payout, 'xi_dach_payout')
 
                 _, p_type = determine_hand_type(player.hand)
                 results.append({
@@ -339,9 +317,8 @@ async def _start_game(cog: "XiDachCog", channel, table: Table) -> None:
                 })
                 player.status = PlayerStatus.BLACKJACK if p_type in (HandType.XI_BAN, HandType.XI_DACH) else PlayerStatus.STAND
 
-            # Pay winners
-            if seed_updates:
-                await batch_update_seeds(seed_updates, reason='xi_dach_payout', category='xidach')
+            # Pay winners and commit the round
+            await table.ledger.settle()
 
             # Send result
             embed = discord.Embed(
@@ -379,7 +356,7 @@ async def _start_game(cog: "XiDachCog", channel, table: Table) -> None:
                 payout = int(player.bet * mul)
                 profit = payout - player.bet
 
-                await batch_update_seeds({uid: payout}, reason='xi_dach_instant_win', category='xidach')
+                table.ledger.credit(uid, payout, 'xi_dach_instant_win')
                 player.status = PlayerStatus.BLACKJACK
                 player.payout = payout  # Store for result embed
 
@@ -606,16 +583,12 @@ async def player_double_multi(cog: "XiDachCog", interaction: discord.Interaction
             await interaction.followup.send("❌ Không thể gấp đôi lúc này!", ephemeral=True)
             return
 
-        balance = await get_user_balance(player.user_id)
-        if balance < player.bet:
-            await interaction.followup.send(f"❌ Không đủ hạt để gấp đôi!", ephemeral=True)
-            return
-
         # Defer handled by View
 
-        # Deduct additional bet
-        # Deduct additional bet
-        await add_seeds(player.user_id, -player.bet, 'xi_dach_double', 'xidach')
+        # Escrow the additional bet
+        if not await table.ledger.hold(player.user_id, player.bet, 'xi_dach_double'):
+            await interaction.followup.send(f"❌ Không đủ hạt để gấp đôi!", ephemeral=True)
+            return
 
         player.bet *= 2
         player.is_doubled = True
@@ -663,36 +636,38 @@ async def force_stand_multi(cog: "XiDachCog", table: Table, player: Player) -> N
 
 
 async def _refresh_turn_display(cog: "XiDachCog", channel, table: Table, player: Player) -> None:
-    """Refresh the current turn display."""
-    score, hand_type = determine_hand_type(player.hand)
-    tuoi_str = "✅ Đủ tuổi" if is_du_tuoi(player.hand) else "❌ Chưa đủ tuổi"
-    type_str = get_hand_description(hand_type)
+    """Mark the current turn display dirty; the table's writer edits it with the latest hand."""
+    async def build() -> dict:
+        score, hand_type = determine_hand_type(player.hand)
+        tuoi_str = "✅ Đủ tuổi" if is_du_tuoi(player.hand) else "❌ Chưa đủ tuổi"
+        type_str = get_hand_description(hand_type)
 
-    embed = discord.Embed(
-        title=f"🎮 Lượt của {player.username}",
-        description=f"**Điểm: {score}** {type_str} ({tuoi_str})",
-        color=discord.Color.red() if hand_type == HandType.BUST else discord.Color.blue()
-    )
-    embed.add_field(name="🃏 Bài của bạn", value=format_hand(player.hand), inline=False)
-    embed.add_field(name="🤖 Nhà Cái", value=format_hand(table.dealer_hand, hide_first=True), inline=False)
+        embed = discord.Embed(
+            title=f"🎮 Lượt của {player.username}",
+            description=f"**Điểm: {score}** {type_str} ({tuoi_str})",
+            color=discord.Color.red() if hand_type == HandType.BUST else discord.Color.blue()
+        )
+        embed.add_field(name="🃏 Bài của bạn", value=format_hand(player.hand), inline=False)
+        embed.add_field(name="🤖 Nhà Cái", value=format_hand(table.dealer_hand, hide_first=True), inline=False)
 
-    try:
-        ts = int(time.time() * 1000)
-        img_bytes = await render_player_hand(player.hand, player.username)
-        filename = f"hand_{ts}.png"
-        file = discord.File(io.BytesIO(img_bytes), filename=filename)
-        embed.set_image(url=f"attachment://{filename}")
+        try:
+            ts = int(time.time() * 1000)
+            img_bytes = await render_player_hand(player.hand, player.username)
+            filename = f"hand_{ts}.png"
+            file = discord.File(io.BytesIO(img_bytes), filename=filename)
+            embed.set_image(url=f"attachment://{filename}")
+            return {"embed": embed, "attachments": [file]}
+        except Exception as e:
+            logger.error(f"[REFRESH] Error: {e}")
+            return {"embed": embed}
 
-        if table.current_turn_msg:
-            await _safe_edit(table.current_turn_msg, embed=embed, attachments=[file])
-    except Exception as e:
-        logger.error(f"[REFRESH] Error: {e}")
-        if table.current_turn_msg:
-            await _safe_edit(table.current_turn_msg, embed=embed)
+    _display(table).mark_dirty(table.current_turn_msg, build)
 
 
 async def _advance_to_next(cog: "XiDachCog", channel, table: Table) -> None:
     """Advance to next player."""
+    # Let the finished turn's message show its final hand first
+    await _display(table).flush()
     async with table.lock:
         # Keep old message for history (do NOT delete)
         if table.current_view:
@@ -707,8 +682,6 @@ async def _advance_to_next(cog: "XiDachCog", channel, table: Table) -> None:
 
 async def _run_dealer(cog: "XiDachCog", channel, table: Table) -> None:
     """Run dealer's AI turn with visual updates."""
-    import random
-    
     async with table.lock:
         if table.status in (TableStatus.DEALER_TURN, TableStatus.FINISHED):
             logger.warning(f"[DEALER] Table {table.table_id} already in dealer phase!")
@@ -742,55 +715,57 @@ async def _run_dealer(cog: "XiDachCog", channel, table: Table) -> None:
         logger.error(f"[DEALER_RENDER] Error: {e}")
         dealer_msg = await _safe_send(channel, embed=embed)
 
-    # Dealer AI loop - each draw with visual update
-    while True:
-        # Longer thinking time: 2-10 seconds
-        think_time = random.uniform(2.0, 10.0)
-        await asyncio.sleep(think_time)
-
-        action, reason = get_dealer_decision(table.dealer_hand, survivors)
-        logger.info(f"[DEALER_AI] {action}: {reason}")
-
-        if action == "stand":
-            break
-
-        # Draw card
-        card = table.deck.draw_one()
-        table.dealer_hand.append(card)
+    # Dealer AI loop - draws mark the message dirty; the writer pushes at most
+    # one frame per DEALER_FRAME_INTERVAL, so quick consecutive draws share a frame
+    display = _display(table)
+    display.interval = DEALER_FRAME_INTERVAL
 
+    async def build_frame() -> dict:
         d_score, d_type = determine_hand_type(table.dealer_hand)
-        
-        # Create updated embed with new hand
         embed = discord.Embed(
             title=f"🎲 NHÀ CÁI: {d_score} điểm",
-            description=f"🃏 *{reason}*",
+            description=f"🃏 *{last_reason}*",
             color=discord.Color.red() if d_type == HandType.BUST else discord.Color.gold()
         )
         embed.add_field(name="🃏 Bài", value=format_hand(table.dealer_hand), inline=False)
-        
-        # Render updated hand - delete old, send new (Discord can't edit attachments properly)
         try:
             ts = int(time.time() * 1000)
             img_bytes = await render_player_hand(table.dealer_hand, "Nhà Cái")
             filename = f"dealer_{ts}.png"
             file = discord.File(io.BytesIO(img_bytes), filename=filename)
             embed.set_image(url=f"attachment://{filename}")
-            
-            # Delete old message and send new one (to update image)
-            try:
-                await dealer_msg.delete()
-            except:
-                pass
-            dealer_msg = await _safe_send(channel, embed=embed, file=file)
+            return {"embed": embed, "attachments": [file]}
         except Exception as e:
             logger.error(f"[DEALER_RENDER] Error: {e}")
-            # Fallback: just edit embed text
-            await _safe_edit(dealer_msg, embed=embed)
+            return {"embed": embed}
+
+    # Survivors do not draw any more: score their hands once for the whole dealer turn
+    survivor_summary = summarize_survivors(survivors)
+    last_reason = ""
+    while True:
+        await asyncio.sleep(get_smart_think_time())
+
+        action, reason = get_dealer_decision(table.dealer_hand, survivor_summary)
+        logger.info(f"[DEALER_AI] {action}: {reason}")
+
+        if action == "stand":
+            break
+
+        # Draw card
+        card = table.deck.draw_one()
+        table.dealer_hand.append(card)
+        last_reason = reason
+        display.mark_dirty(dealer_msg, build_frame)
+
+        d_score, d_type = determine_hand_type(table.dealer_hand)
 
         # Check Ngu Linh or Bust
         if len(table.dealer_hand) >= 5 or d_type == HandType.BUST:
             break
 
+    # The final message replaces the animated one: no point sending its last frame
+    display.discard()
+
     # Final dealer result announcement - richer embed
     d_score, d_type = determine_hand_type(table.dealer_hand)
     logger.info(f"[DEALER_RESULT] Score: {d_score}, Type: {d_type.name}")
@@ -868,7 +843,6 @@ async def _finish_game(cog: "XiDachCog", channel, table: Table) -> None:
 
     try:
         d_score, d_type = determine_hand_type(table.dealer_hand)
-        seed_updates = {}
         results = []
 
         for uid, player in table.players.items():
@@ -893,17 +867,14 @@ async def _finish_game(cog: "XiDachCog", channel, table: Table) -> None:
                 net = payout - player.bet
                 
                 if outcome == "win":
-                    # Add to seed updates
-                    if uid not in seed_updates: seed_updates[uid] = 0
-                    seed_updates[uid] += payout
+                    table.ledger.credit(uid, payout, 'xi_dach_win')
                     result = "win"
                 elif outcome == "lose":
-                    # No payout update needed (bet already deducted)
+                    # No payout (the escrowed bet goes to the house)
                     result = "lose"
                 else: # push
                     # Refund bet
-                    if uid not in seed_updates: seed_updates[uid] = 0
-                    seed_updates[uid] += payout
+                    table.ledger.credit(uid, payout, 'xi_dach_push')
                     result = "push"
 
             results.append({
@@ -921,8 +892,8 @@ async def _finish_game(cog: "XiDachCog", channel, table: Table) -> None:
             logger.info(f"[RESULT] Player {uid}: {result}, net {net:+}")
 
 
-        if seed_updates:
-            await batch_update_seeds(seed_updates, reason='xi_dach_win', category='xidach')
+        # One transaction: escrowed bets, instant wins and payouts of the whole table
+        await table.ledger.settle()
 
         try:
             # Build detailed text summary (Bau Cua Style)
@@ -9,6 +9,10 @@ BETTING_DURATION = 15 # seconds
 TURN_TIMEOUT = 45     # seconds
 CLEANUP_INTERVAL = 300 # 5 minutes
 
+# Dealer policy knobs (services/dealer_policy.py), in bet units per survivor
+DEALER_HOUSE_EDGE = 1.0       # Stand once standing already expects this edge (1.0 = never caps)
+DEALER_RISK_APPETITE = 0.0    # Extra EV credited to hitting (>0 gambles more, <0 plays safer)
+
 # Emoji Constants
 EMOJI_CONFIRM = "✅"
 EMOJI_CANCEL = "❌"
@@ -32,11 +32,15 @@ class Rank(Enum):
         self.symbol = symbol
         self.base_value = value
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Card:
-    """Represents a playing card."""
+    """Represents a playing card (immutable; see CARDS for the 52 shared instances)."""
     suit: Suit
     rank: Rank
+    index: int = field(init=False, repr=False, compare=False)  # Position in CARDS
+
+    def __post_init__(self):
+        object.__setattr__(self, "index", _SUITS.index(self.suit) * len(_RANKS) + _RANKS.index(self.rank))
 
     @property
     def value(self) -> int:
@@ -57,30 +61,46 @@ class Card:
         """Get emoji representation for Discord display."""
         return f"**`{self.rank.symbol}`**{self.suit.value}"
 
+_SUITS = tuple(Suit)
+_RANKS = tuple(Rank)
+
+# Every card once, indexed by Card.index; decks hand these out instead of new objects
+CARDS = tuple(Card(suit, rank) for suit in Suit for rank in Rank)
+DECK_SIZE = len(CARDS)
+
 @dataclass
 class Deck:
-    """A standard 52-card deck."""
-    cards: List[Card] = field(default_factory=list)
+    """A standard 52-card deck: shuffled card indices and a draw cursor."""
+    order: bytearray = field(default_factory=lambda: bytearray(range(DECK_SIZE)))
+    cursor: int = 0
 
     def __post_init__(self):
         self.reset()
 
     def reset(self) -> None:
-        self.cards = [Card(suit, rank) for suit in Suit for rank in Rank]
+        self.order = bytearray(range(DECK_SIZE))
+        self.cursor = 0
         self.shuffle()
 
     def shuffle(self) -> None:
-        random.shuffle(self.cards)
+        """Shuffle the cards not drawn yet."""
+        rest = self.order[self.cursor:]
+        random.shuffle(rest)
+        self.order[self.cursor:] = rest
 
     def draw(self, count: int = 1) -> List[Card]:
-        if count > len(self.cards):
+        if count > len(self):
             self.reset()
-        drawn = self.cards[:count]
-        self.cards = self.cards[count:]
-        return drawn
+        start = self.cursor
+        self.cursor += count
+        return [CARDS[i] for i in self.order[start:self.cursor]]
 
     def draw_one(self) -> Card:
-        return self.draw(1)[0]
+        if self.cursor >= DECK_SIZE:
+            self.reset()
+        card = CARDS[self.order[self.cursor]]
+        self.cursor += 1
+        return card
 
     def __len__(self) -> int:
-        return len(self.cards)
+        return DECK_SIZE - self.cursor
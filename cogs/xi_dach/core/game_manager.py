@@ -1,7 +1,8 @@
 """Game Manager Singleton."""
 
+import asyncio
 import time
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
 from .table import Table, TableStatus
 
 class GameManager:
@@ -14,6 +15,7 @@ class GameManager:
             cls._instance._tables: Dict[str, Table] = {}  # table_id -> Table
             cls._instance._channel_tables: Dict[int, Set[str]] = {} # channel_id -> Set[table_id]
             cls._instance._user_tables: Dict[int, str] = {}  # user_id -> table_id (host only mapping? No, player mapping)
+            cls._instance._voids: Set[asyncio.Task] = set()  # refunds of abandoned tables still running
         return cls._instance
 
     @property
@@ -67,6 +69,13 @@ class GameManager:
         """Remove a table by its uniquely identified table_id."""
         table = self._tables.pop(table_id, None)
         if table:
+            if table.display:
+                table.display.close()
+            if table.ledger.stakes and not table.ledger.settled:
+                # Abandoned before settlement (error, stale cleanup): give the bets back
+                task = asyncio.create_task(table.ledger.void())
+                self._voids.add(task)
+                task.add_done_callback(self._voids.discard)
             # Remove from channel tracking
             if table.channel_id in self._channel_tables:
                 self._channel_tables[table.channel_id].discard(table_id)
@@ -77,6 +86,11 @@ class GameManager:
             for user_id in list(table.players.keys()):
                 self._user_tables.pop(user_id, None)
 
+    async def wait_for_voids(self) -> None:
+        """Wait for the refunds started by remove_table (on unload, before the loop stops)."""
+        if self._voids:
+            await asyncio.gather(*self._voids, return_exceptions=True)
+
     def add_user_to_table(self, user_id: int, table_id: str) -> None:
         self._user_tables[user_id] = table_id
 
@@ -7,6 +7,8 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set
 from enum import Enum
 
+from core.settlement import RoundLedger
+
 from .deck import Card, Deck
 from .player import Player, PlayerStatus
 
@@ -38,7 +40,13 @@ class Table:
     turn_action_timestamp: float = 0.0
     current_turn_msg: Optional[object] = None
     current_view: Optional[object] = None  # MultiGameView for cleanup
+    display: Optional[object] = None  # TableDisplay: coalesced message edits
     lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    ledger: Optional[RoundLedger] = None  # Escrowed bets and payouts, settled once at the end
+
+    def __post_init__(self):
+        if self.ledger is None:
+            self.ledger = RoundLedger(f"xidach:{self.table_id}", "xidach")
 
     @property
     def dealer_value(self) -> int:
@@ -3,22 +3,80 @@ Xi Dach AI Service - Smart Dealer Logic.
 
 Implements risk-based decision making:
 - Mandatory: Draw until score >= 16
-- Smart: Analyze survivors and decide based on risk
+- Smart: Look up hit/stand EV in the precomputed policy table (dealer_policy.py),
+  tuned by DEALER_HOUSE_EDGE / DEALER_RISK_APPETITE
+- Fallback: Threshold rules on how many survivors the dealer is losing to
 """
 
 import random
-from typing import List, Tuple, TYPE_CHECKING
+from bisect import bisect_right
+from typing import List, Optional, Tuple, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..core.deck import Card
     from ..core.player import Player
 
-from .hand_service import calculate_hand_value, determine_hand_type, HandType
+from ..constants import DEALER_HOUSE_EDGE, DEALER_RISK_APPETITE
+from .dealer_policy import CATEGORIES, NGU_LINH_CATEGORY, dealer_policy, dealer_state, survivor_category
+from .hand_service import determine_hand_type, HandType
+
+
+class SurvivorSummary:
+    """Survivor hands as the dealer AI sees them.
+
+    Survivors do not draw during the dealer's turn, so the dealer loop scores
+    them once (summarize_survivors) and every decision reuses the summary.
+    """
+
+    __slots__ = ("count", "hist", "scores", "ngu_linh", "total_active")
+
+    def __init__(self, count: int, hist: Optional[Tuple[int, ...]], scores: List[int], ngu_linh: int):
+        self.count = count  # Survivors summarized, BUST ones included
+        self.hist = hist  # Policy table histogram; None when a hand is not modeled
+        self.scores = sorted(scores)  # Scores of the other standing hands
+        self.ngu_linh = ngu_linh
+        self.total_active = len(scores) + ngu_linh
+
+    def __len__(self) -> int:
+        return self.count
+
+    def losing_to(self, score: int) -> int:
+        """How many survivors beat a dealer standing on `score`."""
+        # NGU_LINH beats all normal hands; normal hands compare scores
+        return self.ngu_linh + len(self.scores) - bisect_right(self.scores, score)
+
+
+def summarize_survivors(survivors: List["Player"]) -> SurvivorSummary:
+    """Score every survivor once."""
+    hist = [0] * len(CATEGORIES)
+    modeled = True
+    scores = []
+    ngu_linh = 0
+
+    for player in survivors:
+        p_score, p_type = determine_hand_type(player.hand)
+
+        # Skip BUST players (already lost)
+        if p_type == HandType.BUST:
+            continue
+
+        category = survivor_category(p_score, p_type)
+        if category is None:
+            modeled = False
+        else:
+            hist[category] += 1
+
+        if category == NGU_LINH_CATEGORY:
+            ngu_linh += 1
+        else:
+            scores.append(p_score)
+
+    return SurvivorSummary(len(survivors), tuple(hist) if modeled else None, scores, ngu_linh)
 
 
 def get_dealer_decision(
     dealer_hand: List["Card"],
-    survivors: List["Player"] = None
+    survivors: Union[List["Player"], SurvivorSummary, None] = None
 ) -> Tuple[str, str]:
     """
     Determine dealer's next action.
@@ -26,11 +84,14 @@ def get_dealer_decision(
     Smart AI Logic:
     1. MANDATORY: Draw if score < 16
     2. CHECK: If 5 cards (Ngu Linh) -> STAND
-    3. SMART: Analyze how many survivors dealer is losing to
+    3. SMART: Compare hit/stand EV from the policy table against the
+       survivors' outcome histogram
+    4. FALLBACK: Threshold rules on how many survivors dealer is losing to
     
     Args:
         dealer_hand: Dealer's current cards
-        survivors: List of Player objects still in game (not BUST)
+        survivors: Player objects still in game (not BUST), or their
+            summarize_survivors() summary (computed once per dealer turn)
         
     Returns:
         Tuple of (action: "hit"/"stand", reason: str)
@@ -54,37 +115,22 @@ def get_dealer_decision(
         return ("hit", f"Dealer chỉ có {score} điểm, chưa đủ tuổi.")
     
     # SMART DECISION (16 - 21)
-    if survivors is None or len(survivors) == 0:
+    if not survivors:
         # No context, play conservatively
         if score >= 17:
             return ("stand", f"Dealer dằn ({score} điểm).")
         else:
             return ("hit", f"Dealer liều rút thêm ({score} điểm).")
     
-    # Calculate survivors dealer is losing to
-    losing_to = 0
-    ngu_linh_exists = False
-    
-    for player in survivors:
-        p_score, p_type = determine_hand_type(player.hand)
-        
-        # Skip BUST players (already lost)
-        if p_type == HandType.BUST:
-            continue
-        
-        # NGU_LINH beats all normal hands
-        if p_type == HandType.NGU_LINH:
-            ngu_linh_exists = True
-            losing_to += 1
-            continue
-        
-        # Compare scores for normal hands
-        if p_score > score:
-            losing_to += 1
-    
-    total_active = sum(1 for p in survivors 
-                       if determine_hand_type(p.hand)[1] != HandType.BUST)
-    
+    summary = survivors if isinstance(survivors, SurvivorSummary) else summarize_survivors(survivors)
+    losing_to = summary.losing_to(score)
+    total_active = summary.total_active
+
+    if summary.hist is not None:
+        evs = dealer_policy.lookup(dealer_state(dealer_hand), summary.hist)
+        if evs is not None:
+            return _policy_decision(score, losing_to, total_active, *evs)
+
     # Decision Matrix
     if losing_to == 0:
         # Winning or tied with everyone
@@ -104,6 +150,24 @@ def get_dealer_decision(
     return ("stand", f"Dealer {score} điểm. Dằn an toàn.")
 
 
+def _policy_decision(
+    score: int, losing_to: int, total_active: int, ev_stand: float, ev_hit: float
+) -> Tuple[str, str]:
+    """Hit/stand from table EVs (dealer's side, bet units summed over survivors)."""
+    # House edge: no need to gamble once standing already expects the target edge
+    capped = ev_stand >= DEALER_HOUSE_EDGE * total_active
+    if not capped and ev_hit + DEALER_RISK_APPETITE * total_active > ev_stand:
+        if losing_to:
+            return ("hit", f"Dealer {score} điểm, đang thua {losing_to} người. Liều!")
+        return ("hit", f"Dealer {score} điểm, rút thêm vẫn có lợi hơn.")
+
+    if losing_to == 0:
+        return ("stand", f"Dealer đang thắng tất cả! Dằn ({score} điểm).")
+    if capped:
+        return ("stand", f"Dealer {score} điểm, đã đủ lời. Dằn.")
+    return ("stand", f"Dealer {score} điểm, chấp nhận rủi ro. Dằn.")
+
+
 def get_smart_think_time() -> float:
     """
     Get random thinking time for dealer AI.
@@ -0,0 +1,148 @@
+"""
+Xi Dach Dealer Policy - Precomputed hit/stand expected values.
+
+The table is built offline by scripts/build_xidach_dealer_policy.py (Monte Carlo
+over the remaining deck, then backward induction) and maps
+(dealer state, survivor outcome histogram) -> (EV if standing, EV if hitting),
+in bet units from the dealer's side, assuming EV-optimal play afterwards.
+A lookup is one dict hit and two array reads.
+
+The built table ships in the repo (seeded, so rebuilding gives the same file);
+rebuilding needs NumPy from requirements-dev.txt.
+
+File layout (gzip-compressed): MAGIC, one JSON header line (categories, max
+survivors, dealer states), then little-endian float32 pairs, state-major.
+"""
+
+import gzip
+import itertools
+import json
+import os
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from ..constants import MAX_PLAYERS
+from .hand_service import HandType
+
+if TYPE_CHECKING:
+    from ..core.deck import Card
+
+POLICY_PATH = "./data/xidach_dealer_policy.bin.gz"
+MAGIC = b"XDPOLICY1\n"
+
+# Survivor outcome categories: stood under 16, stood on 16..21, Ngu Linh
+CATEGORIES = ("<16", "16", "17", "18", "19", "20", "21", "NGU_LINH")
+NGU_LINH_CATEGORY = len(CATEGORIES) - 1
+MAX_SURVIVORS = MAX_PLAYERS
+
+# (card count, hard total with Aces as 1, holds an Ace) - the Ace flag only
+# matters with 2 cards, where an Ace may still count as 11
+DealerState = Tuple[int, int, int]
+
+
+def dealer_state(hand: List["Card"]) -> DealerState:
+    count = len(hand)
+    hard = sum(1 if c.is_ace else c.value for c in hand)
+    has_ace = int(count == 2 and any(c.is_ace for c in hand))
+    return count, hard, has_ace
+
+
+def state_score(state: DealerState) -> int:
+    """Hand score of a dealer state (same rules as calculate_hand_value)."""
+    count, hard, has_ace = state
+    if count <= 2 and has_ace and hard + 10 <= 21:
+        return hard + 10
+    return hard
+
+
+def survivor_category(score: int, hand_type: HandType) -> Optional[int]:
+    """Histogram slot of a standing player, None when the table does not model it."""
+    if hand_type == HandType.NGU_LINH:
+        return NGU_LINH_CATEGORY
+    if hand_type != HandType.NORMAL:
+        return None  # Bust players are out; Xi Ban/Xi Dach are settled in phase 1
+    return max(0, score - 15)
+
+
+def enumerate_histograms(max_total: int, categories: int = len(CATEGORIES)) -> List[Tuple[int, ...]]:
+    """Every count vector over the categories with at most max_total survivors, in table order."""
+    hists = []
+    for total in range(max_total + 1):
+        for bars in itertools.combinations(range(total + categories - 1), categories - 1):
+            prev = -1
+            counts = []
+            for bar in bars + (total + categories - 1,):
+                counts.append(bar - prev - 1)
+                prev = bar
+            hists.append(tuple(counts))
+    return hists
+
+
+def write_policy(path: str, states: Sequence[DealerState], max_survivors: int, values: bytes, meta: Dict) -> None:
+    """Write a table; values are float32 (ev_stand, ev_hit) pairs, little-endian, state-major."""
+    header = dict(meta, categories=list(CATEGORIES), max_survivors=max_survivors, states=[list(s) for s in states])
+    tmp_path = f"{path}.tmp"
+    # mtime=0: the same table always gives the same bytes
+    with gzip.GzipFile(tmp_path, "wb", mtime=0) as f:
+        f.write(MAGIC)
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        f.write(values)
+    os.replace(tmp_path, path)
+
+
+class DealerPolicy:
+    """Read-only view of a built policy table."""
+
+    def __init__(self, path: str = POLICY_PATH):
+        self.path = path
+        self.meta: Dict = {}
+        self._states: Dict[DealerState, int] = {}
+        self._hists: Dict[Tuple[int, ...], int] = {}
+        self._values = array("f")
+        self._loaded = False
+
+    @property
+    def available(self) -> bool:
+        self.load()
+        return bool(self._states)
+
+    def load(self) -> None:
+        """Read the table once; a missing or foreign file leaves the policy unavailable."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        with gzip.open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return
+            header = json.loads(f.readline())
+            values = array("f")
+            values.frombytes(f.read())
+        if header["categories"] != list(CATEGORIES):
+            return
+        if sys.byteorder != "little":
+            values.byteswap()
+        hists = enumerate_histograms(header["max_survivors"])
+        states = [tuple(s) for s in header["states"]]
+        if len(values) != len(states) * len(hists) * 2:
+            return
+        self.meta = header
+        self._values = values
+        self._hists = {h: i for i, h in enumerate(hists)}
+        self._states = {s: i for i, s in enumerate(states)}
+
+    def lookup(self, state: DealerState, hist: Tuple[int, ...]) -> Optional[Tuple[float, float]]:
+        """(ev_stand, ev_hit) for the dealer, or None outside the table."""
+        self.load()
+        s = self._states.get(state)
+        h = self._hists.get(hist)
+        if s is None or h is None:
+            return None
+        i = (s * len(self._hists) + h) * 2
+        return self._values[i], self._values[i + 1]
+
+
+# Global instance (loaded on first lookup)
+dealer_policy = DealerPolicy()
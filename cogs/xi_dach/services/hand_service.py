@@ -8,10 +8,10 @@ Rules Engine implementing proper Vietnamese Xi Dach rules:
 """
 
 from enum import Enum, auto
-from typing import List, Tuple, TYPE_CHECKING
+from itertools import combinations_with_replacement
+from typing import Dict, Iterable, List, Tuple
 
-if TYPE_CHECKING:
-    from ..core.deck import Card
+from ..core.deck import CARDS, Card
 
 
 class HandType(Enum):
@@ -23,7 +23,76 @@ class HandType(Enum):
     XI_BAN = 4      # Two Aces (only 2 cards)
 
 
-def calculate_hand_value(hand: List["Card"]) -> int:
+def _score_values(values: Tuple[int, ...]) -> Tuple[int, HandType]:
+    """
+    Score and type of a hand given its card values (Ace = 1, 10/J/Q/K = 10).
+    Reference rules used to fill HAND_TABLE.
+    """
+    if not values:
+        return 0, HandType.NORMAL
+
+    card_count = len(values)
+    ace_count = values.count(1)
+    total = sum(values)
+
+    # USER RULE: Ace = 1 if hand has > 2 cards.
+    # Ace = 11 (or 1 if bust) if hand has <= 2 cards.
+    if card_count <= 2:
+        # Standard Mode: Ace starts at 11, downgrade while bust
+        total += 10 * ace_count
+        downgrades = ace_count
+        while total > 21 and downgrades > 0:
+            total -= 10
+            downgrades -= 1
+
+    # Bust check first
+    if total > 21:
+        return total, HandType.BUST
+
+    # Special hands only for exactly 2 cards
+    if card_count == 2:
+        # Xi Ban: Two Aces
+        if ace_count == 2:
+            return total, HandType.XI_BAN
+        # Xi Dach: One Ace + One 10-value card
+        if ace_count == 1 and 10 in values:
+            return total, HandType.XI_DACH
+
+    # Ngu Linh: 5 cards without busting
+    if card_count == 5:
+        return total, HandType.NGU_LINH
+
+    return total, HandType.NORMAL
+
+
+# A hand's key is the sum of its cards' HAND_BITS: a 3-bit count per card value,
+# so it needs no sorting and can be updated card by card. Exact up to 7 cards of
+# one value; hands are capped at 5 cards.
+MAX_TABLE_CARDS = 5
+_VALUE_BITS = 3
+HAND_BITS: Tuple[int, ...] = tuple(
+    1 << (_VALUE_BITS * ((1 if card.is_ace else card.value) - 1)) for card in CARDS
+)
+
+
+def _values_key(values: Iterable[int]) -> int:
+    return sum(1 << (_VALUE_BITS * (v - 1)) for v in values)
+
+
+# Packed value counts -> (score, HandType) for every hand of up to MAX_TABLE_CARDS cards
+HAND_TABLE: Dict[int, Tuple[int, HandType]] = {}
+for _count in range(MAX_TABLE_CARDS + 1):
+    for _values in combinations_with_replacement(range(1, 11), _count):
+        HAND_TABLE[_values_key(_values)] = _score_values(_values)
+
+
+def hand_key(hand: List[Card]) -> int:
+    """Packed value counts of a hand (the HAND_TABLE key)."""
+    bits = HAND_BITS
+    return sum(bits[card.index] for card in hand)
+
+
+def calculate_hand_value(hand: List[Card]) -> int:
     """
     Calculate the best possible hand value.
     Aces count as 11 or 1, whichever is better without busting.
@@ -34,40 +103,10 @@ def calculate_hand_value(hand: List["Card"]) -> int:
     Returns:
         Best possible score (<=21 if possible)
     """
-    if not hand:
-        return 0
-    
-    total = 0
-    
-    # USER RULE: Ace = 1 if hand has > 2 cards.
-    # Ace = 11 (or 1 if bust) if hand has <= 2 cards.
-    
-    if len(hand) > 2:
-        # Strict Mode: Ace always 1
-        for card in hand:
-            if card.is_ace:
-                total += 1
-            else:
-                total += card.value
-    else:
-        # Standard Mode (<= 2 cards): Ace starts at 11
-        ace_count = 0
-        for card in hand:
-            if card.is_ace:
-                ace_count += 1
-                total += 11
-            else:
-                total += card.value
-        
-        # Downgrade if bust
-        while total > 21 and ace_count > 0:
-            total -= 10
-            ace_count -= 1
-            
-    return total
+    return determine_hand_type(hand)[0]
 
 
-def determine_hand_type(hand: List["Card"]) -> Tuple[int, HandType]:
+def determine_hand_type(hand: List[Card]) -> Tuple[int, HandType]:
     """
     Determine hand type and score.
     
@@ -80,37 +119,13 @@ def determine_hand_type(hand: List["Card"]) -> Tuple[int, HandType]:
     Returns:
         Tuple of (score, HandType)
     """
-    if not hand:
-        return 0, HandType.NORMAL
-    
-    score = calculate_hand_value(hand)
-    card_count = len(hand)
-    
-    # Bust check first
-    if score > 21:
-        return score, HandType.BUST
-    
-    # Special hands only for exactly 2 cards
-    if card_count == 2:
-        ace_count = sum(1 for c in hand if c.is_ace)
-        ten_count = sum(1 for c in hand if c.is_ten_value)
-        
-        # Xi Ban: Two Aces
-        if ace_count == 2:
-            return score, HandType.XI_BAN
-        
-        # Xi Dach: One Ace + One 10-value card
-        if ace_count == 1 and ten_count == 1:
-            return score, HandType.XI_DACH
-    
-    # Ngu Linh: 5 cards without busting
-    if card_count == 5 and score <= 21:
-        return score, HandType.NGU_LINH
-    
-    return score, HandType.NORMAL
+    if len(hand) > MAX_TABLE_CARDS:
+        return _score_values(tuple(1 if c.is_ace else c.value for c in hand))
+    bits = HAND_BITS
+    return HAND_TABLE[sum(bits[card.index] for card in hand)]
 
 
-def is_du_tuoi(hand: List["Card"]) -> bool:
+def is_du_tuoi(hand: List[Card]) -> bool:
     """
     Check if hand meets minimum score requirement to Stand (16+).
     Special hands always qualify.
@@ -142,7 +157,7 @@ def get_hand_description(hand_type: HandType) -> str:
     return descriptions.get(hand_type, "")
 
 
-def format_hand(hand: List["Card"], hide_first: bool = False) -> str:
+def format_hand(hand: List[Card], hide_first: bool = False) -> str:
     """Format hand for Discord display."""
     if not hand:
         return "🃏"
@@ -156,8 +171,8 @@ def format_hand(hand: List["Card"], hide_first: bool = False) -> str:
 
 
 def compare_hands(
-    player_hand: List["Card"],
-    dealer_hand: List["Card"]
+    player_hand: List[Card],
+    dealer_hand: List[Card]
 ) -> Tuple[str, float]:
     """
     Compare player hand vs dealer hand.
@@ -223,8 +238,8 @@ def compare_hands(
 
 
 def check_phase1_winner(
-    player_hand: List["Card"],
-    dealer_hand: List["Card"]
+    player_hand: List[Card],
+    dealer_hand: List[Card]
 ) -> Tuple[str, float]:
     """
     Phase 1 comparison (initial 2 cards).
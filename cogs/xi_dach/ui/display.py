@@ -0,0 +1,95 @@
+"""
+Xi Dach Table Display - Coalesced message edits per table.
+
+Hits, doubles and dealer draws used to re-render and edit the table message
+one by one, so a fast player (or the dealer) produced an edit per card and
+retried failures with linear sleeps. Now a state change only marks the table
+dirty with a builder for the message; one writer task per table pushes at most
+one edit per interval, rendering the image once from the latest state. Edits
+go through the shared Discord scheduler, which owns rate limits and 429
+retries.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import discord
+
+from core.discord_scheduler import Priority, discord_scheduler
+from core.logger import setup_logger
+
+logger = setup_logger("XiDachMulti", "cogs/xidach_multi.log")
+
+# Minimum seconds between two edits of a table's messages
+EDIT_INTERVAL = 1.0
+
+# Builds message.edit kwargs (embed, attachments...) from the current table state
+EditBuilder = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class TableDisplay:
+    """Single writer for one table's message edits."""
+
+    def __init__(self, interval: float = EDIT_INTERVAL):
+        self.interval = interval
+        self._message: Optional[discord.Message] = None
+        self._build: Optional[EditBuilder] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_edit = 0.0
+        self.marks = 0
+        self.edits = 0
+
+    def mark_dirty(self, message: Optional[discord.Message], build: EditBuilder) -> None:
+        """Schedule message to show the latest state; replaces any pending edit."""
+        if message is None:
+            return
+        if self._message is not None and self._message is not message and self._build is not None:
+            # A different message takes over: the pending one would be stale anyway
+            logger.debug(f"[DISPLAY] Dropping pending edit of message {self._message.id}")
+        self._message = message
+        self._build = build
+        self.marks += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def discard(self) -> None:
+        """Drop the pending edit (an edit already being sent still completes)."""
+        self._build = None
+
+    async def flush(self) -> None:
+        """Wait until the pending edit, if any, has been sent."""
+        task = self._task
+        if task is not None and not task.done():
+            await asyncio.shield(task)
+
+    def close(self) -> None:
+        self._build = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._build is not None:
+            wait = self._last_edit + self.interval - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue  # Re-check: the pending edit may have been discarded meanwhile
+            message, build = self._message, self._build
+            self._build = None
+            try:
+                kwargs = await build()
+                await discord_scheduler.submit(
+                    "message_edit",
+                    lambda: message.edit(**kwargs),
+                    major=message.channel.id,
+                    target=message.id,
+                    priority=Priority.NORMAL,
+                    label=f"xidach table message={message.id}",
+                )
+                self.edits += 1
+            except discord.NotFound:
+                logger.warning(f"[DISPLAY] Message {message.id} deleted before edit")
+            except Exception as e:
+                logger.error(f"[DISPLAY] Edit failed for message {message.id}: {e}")
+            self._last_edit = loop.time()
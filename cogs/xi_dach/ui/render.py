@@ -1,13 +1,21 @@
 """
 Xi Dach Card Renderer - Optimized with Asset Manager & Pillow
+
+Rendered images are cached by content: the ordered (rank, suit) tuple of the
+hand (plus the layout for table images) maps to the encoded bytes, so a
+refresh or a dealer redraw of an unchanged hand costs a dict lookup. Hand
+canvases are cached per card prefix too, and drawing card n+1 pastes one card
+onto a copy of the n-card canvas instead of composing the hand from scratch.
 """
-import asyncio
 import io
 import os
-from typing import List, Tuple, Dict, Union, Optional
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, Tuple, Dict, Union, Optional
 from PIL import Image
 
 from core.logger import setup_logger
+from core.render_service import render_service
 
 logger = setup_logger("CardRenderer", "cogs/card_renderer.log")
 
@@ -27,6 +35,20 @@ CARD_SPACING = 10  # Spacing between cards
 SECTION_PADDING = 10
 ROW_HEIGHT = CARD_HEIGHT + 25
 
+# Layout for a single hand
+HAND_PADDING = 20
+MAX_HAND_CARDS = 5  # Ngũ linh: a hand never holds more than 5 cards
+
+# Encoding: 256-colour palette + fast zlib level. Card art is flat colour and
+# the felt background survives the palette, ~4x smaller and ~10x faster than
+# full RGB PNG at the default level.
+PNG_COMPRESS_LEVEL = 1
+QUANTIZE_COLORS = 256  # 0 = keep full RGB
+
+# Render cache sizes (entries)
+IMAGE_CACHE_SIZE = 512
+CANVAS_CACHE_SIZE = 256
+
 # Suit Mapping for Filenames (Symbol -> Filename Suffix)
 SUIT_MAP = {
     "♠️": "Spades",
@@ -154,6 +176,11 @@ class AssetManager:
 assets = AssetManager()
 
 
+def preload() -> None:
+    """Render service worker hook: load card assets once per process."""
+    assets.load_assets()
+
+
 def _get_card_key(card_obj) -> Tuple[str, str]:
     """Helper to extract rank/suit from Discord objects or tuples."""
     if hasattr(card_obj, 'rank') and hasattr(card_obj, 'suit'):
@@ -164,44 +191,134 @@ def _get_card_key(card_obj) -> Tuple[str, str]:
     return rank, suit
 
 
+# ==================== RENDER CACHE ====================
+
+class _LRUCache:
+    """Thread-safe LRU map (sync renders may be called from executor threads)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Encoded images: ("hand", cards) / ("table", dealer, hide, players) -> bytes
+_image_cache = _LRUCache(IMAGE_CACHE_SIZE)
+# Hand canvases (full MAX_HAND_CARDS width) per card prefix
+_canvas_cache = _LRUCache(CANVAS_CACHE_SIZE)
+
+
+def cache_stats() -> Dict[str, int]:
+    return {
+        "images": len(_image_cache),
+        "image_hits": _image_cache.hits,
+        "image_misses": _image_cache.misses,
+        "canvases": len(_canvas_cache),
+        "canvas_hits": _canvas_cache.hits,
+        "canvas_misses": _canvas_cache.misses,
+    }
+
+
+def clear_render_cache() -> None:
+    _image_cache.clear()
+    _canvas_cache.clear()
+
+
+def _hand_key(cards: List[Union[Tuple[str, str], object]]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(_get_card_key(card_obj) for card_obj in cards)
+
+
+def _hand_width(num_cards: int) -> int:
+    return HAND_PADDING * 2 + (num_cards * CARD_WIDTH) + ((num_cards - 1) * CARD_SPACING)
+
+
+def _encode(img: Image.Image) -> bytes:
+    if QUANTIZE_COLORS:
+        img = img.quantize(QUANTIZE_COLORS, method=Image.Quantize.FASTOCTREE)
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+
+def _hand_canvas(key: Tuple[Tuple[str, str], ...]) -> Image.Image:
+    """MAX_HAND_CARDS-wide canvas with the cards of key pasted (cached per prefix).
+
+    Built by pasting the last card onto a copy of the canvas of key[:-1], so a
+    hand growing one card at a time composes one card per draw.
+    """
+    canvas = _canvas_cache.get(key)
+    if canvas is not None:
+        return canvas
+    if not key:
+        canvas = assets.get_bg(_hand_width(MAX_HAND_CARDS), HAND_PADDING * 2 + CARD_HEIGHT).copy()
+    else:
+        canvas = _hand_canvas(key[:-1]).copy()
+        card_img = assets.get_card(*key[-1])
+        x = HAND_PADDING + (len(key) - 1) * (CARD_WIDTH + CARD_SPACING)
+        canvas.paste(card_img, (x, HAND_PADDING), card_img)
+    _canvas_cache.put(key, canvas)
+    return canvas
+
+
+def _compose_hand(key: Tuple[Tuple[str, str], ...]) -> Image.Image:
+    """Hand image for key (wider than a cached canvas only past MAX_HAND_CARDS)."""
+    height = HAND_PADDING * 2 + CARD_HEIGHT
+    if len(key) <= MAX_HAND_CARDS:
+        return _hand_canvas(key).crop((0, 0, _hand_width(len(key)), height))
+    img = assets.get_bg(_hand_width(len(key)), height).copy()
+    for index, (rank, suit) in enumerate(key):
+        card_img = assets.get_card(rank, suit)
+        img.paste(card_img, (HAND_PADDING + index * (CARD_WIDTH + CARD_SPACING), HAND_PADDING), card_img)
+    return img
+
+
 def render_player_hand_sync(
     cards: List[Union[Tuple[str, str], object]],
     player_name: str = "Player"
 ) -> bytes:
-    """Render a single player's hand using cached assets."""
+    """Render a single player's hand using cached assets (player_name is not drawn)."""
     try:
         # Lazy load check
         if not assets.loaded:
             assets.load_assets()
 
-        num_cards = len(cards)
-        if num_cards == 0:
+        key = _hand_key(cards)
+        if not key:
             return io.BytesIO().getvalue()
 
-        # Calculate Canvas Size
-        padding_x = 20
-        padding_y = 20
-        
-        total_width = padding_x * 2 + (num_cards * CARD_WIDTH) + ((num_cards - 1) * CARD_SPACING)
-        total_height = padding_y * 2 + CARD_HEIGHT
-        
-        # Prepare Background
-        img = assets.get_bg(total_width, total_height).copy()
-        
-        # Paste Cards
-        current_x = padding_x
-        y = padding_y
-        
-        for card_obj in cards:
-            rank, suit = _get_card_key(card_obj)
-            card_img = assets.get_card(rank, suit)
-            img.paste(card_img, (current_x, y), card_img)
-            current_x += CARD_WIDTH + CARD_SPACING
-            
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=False)
-        buffer.seek(0)
-        return buffer.getvalue()
+        cache_key = ("hand", key)
+        data = _image_cache.get(cache_key)
+        if data is None:
+            data = _encode(_compose_hand(key))
+            _image_cache.put(cache_key, data)
+        return data
 
     except Exception as e:
         logger.error(f"[RENDER_ERROR] {e}", exc_info=True)
@@ -212,9 +329,14 @@ async def render_player_hand(
     cards: List[Union[Tuple[str, str], object]],
     player_name: str = "Player"
 ) -> bytes:
-    """Async wrapper used by multi.py"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, render_player_hand_sync, cards, player_name)
+    """Async wrapper used by multi.py: cache hits return at once, misses render in the render service."""
+    key = _hand_key(cards)
+    data = _image_cache.get(("hand", key))
+    if data is None:
+        data = await render_service.submit(render_player_hand_sync, list(key), player_name)
+        if data:
+            _image_cache.put(("hand", key), data)
+    return data
 
 
 # Backwards compatibility
@@ -225,6 +347,18 @@ async def render_hand(cards: List[Tuple[str, str]], hide_first: bool = False) ->
 
 # ==================== TABLE RENDERER (Restored for Compatibility) ====================
 
+def _table_key(dealer_cards, players: List[Dict], hide_dealer: bool) -> Tuple:
+    """Image cache key of a table: the hidden dealer card is not part of it."""
+    dealer_key = _hand_key(dealer_cards)
+    return (
+        "table",
+        dealer_key[1:] if hide_dealer else dealer_key,
+        len(dealer_key),
+        hide_dealer,
+        tuple(_hand_key(player.get('cards', [])) for player in players),
+    )
+
+
 def render_game_state_sync(
     dealer_cards: List[Union[Tuple[str, str], object]],
     players: List[Dict],
@@ -238,6 +372,11 @@ def render_game_state_sync(
         if not assets.loaded:
             assets.load_assets()
 
+        cache_key = _table_key(dealer_cards, players, hide_dealer)
+        data = _image_cache.get(cache_key)
+        if data is not None:
+            return data
+
         # 1. Calc Dimensions
         # Dealer row + 1 Row per player (simple vertical layout)
         num_players = len(players)
@@ -287,10 +426,9 @@ def render_game_state_sync(
             current_y += ROW_HEIGHT
             
         # 5. Save
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=False)
-        buffer.seek(0)
-        return buffer.getvalue()
+        data = _encode(img)
+        _image_cache.put(cache_key, data)
+        return data
 
     except Exception as e:
         logger.error(f"[RENDER_TABLE_ERROR] {e}", exc_info=True)
@@ -302,8 +440,14 @@ async def render_game_state(
     players: List[Dict],
     hide_dealer: bool = True
 ) -> bytes:
-    """Async wrapper for render_game_state_sync."""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None, render_game_state_sync, dealer_cards, players, hide_dealer
-    )
+    """Async wrapper for render_game_state_sync: cache hits return at once, misses render in the render service."""
+    cache_key = _table_key(dealer_cards, players, hide_dealer)
+    data = _image_cache.get(cache_key)
+    if data is None:
+        # Plain (rank, suit) tuples: cheap to pickle across to the worker
+        dealer_key = list(_hand_key(dealer_cards))
+        player_keys = [{'cards': list(_hand_key(player.get('cards', [])))} for player in players]
+        data = await render_service.submit(render_game_state_sync, dealer_key, player_keys, hide_dealer)
+        if data:
+            _image_cache.put(cache_key, data)
+    return data
@@ -3,9 +3,11 @@ import asyncio
 import logging
 import re
 import asyncpg
-from typing import Optional, List, Any, Dict, Tuple
+from typing import Optional, List, Any, Dict, Iterable, Tuple
 from contextlib import asynccontextmanager
 
+from core.query_cache import CACHE_DEFAULT_TTL, QueryCache
+
 logger = logging.getLogger(__name__)
 
 class DatabaseManager:
@@ -16,6 +18,7 @@ class DatabaseManager:
     - Automatic '?' to '$n' parameter conversion (sqlite compat)
     - Context Managers for connections and transactions
     - Robust Error Handling
+    - Keyed result cache (TTL + LRU) with prefix/tag invalidation
     """
     
     _instance = None
@@ -31,6 +34,7 @@ class DatabaseManager:
             return
             
         self.pool: Optional[asyncpg.Pool] = None
+        self.cache = QueryCache()
         # Retrieve credentials from environment (loaded by main bot or dotenv)
         self.host = os.getenv("DB_HOST", "localhost")
         self.port = os.getenv("DB_PORT", "5432")
@@ -136,8 +140,11 @@ class DatabaseManager:
                 logger.error(f"DB Batch Error: {sql} | Error: {e}")
                 raise e
 
-    async def fetchone(self, sql: str, *args) -> Optional[Tuple]:
-        """Fetch a single row."""
+    async def fetchone(self, sql: str, *args, use_cache: bool = False, cache_key: Optional[str] = None,
+                       cache_ttl: float = CACHE_DEFAULT_TTL) -> Optional[Tuple]:
+        """Fetch a single row (cached under cache_key when use_cache is set)."""
+        if use_cache and cache_key:
+            return await self.fetchone_cached(cache_key, cache_ttl, sql, *args)
         if not self.pool:
             await self.connect()
 
@@ -156,8 +163,11 @@ class DatabaseManager:
                 raise e
 
 
-    async def fetchall(self, sql: str, *args) -> List[Tuple]:
-        """Fetch all rows."""
+    async def fetchall(self, sql: str, *args, use_cache: bool = False, cache_key: Optional[str] = None,
+                       cache_ttl: float = CACHE_DEFAULT_TTL) -> List[Tuple]:
+        """Fetch all rows (cached under cache_key when use_cache is set)."""
+        if use_cache and cache_key:
+            return await self.fetchall_cached(cache_key, cache_ttl, sql, *args)
         if not self.pool:
             await self.connect()
 
@@ -176,8 +186,11 @@ class DatabaseManager:
                 raise e
 
 
-    async def fetchrow(self, sql: str, *args):
-        """Fetch a single row as a Record object (asyncpg native)."""
+    async def fetchrow(self, sql: str, *args, use_cache: bool = False, cache_key: Optional[str] = None,
+                       cache_ttl: float = CACHE_DEFAULT_TTL):
+        """Fetch a single row as a Record object (asyncpg native, cached when use_cache is set)."""
+        if use_cache and cache_key:
+            return await self.fetchrow_cached(cache_key, cache_ttl, sql, *args)
         if not self.pool:
             await self.connect()
 
@@ -212,6 +225,42 @@ class DatabaseManager:
         """Alias for execute (legacy compatibility)."""
         return await self.execute(sql, *parameters)
 
+    # --- RESULT CACHE ---
+    # Keys follow "<kind>_<id>..." (balance_{user_id}, config_{guild_id}_{field})
+    # so writers can drop them with clear_cache_by_prefix() once they commit.
+
+    async def fetchone_cached(self, key: str, ttl: float, sql: str, *args, tags: Iterable[str] = ()) -> Optional[Tuple]:
+        """fetchone through the cache: at most one query per key per ttl seconds."""
+        return await self.cache.get_or_load(key, ttl, lambda: self.fetchone(sql, *args), tags)
+
+    async def fetchrow_cached(self, key: str, ttl: float, sql: str, *args, tags: Iterable[str] = ()):
+        """fetchrow through the cache (asyncpg Records are immutable, safe to share)."""
+        return await self.cache.get_or_load(key, ttl, lambda: self.fetchrow(sql, *args), tags)
+
+    async def fetchall_cached(self, key: str, ttl: float, sql: str, *args, tags: Iterable[str] = ()) -> List[Tuple]:
+        """fetchall through the cache. Returns a copy of the list, the rows are shared tuples."""
+        rows = await self.cache.get_or_load(key, ttl, lambda: self.fetchall(sql, *args), tags)
+        return list(rows)
+
+    def clear_cache_by_prefix(self, prefix: str) -> int:
+        """Drop cached results whose key starts with prefix. Call after the write commits."""
+        return self.cache.invalidate_prefix(prefix)
+
+    def clear_cache_keys(self, keys: Iterable[str]) -> int:
+        """Drop exact cache keys. Returns how many were cached."""
+        return sum(self.cache.invalidate(key) for key in keys)
+
+    def clear_cache_by_tag(self, tag: str) -> int:
+        """Drop cached results stored with tag."""
+        return self.cache.invalidate_tag(tag)
+
+    def clear_cache(self) -> None:
+        self.cache.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Size, hits, misses, hit rate, evictions, expirations and invalidations."""
+        return self.cache.stats()
+
     @asynccontextmanager
     async def transaction(self):
         """Async Context Manager for Transactions.
@@ -225,24 +274,40 @@ class DatabaseManager:
         async with self.pool.acquire() as conn:
             txn = conn.transaction()
             await txn.start()
+            proxy = _TransactionProxy(conn, self._convert_sql_params)
             try:
                 # We wrap the connection to support automatic `?` conversion 
                 # inside the transaction execution calls.
                 # However, for now, we yield the raw connection and users 
                 # must beware.
                 # BETTER: Return a proxy helper that does conversion.
-                yield _TransactionProxy(conn, self._convert_sql_params)
+                yield proxy
                 await txn.commit()
             except Exception as e:
                 await txn.rollback()
                 logger.error(f"Transaction Rollback: {e}")
                 raise e
+            # Only committed writes invalidate; readers never see the old value re-cached
+            for prefix in proxy.invalidated_prefixes:
+                self.cache.invalidate_prefix(prefix)
+            for key in proxy.invalidated_keys:
+                self.cache.invalidate(key)
 
 class _TransactionProxy:
     """Helper to support '?' param conversion inside transactions."""
     def __init__(self, conn, converter):
         self.conn = conn
         self.converter = converter
+        self.invalidated_prefixes: List[str] = []
+        self.invalidated_keys: set = set()
+
+    def invalidate_on_commit(self, prefix: str) -> None:
+        """Drop cached results under prefix once (and only if) the transaction commits."""
+        self.invalidated_prefixes.append(prefix)
+
+    def invalidate_keys_on_commit(self, keys: Iterable[str]) -> None:
+        """Drop exact cache keys once the transaction commits (no prefix scan)."""
+        self.invalidated_keys.update(keys)
         
     async def execute(self, sql, *args):
         """Execute query with auto-flattening of nested tuples.
@@ -306,6 +371,29 @@ async def get_user_balance(user_id: int) -> int:
     row = await db_manager.fetchone("SELECT seeds FROM users WHERE user_id = ?", (user_id,))
     return row[0] if row else 0
 
+BALANCE_CACHE_TTL = 30.0
+LEADERBOARD_CACHE_TTL = 60.0
+
+def balance_cache_key(user_id: int) -> str:
+    return f"balance_{int(user_id)}"
+
+def harvest_buff_cache_key(guild_id: int) -> str:
+    """server_config.harvest_buff_until row (fetchrow), dropped with the guild's config_ prefix."""
+    return f"config_{int(guild_id)}_harvest_buff_until"
+
+async def get_cached_balance(user_id: int) -> int:
+    """Get user seeds for display (/tuido, profile), cached for BALANCE_CACHE_TTL.
+
+    Seed writers drop the key after commit (invalidate_keys_on_commit or
+    clear_cache_keys). Checks that guard a spend must keep using
+    get_user_balance or an atomic UPDATE ... WHERE seeds >= cost.
+    """
+    row = await db_manager.fetchone_cached(
+        balance_cache_key(user_id), BALANCE_CACHE_TTL,
+        "SELECT seeds FROM users WHERE user_id = ?", (user_id,)
+    )
+    return row[0] if row else 0
+
 async def get_user_full(user_id: int) -> Optional[Tuple]:
     """Get full user record."""
     return await db_manager.fetchone("SELECT * FROM users WHERE user_id = ?", (user_id,))
@@ -322,6 +410,7 @@ async def add_seeds(user_id: int, amount: int, reason: str = "unknown", category
             "UPDATE users SET seeds = seeds + $1 WHERE user_id = $2",
             amount, user_id
         )
+        conn.invalidate_keys_on_commit([balance_cache_key(user_id)])
         
         # Log
         await conn.execute(
@@ -334,9 +423,106 @@ async def add_seeds(user_id: int, amount: int, reason: str = "unknown", category
         row = await conn.fetchrow("SELECT seeds FROM users WHERE user_id = $1", user_id)
         return row['seeds'] if row else 0
 
+# --- BULK HELPERS (one statement per table, run inside a transaction) ---
+
+async def bulk_ensure_users(conn, users: Dict[int, str]) -> None:
+    """Create missing users in one statement.
+
+    Args:
+        conn: Transaction connection from db_manager.transaction().
+        users: Mapping user_id -> username.
+    """
+    if not users:
+        return
+    await conn.execute(
+        "INSERT INTO users (user_id, username, seeds) "
+        "SELECT u, n, 0 FROM unnest($1::bigint[], $2::text[]) AS t(u, n) "
+        "ON CONFLICT (user_id) DO NOTHING",
+        list(users.keys()), list(users.values())
+    )
+
+async def bulk_add_seeds(conn, entries: List[Tuple[int, int, str, str]]) -> None:
+    """Apply many seed changes with one UPDATE and one log INSERT.
+
+    Args:
+        conn: Transaction connection from db_manager.transaction().
+        entries: (user_id, amount, reason, category) rows. A user may appear
+            several times; balances are summed per user, logs keep every row.
+    """
+    entries = [e for e in entries if e[1]]
+    if not entries:
+        return
+
+    totals: Dict[int, int] = {}
+    for user_id, amount, _, _ in entries:
+        totals[user_id] = totals.get(user_id, 0) + amount
+
+    await conn.execute(
+        "UPDATE users SET seeds = users.seeds + t.amount "
+        "FROM unnest($1::bigint[], $2::bigint[]) AS t(user_id, amount) "
+        "WHERE users.user_id = t.user_id",
+        list(totals.keys()), list(totals.values())
+    )
+    conn.invalidate_keys_on_commit(balance_cache_key(user_id) for user_id in totals)
+    await conn.execute(
+        "INSERT INTO transaction_logs (user_id, amount, reason, category, created_at) "
+        "SELECT u, a, r, c, NOW() FROM unnest($1::bigint[], $2::bigint[], $3::text[], $4::text[]) AS t(u, a, r, c)",
+        [e[0] for e in entries], [e[1] for e in entries],
+        [e[2] for e in entries], [e[3] for e in entries]
+    )
+
+async def bulk_increment_stats(conn, game_id: str, deltas: Dict[Tuple[int, str], int]) -> Dict[Tuple[int, str], int]:
+    """Upsert many stat increments in one statement.
+
+    Args:
+        conn: Transaction connection from db_manager.transaction().
+        game_id: Game identifier (e.g. 'noitu').
+        deltas: Mapping (user_id, stat_key) -> amount to add.
+
+    Returns:
+        Mapping (user_id, stat_key) -> new value.
+    """
+    if not deltas:
+        return {}
+    keys = list(deltas.keys())
+    rows = await conn.fetch(
+        "INSERT INTO user_stats (user_id, game_id, stat_key, value) "
+        "SELECT u, $2, k, v FROM unnest($1::bigint[], $3::text[], $4::bigint[]) AS t(u, k, v) "
+        "ON CONFLICT (user_id, game_id, stat_key) DO UPDATE SET value = user_stats.value + EXCLUDED.value "
+        "RETURNING user_id, stat_key, value",
+        [k[0] for k in keys], game_id, [k[1] for k in keys], [deltas[k] for k in keys]
+    )
+    return {(row['user_id'], row['stat_key']): row['value'] for row in rows}
+
+async def bulk_max_stats(conn, game_id: str, values: Dict[Tuple[int, str], int]) -> Dict[Tuple[int, str], int]:
+    """Raise many stats to GREATEST(current, new) in one statement.
+
+    Args:
+        conn: Transaction connection from db_manager.transaction().
+        game_id: Game identifier (e.g. 'noitu').
+        values: Mapping (user_id, stat_key) -> candidate max value.
+
+    Returns:
+        Mapping (user_id, stat_key) -> new value, only for rows that changed.
+    """
+    if not values:
+        return {}
+    keys = list(values.keys())
+    rows = await conn.fetch(
+        "INSERT INTO user_stats (user_id, game_id, stat_key, value) "
+        "SELECT u, $2, k, v FROM unnest($1::bigint[], $3::text[], $4::bigint[]) AS t(u, k, v) "
+        "ON CONFLICT (user_id, game_id, stat_key) DO UPDATE "
+        "SET value = GREATEST(user_stats.value, EXCLUDED.value) "
+        "WHERE EXCLUDED.value > user_stats.value "
+        "RETURNING user_id, stat_key, value",
+        [k[0] for k in keys], game_id, [k[1] for k in keys], [values[k] for k in keys]
+    )
+    return {(row['user_id'], row['stat_key']): row['value'] for row in rows}
+
 async def get_leaderboard(limit: int = 10) -> List[Tuple]:
-    """Get top rich users."""
-    return await db_manager.fetchall(
+    """Get top rich users (cached; rankings may lag writes by LEADERBOARD_CACHE_TTL)."""
+    return await db_manager.fetchall_cached(
+        f"leaderboard_{limit}", LEADERBOARD_CACHE_TTL,
         "SELECT user_id, username, seeds FROM users ORDER BY seeds DESC LIMIT ?", 
         (limit,)
     )
\ No newline at end of file
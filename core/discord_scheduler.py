@@ -0,0 +1,393 @@
+"""Discord Action Scheduler - Rate-limit-aware queue for outbound Discord actions.
+
+Phase changes in games fire bursts of member edits, permission overwrites and
+thread edits. Sending them sequentially wastes time, and firing them all with
+an unbounded gather runs straight into 429s. The scheduler sits in between:
+
+- Per-route buckets (keyed by route name + major parameter, e.g. the guild for
+  member edits) that start from loose soft caps and follow Discord's
+  X-RateLimit-* headers whenever the caller can see them. Actions sent
+  through discord.py never expose headers: its HTTP client enforces the real
+  buckets (and retries 429s) itself, so the soft caps only keep a burst from
+  piling up inside discord.py, where priorities no longer apply.
+- Priorities, so game-critical actions (mutes, thread locks) go out before
+  cosmetic ones (permission cleanup, message edits).
+- Coalescing: a queued action for the same (route, major, target) is replaced
+  by the newer one, so a mute followed by an unmute only sends the unmute.
+- Bounded concurrency and a global bucket shared by every route.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
+
+from core.logger import setup_logger
+
+logger = setup_logger("DiscordScheduler", "core/discord_scheduler.log")
+
+ActionFactory = Callable[[], Awaitable[Any]]
+BucketKey = Tuple[str, Hashable]
+
+
+class Priority(IntEnum):
+    """Lower value runs first."""
+    CRITICAL = 0   # Voice mutes, anything the game rules depend on
+    HIGH = 1       # Thread lock/unlock, access grants
+    NORMAL = 2     # Messages, DMs, role edits
+    LOW = 3        # Cleanup and cosmetic edits
+
+
+# Soft caps, (requests, per seconds), used until headers are seen for a route.
+# Discord does not publish its per-route limits and changes them without
+# notice, so these are deliberately at or above the buckets it usually
+# returns: the scheduler must never be the thing slowing a phase change down.
+# The real limit is learned from X-RateLimit-* headers (observe_headers) or
+# from the retry_after of a 429 (penalize), and discord.py's own HTTP client
+# still waits on the exact buckets for everything it sends.
+DEFAULT_ROUTE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "member_edit": (20, 5.0),
+    "member_roles": (20, 5.0),
+    "channel_edit": (10, 5.0),
+    "channel_permissions": (10, 5.0),
+    "thread_members": (10, 5.0),
+    "message_send": (10, 5.0),
+    "message_edit": (10, 5.0),
+    "dm_send": (10, 5.0),
+    "guild_role_edit": (10, 5.0),
+}
+FALLBACK_LIMIT = (10, 5.0)
+GLOBAL_LIMIT = (50, 1.0)
+MAX_RETRIES = 3
+
+
+class RateLimited(Exception):
+    """Raised by an action to ask the scheduler to back off and retry it."""
+
+    def __init__(self, retry_after: float, is_global: bool = False):
+        super().__init__(f"Rate limited, retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+        self.is_global = is_global
+
+
+class RouteBucket:
+    """Fixed-window bucket matching Discord's model: `limit` requests per window."""
+
+    __slots__ = ("limit", "window", "remaining", "reset_at")
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def delay(self, now: float) -> float:
+        """Seconds until a request may be sent (0 if one can go now)."""
+        if now >= self.reset_at:
+            return 0.0
+        return 0.0 if self.remaining > 0 else self.reset_at - now
+
+    def take(self, now: float) -> None:
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.window
+        self.remaining -= 1
+
+    def update(self, limit: Optional[int], remaining: Optional[int], reset_after: Optional[float], now: float) -> None:
+        """Apply X-RateLimit-Limit / Remaining / Reset-After from a response."""
+        if limit:
+            self.limit = limit
+        if reset_after is not None:
+            self.reset_at = now + reset_after
+            self.window = max(self.window, reset_after)
+        if remaining is not None:
+            self.remaining = remaining
+
+    def penalize(self, retry_after: float, now: float) -> None:
+        self.remaining = 0
+        self.reset_at = now + retry_after
+
+
+class _Job:
+    __slots__ = ("bucket_key", "coalesce_key", "factory", "future", "priority", "attempts", "started", "label")
+
+    def __init__(self, bucket_key, coalesce_key, factory, future, priority, label):
+        self.bucket_key = bucket_key
+        self.coalesce_key = coalesce_key
+        self.factory = factory
+        self.future = future
+        self.priority = priority
+        self.attempts = 0
+        self.started = False
+        self.label = label
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    return value
+
+
+class DiscordActionScheduler:
+    """Priority queue of outbound Discord actions gated by per-route buckets."""
+
+    def __init__(self, max_concurrency: int = 4, route_limits: Optional[Dict[str, Tuple[int, float]]] = None):
+        self.max_concurrency = max_concurrency
+        self.route_limits = dict(DEFAULT_ROUTE_LIMITS)
+        if route_limits:
+            self.route_limits.update(route_limits)
+
+        self._buckets: Dict[BucketKey, RouteBucket] = {}
+        self._bucket_aliases: Dict[str, str] = {}  # route -> X-RateLimit-Bucket hash
+        self._global = RouteBucket(*GLOBAL_LIMIT)
+        self._heap: List[Tuple[int, int, _Job]] = []
+        self._pending: Dict[Hashable, _Job] = {}
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: set = set()
+
+        # Stats
+        self.sent = 0
+        self.coalesced = 0
+        self.retried = 0
+
+    # ==================== SUBMISSION ====================
+
+    def submit(
+        self,
+        route: str,
+        factory: ActionFactory,
+        *,
+        major: Hashable = None,
+        target: Hashable = None,
+        priority: Priority = Priority.NORMAL,
+        label: Optional[str] = None,
+    ) -> asyncio.Future:
+        """Queue an action and return a future for its result.
+
+        Args:
+            route: Route name, e.g. "member_edit" (see DEFAULT_ROUTE_LIMITS).
+            factory: Zero-argument callable returning the coroutine to run.
+                It is only called when the action is actually sent.
+            major: Major parameter of the route (guild or channel ID).
+            target: What the action modifies. Actions with the same route,
+                major and target coalesce: the queued one is replaced and
+                both callers get the result of the newest.
+            priority: Scheduling priority.
+            label: Short description for logs.
+        """
+        self._ensure_started()
+        coalesce_key = (route, major, target) if target is not None else None
+
+        if coalesce_key is not None:
+            queued = self._pending.get(coalesce_key)
+            if queued is not None and not queued.started:
+                queued.factory = factory
+                queued.label = label or queued.label
+                self.coalesced += 1
+                if priority < queued.priority:
+                    queued.priority = priority
+                    heapq.heappush(self._heap, (priority, next(self._seq), queued))
+                    self._wakeup.set()
+                return queued.future
+
+        job = _Job((route, major), coalesce_key, factory, asyncio.get_running_loop().create_future(), priority, label or route)
+        if coalesce_key is not None:
+            self._pending[coalesce_key] = job
+        heapq.heappush(self._heap, (priority, next(self._seq), job))
+        self._wakeup.set()
+        return job.future
+
+    async def run(self, route: str, factory: ActionFactory, **kwargs) -> Any:
+        """Submit an action and wait for its result."""
+        return await self.submit(route, factory, **kwargs)
+
+    def observe_headers(self, route: str, major: Hashable, headers: Mapping[str, str]) -> None:
+        """Feed X-RateLimit-* response headers back into the route's bucket."""
+        bucket_hash = _header(headers, "X-RateLimit-Bucket")
+        if bucket_hash and self._bucket_aliases.get(route) != bucket_hash:
+            self._bucket_aliases[route] = bucket_hash
+        try:
+            limit = _header(headers, "X-RateLimit-Limit")
+            remaining = _header(headers, "X-RateLimit-Remaining")
+            reset_after = _header(headers, "X-RateLimit-Reset-After")
+            self._bucket((route, major)).update(
+                int(limit) if limit is not None else None,
+                int(remaining) if remaining is not None else None,
+                float(reset_after) if reset_after is not None else None,
+                time.monotonic(),
+            )
+        except ValueError:
+            logger.warning(f"[SCHEDULER] Bad rate limit headers for {route}: {dict(headers)}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": sum(1 for priority, _, job in self._heap if not job.started and priority == job.priority),
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "retried": self.retried,
+            "buckets": len(self._buckets),
+        }
+
+    async def close(self) -> None:
+        """Stop dispatching. Running and queued actions are cancelled, and so are their futures."""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        running = list(self._running)
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        for _, _, job in self._heap:
+            if not job.future.done():
+                job.future.cancel()
+        self._heap.clear()
+        self._pending.clear()
+
+    # ==================== DISPATCH ====================
+
+    def _ensure_started(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    def _bucket(self, key: BucketKey) -> RouteBucket:
+        route, major = key
+        shared = self._bucket_aliases.get(route)
+        if shared:
+            key = (shared, major)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = RouteBucket(*self.route_limits.get(route, FALLBACK_LIMIT))
+        return bucket
+
+    def _next_ready(self) -> Tuple[Optional[_Job], Optional[float]]:
+        """Pop the highest-priority job whose bucket has room.
+
+        Returns (job, None) or (None, seconds until the earliest bucket frees up).
+        """
+        now = time.monotonic()
+        deferred = []
+        job = None
+        wait = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            candidate = entry[2]
+            if candidate.started or entry[0] != candidate.priority:
+                continue  # Already sent, or superseded by a higher-priority push
+            bucket = self._bucket(candidate.bucket_key)
+            delay = max(bucket.delay(now), self._global.delay(now))
+            if delay <= 0:
+                bucket.take(now)
+                self._global.take(now)
+                job = candidate
+                break
+            deferred.append(entry)
+            wait = delay if wait is None else min(wait, delay)
+        for entry in deferred:
+            heapq.heappush(self._heap, entry)
+        return job, wait
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            await self._slots.acquire()
+            self._wakeup.clear()
+            job, wait = self._next_ready()
+            if job is None:
+                self._slots.release()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job.started = True
+            if job.coalesce_key is not None and self._pending.get(job.coalesce_key) is job:
+                del self._pending[job.coalesce_key]
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _execute(self, job: _Job) -> None:
+        try:
+            result = await job.factory()
+        except Exception as e:
+            retry_after = _retry_after(e)
+            if retry_after is not None and job.attempts < MAX_RETRIES:
+                job.attempts += 1
+                self.retried += 1
+                now = time.monotonic()
+                self._bucket(job.bucket_key).penalize(retry_after, now)
+                if isinstance(e, RateLimited) and e.is_global:
+                    self._global.penalize(retry_after, now)
+                logger.warning(f"[SCHEDULER] 429 on {job.label}, retrying in {retry_after:.2f}s (attempt {job.attempts})")
+                self._requeue(job)
+            elif not job.future.done():
+                job.future.set_exception(e)
+        except BaseException:
+            # Cancelled (scheduler closing) or exiting: never leave a caller waiting on the future
+            if not job.future.done():
+                job.future.cancel()
+            raise
+        else:
+            self.sent += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._slots.release()
+            self._wakeup.set()
+
+    def _requeue(self, job: _Job) -> None:
+        job.started = False
+        if job.coalesce_key is not None:
+            newer = self._pending.get(job.coalesce_key)
+            if newer is not None:
+                # A newer action for the same target was queued meanwhile; it wins
+                newer.future.add_done_callback(lambda f, old=job.future: _chain(f, old))
+                return
+            self._pending[job.coalesce_key] = job
+        heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds to wait if the exception is a rate limit, else None."""
+    if isinstance(exc, RateLimited):
+        return exc.retry_after
+    if getattr(exc, "status", None) == 429:
+        return float(getattr(exc, "retry_after", None) or 1.0)
+    return None
+
+
+def _chain(source: asyncio.Future, target: asyncio.Future) -> None:
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+async def gather_actions(futures: List[asyncio.Future]) -> Tuple[int, List[BaseException]]:
+    """Wait for submitted actions; returns (success count, exceptions)."""
+    if not futures:
+        return 0, []
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    return len(results) - len(errors), errors
+
+
+# Global instance
+discord_scheduler = DiscordActionScheduler()
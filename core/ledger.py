@@ -0,0 +1,166 @@
+"""Ledger - Buffered seed grants and stat changes, written in bulk.
+
+Small, frequent writes (a seed reward per chat message or valid NoiTu word,
+a stat increment per answer) used to cost several round trips each: user
+lookup/insert, a SELECT + UPDATE per stat, a three-statement add_seeds
+transaction. A Ledger collects those changes in memory and write_batch()
+applies them in one transaction with a constant number of statements,
+whatever the number of changes:
+
+1. bulk_ensure_users: create users seen for the first time
+2. bulk_add_seeds: one UPDATE for all balances and one INSERT of
+   transaction_logs, one row per (user, reason, category)
+3. one UPDATE stamping last_chat_reward for users rewarded for chatting
+4. bulk_increment_stats / bulk_max_stats: one upsert each (game stats only)
+
+Balances become visible within one flush interval. A failed write is merged
+back with restore() and retried on the next flush.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.database import (
+    bulk_add_seeds,
+    bulk_ensure_users,
+    bulk_increment_stats,
+    bulk_max_stats,
+    db_manager,
+)
+
+# (user_id, reason, category)
+SeedKey = Tuple[int, str, str]
+# (user_id, stat_key)
+StatKey = Tuple[int, str]
+
+
+@dataclass
+class LedgerBatch:
+    """A drained snapshot of a ledger, ready to be written."""
+    usernames: Dict[int, str] = field(default_factory=dict)
+    seeds: Dict[SeedKey, int] = field(default_factory=dict)
+    # Number of grants merged into each seeds entry
+    counts: Dict[SeedKey, int] = field(default_factory=dict)
+    stat_deltas: Dict[StatKey, int] = field(default_factory=dict)
+    max_stats: Dict[StatKey, int] = field(default_factory=dict)
+    chat_stamps: Set[int] = field(default_factory=set)
+    # Where to announce achievements unlocked by the stats (not written)
+    channels: Dict[int, object] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not (self.seeds or self.stat_deltas or self.max_stats or self.chat_stamps)
+
+    def total_seeds(self) -> int:
+        return sum(self.seeds.values())
+
+    def grant_count(self) -> int:
+        return sum(self.counts.values())
+
+    def seed_entries(self) -> List[Tuple[int, int, str, str]]:
+        """(user_id, amount, reason, category) rows for bulk_add_seeds."""
+        return [(user_id, amount, reason, category) for (user_id, reason, category), amount in self.seeds.items()]
+
+
+class Ledger:
+    """In-memory accumulator for seed grants and stat changes.
+
+    All mutators are synchronous so event listeners and game hot paths never
+    wait on the database.
+
+    Args:
+        category: transaction_logs category of add_seeds() grants that do not
+            name one.
+    """
+
+    def __init__(self, category: str):
+        self.category = category
+        self._batch = LedgerBatch()
+
+    def remember_user(self, user_id: int, username: str, channel=None) -> None:
+        """Record a username (for user creation) and the channel for notifications."""
+        user_id = int(user_id)
+        self._batch.usernames[user_id] = username
+        if channel is not None:
+            self._batch.channels[user_id] = channel
+
+    def add_seeds(self, user_id: int, amount: int, reason: str, category: Optional[str] = None) -> None:
+        if amount:
+            key = (int(user_id), reason, category or self.category)
+            self._batch.seeds[key] = self._batch.seeds.get(key, 0) + int(amount)
+            self._batch.counts[key] = self._batch.counts.get(key, 0) + 1
+
+    def stamp_chat(self, user_id: int) -> None:
+        """Set last_chat_reward to the write time."""
+        self._batch.chat_stamps.add(int(user_id))
+
+    def increment(self, user_id: int, stat_key: str, amount: int = 1) -> None:
+        key = (int(user_id), stat_key)
+        self._batch.stat_deltas[key] = self._batch.stat_deltas.get(key, 0) + amount
+
+    def set_max(self, user_id: int, stat_key: str, value: int) -> None:
+        key = (int(user_id), stat_key)
+        if value > self._batch.max_stats.get(key, value - 1):
+            self._batch.max_stats[key] = value
+
+    def is_empty(self) -> bool:
+        return self._batch.is_empty()
+
+    def drain(self) -> LedgerBatch:
+        """Take the pending changes, leaving an empty ledger for new writes."""
+        batch, self._batch = self._batch, LedgerBatch()
+        return batch
+
+    def restore(self, batch: LedgerBatch) -> None:
+        """Merge a batch that failed to write back into the ledger."""
+        current = self._batch
+        for user_id, username in batch.usernames.items():
+            current.usernames.setdefault(user_id, username)
+        for user_id, channel in batch.channels.items():
+            current.channels.setdefault(user_id, channel)
+        for key, amount in batch.seeds.items():
+            current.seeds[key] = current.seeds.get(key, 0) + amount
+        for key, count in batch.counts.items():
+            current.counts[key] = current.counts.get(key, 0) + count
+        for key, amount in batch.stat_deltas.items():
+            current.stat_deltas[key] = current.stat_deltas.get(key, 0) + amount
+        for key, value in batch.max_stats.items():
+            self.set_max(key[0], key[1], value)
+        current.chat_stamps |= batch.chat_stamps
+
+
+async def write_batch(batch: LedgerBatch, game_id: Optional[str] = None) -> Dict[StatKey, int]:
+    """Write a drained batch in one transaction.
+
+    Args:
+        batch: What Ledger.drain() returned.
+        game_id: Game the stats belong to (e.g. 'noitu'); required if the
+            batch has stat changes.
+
+    Returns:
+        Mapping (user_id, stat_key) -> new value for every stat that changed,
+        so the caller can run achievement checks without re-reading stats.
+    """
+    if batch.is_empty():
+        return {}
+    if (batch.stat_deltas or batch.max_stats) and not game_id:
+        raise ValueError("write_batch needs a game_id to write stats")
+
+    to_ensure = dict(batch.usernames)
+    for user_id, _, _ in batch.seeds:
+        to_ensure.setdefault(user_id, "Unknown")
+
+    changed: Dict[StatKey, int] = {}
+    async with db_manager.transaction() as conn:
+        await bulk_ensure_users(conn, to_ensure)
+        await bulk_add_seeds(conn, batch.seed_entries())
+        if batch.chat_stamps:
+            await conn.execute(
+                "UPDATE users SET last_chat_reward = CURRENT_TIMESTAMP "
+                "FROM unnest($1::bigint[]) AS t(user_id) WHERE users.user_id = t.user_id",
+                list(batch.chat_stamps)
+            )
+        if batch.stat_deltas:
+            changed.update(await bulk_increment_stats(conn, game_id, batch.stat_deltas))
+        if batch.max_stats:
+            changed.update(await bulk_max_stats(conn, game_id, batch.max_stats))
+    return changed
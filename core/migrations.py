@@ -0,0 +1,64 @@
+"""Schema Migrations - Idempotent PostgreSQL schema changes applied on startup.
+
+setup_data.py only builds the SQLite schema, and scripts/migrate_data.py
+drops and recreates tables, so neither can add a table or column to a live
+database. Schema additions that code depends on are listed here instead.
+Every statement must be safe to run again (IF NOT EXISTS, guarded DELETEs);
+run_migrations() applies all of them on every start, each step in its own
+transaction so one failing step does not block the others.
+"""
+
+from typing import List, Tuple
+
+from core.database import db_manager
+from core.logger import setup_logger
+
+logger = setup_logger("Migrations", "core/database.log")
+
+# (name, statements) - applied in order
+MIGRATIONS: List[Tuple[str, List[str]]] = [
+    # Escrowed stakes of unsettled game rounds (core/settlement.py)
+    ("game_escrow", [
+        "CREATE TABLE IF NOT EXISTS game_escrow ("
+        "  round_id TEXT NOT NULL,"
+        "  user_id BIGINT NOT NULL,"
+        "  category TEXT NOT NULL,"
+        "  amount BIGINT NOT NULL,"
+        "  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,"
+        "  PRIMARY KEY (round_id, user_id)"
+        ")",
+    ]),
+    # Werewolf phase deltas and the upsert key of game sessions (cogs/werewolf/engine/manager.py)
+    ("game_sessions_upsert_key", [
+        "ALTER TABLE game_sessions ADD COLUMN IF NOT EXISTS game_deltas TEXT DEFAULT ''",
+        # Keep the newest row of each key so the unique index can be built
+        "DELETE FROM game_sessions WHERE ctid IN ("
+        "  SELECT ctid FROM ("
+        "    SELECT ctid, ROW_NUMBER() OVER ("
+        "      PARTITION BY guild_id, game_type, COALESCE(voice_channel_id, 0) "
+        "      ORDER BY last_saved DESC NULLS LAST"
+        "    ) AS rn FROM game_sessions"
+        "  ) ranked WHERE rn > 1"
+        ")",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_game_sessions_key "
+        "ON game_sessions (guild_id, game_type, (COALESCE(voice_channel_id, 0)))",
+    ]),
+]
+
+
+async def run_migrations() -> int:
+    """Apply every migration. Returns the number of steps that failed."""
+    failed = 0
+    for name, statements in MIGRATIONS:
+        try:
+            async with db_manager.transaction() as conn:
+                for sql in statements:
+                    await conn.execute(sql)
+        except Exception as e:
+            failed += 1
+            logger.error(f"[MIGRATION] {name} failed: {e}", exc_info=True)
+    if failed:
+        logger.warning(f"[MIGRATION] {failed}/{len(MIGRATIONS)} steps failed")
+    else:
+        logger.info(f"[MIGRATION] Schema up to date ({len(MIGRATIONS)} steps)")
+    return failed
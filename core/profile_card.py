@@ -0,0 +1,140 @@
+"""Profile Card - Pillow renderer for the /hoso profile card.
+
+Runs inside the render service's worker processes (see core/render_service.py),
+so everything here is plain, picklable data in and PNG bytes out. Fonts, the
+background and the circular avatar mask are built once per process by preload().
+"""
+
+import io
+import os
+from typing import Dict, Optional
+
+from PIL import Image, ImageDraw, ImageFont
+
+ASSETS_DIR = "./assets"
+BG_PATH = os.path.join(ASSETS_DIR, "card_bg_ghibli.png")
+
+WIDTH, HEIGHT = 900, 300
+AVATAR_SIZE = 200
+
+COLOR_BG = (245, 240, 235)
+COLOR_BORDER = (139, 90, 43)
+COLOR_TEXT_MAIN = (74, 59, 42)
+COLOR_TEXT_ACCENT = (92, 138, 69)
+COLOR_BAR_BG = (224, 224, 224)
+COLOR_BAR_FILL = (118, 200, 147)
+
+# (file, size) per font slot
+FONTS = {
+    "main": ("PatrickHand-Regular.ttf", 45),
+    "rank": ("PatrickHand-Regular.ttf", 18),
+    "info": ("Nunito-Bold.ttf", 16),
+    "small": ("Nunito-Bold.ttf", 14),
+}
+
+_fonts: Dict[str, ImageFont.ImageFont] = {}
+_background: Optional[Image.Image] = None
+_avatar_mask: Optional[Image.Image] = None
+
+
+def _load_font(name: str, size: int, fallback_font: str = "arial.ttf") -> ImageFont.ImageFont:
+    try:
+        return ImageFont.truetype(os.path.join(ASSETS_DIR, name), size)
+    except Exception:
+        try:
+            return ImageFont.truetype(fallback_font, size)
+        except Exception:
+            return ImageFont.load_default()
+
+
+def preload() -> None:
+    """Load fonts, the background and the avatar mask once per process."""
+    global _background, _avatar_mask
+    if _fonts:
+        return
+    for slot, (name, size) in FONTS.items():
+        _fonts[slot] = _load_font(name, size)
+    _avatar_mask = Image.new('L', (AVATAR_SIZE, AVATAR_SIZE), 0)
+    ImageDraw.Draw(_avatar_mask).ellipse((0, 0, AVATAR_SIZE, AVATAR_SIZE), fill=255)
+    if os.path.exists(BG_PATH):
+        try:
+            _background = Image.open(BG_PATH).convert("RGB").resize((WIDTH, HEIGHT))
+        except Exception:
+            _background = None
+
+
+def rank_title(seeds: int) -> str:
+    """Rank title based on seeds earned (without emoji)."""
+    if seeds < 50:
+        return "Người Gieo Hạt"
+    elif seeds < 200:
+        return "Nảy Mầm"
+    elif seeds < 500:
+        return "Cây Non"
+    elif seeds < 1000:
+        return "Trưởng Thành"
+    elif seeds < 5000:
+        return "Ra Hoa"
+    else:
+        return "Cây Đại Thụ"
+
+
+def next_milestone(seeds: int) -> int:
+    if seeds >= 5000:
+        return 10000
+    if seeds >= 1000:
+        return 5000
+    if seeds >= 500:
+        return 1000
+    if seeds >= 200:
+        return 500
+    if seeds >= 50:
+        return 200
+    return 50
+
+
+def render_profile_card(display_name: str, seeds: int, rank: int, avatar_bytes: bytes) -> bytes:
+    """Profile card PNG for one user."""
+    preload()
+
+    if _background is not None:
+        img = _background.copy()
+    else:
+        img = Image.new('RGB', (WIDTH, HEIGHT), color=COLOR_BG)
+
+    draw = ImageDraw.Draw(img, 'RGBA')
+
+    if _background is None:
+        draw.rectangle((5, 5, WIDTH-5, HEIGHT-5), outline=COLOR_BORDER, width=3)
+
+    # --- AVATAR SECTION ---
+    avatar = Image.open(io.BytesIO(avatar_bytes)).convert('RGBA').resize((AVATAR_SIZE, AVATAR_SIZE))
+
+    avatar_x, avatar_y = 25, 50
+    img.paste(avatar, (avatar_x, avatar_y), _avatar_mask)
+    draw.ellipse((avatar_x-5, avatar_y-5, avatar_x+AVATAR_SIZE+5, avatar_y+AVATAR_SIZE+5),
+                 outline=COLOR_BORDER, width=4)
+
+    # --- INFO SECTION ---
+    info_x = 280
+
+    draw.text((info_x, 90), display_name, font=_fonts["main"], fill=COLOR_TEXT_MAIN)
+    draw.text((info_x, 145), f"Hạng: {rank_title(seeds)} (#{rank})", font=_fonts["rank"], fill=COLOR_TEXT_ACCENT)
+
+    # Progress Bar
+    milestone = next_milestone(seeds)
+    progress = min(seeds / milestone, 1.0)
+
+    bar_x, bar_y = info_x, 175
+    bar_w, bar_h = 335, 15
+
+    draw.text((info_x + bar_w - 100, 150), f"{seeds}/{milestone}", font=_fonts["info"], fill=COLOR_TEXT_MAIN)
+    draw.rounded_rectangle([(bar_x, bar_y), (bar_x + bar_w, bar_y + bar_h)], radius=12, fill=COLOR_BAR_BG)
+
+    if progress > 0:
+        fill_w = int(bar_w * progress)
+        draw.rounded_rectangle([(bar_x, bar_y), (bar_x + fill_w, bar_y + bar_h)], radius=12, fill=COLOR_BAR_FILL)
+
+    img_bytes = io.BytesIO()
+    img.save(img_bytes, 'PNG')
+    return img_bytes.getvalue()
@@ -0,0 +1,179 @@
+"""Query Cache - Keyed TTL/LRU cache for read-mostly query results.
+
+Used by DatabaseManager (fetchone_cached, fetchrow_cached, fetchall_cached and
+the use_cache=... keywords of fetchone/fetchrow/fetchall). Keys are strings the
+caller picks, following the existing prefixes ("balance_{user_id}",
+"config_{guild_id}_...", "invites_{user_id}") so that a writer can drop every
+related entry with one clear_cache_by_prefix() after its commit. Entries may
+also carry tags for invalidation across unrelated keys.
+
+- Entries expire after their TTL and the least recently used entry is evicted
+  beyond maxsize.
+- Concurrent misses on the same key share one query (single flight).
+- A load that started before an invalidation of its key (directly, by prefix
+  or by tag) is returned to its callers but not stored, so a slow read can
+  never put back a value a writer just dropped. Loads of unrelated keys are
+  not affected.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+CACHE_MAX_ENTRIES = 4096
+CACHE_DEFAULT_TTL = 60.0  # seconds
+
+_MISS = object()
+
+# (expires_at, value, tags)
+_Entry = Tuple[float, Any, Tuple[str, ...]]
+
+
+class QueryCache:
+    """TTL + LRU map from cache key to query result."""
+
+    def __init__(self, maxsize: int = CACHE_MAX_ENTRIES):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        # key -> (future, tags) of the load running for it. An invalidation that
+        # matches a running load unregisters it, and an unregistered load is not stored
+        self._inflight: Dict[str, Tuple[asyncio.Future, Tuple[str, ...]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Any:
+        """Cached value for key, or _MISS."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISS
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return _MISS
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        if ttl <= 0:
+            return
+        if key in self._data:
+            self._remove(key)
+        tags = tuple(tags)
+        self._data[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._data) > self.maxsize:
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: str,
+        ttl: float,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """Return the cached value, or run loader once and cache its result."""
+        value = self.get(key)
+        if value is not _MISS:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending[0])
+
+        tags = tuple(tags)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (future, tags)
+        try:
+            value = await loader()
+        except BaseException as e:
+            if self._is_loading(key, future):
+                del self._inflight[key]
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()  # Waiters re-raise it; no "never retrieved" warning
+            else:
+                future.cancel()
+            raise
+
+        if self._is_loading(key, future):
+            # Not invalidated while loading
+            del self._inflight[key]
+            self.put(key, value, ttl, tags)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: str) -> bool:
+        """Drop one key. Returns True if it was cached."""
+        self._inflight.pop(key, None)
+        if key in self._data:
+            self._remove(key)
+            self.invalidations += 1
+            return True
+        return False
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Drop every key starting with prefix. Returns the number of entries dropped."""
+        for key in [k for k in self._inflight if k.startswith(prefix)]:
+            del self._inflight[key]
+        keys = [k for k in self._data if k.startswith(prefix)]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Drop every key stored with tag. Returns the number of entries dropped."""
+        for key in [k for k, (_, tags) in self._inflight.items() if tag in tags]:
+            del self._inflight[key]
+        keys = list(self._tags.get(tag, ()))
+        for key in keys:
+            self._inflight.pop(key, None)
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._tags.clear()
+        self._inflight.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _is_loading(self, key: str, future: asyncio.Future) -> bool:
+        pending = self._inflight.get(key)
+        return pending is not None and pending[0] is future
+
+    def _remove(self, key: str) -> Optional[_Entry]:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            for tag in entry[2]:
+                keys = self._tags.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tags[tag]
+        return entry
@@ -0,0 +1,154 @@
+"""Render Service - Shared process pool for Pillow rendering.
+
+Card tables (Xi Dach) and profile cards render with Pillow. On the default
+thread pool that work holds the GIL against the event loop and competes with
+every other run_in_executor user. The service runs it in a dedicated process
+pool instead:
+
+- One worker per core, started with `spawn` (no forked event loop or threads)
+  and each preloading the render assets (cards, backgrounds, fonts) once.
+- A bounded number of jobs in flight per worker. Callers beyond that wait for
+  a slot, and get RenderBusy if none frees up within the queue timeout, so a
+  burst backs off instead of piling up unbounded work.
+- A per-job timeout. The job keeps running in its worker, but the caller is
+  released and the slot is freed.
+
+Job functions must be module-level and take/return picklable values.
+"""
+
+import asyncio
+import importlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from core.logger import setup_logger
+
+logger = setup_logger("RenderService", "core/render_service.log")
+
+# Modules whose preload() runs once in every worker
+PRELOAD_MODULES = ("cogs.xi_dach.ui.render", "core.profile_card")
+MAX_PENDING_PER_WORKER = 4
+QUEUE_TIMEOUT = 5.0   # seconds to wait for a free slot
+JOB_TIMEOUT = 15.0    # seconds per render
+
+
+class RenderBusy(Exception):
+    """No render slot freed up within the queue timeout."""
+
+
+def _init_worker(modules: Sequence[str]) -> None:
+    for name in modules:
+        try:
+            importlib.import_module(name).preload()
+        except Exception as e:
+            logger.error(f"[RENDER] Worker preload failed for {name}: {e}", exc_info=True)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class RenderService:
+    """Bounded front of a process pool for CPU-bound image rendering."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending_per_worker: int = MAX_PENDING_PER_WORKER,
+        preload: Sequence[str] = PRELOAD_MODULES,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = self.workers * max_pending_per_worker
+        self.preload = tuple(preload)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Created once and kept across pool restarts, so jobs waiting on the
+        # old pool's slots still bound the total in flight
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.submitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.busy_time = 0.0
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.preload,),
+            )
+            if self._slots is None:
+                self._slots = asyncio.Semaphore(self.max_pending)
+            logger.info(f"[RENDER] Process pool started: workers={self.workers} max_pending={self.max_pending}")
+        return self._pool
+
+    async def start(self) -> None:
+        """Spawn every worker now, so asset preloading happens before the first render."""
+        pool = self._ensure_pool()
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*[loop.run_in_executor(pool, _ping) for _ in range(self.workers)])
+        logger.info(f"[RENDER] Workers ready: {len(set(pids))} process(es)")
+
+    async def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: float = JOB_TIMEOUT,
+        queue_timeout: float = QUEUE_TIMEOUT,
+    ) -> Any:
+        """Run fn(*args) in a worker and return its result.
+
+        Raises RenderBusy when the queue stays full for queue_timeout, and
+        asyncio.TimeoutError when the job takes longer than timeout.
+        """
+        pool = self._ensure_pool()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise RenderBusy(f"render queue full ({self.max_pending} jobs)") from None
+
+        started = time.perf_counter()
+        try:
+            self.submitted += 1
+            loop = asyncio.get_running_loop()
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(pool, fn, *args), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                logger.warning(f"[RENDER] {getattr(fn, '__name__', fn)} timed out after {timeout}s")
+                raise
+            except BrokenProcessPool:
+                # A worker died (OOM, crash): start a fresh pool for the next jobs
+                logger.error("[RENDER] Process pool broken, restarting")
+                if self._pool is pool:
+                    self._pool = None
+                    pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        finally:
+            self.busy_time += time.perf_counter() - started
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "busy_time": round(self.busy_time, 3),
+        }
+
+    def close(self) -> None:
+        """Stop the workers (on bot shutdown)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Global instance
+render_service = RenderService()
@@ -0,0 +1,209 @@
+"""Game Settlement - Escrowed bets and one-transaction round payouts.
+
+A round (one Xi Dach table, one Bau Cua roll) keeps its money movements in a
+RoundLedger instead of calling add_seeds per bet:
+
+- hold(): takes the stake from the user's balance and records it in the
+  game_escrow table in one statement (the balance check is part of the
+  UPDATE, so there is no read-then-write race). Nothing is logged yet.
+- release(): gives a stake back before the round is decided (cancelled bet).
+- credit(): queues a payout in memory.
+- settle(): one transaction, a constant number of statements whatever the
+  table size: clear the round's escrow rows, credit all payouts, and write
+  every stake and payout to transaction_logs.
+
+Escrow rows left behind by a crash belong to rounds that never settled;
+recover_escrow() refunds them on startup.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from core.database import balance_cache_key, db_manager
+from core.logger import setup_logger
+
+logger = setup_logger("Settlement", "core/database.log")
+
+# (user_id, amount, reason) - negative amounts are stakes
+LedgerEntry = Tuple[int, int, str]
+
+
+class RoundLedger:
+    """Stakes and payouts of one game round."""
+
+    def __init__(self, round_id: str, category: str):
+        self.round_id = round_id
+        self.category = category
+        self.stakes: Dict[int, int] = {}
+        self.entries: List[LedgerEntry] = []
+        # Partial refunds already paid back by release(); logged at settlement, never credited
+        self.refunds: List[LedgerEntry] = []
+        self.settled = False
+
+    def staked(self, user_id: int) -> int:
+        return self.stakes.get(user_id, 0)
+
+    async def hold(self, user_id: int, amount: int, reason: str) -> bool:
+        """Move amount from the user's balance into escrow. False if the balance is short."""
+        if amount <= 0 or self.settled:
+            return False
+        row = await db_manager.fetchrow(
+            "WITH debit AS ("
+            "  UPDATE users SET seeds = seeds - $3 WHERE user_id = $2 AND seeds >= $3 RETURNING user_id"
+            ") "
+            "INSERT INTO game_escrow (round_id, user_id, category, amount) "
+            "SELECT $1, user_id, $4, $3 FROM debit "
+            "ON CONFLICT (round_id, user_id) DO UPDATE SET amount = game_escrow.amount + EXCLUDED.amount "
+            "RETURNING amount",
+            self.round_id, user_id, amount, self.category
+        )
+        if row is None:
+            return False
+        db_manager.clear_cache_keys([balance_cache_key(user_id)])
+        self.stakes[user_id] = self.stakes.get(user_id, 0) + amount
+        self.entries.append((user_id, -amount, reason))
+        return True
+
+    async def release(self, user_id: int, amount: Optional[int] = None) -> int:
+        """Refund a user's stake (all of it by default) before settlement. Returns the amount refunded."""
+        staked = self.stakes.get(user_id, 0)
+        if self.settled or not staked:
+            return 0
+        if amount is None or amount >= staked:
+            row = await db_manager.fetchrow(
+                "WITH freed AS ("
+                "  DELETE FROM game_escrow WHERE round_id = $1 AND user_id = $2 RETURNING user_id, amount"
+                ") "
+                "UPDATE users SET seeds = users.seeds + freed.amount FROM freed "
+                "WHERE users.user_id = freed.user_id RETURNING freed.amount",
+                self.round_id, user_id
+            )
+            if row is None:
+                return 0
+            del self.stakes[user_id]
+            self.entries = [e for e in self.entries if e[0] != user_id]
+            self.refunds = [e for e in self.refunds if e[0] != user_id]
+        else:
+            row = await db_manager.fetchrow(
+                "WITH freed AS ("
+                "  UPDATE game_escrow SET amount = amount - $3 "
+                "  WHERE round_id = $1 AND user_id = $2 AND amount >= $3 RETURNING user_id, $3::bigint AS amount"
+                ") "
+                "UPDATE users SET seeds = users.seeds + freed.amount FROM freed "
+                "WHERE users.user_id = freed.user_id RETURNING freed.amount",
+                self.round_id, user_id, amount
+            )
+            if row is None:
+                return 0
+            self.stakes[user_id] = staked - amount
+            # Drop the matching stake entry so the log shows only bets that stood
+            for i in range(len(self.entries) - 1, -1, -1):
+                if self.entries[i][0] == user_id and self.entries[i][1] == -amount:
+                    del self.entries[i]
+                    break
+            else:
+                self.refunds.append((user_id, amount, "refund"))
+        db_manager.clear_cache_keys([balance_cache_key(user_id)])
+        return row['amount']
+
+    def credit(self, user_id: int, amount: int, reason: str) -> None:
+        """Queue a payout (stake included) for settlement."""
+        if amount > 0:
+            self.entries.append((user_id, amount, reason))
+
+    async def void(self) -> int:
+        """Refund every stake of a round that will not be settled. Returns rows refunded."""
+        if self.settled or not self.stakes:
+            return 0
+        self.settled = True
+        async with db_manager.transaction() as conn:
+            rows = await conn.fetch(
+                "DELETE FROM game_escrow WHERE round_id = $1 RETURNING user_id, amount", self.round_id
+            )
+            await _refund(conn, rows)
+        logger.info(f"[VOID] {self.round_id}: refunded {len(rows)} stakes")
+        return len(rows)
+
+    async def settle(self) -> Dict[int, int]:
+        """Apply the round atomically. Returns the credited total per user.
+
+        On failure the escrow stays in place, so void() (or recover_escrow on
+        the next start) can still refund the stakes. A user whose escrow row
+        does not match the ledger's stake is refunded what the row held
+        instead of being paid out, so a stale ledger cannot mint seeds.
+        """
+        if self.settled:
+            return {}
+
+        async with db_manager.transaction() as conn:
+            escrowed = await conn.fetch(
+                "DELETE FROM game_escrow WHERE round_id = $1 RETURNING user_id, amount", self.round_id
+            )
+            # The table is authoritative for what was taken: only users whose
+            # escrow row matches their ledger stake are paid out, the others
+            # get back what the table held for them and nothing more
+            held = {row['user_id']: row['amount'] for row in escrowed}
+            mismatched = {
+                user_id for user_id in held.keys() | self.stakes.keys()
+                if held.get(user_id) != self.stakes.get(user_id)
+            }
+            credits: Dict[int, int] = {}
+            logs = [e for e in self.entries + self.refunds if e[1] and e[0] not in mismatched]
+            for user_id, amount, _ in self.entries:
+                if amount > 0 and user_id not in mismatched:
+                    credits[user_id] = credits.get(user_id, 0) + amount
+            if mismatched:
+                logger.error(
+                    f"[SETTLE] {self.round_id}: escrow {held} != ledger stakes {self.stakes}, "
+                    f"refunding held stakes of {sorted(mismatched)} instead of paying out"
+                )
+                for user_id in mismatched:
+                    if held.get(user_id):
+                        # Like void(): the stake was never logged, so neither is its refund
+                        credits[user_id] = held[user_id]
+            if credits:
+                await conn.execute(
+                    "UPDATE users SET seeds = users.seeds + t.amount "
+                    "FROM unnest($1::bigint[], $2::bigint[]) AS t(user_id, amount) "
+                    "WHERE users.user_id = t.user_id",
+                    list(credits.keys()), list(credits.values())
+                )
+                conn.invalidate_keys_on_commit(balance_cache_key(user_id) for user_id in credits)
+            if logs:
+                await conn.execute(
+                    "INSERT INTO transaction_logs (user_id, amount, reason, category, created_at) "
+                    "SELECT u, a, r, $4, NOW() FROM unnest($1::bigint[], $2::bigint[], $3::text[]) AS t(u, a, r)",
+                    [e[0] for e in logs], [e[1] for e in logs], [e[2] for e in logs], self.category
+                )
+
+        self.settled = True
+        logger.info(
+            f"[SETTLE] {self.round_id}: {len(self.stakes)} stakes ({sum(self.stakes.values())}), "
+            f"{len(credits)} payouts ({sum(credits.values())})"
+        )
+        return credits
+
+
+async def _refund(conn, rows) -> None:
+    """Give escrow rows (user_id, amount) back to their users in one statement."""
+    totals: Dict[int, int] = {}
+    for row in rows:
+        totals[row['user_id']] = totals.get(row['user_id'], 0) + row['amount']
+    if totals:
+        await conn.execute(
+            "UPDATE users SET seeds = users.seeds + t.amount "
+            "FROM unnest($1::bigint[], $2::bigint[]) AS t(user_id, amount) "
+            "WHERE users.user_id = t.user_id",
+            list(totals.keys()), list(totals.values())
+        )
+        conn.invalidate_keys_on_commit(balance_cache_key(user_id) for user_id in totals)
+
+
+async def recover_escrow() -> int:
+    """Refund stakes of rounds that never settled (bot stopped mid-round). Returns rows refunded."""
+    async with db_manager.transaction() as conn:
+        rows = await conn.fetch("DELETE FROM game_escrow RETURNING round_id, user_id, amount")
+        await _refund(conn, rows)
+    if rows:
+        rounds = sorted({row['round_id'] for row in rows})
+        logger.warning(f"[ESCROW_RECOVERY] Refunded {len(rows)} stakes from unsettled rounds: {', '.join(rounds)}")
+    return len(rows)
@@ -5,7 +5,7 @@ Handles connection pooling, query caching, and batch operations for better perfo
 import time
 import asyncio
 from typing import Optional, Dict, List, Any, Tuple
-from core.database import db_manager, get_user_balance, get_user_full, add_seeds, get_leaderboard, get_db_connection
+from core.database import db_manager, get_user_balance, get_user_full, add_seeds, get_leaderboard, get_db_connection, balance_cache_key
 from configs.settings import DB_PATH
 from core.logger import setup_logger
 
@@ -64,6 +64,7 @@ async def batch_update_seeds(updates: Dict[int, int]):
     params = [(amount, user_id) for user_id, amount in updates.items()]
     
     await db_manager.executemany(sql, params)
+    db_manager.clear_cache_keys(balance_cache_key(user_id) for user_id in updates)
 
 
 # ==================== TREE QUERIES ====================
@@ -150,6 +151,10 @@ async def _remove_item_unsafe(user_id: int, item_id: str, quantity: int = 1) ->
 
 # ==================== SERVER CONFIG QUERIES ====================
 
+# Config changes only through set_server_config / the config commands, which
+# invalidate "config_{guild_id}_" right after writing
+SERVER_CONFIG_CACHE_TTL = 300
+
 async def get_server_config(guild_id: int, field: str) -> Optional[Any]:
     """Retrieves a specific configuration field for a server.
 
@@ -160,7 +165,8 @@ async def get_server_config(guild_id: int, field: str) -> Optional[Any]:
     Returns:
         Optional[Any]: The value of the config field, or None if not found.
     """
-    result = await db_manager.fetchone(
+    result = await db_manager.fetchone_cached(
+        f"config_{guild_id}_{field}", SERVER_CONFIG_CACHE_TTL,
         f"SELECT {field} FROM server_config WHERE guild_id = ?",
         (guild_id),
     )
@@ -179,6 +185,7 @@ async def set_server_config(guild_id: int, field: str, value: Any):
         f"INSERT INTO server_config (guild_id, {field}) VALUES (?, ?) ON CONFLICT (guild_id) DO UPDATE SET {field} = EXCLUDED.{field}",
         (guild_id, value)
     )
+    db_manager.clear_cache_by_prefix(f"config_{guild_id}_")
 
 
 async def get_rod_data(user_id: int) -> tuple[int, int]:
@@ -242,6 +249,7 @@ async def add_seeds_new(user_id: int, amount: int):
         "UPDATE users SET seeds = seeds + ?, last_active = CURRENT_TIMESTAMP WHERE user_id = ?",
         (amount, user_id)
     )
+    db_manager.clear_cache_keys([balance_cache_key(user_id)])
 
 
 async def get_leaderboard_new(limit: int = 10) -> List[tuple]:
@@ -602,6 +610,7 @@ async def buy_shop_item(user_id: int, item_id: str, cost: int, quantity: int = 1
         
         # Commit transaction
         await db.commit()
+        db_manager.clear_cache_keys([balance_cache_key(user_id)])
         
         return True, "Mua thành công!"
         
@@ -665,6 +674,7 @@ async def upgrade_fishing_rod(user_id: int, upgrade_cost: int) -> tuple[bool, st
         """, (user_id))
         
         await db.commit()
+        db_manager.clear_cache_keys([balance_cache_key(user_id)])
         
         return True, "Nâng cấp cần câu thành công!"
         
@@ -793,6 +803,7 @@ async def repair_fishing_rod(user_id: int, repair_cost: int) -> tuple[bool, str]
             )
         
         await db.commit()
+        db_manager.clear_cache_keys([balance_cache_key(user_id)])
         
         return True, "Sửa cần câu thành công!"
         
@@ -851,6 +862,7 @@ async def sell_items_atomic(user_id: int, items: Dict[str, int], total_money: in
         await db.commit()
         
         # Clear caches
+        db_manager.clear_cache_keys([balance_cache_key(user_id)])
         
         return True, "Giao dịch thành công!"
         
@@ -63,14 +63,14 @@ async def on_ready():
     bot.achievement_manager = AchievementManager(bot)
     logger.info("✓ Achievement Manager initialized")
     
-    # Preload Xi Dach Assets (to prevent render timeouts)
+    # Start render workers: each preloads Xi Dach cards, backgrounds and fonts (prevents render timeouts)
     try:
-        from cogs.xi_dach.ui.render import assets as card_assets
-        logger.info("Loading Xi Dach assets...")
-        card_assets.load_assets()
-        logger.info("✓ Xi Dach assets loaded")
+        from core.render_service import render_service
+        logger.info("Starting render service...")
+        await render_service.start()
+        logger.info("✓ Render service ready")
     except Exception as e:
-        logger.error(f"Failed to load Xi Dach assets: {e}")
+        logger.error(f"Failed to start render service: {e}")
     
     # Attach Discord logging handler (reads config from database)
     try:
@@ -83,6 +83,18 @@ async def on_ready():
 
     # Load cogs on first ready only
     if not bot.cogs_loaded:
+        # Idempotent schema additions (game_escrow, game_sessions key, ...) before anything uses them
+        try:
+            from core.migrations import run_migrations
+            await run_migrations()
+        except Exception as e:
+            logger.error(f"Failed to run schema migrations: {e}")
+        # Refund stakes of game rounds cut off by the last shutdown
+        try:
+            from core.settlement import recover_escrow
+            await recover_escrow()
+        except Exception as e:
+            logger.error(f"Failed to recover game escrow: {e}")
         await load_cogs()
         bot.cogs_loaded = True
     
@@ -208,7 +220,12 @@ async def main():
                 logger.error(f"Error building words dict: {e}")
         
         # Start bot (cogs will be loaded in on_ready)
-        await bot.start(os.getenv('DISCORD_TOKEN'))
+        try:
+            await bot.start(os.getenv('DISCORD_TOKEN'))
+        finally:
+            # Render workers are separate processes: stop them with the bot
+            from core.render_service import render_service
+            render_service.close()
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,143 @@
+"""Werewolf replay analytics: balance and timing report over recorded games.
+
+Reads the replay files the live game appends to (data/werewolf_replays/*.jsonl.gz)
+and reports win rates by alignment and role, death causes, how long each timed
+phase really ran against its configured duration, vote turnout/tie rates and
+how fast DM choices are answered, with suggested durations where players
+routinely finish well before the deadline.
+
+Usage:
+    python scripts/analyze_werewolf_replays.py [paths ...] [--min-players 0]
+"""
+import argparse
+import math
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.werewolf.engine.replay import REPLAY_DIR, iter_records  # noqa: E402
+
+# A phase "finishes early" when it takes less than this share of its planned time
+EARLY_RATIO = 0.9
+# Suggest a shorter duration when p90 of the real time is below this share of it
+SUGGEST_RATIO = 0.6
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def kind_of(title: str) -> str:
+    """Vote/prompt title with its day/night number folded, e.g. 'Bỏ phiếu ngày #'."""
+    return re.sub(r"\d+", "#", title).strip()
+
+
+def suggest(samples: List[float], configured: float) -> str:
+    """A shorter duration when 90% of samples fit well inside the configured one."""
+    p90 = percentile(samples, 0.9)
+    if len(samples) >= 5 and configured and p90 < configured * SUGGEST_RATIO:
+        return f"  -> thử {max(5, 5 * math.ceil(p90 / 5))}s"
+    return ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[REPLAY_DIR])
+    parser.add_argument("--min-players", type=int, default=0)
+    args = parser.parse_args()
+
+    games = 0
+    unfinished = 0
+    winners: Counter = Counter()
+    lengths: List[float] = []
+    role_games: Counter = Counter()
+    role_wins: Counter = Counter()
+    causes: Counter = Counter()
+    phases: Dict[str, List[tuple]] = defaultdict(list)
+    votes: Dict[str, List[dict]] = defaultdict(list)
+    choices: Dict[str, List[dict]] = defaultdict(list)
+
+    for record in iter_records(args.paths):
+        players = record.get("players", {})
+        if len(players) < args.min_players:
+            continue
+        if record.get("winner") is None:
+            unfinished += 1
+            continue
+        games += 1
+        winner = record["winner"]
+        winners[winner] += 1
+        lengths.append(record.get("secs", 0.0))
+        for player in players.values():
+            for role_name in player["roles"]:
+                role_games[role_name] += 1
+                if player["alignment"] == winner:
+                    role_wins[role_name] += 1
+        for _, kind, payload in record.get("events", ()):
+            if kind == "phase":
+                phases[payload["name"]].append((payload["secs"], payload.get("planned")))
+            elif kind == "vote":
+                votes[kind_of(payload["title"])].append(payload)
+            elif kind == "choice":
+                choices[kind_of(payload["title"])].append(payload)
+            elif kind == "death":
+                causes[payload["cause"]] += 1
+
+    if not games:
+        print(f"[REPLAY] No finished games found in {', '.join(args.paths)} ({unfinished} unfinished)")
+        return
+
+    print(f"[REPLAY] {games:,} games ({unfinished} unfinished skipped), "
+          f"avg {mean(lengths) / 60:.1f} min, p90 {percentile(lengths, 0.9) / 60:.1f} min")
+    print("  * Wins: " + ", ".join(f"{k}={v / games:.1%}" for k, v in winners.most_common()))
+    print("  * Deaths: " + ", ".join(f"{k}={v}" for k, v in causes.most_common()))
+    print("  * Role win rates:")
+    for role_name, count in role_games.most_common():
+        print(f"      {role_name:<16} {role_wins[role_name] / count:6.1%}  ({count:,} seats)")
+
+    print("  * Phases (real seconds):")
+    for name, samples in sorted(phases.items()):
+        secs = [s for s, _ in samples]
+        planned = [p for _, p in samples if p]
+        line = f"      {name:<12} n={len(secs):<5} avg={mean(secs):7.1f} p50={percentile(secs, 0.5):7.1f} p90={percentile(secs, 0.9):7.1f}"
+        if planned:
+            early = sum(1 for s, p in samples if p and s < p * EARLY_RATIO)
+            line += f"  planned={mean(planned):6.1f} early={early / len(planned):.0%}"
+            line += suggest(secs, mean(planned))
+        print(line)
+
+    print("  * Votes:")
+    for title, items in sorted(votes.items(), key=lambda kv: -len(kv[1])):
+        turnout = [
+            sum(1 for target in v["votes"].values() if target is not None) / len(v["votes"])
+            for v in items if v["votes"]
+        ]
+        ties = sum(1 for v in items if v["tie"])
+        last = [v["last_vote"] for v in items if v.get("last_vote") is not None]
+        duration = mean([v["duration"] for v in items])
+        p90 = percentile(last, 0.9)
+        print(f"      {title[:40]:<40} n={len(items):<5} turnout={mean(turnout):.0%} tie={ties / len(items):.0%} "
+              f"last_vote_p90={p90:5.1f}s/{duration:.0f}s" + suggest(last, duration))
+
+    print("  * DM choices:")
+    for title, items in sorted(choices.items(), key=lambda kv: -len(kv[1])):
+        answered = [c["secs"] for c in items if c["choice"] is not None]
+        timeout = mean([c["timeout"] for c in items])
+        p90 = percentile(answered, 0.9)
+        print(f"      {title[:40]:<40} n={len(items):<5} no_answer={1 - len(answered) / len(items):.0%} "
+              f"answer_p90={p90:5.1f}s/{timeout:.0f}s" + suggest(answered, timeout))
+
+
+if __name__ == "__main__":
+    main()
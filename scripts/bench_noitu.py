@@ -0,0 +1,207 @@
+"""Microbenchmark: messages per second through NoiTu's validation stage.
+
+Feeds a synthetic stream of chat messages (valid moves, wrong connections,
+already-used and unknown words) into GameNoiTu._process_word with Discord
+side effects stubbed out, and compares it with the previous string-based
+validation path.
+
+Usage:
+    python scripts/bench_noitu.py [--messages 200000] [--syllables 3000]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.noi_tu.cog import GameNoiTu, logger as noitu_logger  # noqa: E402
+from cogs.noi_tu.word_index import UNKNOWN, word_key  # noqa: E402
+
+
+class _FakeAuthor:
+    __slots__ = ("id", "name", "mention", "bot")
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+
+
+class _FakeChannel:
+    id = 1
+
+    def send(self, *args, **kwargs):
+        return None
+
+
+class _FakeMessage:
+    __slots__ = ("author", "content", "channel")
+
+    def __init__(self, author: _FakeAuthor, content: str, channel: _FakeChannel):
+        self.author = author
+        self.content = content
+        self.channel = channel
+
+    def add_reaction(self, emoji):
+        return None
+
+
+def build_dictionary(syllable_count: int, fanout: int, rng: random.Random) -> dict:
+    syllables = [f"s{i}" for i in range(syllable_count)]
+    return {first: rng.sample(syllables, fanout) for first in syllables}
+
+
+def build_stream(words_dict: dict, count: int, rng: random.Random) -> list:
+    """Random walk over the dictionary, mixed with typical rejections."""
+    channel = _FakeChannel()
+    authors = [_FakeAuthor(i) for i in range(1, 9)]
+    firsts = list(words_dict)
+    current = rng.choice(firsts)
+    used = set()
+    messages = []
+    for i in range(count):
+        author = authors[i % len(authors)]
+        roll = rng.random()
+        if roll < 0.6:
+            options = [s for s in words_dict[current] if f"{current} {s}" not in used]
+            if not options:
+                used.clear()
+                options = words_dict[current]
+            second = rng.choice(options)
+            text = f"{current} {second}"
+            used.add(text)
+            current = second
+        elif roll < 0.8:
+            text = f"{rng.choice(firsts)} {rng.choice(firsts)}"
+        elif roll < 0.9:
+            text = f"{current} khongco"
+        else:
+            text = "hello world nope"
+        messages.append(_FakeMessage(author, f"  {text.upper()} ", channel))
+    return messages
+
+
+def new_game(cog: GameNoiTu, start_word: str) -> dict:
+    game = {
+        "channel_id": 1,
+        "current_word": start_word,
+        "used_words": {start_word},
+        "last_author_id": None,
+        "timer_task": None,
+        "timer_message": None,
+        "player_count": 0,
+        "last_message_time": None,
+        "start_message": None,
+        "start_message_content": "",
+        "players": {},
+    }
+    cog._sync_game_keys(game)
+    return game
+
+
+def legacy_validate(content_raw: str, game: dict, all_words: set, words_dict: dict) -> str:
+    """The string-based checks _process_word used before the syllable index."""
+    content = content_raw.lower().strip()
+    if len(content.split()) != 2:
+        return "invalid_format"
+    last_syllable = game["current_word"].split()[-1].lower()
+    first_syllable = content.split()[0].lower()
+    if first_syllable != last_syllable:
+        return "wrong_connection"
+    if content in game["used_words"]:
+        return "already_used"
+    if content.lower().strip() not in all_words:
+        return "not_in_dict"
+    parts = content.split()
+    _ = len(parts[0]) == len(parts[1]) and parts[0][0] == parts[1][0]
+    game["used_words"].add(content)
+    game["current_word"] = content
+    tail = content.split()[-1]
+    any(f"{tail} {s}" not in game["used_words"] for s in words_dict.get(tail, ()))
+    return "valid_move"
+
+
+def indexed_validate(content_raw: str, game: dict, index) -> str:
+    """The same checks through the syllable index (what _process_word now does)."""
+    parsed = index.parse(content_raw)
+    if parsed is None:
+        return "invalid_format"
+    first_id, second_id, content = parsed
+    if game["last_id"] == UNKNOWN:
+        connects = content.split()[0] == game["current_word"].split()[-1]
+    else:
+        connects = first_id == game["last_id"]
+    if not connects:
+        return "wrong_connection"
+    key = word_key(first_id, second_id) if UNKNOWN not in (first_id, second_id) else UNKNOWN
+    if key in game["used_keys"]:
+        return "already_used"
+    if key not in index.words:
+        return "not_in_dict"
+    _ = key in index.reduplicative
+    game["used_keys"].add(key)
+    game["used_words"].add(content)
+    game["current_word"] = content
+    game["last_id"] = second_id
+    index.has_next(second_id, game["used_keys"])
+    return "valid_move"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--syllables", type=int, default=3_000)
+    parser.add_argument("--fanout", type=int, default=20)
+    args = parser.parse_args()
+
+    noitu_logger.setLevel(logging.WARNING)
+    rng = random.Random(7)
+    words_dict = build_dictionary(args.syllables, args.fanout, rng)
+    messages = build_stream(words_dict, args.messages, rng)
+
+    cog = GameNoiTu(bot=None)
+    cog.words_dict = words_dict
+    cog.all_words, cog.all_words_list, cog.word_index = cog._build_word_tables(words_dict)
+    # Side effects are out of scope: drop the coroutine/awaitable immediately
+    cog._dispatch = lambda coro, label: coro.close() if hasattr(coro, "close") else None
+
+    start_word = messages[0].content.strip().lower()
+    start_word = start_word if start_word in cog.all_words else cog.all_words_list[0]
+
+    guild_id = 1
+    cog.games[guild_id] = new_game(cog, start_word)
+    start = time.perf_counter()
+    results = {}
+    for message in messages:
+        game = cog.games[guild_id]
+        if game.get("ended"):
+            cog.games[guild_id] = game = new_game(cog, start_word)
+        result = cog._process_word(message, guild_id, game)
+        results[result] = results.get(result, 0) + 1
+    indexed = time.perf_counter() - start
+
+    game = new_game(cog, start_word)
+    start = time.perf_counter()
+    for message in messages:
+        indexed_validate(message.content, game, cog.word_index)
+    indexed_only = time.perf_counter() - start
+
+    game = new_game(cog, start_word)
+    start = time.perf_counter()
+    for message in messages:
+        legacy_validate(message.content, game, cog.all_words, words_dict)
+    legacy = time.perf_counter() - start
+
+    print(f"[BENCH] {args.messages:,} messages, {len(cog.all_words):,} words")
+    print(f"  * Outcomes: {results}")
+    print(f"  * _process_word end to end:  {args.messages / indexed:,.0f} msg/s")
+    print(f"  * Validation, syllable index: {args.messages / indexed_only:,.0f} msg/s")
+    print(f"  * Validation, legacy strings: {args.messages / legacy:,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
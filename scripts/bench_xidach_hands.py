@@ -0,0 +1,124 @@
+"""Microbenchmark: Xi Dach hand scoring and deck draws per second.
+
+Scores random 2-5 card hands with the previous per-card loop and with the
+HAND_TABLE lookup (per hand, and by precomputed key as a simulation keeping
+keys incrementally would), checking both agree, then times dealing rounds
+from the previous list-slicing deck and the bytearray deck.
+
+Usage:
+    python scripts/bench_xidach_hands.py [--hands 500000] [--rounds 100000] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.xi_dach.core.deck import CARDS, Deck  # noqa: E402
+from cogs.xi_dach.services.hand_service import (  # noqa: E402
+    HAND_TABLE,
+    HandType,
+    determine_hand_type,
+    hand_key,
+)
+
+
+def legacy_determine_hand_type(hand):
+    """Scoring before the lookup table: properties per card, every call."""
+    if not hand:
+        return 0, HandType.NORMAL
+    total = 0
+    if len(hand) > 2:
+        for card in hand:
+            total += 1 if card.is_ace else card.value
+    else:
+        ace_count = 0
+        for card in hand:
+            if card.is_ace:
+                ace_count += 1
+                total += 11
+            else:
+                total += card.value
+        while total > 21 and ace_count > 0:
+            total -= 10
+            ace_count -= 1
+    if total > 21:
+        return total, HandType.BUST
+    if len(hand) == 2:
+        ace_count = sum(1 for c in hand if c.is_ace)
+        ten_count = sum(1 for c in hand if c.is_ten_value)
+        if ace_count == 2:
+            return total, HandType.XI_BAN
+        if ace_count == 1 and ten_count == 1:
+            return total, HandType.XI_DACH
+    if len(hand) == 5:
+        return total, HandType.NGU_LINH
+    return total, HandType.NORMAL
+
+
+class LegacyDeck:
+    """The deck before the bytearray: a list sliced and rebuilt on every draw."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.cards = list(CARDS)
+        random.shuffle(self.cards)
+
+    def draw(self, count=1):
+        if count > len(self.cards):
+            self.reset()
+        drawn = self.cards[:count]
+        self.cards = self.cards[count:]
+        return drawn
+
+    def draw_one(self):
+        return self.draw(1)[0]
+
+
+def run(label: str, fn, items, unit: str) -> None:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    elapsed = time.perf_counter() - start
+    print(f"  * {label:<24} {len(items) / elapsed:12,.0f} {unit}/s")
+
+
+def deal_round(deck) -> None:
+    """One table round: 4 players x 2 cards, dealer 2, then 6 hits."""
+    for _ in range(8):
+        deck.draw_one()
+    deck.draw(2)
+    for _ in range(6):
+        deck.draw_one()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, default=500_000)
+    parser.add_argument("--rounds", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    hands = [rng.sample(CARDS, rng.randint(2, 5)) for _ in range(args.hands)]
+    keys = [hand_key(hand) for hand in hands]
+    mismatches = sum(legacy_determine_hand_type(h) != determine_hand_type(h) for h in hands)
+    print(f"[BENCH] {args.hands:,} hands, {mismatches} mismatches")
+
+    run("before (per-card loop)", legacy_determine_hand_type, hands, "hands")
+    run("after (HAND_TABLE)", determine_hand_type, hands, "hands")
+    run("after (precomputed key)", HAND_TABLE.__getitem__, keys, "hands")
+
+    random.seed(args.seed)
+    rounds = [None] * args.rounds
+    legacy, deck = LegacyDeck(), Deck()
+    run("before (list deck)", lambda _: deal_round(legacy), rounds, "rounds")
+    run("after (bytearray deck)", lambda _: deal_round(deck), rounds, "rounds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Microbenchmark: Xi Dach hand renders per second and bytes per image.
+
+Replays a synthetic table workload (hands dealt two cards, growing one card at
+a time up to five, each state rendered several times as hits, refreshes and
+dealer steps do) through the cached renderer, and compares it with the
+previous from-scratch compose + full RGB PNG path.
+
+Usage:
+    python scripts/bench_xidach_render.py [--hands 300] [--repeats 3] [--seed 0]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.xi_dach.ui import render  # noqa: E402
+
+RANKS = [str(i) for i in range(2, 11)] + ["J", "Q", "K", "A"]
+SUITS = ["♠️", "♥️", "♦️", "♣️"]
+
+
+def legacy_render(cards) -> bytes:
+    """The renderer before the cache: compose every card, default PNG."""
+    num_cards = len(cards)
+    width = 40 + num_cards * render.CARD_WIDTH + (num_cards - 1) * render.CARD_SPACING
+    img = render.assets.get_bg(width, 40 + render.CARD_HEIGHT).copy()
+    x = 20
+    for rank, suit in cards:
+        card_img = render.assets.get_card(rank, suit)
+        img.paste(card_img, (x, 20), card_img)
+        x += render.CARD_WIDTH + render.CARD_SPACING
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", optimize=False)
+    return buffer.getvalue()
+
+
+def build_workload(hands: int, repeats: int, rng: random.Random) -> list:
+    """Hand states in render order: every prefix from 2 cards up, repeated."""
+    deck = [(rank, suit) for rank in RANKS for suit in SUITS]
+    workload = []
+    for _ in range(hands):
+        hand = rng.sample(deck, rng.randint(2, render.MAX_HAND_CARDS))
+        for size in range(2, len(hand) + 1):
+            workload.extend([hand[:size]] * repeats)
+    return workload
+
+
+def run(label: str, fn, workload: list) -> None:
+    start = time.perf_counter()
+    total_bytes = 0
+    for cards in workload:
+        total_bytes += len(fn(cards))
+    elapsed = time.perf_counter() - start
+    print(f"  * {label:<22} {len(workload) / elapsed:9,.0f} renders/s  {total_bytes / len(workload):9,.0f} bytes/image")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, default=300)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    render.assets.load_assets()
+    workload = build_workload(args.hands, args.repeats, random.Random(args.seed))
+    unique = len({tuple(cards) for cards in workload})
+    print(f"[BENCH] {len(workload):,} renders of {unique:,} distinct hands")
+
+    run("before (no cache, PNG)", legacy_render, workload)
+    render.clear_render_cache()
+    run("after (cache)", render.render_player_hand_sync, workload)
+    print("  * Cache: " + ", ".join(f"{k}={v:,}" for k, v in render.cache_stats().items()))
+
+
+if __name__ == "__main__":
+    main()
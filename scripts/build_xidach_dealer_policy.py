@@ -0,0 +1,237 @@
+"""Build the Xi Dach dealer policy table (data/xidach_dealer_policy.bin).
+
+1. Monte Carlo: shuffle many decks (vectorized with NumPy) and count, for
+   every dealer state reached while drawing, which card comes next. The
+   transition estimate includes the dealer's own card removal; states seen
+   rarely are smoothed towards the full-deck distribution.
+2. Backward induction over dealer states, vectorized over every survivor
+   histogram: EV of standing is the payoff row of the final dealer outcome
+   against the histogram, EV of hitting is the transition-weighted value of
+   the next state (forced hits under 16, stop at 5 cards).
+
+Payoffs come from compare_hands on representative hands, so they follow the
+live rules. Ngu Linh against Ngu Linh is scored as a push (survivor scores
+inside that category are not tracked).
+
+Needs NumPy (builder only: pip install -r requirements-dev.txt); the bot reads
+the table with the standard library. The built table is committed; rebuild and
+commit it again after changing the rules or the payoffs.
+
+Usage:
+    python scripts/build_xidach_dealer_policy.py [--decks 1000000] [--seed 0] [--bench 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.xi_dach.core.deck import Card, Rank, Suit  # noqa: E402
+from cogs.xi_dach.services import ai_service  # noqa: E402
+from cogs.xi_dach.services.dealer_policy import (  # noqa: E402
+    CATEGORIES,
+    MAX_SURVIVORS,
+    POLICY_PATH,
+    DealerPolicy,
+    enumerate_histograms,
+    state_score,
+    write_policy,
+)
+from cogs.xi_dach.services.hand_service import compare_hands  # noqa: E402
+
+MAX_CARDS = 5
+CHUNK = 100_000
+SMOOTHING = 10.0  # pseudo-draws of full-deck prior per state
+
+# Card values 1..10 (Ace = 1) of one 52-card deck, and the full-deck prior
+DECK_VALUES = np.array([min(i % 13 + 1, 10) for i in range(52)], dtype=np.int8)
+PRIOR = np.bincount(DECK_VALUES, minlength=11)[1:] / 52.0
+RANK_BY_VALUE = {1: Rank.ACE, 2: Rank.TWO, 3: Rank.THREE, 4: Rank.FOUR, 5: Rank.FIVE,
+                 6: Rank.SIX, 7: Rank.SEVEN, 8: Rank.EIGHT, 9: Rank.NINE, 10: Rank.TEN}
+
+# Dealer final outcomes: bust, stood on 16..21, Ngu Linh
+OUTCOMES = ("BUST", "16", "17", "18", "19", "20", "21", "NGU_LINH")
+
+
+def hand(*values):
+    return [Card(Suit.SPADE, RANK_BY_VALUE[v]) for v in values]
+
+
+def payoff_matrix() -> np.ndarray:
+    """Dealer net result per unit bet, [outcome, survivor category]."""
+    dealer_hands = [hand(10, 10, 5)] + [hand(10, 5, s - 15) for s in range(16, 22)] + [hand(2, 2, 2, 2, 2)]
+    player_hands = [hand(10, 2, 3)] + [hand(10, 5, s - 15) for s in range(16, 22)] + [hand(2, 2, 2, 2, 2)]
+    matrix = np.zeros((len(OUTCOMES), len(CATEGORIES)))
+    for o, dealer in enumerate(dealer_hands):
+        for c, player in enumerate(player_hands):
+            _, multiplier = compare_hands(player, dealer)
+            matrix[o, c] = 1.0 - multiplier
+    return matrix
+
+
+def outcome_of(state) -> int:
+    score = state_score(state)
+    if score > 21:
+        return 0
+    if state[0] >= MAX_CARDS:
+        return len(OUTCOMES) - 1
+    return score - 15
+
+
+def estimate_transitions(decks: int, rng: np.random.Generator) -> dict:
+    """P(next card value | dealer state) from simulated shuffles."""
+    # key = (count * 64 + hard) * 2 + has_ace, 10 next values per key
+    size = (MAX_CARDS * 64 + 64) * 2 * 10
+    counts = np.zeros(size, dtype=np.int64)
+    for start in range(0, decks, CHUNK):
+        n = min(CHUNK, decks - start)
+        order = rng.random((n, 52)).argsort(axis=1)[:, :MAX_CARDS]
+        values = DECK_VALUES[order].astype(np.int64)
+        hard = values.cumsum(axis=1)
+        opening_ace = (values[:, :2] == 1).any(axis=1)
+        for count in range(2, MAX_CARDS):
+            has_ace = opening_ace if count == 2 else np.zeros(n, dtype=bool)
+            key = (count * 64 + hard[:, count - 1]) * 2 + has_ace
+            counts += np.bincount(key * 10 + values[:, count] - 1, minlength=size)
+    counts = counts.reshape(-1, 10)
+    transitions = {}
+    for key in np.flatnonzero(counts.sum(axis=1)):
+        row = counts[key]
+        state = (int(key // 2 // 64), int(key // 2 % 64), int(key % 2))
+        transitions[state] = (row + SMOOTHING * PRIOR) / (row.sum() + SMOOTHING)
+    return transitions
+
+
+def solve(transitions: dict, hists: np.ndarray, payoff: np.ndarray):
+    """Backward induction; returns decision states and their (ev_stand, ev_hit) arrays."""
+    results = hists @ payoff.T  # [hist, outcome]
+    memo = {}
+
+    def value(state):
+        if state in memo:
+            return memo[state]
+        count, hard, has_ace = state
+        score = state_score(state)
+        if score > 21 or count >= MAX_CARDS:
+            memo[state] = results[:, outcome_of(state)], None
+            return memo[state]
+        probs = transitions.get(state, PRIOR)
+        ev_hit = np.zeros(len(hists))
+        for v in range(1, 11):
+            ev_hit += probs[v - 1] * best(((count + 1), hard + v, 0))
+        if score < 16:
+            memo[state] = ev_hit, None
+        else:
+            memo[state] = results[:, outcome_of(state)], ev_hit
+        return memo[state]
+
+    def best(state):
+        stand, hit = value(state)
+        return stand if hit is None else np.maximum(stand, hit)
+
+    # Every opening two-card state, which reaches every later one
+    for first in range(1, 11):
+        for second in range(1, 11):
+            best((2, first + second, int(first == 1 or second == 1)))
+
+    states = sorted(s for s, (_, hit) in memo.items() if hit is not None and state_score(s) >= 16)
+    return states, [memo[s] for s in states]
+
+
+def threshold_action(state, hist) -> str:
+    """The previous hand-written rules on a (state, histogram) pair."""
+    score = state_score(state)
+    losing = sum(n for c, n in enumerate(hist) if c == len(CATEGORIES) - 1 or (0 < c and c + 15 > score))
+    total = sum(hist)
+    if total == 0:
+        return "stand" if score >= 17 else "hit"
+    if losing == 0:
+        return "stand"
+    if score <= 17:
+        return "hit"
+    if score == 18:
+        return "hit" if losing > total / 2 else "stand"
+    return "stand"
+
+
+def bench_lookups(path: str, count: int, rng: random.Random) -> None:
+    """Time get_dealer_decision with the built table against the threshold rules.
+
+    Survivors are summarized once per case, as the dealer loop does once per turn.
+    """
+    policy = DealerPolicy(path)
+    policy.load()
+    deck = [Card(suit, rank) for suit in Suit for rank in Rank]
+
+    class Survivor:
+        __slots__ = ("hand",)
+
+        def __init__(self, cards):
+            self.hand = cards
+
+    cases = []
+    while len(cases) < 2000:
+        cards = rng.sample(deck, 12)
+        dealer = cards[:rng.randint(2, 4)]
+        if state_score((len(dealer), sum(1 if c.is_ace else c.value for c in dealer), 0)) > 21:
+            continue
+        survivors = [Survivor(cards[i:i + 3]) for i in range(4, 4 + 3 * rng.randint(0, 2), 3)]
+        cases.append((dealer, ai_service.summarize_survivors(survivors)))
+
+    for label, active in (("threshold rules", None), ("policy table", policy)):
+        ai_service.dealer_policy = active or DealerPolicy(os.devnull)
+        start = time.perf_counter()
+        for i in range(count):
+            ai_service.get_dealer_decision(*cases[i % len(cases)])
+        elapsed = time.perf_counter() - start
+        print(f"  * {label:<16} {elapsed / count * 1e6:6.2f} us/decision")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--decks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-survivors", type=int, default=MAX_SURVIVORS)
+    parser.add_argument("--out", default=POLICY_PATH)
+    parser.add_argument("--bench", type=int, default=200_000, help="decisions to time (0 = skip)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    transitions = estimate_transitions(args.decks, np.random.default_rng(args.seed))
+    mc_secs = time.perf_counter() - start
+
+    hist_list = enumerate_histograms(args.max_survivors)
+    hists = np.array(hist_list, dtype=np.float64)
+    start = time.perf_counter()
+    states, evs = solve(transitions, hists, payoff_matrix())
+    solve_secs = time.perf_counter() - start
+
+    table = np.empty((len(states), len(hists), 2), dtype="<f4")
+    for i, (stand, hit) in enumerate(evs):
+        table[i, :, 0] = stand
+        table[i, :, 1] = hit
+    write_policy(args.out, states, args.max_survivors, table.tobytes(), {
+        "decks": args.decks,
+        "seed": args.seed,
+    })
+
+    hits = table[:, :, 1] > table[:, :, 0]
+    changed = sum(
+        (threshold_action(state, hist) == "hit") != bool(hits[i, j])
+        for i, state in enumerate(states) for j, hist in enumerate(hist_list) if sum(hist)
+    )
+    print(f"[POLICY] {args.decks:,} decks in {mc_secs:.1f}s, {len(states)} states x {len(hists):,} histograms "
+          f"solved in {solve_secs:.1f}s -> {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB)")
+    print(f"  * Hit in {hits.mean():.1%} of entries; differs from the threshold rules in "
+          f"{changed / (hits.size - len(states)):.1%}")
+
+    if args.bench:
+        bench_lookups(args.out, args.bench, random.Random(args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Seeded Werewolf simulation: rules throughput and regression harness.
+
+Plays games through the headless engine with a random fake transport and
+reports games per second, CPU time per phase, win rates by alignment and role,
+and any invariant failures (exit code 1 if there are some).
+
+Usage:
+    python scripts/sim_werewolf.py [--games 5000] [--players 8 12 16] [--seed 0]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.werewolf.roles.base import Expansion  # noqa: E402
+from cogs.werewolf.engine.simulation import run_simulations  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=5_000)
+    parser.add_argument("--players", type=int, nargs="+", default=[8, 12, 16])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--expansions", nargs="+", default=[Expansion.BASIC.value],
+        choices=[e.value for e in Expansion],
+    )
+    args = parser.parse_args()
+
+    report = run_simulations(args.games, args.players, args.seed, {Expansion(e) for e in args.expansions})
+
+    played = max(report.games, 1)
+    print(f"[SIM] {report.games:,} games in {report.elapsed:.2f}s ({report.games_per_second:,.0f} games/s)")
+    print(f"  * Avg nights per game: {report.rounds / played:.2f}")
+    for phase, seconds in sorted(report.phase_seconds.items()):
+        print(f"  * CPU {phase:<6} {seconds * 1e6 / played:8.1f} µs/game")
+    print("  * Port calls per game: " + ", ".join(f"{k}={v / played:.1f}" for k, v in sorted(report.port_calls.items())))
+    print("  * Wins: " + ", ".join(f"{k}={v / played:.1%}" for k, v in report.wins.most_common()))
+    print("  * Role win rates:")
+    for role_name, count in report.role_games.most_common():
+        print(f"      {role_name:<16} {report.role_wins[role_name] / count:6.1%}  ({count:,} seats)")
+
+    if report.failures:
+        print(f"[SIM] {len(report.failures)} failed games, first: {report.failures[0]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
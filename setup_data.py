@@ -255,10 +255,18 @@ def init_database():
                     voice_channel_id INTEGER, -- For werewolf voice games, NULL for text
                     channel_id INTEGER,
                     game_state TEXT, -- JSON serialized state
+                    game_deltas TEXT DEFAULT '', -- Werewolf phase deltas since game_state, one JSON per line
                     last_saved DATETIME DEFAULT CURRENT_TIMESTAMP,
                     PRIMARY KEY (guild_id, game_type, voice_channel_id)
                 )''')
 
+    # Add game_deltas column if not exists
+    try:
+        c.execute("ALTER TABLE game_sessions ADD COLUMN game_deltas TEXT DEFAULT ''")
+        print("✓ Added game_deltas column to game_sessions table")
+    except sqlite3.OperationalError:
+        pass
+
     # 10. MODULE: USER BUFFS (Persistence cho buff/emotional state)
     # Lưu trạng thái buff/debuff để không mất khi restart
     c.execute('''CREATE TABLE IF NOT EXISTS user_buffs (
@@ -299,7 +307,19 @@ def init_database():
     except:
         pass
 
-    # 13. LEGACY SNAPSHOT MIGRATION (One-time)
+    # 13. GAME ESCROW (Stakes of rounds in progress, core/settlement.py)
+    # Rows exist only between a bet and its round's settlement; leftovers after
+    # a crash are refunded on startup
+    c.execute('''CREATE TABLE IF NOT EXISTS game_escrow (
+                    round_id TEXT NOT NULL,        -- e.g., 'xidach:<table_id>', 'baucua:<game_id>'
+                    user_id INTEGER NOT NULL,
+                    category TEXT NOT NULL,        -- transaction_logs category of the game
+                    amount INTEGER NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (round_id, user_id)
+                )''')
+
+    # 14. LEGACY SNAPSHOT MIGRATION (One-time)
     # Check if transaction_logs is empty but users have money
     t_count = c.execute("SELECT COUNT(*) FROM transaction_logs").fetchone()[0]
     if t_count == 0:
@@ -432,6 +452,13 @@ def init_database():
     except:
         pass
 
+    # Unique key for game session upserts (text games have a NULL voice channel)
+    try:
+        c.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_game_sessions_key ON game_sessions(guild_id, game_type, (COALESCE(voice_channel_id, 0)))")
+        print("✓ Created unique index: game_sessions(guild_id, game_type, voice_channel_id)")
+    except:
+        pass
+
     conn.commit()
     
     # ==================== VACUUM DATABASE ====================
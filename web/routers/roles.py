@@ -16,6 +16,7 @@ import json
 
 from ..config import DISCORD_TOKEN, DISCORD_API_BASE, DEFAULT_GUILD_ID
 from database_manager import get_server_config, db_manager
+from core.discord_scheduler import RateLimited, discord_scheduler
 
 router = APIRouter()
 logger = logging.getLogger("AdminPanel.Roles")
@@ -49,17 +50,29 @@ class BatchUpdate(BaseModel):
 
 
 # Helper functions
-async def discord_request(method: str, endpoint: str, json_data: Dict = None) -> Optional[Dict]:
-    """Make async request to Discord API."""
+async def discord_request(method: str, endpoint: str, json_data: Dict = None, route: Optional[tuple] = None) -> Optional[Dict]:
+    """Make async request to Discord API.
+    
+    When `route` ((name, major) as used by the action scheduler) is given, the
+    response's rate limit headers are fed back into that route's bucket and a
+    429 raises RateLimited so the scheduler can back off and retry.
+    """
     url = f"{DISCORD_API_BASE}{endpoint}"
     async with httpx.AsyncClient(timeout=10.0) as client:
         try:
             response = await client.request(method, url, headers=HEADERS, json=json_data)
+            if route:
+                discord_scheduler.observe_headers(route[0], route[1], response.headers)
+                if response.status_code == 429:
+                    body = response.json()
+                    raise RateLimited(float(body.get("retry_after", 1.0)), bool(body.get("global")))
             if response.status_code < 300:
                 return response.json()
             else:
                 logger.error(f"Discord API error: {response.status_code} - {response.text}")
                 return None
+        except RateLimited:
+            raise
         except Exception as e:
             logger.error(f"Discord request failed: {e}")
             return None
@@ -88,7 +101,7 @@ async def add_category_role_id(guild_id: str, role_id: str):
                 (json.dumps(current_ids), int(guild_id))
             )
             # CRITICAL: Invalidate cache so subsequent fetches see the new category
-            db_manager.clear_cache_by_prefix(f"config_{guild_id}")
+            db_manager.clear_cache_by_prefix(f"config_{guild_id}_")
     except Exception as e:
         logger.error(f"Failed to save category role: {e}")
 
@@ -216,19 +229,37 @@ async def process_batch(task_id: str, updates: List[Dict], reorder: Dict, guild_
         
         TASKS[task_id].update({"status": "processing", "progress": 0})
         
-        # Process individual updates
+        # Merge updates per role so each role is patched once with its final values
+        payloads: Dict[str, Dict] = {}
         for update in updates:
-            role_id = update['id']
-            payload = {}
+            payload = payloads.setdefault(str(update['id']), {})
             if 'name' in update:
                 payload['name'] = update['name']
             if 'color' in update:
                 payload['color'] = int(update['color'])
-            
-            await discord_request("PATCH", f"/guilds/{guild_id}/roles/{role_id}", payload)
+        total = len(payloads) + 1
+        
+        def _progress(_future):
+            nonlocal current
             current += 1
             TASKS[task_id]["progress"] = int((current / total) * 100)
-            await asyncio.sleep(0.2)  # Rate limit protection
+        
+        # Paced by the scheduler's guild role bucket, which follows Discord's headers
+        futures = []
+        for role_id, payload in payloads.items():
+            future = discord_scheduler.submit(
+                "guild_role_edit",
+                lambda role_id=role_id, payload=payload: discord_request(
+                    "PATCH", f"/guilds/{guild_id}/roles/{role_id}", payload,
+                    route=("guild_role_edit", guild_id),
+                ),
+                major=guild_id,
+                target=role_id,
+                label=f"role edit {role_id}",
+            )
+            future.add_done_callback(_progress)
+            futures.append(future)
+        await asyncio.gather(*futures)
         
         # Process reorder if provided
         if reorder and reorder.get('categories'):